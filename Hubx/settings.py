@@ -47,6 +47,10 @@ FERNET_KEY = os.environ.get(
     base64.urlsafe_b64encode(SECRET_KEY.encode()[:32]).decode(),
 )
 
+# Semente Ed25519 (32 bytes em base64) que assina os manifestos de check-in;
+# vazia, a chave é derivada de SECRET_KEY.
+CHECKIN_MANIFESTO_CHAVE = os.environ.get("CHECKIN_MANIFESTO_CHAVE", "")
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG", "True").lower() in {"1", "true", "yes"}
 
@@ -246,6 +250,9 @@ DATABASES = {
     }
 }
 
+# Número máximo de grupos de consultas do dashboard executados em paralelo
+DASHBOARD_METRICS_MAX_WORKERS = int(os.getenv("DASHBOARD_METRICS_MAX_WORKERS", "4"))
+
 PAGAMENTOS_ROW_LOCKS_ENABLED = os.getenv("PAGAMENTOS_ROW_LOCKS_ENABLED", "1").strip().lower() in {
     "1",
     "true",
@@ -477,6 +484,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "organizacoes.tasks.publicar_feed_noticias_task",
         "schedule": crontab(minute=0, hour=12),
     },
+    "reconciliar_rollups_dashboard": {
+        "task": "dashboard.tasks.reconciliar_rollups_dashboard",
+        "schedule": crontab(minute=30, hour=2),
+    },
+    "atualizar_sugestoes_conexoes": {
+        "task": "conexoes.tasks.atualizar_sugestoes_conexoes",
+        "schedule": crontab(minute=0, hour=4),
+    },
     "executar_feed_plugins": {  # executa plugins do feed periodicamente
         "task": "feed.tasks.executar_plugins",
         "schedule": crontab(minute="*" if FEED_PLUGINS_INTERVAL_MINUTES == 1 else f"*/{FEED_PLUGINS_INTERVAL_MINUTES}"),
@@ -62,6 +62,10 @@ urlpatterns = [
         "api/nucleos/",
         include(("nucleos.api_urls", "nucleos_api"), namespace="nucleos_api"),
     ),
+    path(
+        "api/membros/",
+        include(("membros.api_urls", "membros_api"), namespace="membros_api"),
+    ),
     path(
         "api/audit/",
         include(("audit.api_urls", "audit_api"), namespace="audit_api"),
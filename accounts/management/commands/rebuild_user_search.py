@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from accounts.search import SEARCH_FIELDS, busca_namespace, documento_busca, sincronizar_fts
+from core.cache import bump_cache_version
+
+
+class Command(BaseCommand):
+    help = "Recalcula o documento de busca dos usuários (após importações ou updates em massa)"
+
+    def handle(self, *args, **options):
+        alterados = []
+        for user in User.all_objects.only("id", "organizacao_id", "search_document", *SEARCH_FIELDS).iterator(
+            chunk_size=1000
+        ):
+            documento = documento_busca(user)
+            if documento != user.search_document:
+                user.search_document = documento
+                alterados.append(user)
+        User.all_objects.bulk_update(alterados, ["search_document"], batch_size=1000)
+        sincronizar_fts()
+        for organizacao_id in {user.organizacao_id for user in alterados if user.organizacao_id}:
+            bump_cache_version(busca_namespace(organizacao_id))
+        self.stdout.write(self.style.SUCCESS(f"{len(alterados)} documentos de busca atualizados"))
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:46
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Normalização de ``accounts.search`` copiada aqui: a migração não deve mudar junto com o módulo.
+FTS_TABLE = "accounts_user_busca"
+PG_TRGM_INDEX = "accounts_user_search_document_trgm"
+NOME_FIELDS = ("username", "contato", "nome_fantasia", "razao_social")
+DIGITOS_FIELDS = ("cnpj",)
+CHUNK_SIZE = 1000
+
+_NAO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+_NAO_DIGITO = re.compile(r"\D+")
+
+
+def _normalizar(texto):
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    sem_acentos = "".join(char for char in decomposto if not unicodedata.combining(char))
+    return _NAO_ALFANUMERICO.sub(" ", sem_acentos.lower()).strip()
+
+
+def _documento(user):
+    partes = [_normalizar(getattr(user, field)) for field in NOME_FIELDS]
+    partes += [_NAO_DIGITO.sub("", getattr(user, field) or "") for field in DIGITOS_FIELDS]
+    return " ".join(parte for parte in partes if parte)
+
+
+def populate_search_document(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    usuarios = User.objects.only("id", "search_document", *NOME_FIELDS, *DIGITOS_FIELDS).order_by("pk")
+    ultimo = None
+    while True:
+        lote = list((usuarios if ultimo is None else usuarios.filter(pk__gt=ultimo))[:CHUNK_SIZE])
+        if not lote:
+            return
+        for user in lote:
+            user.search_document = _documento(user)
+        User.objects.bulk_update(lote, ["search_document"])
+        ultimo = lote[-1].pk
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_TRGM_INDEX} ON accounts_user USING gin (search_document gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(search_document, tokenize='trigram')"
+        )
+        schema_editor.execute(f"DELETE FROM {FTS_TABLE}")  # noqa: S608
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) "  # noqa: S608
+            "SELECT id, search_document FROM accounts_user"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_TRGM_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0028_alter_user_two_factor_secret"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(populate_search_document, migrations.RunPython.noop),
+        # Índice GIN de trigramas no PostgreSQL; tabela FTS5 (trigram) no SQLite.
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
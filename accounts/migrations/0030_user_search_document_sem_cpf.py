@@ -0,0 +1,72 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+FTS_TABLE = "accounts_user_busca"
+NOME_FIELDS = ("username", "contato", "nome_fantasia", "razao_social")
+CHUNK_SIZE = 1000
+
+_NAO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+_NAO_DIGITO = re.compile(r"\D+")
+
+
+def _normalizar(texto):
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    sem_acentos = "".join(char for char in decomposto if not unicodedata.combining(char))
+    return _NAO_ALFANUMERICO.sub(" ", sem_acentos.lower()).strip()
+
+
+def _documento(user):
+    partes = [_normalizar(getattr(user, field)) for field in NOME_FIELDS]
+    partes.append(_NAO_DIGITO.sub("", user.cnpj or ""))
+    return " ".join(parte for parte in partes if parte)
+
+
+def _sincronizar_fts(schema_editor, user_ids):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite" or FTS_TABLE not in connection.introspection.table_names():
+        return
+    marcadores = ", ".join(["%s"] * len(user_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marcadores})", user_ids)  # noqa: S608
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) "  # noqa: S608
+            f"SELECT id, search_document FROM accounts_user WHERE id IN ({marcadores})",
+            user_ids,
+        )
+
+
+def remover_cpf_do_documento(apps, schema_editor):
+    """Regera o documento de busca de quem tem CPF, que deixou de ser indexado."""
+
+    User = apps.get_model("accounts", "User")
+    usuarios = (
+        User.objects.exclude(cpf__isnull=True)
+        .exclude(cpf="")
+        .only("id", "search_document", "cnpj", *NOME_FIELDS)
+        .order_by("pk")
+    )
+    ultimo = None
+    while True:
+        lote = list((usuarios if ultimo is None else usuarios.filter(pk__gt=ultimo))[:CHUNK_SIZE])
+        if not lote:
+            return
+        for user in lote:
+            user.search_document = _documento(user)
+        User.objects.bulk_update(lote, ["search_document"])
+        _sincronizar_fts(schema_editor, [user.pk for user in lote])
+        ultimo = lote[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0029_user_search_document"),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_cpf_do_documento, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0030_user_search_document_sem_cpf"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="calendario_feed_versao",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
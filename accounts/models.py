@@ -4,10 +4,10 @@ from __future__ import annotations
 import base64
 import hashlib
 import hmac
-import secrets
 import posixpath
-from pathlib import Path
+import secrets
 import uuid
+from pathlib import Path
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -16,20 +16,19 @@ from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Q
-from django.db.models import PROTECT, SET_NULL
+from django.db.models import PROTECT, SET_NULL, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
 from core.fields import EncryptedCharField, EncryptedTextField
-from core.models import SoftDeleteModel, TimeStampedModel
+from core.models import FieldTrackerMixin, SoftDeleteModel, TimeStampedModel
 from core.uploads.validators import validate_upload
 from organizacoes.utils import validate_cnpj
 
+from .search import SEARCH_FIELDS, documento_busca
 from .validators import cpf_validator
 
-
 # --- BEGIN: Área de atuação (choices) ---
 AREA_ATUACAO_CHOICES = [
     ("tecnologia", "Tecnologia da Informação"),
@@ -75,6 +74,12 @@ class UserType(models.TextChoices):
     CONSULTOR = "consultor", "Consultor"
 
 
+# Papéis gravados em ``user_type`` que não dependem dos vínculos com núcleos.
+_PAPEIS_EXPLICITOS = frozenset(
+    {UserType.ADMIN.value, UserType.OPERADOR.value, UserType.CONSULTOR.value, UserType.COORDENADOR.value}
+)
+
+
 class CustomUserManager(DjangoUserManager.from_queryset(UserQuerySet)):
     """User manager que utiliza o email como identificador principal."""
 
@@ -122,7 +127,7 @@ class SoftDeleteUserManager(CustomUserManager):
         return super().get_queryset().filter(deleted=False)
 
 
-class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
+class User(FieldTrackerMixin, AbstractUser, TimeStampedModel, SoftDeleteModel):
     """
     Modelo de usuário customizado.
     Herdamos de AbstractUser para manter toda a infraestrutura
@@ -192,6 +197,8 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
 
     # Identificador público estável (UUID) para uso em URLs
     public_id = models.UUIDField(default=uuid.uuid4, unique=True, db_index=True, editable=False)
+    # Nomes sem acentos e documentos só com dígitos; ver ``accounts.search``.
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     # Campos migrados do antigo modelo Perfil
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
@@ -220,6 +227,8 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
         ),
     )
     email_confirmed = models.BooleanField(default=False)
+    # Versão dos links de assinatura do calendário (ICS); incrementar invalida os anteriores.
+    calendario_feed_versao = models.PositiveIntegerField(default=0, editable=False)
 
     user_type = models.CharField(
         max_length=20,
@@ -255,6 +264,8 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
     objects = SoftDeleteUserManager()
     all_objects = CustomUserManager()
 
+    tracked_fields = ("organizacao", "date_joined")
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = ["username"]
 
@@ -295,37 +306,61 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
                     return True
             return False
 
-        participacoes_manager = getattr(self, "participacoes", None)
-        if participacoes_manager is None:
+        if self.pk is None:
             return False
 
-        filters: dict[str, object] = {"status": "ativo", "status_suspensao": False}
-        if papel is not None:
-            filters["papel"] = papel
-        return participacoes_manager.filter(**filters).exists()
+        indice = self._vinculos_nucleos()
+        if papel is None:
+            return bool(indice.ativos_sem_suspensao)
+        if papel == "coordenador":
+            return bool(indice.coordenacao)
+        return bool(indice.ativos_sem_suspensao - indice.coordenacao)
 
     def _has_consultoria_vinculo(self) -> bool:
         consultoria_prefetched = self._get_prefetched_related("nucleos_consultoria")
         if consultoria_prefetched is not None:
             return any(True for _ in consultoria_prefetched)
 
-        consultoria_manager = getattr(self, "nucleos_consultoria", None)
-        if consultoria_manager is None:
+        if self.pk is None:
             return False
-        return consultoria_manager.exists()
+        return bool(self._vinculos_nucleos().consultoria)
+
+    def _vinculos_nucleos(self):
+        """Vínculos com núcleos memorizados na instância e em cache por usuário.
+
+        Substitui as consultas ``exists()`` de ``get_tipo_usuario``: após a
+        primeira resolução, verificações de papel na mesma requisição não
+        acessam o banco.
+        """
+
+        from nucleos.membership import obter_indice
+
+        return obter_indice(self)
 
     @property
     def get_tipo_usuario(self):
+        # Memorizado na instância (duração da requisição); a chave inclui os
+        # campos do próprio usuário e, quando o papel depende de núcleos, a
+        # versão do índice de vínculos (lida uma vez por instância), para
+        # refletir promoções feitas por ``ParticipacaoNucleo`` no mesmo processo.
+        chave = (self.is_superuser, self.user_type, self.is_coordenador, self.is_associado, self.nucleo_id)
+        versao = None
+        if not self.is_superuser and self.user_type not in _PAPEIS_EXPLICITOS and self.pk is not None:
+            from nucleos.membership import versao_indice
+
+            versao = versao_indice(self)
+        memo = self.__dict__.get("_tipo_usuario_memo")
+        if memo is not None and memo[0] == (chave, versao):
+            return memo[1]
+        tipo = self._resolver_tipo_usuario()
+        self._tipo_usuario_memo = ((chave, versao), tipo)
+        return tipo
+
+    def _resolver_tipo_usuario(self):
         if self.is_superuser:
             return UserType.ROOT.value
 
-        explicit_roles = {
-            UserType.ADMIN.value,
-            UserType.OPERADOR.value,
-            UserType.CONSULTOR.value,
-            UserType.COORDENADOR.value,
-        }
-        if self.user_type in explicit_roles:
+        if self.user_type in _PAPEIS_EXPLICITOS:
             return self.user_type
 
         if self._has_consultoria_vinculo():
@@ -354,6 +389,10 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
             self.cnpj = validate_cnpj(self.cnpj)
         if self.user_type == UserType.ROOT.value:
             self.nucleo = None  # Garantir que usuários root não interajam com núcleos
+        self.search_document = documento_busca(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(SEARCH_FIELDS):
+            kwargs["update_fields"] = {*update_fields, "search_document"}
         super().save(*args, **kwargs)
 
     def clean(self):  # type: ignore[override]
@@ -457,9 +496,10 @@ class User(AbstractUser, TimeStampedModel, SoftDeleteModel):
 
     @property
     def nucleos(self):
+        from nucleos.membership import obter_indice
         from nucleos.models import Nucleo
 
-        return Nucleo.objects.filter(participacoes__user=self, participacoes__status="ativo")
+        return Nucleo.objects.filter(pk__in=obter_indice(self).ativos)
 
 
 class MediaTag(TimeStampedModel, SoftDeleteModel):
@@ -0,0 +1,167 @@
+"""Busca de usuários por documento normalizado.
+
+Cada usuário guarda em ``User.search_document`` seus nomes (username, contato,
+nome fantasia e razão social) sem acentos e em minúsculas, seguidos do CNPJ
+apenas com dígitos. O CPF fica de fora: a busca alimenta telas abertas a
+associados e não pode revelar a quem pertence um documento pessoal. A consulta
+é normalizada da mesma forma e cada termo vira um ``LIKE`` sobre essa coluna:
+
+* no PostgreSQL o ``LIKE`` usa o índice GIN ``gin_trgm_ops`` (``pg_trgm``) e a
+  ordenação considera a similaridade de trigramas;
+* no SQLite os termos com três ou mais caracteres são resolvidos pela tabela
+  FTS5 ``accounts_user_busca`` (tokenizador ``trigram``), mantida pelos sinais
+  de ``User``.
+
+O índice e a tabela são criados pela migração ``0029``; depois de alterações
+em massa, execute ``python manage.py rebuild_user_search``.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any
+
+from django.db import connection
+from django.db.models import Case, IntegerField, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+
+NOME_FIELDS = ("username", "contato", "nome_fantasia", "razao_social")
+DIGITOS_FIELDS = ("cnpj",)
+SEARCH_FIELDS = NOME_FIELDS + DIGITOS_FIELDS
+
+FTS_TABLE = "accounts_user_busca"
+# O tokenizador ``trigram`` do FTS5 só indexa termos com pelo menos 3 caracteres.
+FTS_MIN_TERMO = 3
+
+_NAO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+_NAO_DIGITO = re.compile(r"\D+")
+_APENAS_DOCUMENTO = re.compile(r"^[\d\s./-]+$")
+
+
+def normalizar_busca(texto: Any) -> str:
+    """Remove acentos, converte para minúsculas e separa palavras por espaço."""
+
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    sem_acentos = "".join(char for char in decomposto if not unicodedata.combining(char))
+    return _NAO_ALFANUMERICO.sub(" ", sem_acentos.lower()).strip()
+
+
+def documento_busca(user) -> str:
+    partes = [normalizar_busca(getattr(user, field, None)) for field in NOME_FIELDS]
+    partes += [_NAO_DIGITO.sub("", getattr(user, field, None) or "") for field in DIGITOS_FIELDS]
+    return " ".join(parte for parte in partes if parte)
+
+
+def termos_busca(consulta: str) -> list[str]:
+    """Termos normalizados da consulta; um CNPJ formatado vira um só termo."""
+
+    consulta = (consulta or "").strip()
+    if not consulta:
+        return []
+    if _APENAS_DOCUMENTO.match(consulta):
+        digitos = _NAO_DIGITO.sub("", consulta)
+        return [digitos] if digitos else []
+    return normalizar_busca(consulta).split()
+
+
+def busca_namespace(organizacao_id: Any) -> str:
+    """Versão de cache das sugestões de busca de uma organização."""
+
+    return f"usuarios_busca_org_{organizacao_id}"
+
+
+def fts_disponivel() -> bool:
+    if connection.vendor != "sqlite":
+        return False
+    # Só o resultado positivo é memorizado: a tabela pode surgir após ``migrate``.
+    if not getattr(connection, "_accounts_fts_disponivel", False):
+        connection._accounts_fts_disponivel = FTS_TABLE in connection.introspection.table_names()
+    return connection._accounts_fts_disponivel
+
+
+def _fts_match(termos: list[str]) -> str:
+    return " AND ".join(f'"{termo}"' for termo in termos)
+
+
+def buscar_usuarios(queryset: QuerySet, consulta: str) -> QuerySet:
+    """Filtra ``queryset`` pela consulta e anota ``busca_rank`` (menor é melhor).
+
+    Sem termos, devolve o ``queryset`` intacto (sem a anotação).
+    """
+
+    termos = termos_busca(consulta)
+    if not termos:
+        return queryset
+
+    indexados = [termo for termo in termos if len(termo) >= FTS_MIN_TERMO]
+    if indexados and fts_disponivel():
+        # O FTS5 reduz os candidatos; o ``LIKE`` abaixo confirma cada linha.
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",  # noqa: S608
+                [_fts_match(indexados)],
+            )
+        )
+    for termo in termos:
+        queryset = queryset.filter(search_document__contains=termo)
+
+    principal = termos[0]
+    queryset = queryset.annotate(
+        busca_rank=Case(
+            When(search_document__startswith=principal, then=Value(0)),
+            When(search_document__contains=f" {principal}", then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+    )
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        queryset = queryset.annotate(busca_similaridade=TrigramWordSimilarity(" ".join(termos), "search_document"))
+    return queryset
+
+
+def ordenar_por_relevancia(queryset: QuerySet, *fallback: str) -> QuerySet:
+    """Ordena resultados de :func:`buscar_usuarios` por relevância e ``fallback``."""
+
+    if "busca_rank" not in queryset.query.annotations:
+        return queryset.order_by(*fallback)
+    ordem = ["busca_rank"]
+    if "busca_similaridade" in queryset.query.annotations:
+        ordem.append("-busca_similaridade")
+    return queryset.order_by(*ordem, *fallback)
+
+
+FTS_CREATE_SQL = f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(search_document, tokenize='trigram')"
+PG_TRGM_INDEX = "accounts_user_search_document_trgm"
+
+
+def sincronizar_fts(user_ids: list[Any] | None = None) -> None:
+    """Atualiza a tabela FTS5 (SQLite) para ``user_ids`` ou para todos."""
+
+    if not fts_disponivel():
+        return
+    with connection.cursor() as cursor:
+        if user_ids is None:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")  # noqa: S608
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, search_document) "  # noqa: S608
+                "SELECT id, search_document FROM accounts_user"
+            )
+            return
+        for user_id in user_ids:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])  # noqa: S608
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) "  # noqa: S608
+            f"SELECT id, search_document FROM accounts_user WHERE id IN ({', '.join(['%s'] * len(user_ids))})",
+            list(user_ids),
+        )
+
+
+def remover_fts(user_id: Any) -> None:
+    if fts_disponivel():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])  # noqa: S608
@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from configuracoes.models import ConfiguracaoConta
+from core.cache import bump_cache_version
+
+from .search import busca_namespace, remover_fts, sincronizar_fts
 
 User = get_user_model()
 
@@ -17,3 +20,21 @@ def create_configuracao_conta(sender, instance, created, **kwargs):
     if instance.user_type in {"root", "admin"}:
         instance.is_staff = True
         instance.save(update_fields=["is_staff"])
+
+
+@receiver(post_save, sender=User)
+def atualizar_busca_usuario(sender, instance, update_fields=None, **kwargs):
+    """Mantém a tabela FTS (SQLite) e o cache do typeahead em dia."""
+    if update_fields is not None and not {"search_document", "organizacao", "deleted"} & set(update_fields):
+        return
+
+    sincronizar_fts([instance.pk])
+    if instance.organizacao_id:
+        bump_cache_version(busca_namespace(instance.organizacao_id))
+
+
+@receiver(post_delete, sender=User)
+def remover_busca_usuario(sender, instance, **kwargs):
+    remover_fts(instance.pk)
+    if instance.organizacao_id:
+        bump_cache_version(busca_namespace(instance.organizacao_id))
@@ -2,9 +2,9 @@ import json
 import logging
 import os
 import uuid
+from urllib.parse import urlencode
 
 from django.conf import settings
-
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model, login, logout
 from django.contrib.auth.decorators import login_required
@@ -18,54 +18,39 @@ from django.core.paginator import Paginator
 from django.db import IntegrityError, transaction
 from django.db.models import Avg, BooleanField, Count, Exists, OuterRef, Q, Value
 from django.db.models.functions import Lower
-from django.http import (
-    Http404,
-    HttpResponse,
-    HttpResponseBadRequest,
-    HttpResponseForbidden,
-    JsonResponse,
-)
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
-from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_GET, require_POST
-from urllib.parse import urlencode
 from django_ratelimit.decorators import ratelimit
 from rest_framework import viewsets
-
 from rest_framework.permissions import IsAuthenticated
 
-
-logger = logging.getLogger(__name__)
-
 from accounts.serializers import UserSerializer
-from accounts.tasks import (
-    send_cancel_delete_email,
-    send_confirmation_email,
-    send_password_reset_email,
-)
+from accounts.tasks import send_cancel_delete_email, send_confirmation_email, send_password_reset_email
 from audit.services import hash_ip, log_audit
+from conexoes.sugestoes import sugestoes_para
+from core.permissions import IsAdmin, IsCoordenador
 from core.uploads.validators import validate_upload
-from core.permissions import (
-    IsAdmin,
-    IsCoordenador,
-)
-from nucleos.models import ConviteNucleo
 from eventos.models import Evento, InscricaoEvento, PreRegistroConvite
+from eventos.services.qrcodes import preparar_qrcodes
+from feed.models import Bookmark, Flag, Post, Reacao
+from nucleos.models import ConviteNucleo
+from organizacoes.utils import validate_cnpj
 from tokens.models import TokenAcesso
 from tokens.services import find_token_by_code
 from tokens.utils import get_client_ip
-from organizacoes.utils import validate_cnpj
-from feed.models import Bookmark, Flag, Post, Reacao
+
 from .auth import clear_login_failures, get_user_lockout_until, register_login_failure
 from .forms import (
     CPF_REUSE_ERROR,
-    EmailOtpLoginForm,
     IDENTIFIER_REQUIRED_ERROR,
     EmailLoginForm,
+    EmailOtpLoginForm,
     InformacoesPessoaisForm,
     TotpLoginForm,
     UserRatingForm,
@@ -79,10 +64,12 @@ from .mfa import (
     resolve_preferred_method,
     verify_email_challenge,
 )
-from .utils import build_profile_section_url, is_htmx_or_ajax, redirect_to_profile_section
 from .models import AccountToken, LoginAttempt, MFALoginChallenge, SecurityEvent, UserRating, UserType
+from .utils import build_profile_section_url, is_htmx_or_ajax, redirect_to_profile_section
 from .validators import cpf_validator
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
 PERFIL_DEFAULT_SECTION = "info"
@@ -393,9 +380,7 @@ def perfil(request):
             if valor_exibicao is None:
                 valor_exibicao = inscricao.get_valor_evento()
             inscricao.valor_exibicao = valor_exibicao
-            if not inscricao.qrcode_url:
-                inscricao.gerar_qrcode()
-                inscricao.save(update_fields=["qrcode_url"])
+        preparar_qrcodes(perfil_inscricoes)
 
     portfolio_medias = list(
         target_user.medias.visible_to(viewer, target_user)
@@ -503,6 +488,7 @@ def perfil(request):
         "perfil_show_ratings_card": show_profile_cards,
         "perfil_show_inscricoes_card": show_inscricoes_card,
         "perfil_minhas_inscricoes": perfil_inscricoes,
+        "sugestoes_conexao": sugestoes_para(target_user) if is_owner else [],
     }
 
     default_section, default_url = _perfil_default_section_url(
@@ -5,3 +5,6 @@ class ConexoesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "conexoes"
     verbose_name = "Conexões"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,120 @@
+"""Totais de conexões por usuário e cache das páginas do carrossel.
+
+``ContadorConexoes`` guarda, por usuário, quantas conexões, solicitações
+recebidas e solicitações enviadas ele tem (apenas usuários não excluídos, como
+os managers relacionados de ``User``). Os sinais de ``conexoes.signals``
+recontam os usuários envolvidos a cada aceite, remoção ou solicitação e
+incrementam a versão ``conexoes_usuario_<id>``, que invalida as páginas do
+carrossel guardadas por :func:`pagina_em_cache`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import bump_cache_version, get_cache_version
+
+from .models import ContadorConexoes
+
+CAROUSEL_CACHE_TIMEOUT = 5 * 60
+CAMPOS = ("conexoes", "solicitacoes_recebidas", "solicitacoes_enviadas")
+
+
+def conexoes_namespace(user_id: Any) -> str:
+    return f"conexoes_usuario_{user_id}"
+
+
+def contar(User, user_ids: Iterable[Any]) -> dict[Any, tuple[int, int, int]]:
+    """Conta conexões e solicitações de ``user_ids`` direto nas tabelas M2M.
+
+    Também usado pela migração de carga inicial, com o modelo histórico.
+    """
+
+    user_ids = list(user_ids)
+    totais = {user_id: [0, 0, 0] for user_id in user_ids}
+    # ``add`` grava a linha espelhada da relação simétrica só depois do sinal
+    # ``post_add``; por isso as conexões são lidas nos dois sentidos.
+    pares = User.connections.through.objects.filter(Q(from_user_id__in=user_ids) | Q(to_user_id__in=user_ids))
+    conexoes: dict[Any, set[Any]] = {user_id: set() for user_id in user_ids}
+    for origem, destino in pares.filter(from_user__deleted=False, to_user__deleted=False).values_list(
+        "from_user_id", "to_user_id"
+    ):
+        for user_id, outro in ((origem, destino), (destino, origem)):
+            if user_id in conexoes:
+                conexoes[user_id].add(outro)
+    for user_id, outros in conexoes.items():
+        totais[user_id][0] = len(outros)
+
+    solicitacoes = User.followers.through.objects
+    consultas = (
+        # ``user.followers``: quem pediu conexão ao usuário.
+        (1, solicitacoes.filter(from_user_id__in=user_ids, to_user__deleted=False), "from_user_id"),
+        # ``user.following``: pedidos enviados pelo usuário.
+        (2, solicitacoes.filter(to_user_id__in=user_ids, from_user__deleted=False), "to_user_id"),
+    )
+    for posicao, queryset, coluna in consultas:
+        for user_id, total in queryset.values(coluna).annotate(total=Count("id")).values_list(coluna, "total"):
+            totais[user_id][posicao] = total
+    return {user_id: tuple(valores) for user_id, valores in totais.items()}
+
+
+def recontar(user_ids: Iterable[Any]) -> dict[Any, tuple[int, int, int]]:
+    """Recalcula e grava os contadores de ``user_ids``; invalida seus carrosséis."""
+
+    User = get_user_model()
+    ids = set(User.all_objects.filter(pk__in={user_id for user_id in user_ids if user_id}).values_list("pk", flat=True))
+    if not ids:
+        return {}
+    totais = contar(User, ids)
+    ContadorConexoes.objects.bulk_create(
+        [ContadorConexoes(user_id=user_id, **dict(zip(CAMPOS, valores))) for user_id, valores in totais.items()],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=[*CAMPOS, "atualizado_em"],
+    )
+    for user_id in ids:
+        bump_cache_version(conexoes_namespace(user_id))
+    return totais
+
+
+def vizinhos(user_id: Any) -> set[Any]:
+    """Usuários ligados a ``user_id`` por conexão ou solicitação, em qualquer sentido."""
+
+    User = get_user_model()
+    ids: set[Any] = set()
+    for through in (User.connections.through, User.followers.through):
+        for origem, destino in through.objects.filter(Q(from_user_id=user_id) | Q(to_user_id=user_id)).values_list(
+            "from_user_id", "to_user_id"
+        ):
+            ids.update((origem, destino))
+    ids.discard(user_id)
+    return ids
+
+
+def obter_totais(user) -> tuple[int, int, int]:
+    """(conexões, solicitações recebidas, solicitações enviadas) de ``user``."""
+
+    if not getattr(user, "pk", None):
+        return 0, 0, 0
+    totais = ContadorConexoes.objects.filter(user_id=user.pk).values_list(*CAMPOS).first()
+    if totais is None:
+        # Usuário ainda sem contador: a primeira leitura grava o valor.
+        totais = recontar([user.pk]).get(user.pk, (0, 0, 0))
+    return tuple(totais)
+
+
+def pagina_em_cache(user_id: Any, secao: str, numero: int, carregar: Callable[[], list[Any]]) -> list[Any]:
+    """Ids da página ``numero`` da seção do carrossel, em cache versionado por usuário."""
+
+    versao = get_cache_version(conexoes_namespace(user_id))
+    chave = f"conexoes_carousel:{user_id}:v{versao}:{secao}:{numero}"
+    ids = cache.get(chave)
+    if ids is None:
+        ids = carregar()
+        cache.set(chave, ids, CAROUSEL_CACHE_TIMEOUT)
+    return ids
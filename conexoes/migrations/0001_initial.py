@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2025-10-19 07:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SugestaoConexao",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("posicao", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                ("conexoes_comuns", models.PositiveSmallIntegerField(default=0)),
+                ("nucleos_comuns", models.PositiveSmallIntegerField(default=0)),
+                ("eventos_comuns", models.PositiveSmallIntegerField(default=0)),
+                ("calculado_em", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "sugerido",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sugestoes_conexao",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sugestão de conexão",
+                "verbose_name_plural": "Sugestões de conexão",
+                "ordering": ["user", "posicao"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "posicao"), name="sugestao_conexao_user_posicao"),
+                    models.UniqueConstraint(fields=("user", "sugerido"), name="sugestao_conexao_user_sugerido"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2025-10-19 08:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from conexoes.contadores import CAMPOS, contar
+
+
+def preencher_contadores(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    ContadorConexoes = apps.get_model("conexoes", "ContadorConexoes")
+    user_ids = list(User.objects.values_list("pk", flat=True))
+    for inicio in range(0, len(user_ids), 500):
+        totais = contar(User, user_ids[inicio : inicio + 500])
+        ContadorConexoes.objects.bulk_create(
+            [ContadorConexoes(user_id=user_id, **dict(zip(CAMPOS, valores))) for user_id, valores in totais.items()]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0029_user_search_document"),
+        ("conexoes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContadorConexoes",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="contador_conexoes",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("conexoes", models.PositiveIntegerField(default=0)),
+                ("solicitacoes_recebidas", models.PositiveIntegerField(default=0)),
+                ("solicitacoes_enviadas", models.PositiveIntegerField(default=0)),
+                ("atualizado_em", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Contador de conexões",
+                "verbose_name_plural": "Contadores de conexões",
+            },
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
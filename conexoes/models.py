@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class SugestaoConexao(models.Model):
+    """Sugestão de conexão pré-calculada por :mod:`conexoes.sugestoes`."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sugestoes_conexao",
+    )
+    sugerido = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    posicao = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    conexoes_comuns = models.PositiveSmallIntegerField(default=0)
+    nucleos_comuns = models.PositiveSmallIntegerField(default=0)
+    eventos_comuns = models.PositiveSmallIntegerField(default=0)
+    calculado_em = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Sugestão de conexão")
+        verbose_name_plural = _("Sugestões de conexão")
+        ordering = ["user", "posicao"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "posicao"], name="sugestao_conexao_user_posicao"),
+            models.UniqueConstraint(fields=["user", "sugerido"], name="sugestao_conexao_user_sugerido"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} -> {self.sugerido_id} ({self.posicao})"
+
+
+class ContadorConexoes(models.Model):
+    """Totais de conexões e solicitações do usuário, mantidos por :mod:`conexoes.contadores`."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="contador_conexoes",
+    )
+    conexoes = models.PositiveIntegerField(default=0)
+    solicitacoes_recebidas = models.PositiveIntegerField(default=0)
+    solicitacoes_enviadas = models.PositiveIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Contador de conexões")
+        verbose_name_plural = _("Contadores de conexões")
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.conexoes}/{self.solicitacoes_recebidas}/{self.solicitacoes_enviadas}"
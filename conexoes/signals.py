@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .contadores import recontar, vizinhos
+from .sugestoes import descartar_sugestoes
+
+User = get_user_model()
+
+_VIZINHOS_ATTR = "_conexoes_vizinhos"
+
+
+@receiver(m2m_changed, sender=User.connections.through)
+@receiver(m2m_changed, sender=User.followers.through)
+def atualizar_vinculos_conexao(sender, instance, action, pk_set, **kwargs) -> None:
+    """Mantém contadores e sugestões em dia após aceite, remoção ou solicitação."""
+
+    if action == "pre_clear":
+        setattr(instance, _VIZINHOS_ATTR, vizinhos(instance.pk))
+    elif action == "post_clear":
+        recontar({instance.pk, *getattr(instance, _VIZINHOS_ATTR, ())})
+    elif action in {"post_add", "post_remove"}:
+        recontar({instance.pk, *(pk_set or ())})
+        if action == "post_add":
+            # Conexões e solicitações novas deixam de aparecer como sugestão.
+            descartar_sugestoes(instance.pk, pk_set)
+
+
+@receiver(post_save, sender=User)
+def recontar_vizinhos_exclusao_logica(sender, instance, update_fields=None, **kwargs) -> None:
+    """Exclusão lógica (ou restauração) altera os totais de quem está ligado ao usuário."""
+
+    if update_fields is not None and "deleted" in update_fields:
+        recontar(vizinhos(instance.pk))
+
+
+@receiver(pre_delete, sender=User)
+def guardar_vizinhos_exclusao(sender, instance, **kwargs) -> None:
+    setattr(instance, _VIZINHOS_ATTR, vizinhos(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def recontar_vizinhos_exclusao(sender, instance, **kwargs) -> None:
+    recontar(getattr(instance, _VIZINHOS_ATTR, ()))
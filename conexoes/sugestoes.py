@@ -0,0 +1,218 @@
+"""Sugestões de conexão ("pessoas que você talvez conheça").
+
+O cálculo roda fora da requisição (tarefa ``atualizar_sugestoes_conexoes``),
+uma organização por vez. O grafo de conexões e os vínculos com núcleos e
+eventos são carregados em poucas consultas e montados como matrizes esparsas
+no formato CSR (``indptr``/``indices`` em arrays NumPy). Para cada usuário:
+
+* conexões em comum são os vizinhos dos vizinhos (linha de ``A·A``);
+* núcleos e eventos em comum são as linhas de ``N·Nᵀ`` e ``E·Eᵀ``.
+
+O score pondera as três contagens por :data:`PESOS`; o próprio usuário, suas
+conexões e solicitações pendentes (em qualquer sentido) são descartados. As
+:data:`LIMITE_SUGESTOES` melhores ficam em :class:`~conexoes.models.SugestaoConexao`,
+lidas pelas páginas com :func:`sugestoes_para` em uma consulta indexada.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from eventos.models import InscricaoEvento
+from nucleos.models import ParticipacaoNucleo
+
+from .models import SugestaoConexao
+
+LIMITE_SUGESTOES = 12
+PESOS = {"conexoes": 3.0, "nucleos": 2.0, "eventos": 1.0}
+# Limite dos contadores gravados em ``PositiveSmallIntegerField``.
+_MAX_CONTADOR = 32767
+
+
+def _csr(linhas, colunas, n_linhas: int):
+    """Monta ``(indptr, indices)`` a partir de pares (linha, coluna) sem repetição."""
+
+    import numpy as np
+
+    if len(linhas):
+        pares = np.unique(np.stack([linhas, colunas], axis=1), axis=0)
+        linhas, colunas = pares[:, 0], pares[:, 1]
+    indptr = np.zeros(n_linhas + 1, dtype=np.int64)
+    np.cumsum(np.bincount(linhas, minlength=n_linhas), out=indptr[1:])
+    return indptr, np.asarray(colunas, dtype=np.int64)
+
+
+def _linha(csr, indice: int):
+    indptr, indices = csr
+    return indices[indptr[indice] : indptr[indice + 1]]
+
+
+def _vizinhos_em_comum(csr_origem, csr_destino, indice: int):
+    """Linha ``indice`` de ``origem · destino`` como (colunas, contagens)."""
+
+    import numpy as np
+
+    meio = _linha(csr_origem, indice)
+    if not len(meio):
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio
+    indptr, indices = csr_destino
+    alcancados = np.concatenate([indices[indptr[j] : indptr[j + 1]] for j in meio])
+    return np.unique(alcancados, return_counts=True)
+
+
+class _Grafo:
+    """Matrizes esparsas de uma organização, indexadas pela posição em ``user_ids``."""
+
+    def __init__(self, organizacao_id: Any) -> None:
+        import numpy as np
+
+        User = get_user_model()
+        usuarios = User.objects.filter(organizacao_id=organizacao_id, is_active=True).values("id")
+        self.user_ids = np.fromiter(usuarios.order_by("id").values_list("id", flat=True), dtype=np.int64)
+        n = len(self.user_ids)
+
+        def posicoes(ids):
+            ids = np.fromiter(ids, dtype=np.int64)
+            if not n:
+                return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+            pos = np.minimum(np.searchsorted(self.user_ids, ids), n - 1)
+            return pos, self.user_ids[pos] == ids
+
+        def arestas(through) -> tuple:
+            pares = list(
+                through.objects.filter(from_user_id__in=usuarios, to_user_id__in=usuarios).values_list(
+                    "from_user_id", "to_user_id"
+                )
+            )
+            origem, ok_origem = posicoes(par[0] for par in pares)
+            destino, ok_destino = posicoes(par[1] for par in pares)
+            ok = ok_origem & ok_destino
+            # Simetriza: o sentido do vínculo não importa para as sugestões.
+            return np.concatenate([origem[ok], destino[ok]]), np.concatenate([destino[ok], origem[ok]])
+
+        def bipartido(pares: list[tuple[int, Any]]):
+            membros, ok = posicoes(par[0] for par in pares)
+            # Núcleos e eventos recebem índices densos (eventos usam UUID como chave).
+            chaves: dict[Any, int] = {}
+            grupos = np.fromiter((chaves.setdefault(par[1], len(chaves)) for par in pares), dtype=np.int64)
+            membros, grupos = membros[ok], grupos[ok]
+            return _csr(membros, grupos, n), _csr(grupos, membros, len(chaves))
+
+        self.conexoes = _csr(*arestas(User.connections.through), n)
+        self.solicitacoes = _csr(*arestas(User.followers.through), n)
+        self.nucleos, self.membros_nucleo = bipartido(
+            list(
+                ParticipacaoNucleo.objects.filter(
+                    user_id__in=usuarios,
+                    status="ativo",
+                    status_suspensao=False,
+                    nucleo__deleted=False,
+                ).values_list("user_id", "nucleo_id")
+            )
+        )
+        self.eventos, self.inscritos_evento = bipartido(
+            list(
+                InscricaoEvento.objects.filter(
+                    user_id__in=usuarios,
+                    status="confirmada",
+                    evento__organizacao_id=organizacao_id,
+                    evento__deleted=False,
+                ).values_list("user_id", "evento_id")
+            )
+        )
+
+    def sugestoes(self, indice: int, limite: int) -> list[tuple[int, float, int, int, int]]:
+        """Melhores candidatos de ``indice``: (user_id, score, conexões, núcleos, eventos)."""
+
+        import numpy as np
+
+        componentes = [
+            _vizinhos_em_comum(self.conexoes, self.conexoes, indice),
+            _vizinhos_em_comum(self.nucleos, self.membros_nucleo, indice),
+            _vizinhos_em_comum(self.eventos, self.inscritos_evento, indice),
+        ]
+        candidatos = np.unique(np.concatenate([colunas for colunas, _ in componentes]))
+        excluidos = np.concatenate([[indice], _linha(self.conexoes, indice), _linha(self.solicitacoes, indice)])
+        candidatos = candidatos[~np.isin(candidatos, excluidos)]
+        if not len(candidatos):
+            return []
+
+        contagens = np.zeros((3, len(candidatos)), dtype=np.int64)
+        for linha, (colunas, totais) in enumerate(componentes):
+            pos = np.searchsorted(candidatos, colunas)
+            ok = (pos < len(candidatos)) & (candidatos[np.minimum(pos, len(candidatos) - 1)] == colunas)
+            contagens[linha, pos[ok]] = totais[ok]
+        scores = np.array([PESOS["conexoes"], PESOS["nucleos"], PESOS["eventos"]]) @ contagens
+
+        melhores = np.arange(len(candidatos))
+        if len(candidatos) > limite:
+            # Só os candidatos com score a partir do N-ésimo maior são ordenados.
+            corte = -np.partition(-scores, limite - 1)[limite - 1]
+            melhores = melhores[scores >= corte]
+        # Score decrescente; empate pelo id do usuário para resultados estáveis.
+        ordem = melhores[np.lexsort((self.user_ids[candidatos[melhores]], -scores[melhores]))][:limite]
+        contagens = np.minimum(contagens, _MAX_CONTADOR)
+        return [
+            (
+                int(self.user_ids[candidatos[j]]),
+                float(scores[j]),
+                int(contagens[0, j]),
+                int(contagens[1, j]),
+                int(contagens[2, j]),
+            )
+            for j in ordem
+        ]
+
+
+def calcular_sugestoes(organizacao_id: Any, limite: int = LIMITE_SUGESTOES) -> int:
+    """Recalcula e grava as sugestões da organização; devolve quantas linhas gravou."""
+
+    grafo = _Grafo(organizacao_id)
+    agora = timezone.now()
+    linhas = [
+        SugestaoConexao(
+            user_id=int(user_id),
+            sugerido_id=sugerido_id,
+            posicao=posicao,
+            score=score,
+            conexoes_comuns=conexoes,
+            nucleos_comuns=nucleos,
+            eventos_comuns=eventos,
+            calculado_em=agora,
+        )
+        for indice, user_id in enumerate(grafo.user_ids)
+        for posicao, (sugerido_id, score, conexoes, nucleos, eventos) in enumerate(grafo.sugestoes(indice, limite))
+    ]
+    with transaction.atomic():
+        SugestaoConexao.objects.filter(user__organizacao_id=organizacao_id).delete()
+        SugestaoConexao.objects.bulk_create(linhas, batch_size=1000)
+    return len(linhas)
+
+
+def sugestoes_para(user, limite: int = LIMITE_SUGESTOES) -> list[SugestaoConexao]:
+    """Sugestões gravadas de ``user`` (uma consulta, sem percorrer o grafo)."""
+
+    if not getattr(user, "is_authenticated", False):
+        return []
+    return list(
+        SugestaoConexao.objects.filter(user=user, sugerido__is_active=True, sugerido__deleted=False)
+        .select_related("sugerido")
+        .order_by("posicao")[:limite]
+    )
+
+
+def descartar_sugestoes(user_id: Any, outros_ids) -> None:
+    """Remove sugestões entre ``user_id`` e ``outros_ids`` nos dois sentidos."""
+
+    outros_ids = list(outros_ids or [])
+    if not user_id or not outros_ids:
+        return
+    SugestaoConexao.objects.filter(
+        Q(user_id=user_id, sugerido_id__in=outros_ids) | Q(user_id__in=outros_ids, sugerido_id=user_id)
+    ).delete()
@@ -35,3 +35,18 @@ def enviar_notificacao_conexao_async(
             template_codigo=template_codigo,
         )
         raise self.retry(countdown=2**self.request.retries)
+
+
+@shared_task
+def atualizar_sugestoes_conexoes() -> int:
+    """Recalcula as sugestões de conexão de todas as organizações."""
+
+    from organizacoes.models import Organizacao
+
+    from .sugestoes import calcular_sugestoes
+
+    total = 0
+    for organizacao_id in Organizacao.objects.values_list("id", flat=True):
+        total += calcular_sugestoes(organizacao_id)
+    logger.info("sugestoes_conexoes_atualizadas", linhas=total)
+    return total
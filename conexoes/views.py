@@ -1,6 +1,5 @@
 import json
 import logging
-import re
 import time
 from urllib.parse import urlencode
 
@@ -9,22 +8,25 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
-from django.db.models import F, Q, Value
-from django.db.models.functions import Replace
 from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse
 from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
 from django.views import View
 
 from accounts.models import UserType
+from accounts.search import buscar_usuarios, ordenar_por_relevancia
 from accounts.utils import is_htmx_or_ajax
 from accounts.views import _build_profile_connection_action_context
+from membros.badges import carregar_badges
 
+from .contadores import obter_totais, pagina_em_cache
 from .forms import ConnectionsSearchForm
+from .sugestoes import sugestoes_para
 from .tasks import enviar_notificacao_conexao_async
 
 User = get_user_model()
@@ -69,63 +71,68 @@ def _deny_root_connections_access(request):
 
 def _get_user_connections(user, query: str):
     connections = (
-        user.connections.select_related("organizacao", "nucleo").prefetch_related(
-            "participacoes__nucleo", "nucleos_consultoria"
-        )
+        user.connections.select_related("organizacao", "nucleo").order_by("id")
         if hasattr(user, "connections")
         else User.objects.none()
     )
 
     if query:
-        filters = Q(username__icontains=query) | Q(contato__icontains=query)
-        connections = connections.filter(filters)
+        connections = ordenar_por_relevancia(buscar_usuarios(connections, query), "id")
 
     return connections
 
 
 def _get_user_connection_requests(user, query: str):
     connection_requests = (
-        user.followers.select_related("organizacao", "nucleo").prefetch_related(
-            "participacoes__nucleo", "nucleos_consultoria"
-        )
+        user.followers.select_related("organizacao", "nucleo").order_by("id")
         if hasattr(user, "followers")
         else User.objects.none()
     )
 
     if query:
-        filters = Q(username__icontains=query) | Q(contato__icontains=query)
-        connection_requests = connection_requests.filter(filters)
+        connection_requests = ordenar_por_relevancia(buscar_usuarios(connection_requests, query), "id")
 
     return connection_requests
 
 
 def _get_user_sent_connection_requests(user, query: str):
     sent_requests = (
-        user.following.select_related("organizacao", "nucleo").prefetch_related(
-            "participacoes__nucleo", "nucleos_consultoria"
-        )
+        user.following.select_related("organizacao", "nucleo").order_by("id")
         if hasattr(user, "following")
         else User.objects.none()
     )
 
     if query:
-        filters = Q(username__icontains=query) | Q(contato__icontains=query)
-        sent_requests = sent_requests.filter(filters)
+        sent_requests = ordenar_por_relevancia(buscar_usuarios(sent_requests, query), "id")
 
     return sent_requests
 
 
 def _connection_totals(user):
-    total_conexoes = user.connections.count() if hasattr(user, "connections") else 0
-    total_solicitacoes = user.followers.count() if hasattr(user, "followers") else 0
-    total_solicitacoes_enviadas = user.following.count() if hasattr(user, "following") else 0
-    return total_conexoes, total_solicitacoes, total_solicitacoes_enviadas
+    return obter_totais(user)
 
 
 CONNECTION_FILTER_CHOICES = {"ativas", "pendentes", "enviadas"}
 CONEXOES_CAROUSEL_PAGE_SIZE = 6
 
 
+class _TotalConhecidoPaginator(Paginator):
+    """Paginator que usa o total de ``ContadorConexoes`` em vez de ``COUNT``."""
+
+    def __init__(self, object_list, per_page, total: int):
+        super().__init__(object_list, per_page)
+        self._total = total
+
+    @cached_property
+    def count(self) -> int:
+        return self._total
+
+
+def _preparar_cartoes(usuarios) -> list:
+    # Badges de papel e núcleo carregadas em lote só para a página exibida.
+    return carregar_badges(usuarios)
+
+
 def _resolve_connections_filter(request):
     status_value = (request.GET.get("status") or "").strip().lower()
     filter_value = (request.GET.get("filter") or "").strip().lower()
@@ -183,11 +190,19 @@ def _build_connections_page_context(
     active_filter: str,
     *,
     section_pages: dict[str, int] | None = None,
+    only_sections: set[str] | None = None,
 ):
     if section_pages is None:
         section_pages = {}
 
     total_conexoes, total_solicitacoes, total_solicitacoes_enviadas = _connection_totals(request.user)
+    section_totals = None
+    if not query:
+        section_totals = {
+            "minhas": total_conexoes,
+            "pendentes": total_solicitacoes,
+            "enviadas": total_solicitacoes_enviadas,
+        }
     search_params = {"q": query} if query else {}
     search_page_url = reverse("conexoes:perfil_conexoes_buscar")
     if search_params:
@@ -201,6 +216,8 @@ def _build_connections_page_context(
         search_term=query,
         status_filter=active_filter,
         section_pages=section_pages,
+        only_sections=only_sections,
+        section_totals=section_totals,
     )
 
     sections = carousel_sections.get("sections", {})
@@ -277,7 +294,14 @@ def build_conexao_carousel_sections(
     status_filter: str | None = None,
     section_pages: dict[str, int] | None = None,
     only_sections: set[str] | None = None,
+    section_totals: dict[str, int] | None = None,
 ):
+    """Monta as seções do carrossel de conexões.
+
+    Com ``section_totals`` (listas sem busca), o total vem dos contadores e os
+    ids de cada página ficam em cache versionado por usuário.
+    """
+
     if section_pages is None:
         section_pages = {}
 
@@ -314,9 +338,24 @@ def build_conexao_carousel_sections(
             continue
 
         queryset = definition["queryset"]
-        paginator = Paginator(queryset, CONEXOES_CAROUSEL_PAGE_SIZE)
+        total = (section_totals or {}).get(section_key)
+        if total is None:
+            paginator = Paginator(queryset, CONEXOES_CAROUSEL_PAGE_SIZE)
+        else:
+            paginator = _TotalConhecidoPaginator(queryset, CONEXOES_CAROUSEL_PAGE_SIZE, total)
         page_number = section_pages.get(section_key) or 1
         page_obj = paginator.get_page(page_number)
+        if not total:
+            page_obj.object_list = _preparar_cartoes(page_obj.object_list)
+        else:
+            ids = pagina_em_cache(
+                request.user.pk,
+                section_key,
+                page_obj.number,
+                lambda page_obj=page_obj: list(page_obj.object_list.values_list("pk", flat=True)),
+            )
+            usuarios = queryset.model.objects.select_related("organizacao", "nucleo").in_bulk(ids)
+            page_obj.object_list = _preparar_cartoes(usuarios[pk] for pk in ids if pk in usuarios)
 
         sections[section_key] = {
             "section": section_key,
@@ -452,12 +491,14 @@ def perfil_conexoes(request):
     if is_htmx_or_ajax(request):
         context.update(_profile_dashboard_hx_context())
         if tab == "solicitacoes":
+            context["connection_requests"] = _preparar_cartoes(connection_requests)
             return render(request, "conexoes/partials/request_list.html", context)
         return render(request, "conexoes/partials/connections_list_content.html", context)
 
     if tab == "solicitacoes":
         return render(request, "conexoes/solicitacoes.html", context)
 
+    context["sugestoes_conexao"] = sugestoes_para(request.user)
     return render(request, "conexoes/connections_list.html", context)
 
 
@@ -503,6 +544,7 @@ def perfil_conexoes_partial(request):
     context.update(_profile_dashboard_hx_context())
     _refresh_minhas_conexoes_empty_cta(context)
     if tab == "solicitacoes":
+        context["connection_requests"] = _preparar_cartoes(connection_requests)
         return render(request, "conexoes/partials/request_list.html", context)
     return render(request, "conexoes/partials/connections_list_content.html", context)
 
@@ -541,6 +583,7 @@ class ConexaoListCarouselView(LoginRequiredMixin, View):
             search_term,
             status_filter,
             section_pages={section: page_number},
+            only_sections={section},
         )
 
         section_context_map = {
@@ -710,34 +753,8 @@ def _build_conexoes_busca_context(
             User.objects.filter(organizacao=organizacao, is_associado=True)
             .exclude(pk=user.pk)
             .select_related("organizacao", "nucleo")
-            .prefetch_related("participacoes__nucleo", "nucleos_consultoria")
-            .annotate(
-                cnpj_digits=Replace(
-                    Replace(
-                        Replace(Replace(F("cnpj"), Value("."), Value("")), Value("-"), Value("")),
-                        Value("/"),
-                        Value(""),
-                    ),
-                    Value(" "),
-                    Value(""),
-                )
-            )
         )
-
-        if query:
-            digits = re.sub(r"\D", "", query)
-            filters = (
-                Q(contato__icontains=query)
-                | Q(nome_fantasia__icontains=query)
-                | Q(username__icontains=query)
-                | Q(razao_social__icontains=query)
-                | Q(cnpj__icontains=query)
-            )
-            if digits:
-                filters |= Q(cnpj_digits__icontains=digits)
-            membros = membros.filter(filters)
-
-        membros = membros.order_by("nome_fantasia", "contato", "username")
+        membros = ordenar_por_relevancia(buscar_usuarios(membros, query), "nome_fantasia", "contato", "username")
 
     conexoes_ids = set()
     solicitacoes_enviadas_ids = set()
@@ -763,6 +780,7 @@ def _build_conexoes_busca_context(
 
     paginator = Paginator(membros, CONEXOES_CAROUSEL_PAGE_SIZE)
     page_obj = paginator.get_page(parsed_page)
+    page_obj.object_list = _preparar_cartoes(page_obj.object_list)
 
     empty_message = _("Nenhum membro encontrado para os critérios informados.")
     if not organizacao:
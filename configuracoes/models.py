@@ -5,7 +5,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from core.fields import EncryptedCharField
-from core.models import SoftDeleteManager, SoftDeleteModel, TimeStampedModel
+from core.models import FieldTrackerMixin, SoftDeleteManager, SoftDeleteModel, TimeStampedModel
 from organizacoes.models import Organizacao
 
 NOTIFICACAO_FREQ_CHOICES = [
@@ -36,7 +36,7 @@ DIAS_SEMANA_CHOICES = [
 ]
 
 
-class ConfiguracaoConta(TimeStampedModel, SoftDeleteModel):
+class ConfiguracaoConta(FieldTrackerMixin, TimeStampedModel, SoftDeleteModel):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -80,6 +80,20 @@ class ConfiguracaoConta(TimeStampedModel, SoftDeleteModel):
     objects = SoftDeleteManager()
     all_objects = models.Manager()
 
+    tracked_fields = (
+        "receber_notificacoes_email",
+        "frequencia_notificacoes_email",
+        "receber_notificacoes_whatsapp",
+        "frequencia_notificacoes_whatsapp",
+        "receber_notificacoes_push",
+        "frequencia_notificacoes_push",
+        "idioma",
+        "tema",
+        "hora_notificacao_diaria",
+        "hora_notificacao_semanal",
+        "dia_semana_notificacao",
+    )
+
     class Meta:
         ordering = ["-updated_at"]
         constraints = [models.UniqueConstraint(fields=["user"], name="configuracao_conta_user_unique")]
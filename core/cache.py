@@ -17,3 +17,16 @@ def bump_cache_version(namespace: str) -> None:
         cache.incr(key)
     except ValueError:
         cache.set(key, 2)
+
+
+def get_cache_versions(namespaces) -> dict[str, int]:
+    """Return the current cache versions for several namespaces at once."""
+    keys = {namespace: f"cache_version:{namespace}" for namespace in namespaces}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for namespace, key in keys.items():
+        if key not in found:
+            cache.add(key, 1)
+            found[key] = cache.get(key)
+        versions[namespace] = int(found[key] or 1)
+    return versions
@@ -1,6 +1,7 @@
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 
-from core.utils import get_back_navigation_fallback, resolve_back_href
+from core.utils import get_back_navigation_fallback, is_htmx_partial, resolve_back_href
 
 
 def htmx_version(request):
@@ -12,18 +13,29 @@ def htmx_version(request):
 
 
 def menu_items(request):
+    # Fragmentos HTMX não renderizam a barra lateral; nas páginas completas o
+    # menu só é montado quando o template percorre ``NAV_MENU``.
+    if is_htmx_partial(request):
+        return {"NAV_MENU": []}
+
     from .menu import build_menu
 
-    return {"NAV_MENU": build_menu(request)}
+    return {"NAV_MENU": SimpleLazyObject(lambda: build_menu(request))}
 
 
 def back_navigation(request):
-    fallback = get_back_navigation_fallback(request)
-    back_href = resolve_back_href(request, fallback=fallback)
-    context = {"back_href": back_href}
-    if fallback:
-        context["back_component_config"] = {
-            "href": back_href,
-            "fallback_href": fallback,
-        }
-    return context
+    # Avaliado sob demanda: a maioria dos templates não usa o botão "voltar".
+    def _back_href():
+        return resolve_back_href(request, fallback=get_back_navigation_fallback(request))
+
+    def _back_component_config():
+        fallback = get_back_navigation_fallback(request)
+        if not fallback:
+            return None
+        return {"href": back_href, "fallback_href": fallback}
+
+    back_href = SimpleLazyObject(_back_href)
+    return {
+        "back_href": back_href,
+        "back_component_config": SimpleLazyObject(_back_component_config),
+    }
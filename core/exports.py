@@ -0,0 +1,264 @@
+"""Exportações assíncronas de arquivos (PDF, CSV e XLSX).
+
+Cada tipo de exportação é registrado com :func:`register_export` e informa
+como calcular a versão dos dados, o nome do arquivo e o conteúdo de cada
+formato. O arquivo gerado é gravado no storage em um caminho derivado da
+versão, de modo que downloads repetidos são servidos diretamente do storage
+enquanto os dados não mudarem; ao gravar uma versão nova, as anteriores do
+mesmo objeto são apagadas. A geração acontece em um worker Celery e o
+identificador do job é assinado e vinculado ao usuário que o solicitou.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import hmac
+import io
+import logging
+import re
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("pdf", "csv", "xlsx")
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+JOB_SALT = "core.exports.job"
+JOB_MAX_AGE = 60 * 60 * 24
+RUNNING_TIMEOUT = 60 * 10
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Tamanho dos blocos lidos por ``QuerySet.iterator`` nas exportações de listas
+# grandes: ``rows`` pode ser um gerador e a memória não cresce com o total.
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportError(Exception):
+    """Falha ao solicitar ou gerar uma exportação."""
+
+
+@dataclass(frozen=True)
+class ExportDefinition:
+    """Descreve um tipo de exportação.
+
+    ``version`` deve mudar sempre que o conteúdo exportado mudar; ``columns`` e
+    ``rows`` alimentam CSV/XLSX e ``render_pdf`` escreve o PDF em um arquivo
+    binário aberto.
+    """
+
+    name: str
+    version: Callable[[Any], str]
+    filename: Callable[[Any], str]
+    columns: Callable[[], Sequence[str]] | None = None
+    rows: Callable[[Any], Iterable[Sequence[Any]]] | None = None
+    render_pdf: Callable[[Any, Any], None] | None = None
+    formats: tuple[str, ...] = field(default=EXPORT_FORMATS)
+
+    def supports(self, formato: str) -> bool:
+        if formato not in self.formats:
+            return False
+        if formato == "pdf":
+            return self.render_pdf is not None
+        return self.columns is not None and self.rows is not None
+
+
+_REGISTRY: dict[str, ExportDefinition] = {}
+
+
+def register_export(definition: ExportDefinition) -> ExportDefinition:
+    _REGISTRY[definition.name] = definition
+    return definition
+
+
+def get_export(name: str) -> ExportDefinition:
+    try:
+        return _REGISTRY[name]
+    except KeyError as exc:
+        raise ExportError(f"Exportação desconhecida: {name}") from exc
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    """Estado de uma exportação identificada por ``job_id``."""
+
+    job_id: str
+    name: str
+    object_id: str
+    formato: str
+    path: str
+    filename: str
+
+    @property
+    def ready(self) -> bool:
+        return default_storage.exists(self.path)
+
+    @property
+    def error(self) -> str | None:
+        return cache.get(_error_key(self.path))
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.formato]
+
+
+def _storage_path(name: str, object_id: Any, version: str, formato: str) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{name}:{object_id}:{version}".encode(),
+        hashlib.sha256,
+    ).hexdigest()[:32]
+    return f"exportacoes/{name}/{object_id}/{digest}.{formato}"
+
+
+def _running_key(path: str) -> str:
+    return f"exportacao_em_andamento:{path}"
+
+
+def _error_key(path: str) -> str:
+    return f"exportacao_erro:{path}"
+
+
+def request_export(name: str, object_id: Any, formato: str, *, user: Any) -> ExportJob:
+    """Solicita a exportação e agenda a geração se o arquivo ainda não existir."""
+
+    definition = get_export(name)
+    if not definition.supports(formato):
+        raise ExportError(f"Formato {formato} não suportado para {name}.")
+
+    object_id = str(object_id)
+    path = _storage_path(name, object_id, definition.version(object_id), formato)
+    job_id = signing.dumps(
+        {"n": name, "o": object_id, "f": formato, "p": path, "u": str(getattr(user, "pk", ""))},
+        salt=JOB_SALT,
+        compress=True,
+    )
+    job = ExportJob(job_id, name, object_id, formato, path, definition.filename(object_id) + f".{formato}")
+
+    if not job.ready and cache.add(_running_key(path), True, RUNNING_TIMEOUT):
+        from .tasks import gerar_exportacao
+
+        cache.delete(_error_key(path))
+        gerar_exportacao.delay(name, object_id, formato, path)
+    return job
+
+
+def load_job(job_id: str, *, user: Any) -> ExportJob:
+    """Valida o ``job_id`` assinado e confirma que pertence a ``user``."""
+
+    try:
+        data = signing.loads(job_id, salt=JOB_SALT, max_age=JOB_MAX_AGE)
+    except signing.BadSignature as exc:
+        raise ExportError("Exportação inválida ou expirada.") from exc
+    if data.get("u") != str(getattr(user, "pk", "")):
+        raise ExportError("Exportação solicitada por outro usuário.")
+    definition = get_export(data["n"])
+    return ExportJob(
+        job_id,
+        data["n"],
+        data["o"],
+        data["f"],
+        data["p"],
+        definition.filename(data["o"]) + f".{data['f']}",
+    )
+
+
+# Planilhas interpretam células iniciadas por estes caracteres como fórmula
+# (o openpyxl grava ``=...`` como fórmula ativa); dados de usuários são exportados.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# ``+``/``-`` seguidos apenas de dígitos e separadores (telefones E.164, números
+# negativos, o marcador ``-``) não chamam funções nem referenciam células.
+_NUMERIC_TEXT = re.compile(r"[+-][\d\s().,-]*")
+
+
+def _safe_cell(value: Any) -> Any:
+    if not isinstance(value, str) or not value.startswith(FORMULA_PREFIXES):
+        return value
+    if value[0] in "+-" and _NUMERIC_TEXT.fullmatch(value):
+        return value
+    return f"'{value}"
+
+
+def _safe_rows(rows: Iterable[Sequence[Any]]) -> Iterator[list[Any]]:
+    for row in rows:
+        yield [_safe_cell(value) for value in row]
+
+
+def _write_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]], handler) -> None:
+    text = io.TextIOWrapper(handler, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow([_safe_cell(column) for column in columns])
+    writer.writerows(_safe_rows(rows))
+    text.flush()
+    text.detach()
+
+
+def _write_xlsx(columns: Sequence[str], rows: Iterable[Sequence[Any]], handler) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([_safe_cell(column) for column in columns])
+    for row in _safe_rows(rows):
+        sheet.append(row)
+    workbook.save(handler)
+
+
+def generate_export(name: str, object_id: str, formato: str, path: str) -> str:
+    """Gera o arquivo no storage (executado pelo worker)."""
+
+    if default_storage.exists(path):
+        return path
+
+    definition = get_export(name)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as handler:
+        if formato == "pdf":
+            definition.render_pdf(object_id, handler)
+        elif formato == "csv":
+            _write_csv(definition.columns(), definition.rows(object_id), handler)
+        elif formato == "xlsx":
+            _write_xlsx(definition.columns(), definition.rows(object_id), handler)
+        else:  # pragma: no cover - validado em request_export
+            raise ExportError(f"Formato {formato} não suportado.")
+        handler.seek(0)
+        if not default_storage.exists(path):
+            default_storage.save(path, File(handler))
+    _remove_stale_versions(path)
+    return path
+
+
+def _remove_stale_versions(path: str) -> None:
+    """Apaga os arquivos de versões anteriores do mesmo objeto.
+
+    Exportações carregam dados pessoais; só a versão atual permanece no storage.
+    """
+
+    directory, filename = path.rsplit("/", 1)
+    digest = filename.split(".", 1)[0]
+    try:
+        _directories, files = default_storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return
+    for stale in files:
+        if stale.split(".", 1)[0] != digest:
+            default_storage.delete(f"{directory}/{stale}")
+
+
+def record_failure(path: str, message: str) -> None:
+    cache.set(_error_key(path), message, RUNNING_TIMEOUT)
+    cache.delete(_running_key(path))
+
+
+def finish(path: str) -> None:
+    cache.delete(_running_key(path))
@@ -1,10 +1,13 @@
 from __future__ import annotations
+
 from collections import defaultdict
 from dataclasses import dataclass, replace
+from types import SimpleNamespace
 from typing import List
 from urllib.parse import parse_qsl, urlsplit
 
-from django.urls import NoReverseMatch, reverse
+from django.conf import settings
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
@@ -516,13 +519,12 @@ def _build_organizacao_site_menu_item(user) -> MenuItem | None:
     )
 
 
-def _build_organizacao_admin_menu_item(user) -> MenuItem | None:
+def _can_manage_organizacao(user) -> bool:
     if not getattr(user, "is_authenticated", False):
-        return None
+        return False
 
-    org_id = getattr(user, "organizacao_id", None)
-    if not org_id:
-        return None
+    if not getattr(user, "organizacao_id", None):
+        return False
 
     tipo_attr = getattr(user, "get_tipo_usuario", None)
     if callable(tipo_attr):
@@ -534,12 +536,16 @@ def _build_organizacao_admin_menu_item(user) -> MenuItem | None:
     if isinstance(raw_attr, UserType):
         raw_attr = raw_attr.value
 
-    if tipo_attr != UserType.ADMIN.value and raw_attr != UserType.ADMIN.value:
+    return tipo_attr == UserType.ADMIN.value or raw_attr == UserType.ADMIN.value
+
+
+def _build_organizacao_admin_menu_item(user) -> MenuItem | None:
+    if not _can_manage_organizacao(user):
         return None
 
     return MenuItem(
         id="organizacao-admin",
-        path=reverse("organizacoes:update", kwargs={"pk": org_id}),
+        path=reverse("organizacoes:update", kwargs={"pk": user.organizacao_id}),
         label="Organização",
         icon=ICON_ORGS,
         permissions=["admin"],
@@ -636,77 +642,193 @@ def _filter_items(items: List[MenuItem], user) -> List[MenuItem]:
     return filtered
 
 
-def _collect_path_queries(items: List[MenuItem], mapping):
-    for item in items:
-        split = urlsplit(item.path)
-        query = tuple(sorted(parse_qsl(split.query, keep_blank_values=True)))
-        mapping[split.path].add(query)
-        if item.children:
-            _collect_path_queries(item.children, mapping)
+def _query_key(query: str) -> tuple:
+    return tuple(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+@dataclass(eq=False, frozen=True)
+class _ItemCompilado:
+    """Item de menu com o caminho já decomposto para a marcação de ativo."""
+
+    item: MenuItem
+    path: str
+    query: tuple
+    children: tuple["_ItemCompilado", ...] = ()
+
+
+@dataclass(frozen=True)
+class _MenuCompilado:
+    items: tuple[_ItemCompilado, ...]
+    # caminho -> itens com esse caminho; caminho -> queries não vazias usadas nele
+    by_path: dict[str, tuple[_ItemCompilado, ...]]
+    path_queries: dict[str, frozenset[tuple]]
+    # caminho -> itens sem query que também ficam ativos nas subpáginas
+    by_prefix: dict[str, tuple[_ItemCompilado, ...]]
+    org_site_index: int
+    org_admin_index: int | None
+
+
+# Menus pré-compilados por processo; ver ``_menu_variant``.
+_COMPILED_MENUS: dict[tuple, _MenuCompilado] = {}
+
+
+def _compile_item(item: MenuItem) -> _ItemCompilado:
+    split = urlsplit(item.path)
+    return _ItemCompilado(
+        item=replace(item, children=None),
+        path=split.path,
+        query=_query_key(split.query),
+        children=tuple(_compile_item(child) for child in item.children or ()),
+    )
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node.children)
 
 
-def _mark_active(items: List[MenuItem], current_full_path: str, path_queries) -> bool:
+def _compile_menu(perfil) -> _MenuCompilado:
+    items = _get_menu_items()
+    _apply_dashboard_path(items, _resolve_dashboard_path(perfil))
+    nodes = tuple(_compile_item(item) for item in _filter_items(items, perfil))
+
+    by_path: dict[str, list[_ItemCompilado]] = defaultdict(list)
+    path_queries: dict[str, set[tuple]] = defaultdict(set)
+    by_prefix: dict[str, list[_ItemCompilado]] = defaultdict(list)
+    for node in _walk(nodes):
+        by_path[node.path].append(node)
+        if node.query:
+            path_queries[node.path].add(node.query)
+        elif node.path and node.path != "/":
+            by_prefix[node.path].append(node)
+
+    ids = [node.item.id for node in nodes]
+    org_site_index = ids.index("logout") if "logout" in ids else len(ids)
+    org_admin_index = None
+    if _can_manage_organizacao(perfil):
+        org_admin_index = ids.index("configuracoes") if "configuracoes" in ids else len(ids)
+    return _MenuCompilado(
+        items=nodes,
+        by_path={path: tuple(found) for path, found in by_path.items()},
+        path_queries={path: frozenset(queries) for path, queries in path_queries.items()},
+        by_prefix={path: tuple(found) for path, found in by_prefix.items()},
+        org_site_index=org_site_index,
+        org_admin_index=org_admin_index,
+    )
+
+
+def _coerce_user_type(value):
+    if isinstance(value, UserType):
+        return value.value
+    return value
+
+
+def _menu_variant(user) -> tuple[tuple, SimpleNamespace]:
+    """Chave do menu compilado e o perfil mínimo usado para montá-lo.
+
+    O menu depende apenas do tipo de usuário, de haver organização e das rotas
+    (``urlconf`` e prefixo do script); nada específico do usuário é compilado.
+    """
+
+    autenticado = bool(getattr(user, "is_authenticated", False))
+    tipo = raw = None
+    organizacao_id = None
+    if autenticado:
+        tipo = getattr(user, "get_tipo_usuario", None)
+        if callable(tipo):
+            tipo = tipo()
+        tipo = _coerce_user_type(tipo)
+        raw = _coerce_user_type(getattr(user, "user_type", None))
+        # O id real só é usado no item "Organização", montado por requisição.
+        organizacao_id = 1 if getattr(user, "organizacao_id", None) else None
+    key = (
+        get_urlconf() or settings.ROOT_URLCONF,
+        get_script_prefix(),
+        autenticado,
+        tipo,
+        raw,
+        organizacao_id is not None,
+    )
+    perfil = SimpleNamespace(
+        is_authenticated=autenticado,
+        get_tipo_usuario=tipo,
+        user_type=raw,
+        organizacao_id=organizacao_id,
+    )
+    return key, perfil
+
+
+def _get_compiled_menu(user) -> _MenuCompilado:
+    key, perfil = _menu_variant(user)
+    compiled = _COMPILED_MENUS.get(key)
+    if compiled is None:
+        compiled = _COMPILED_MENUS[key] = _compile_menu(perfil)
+    return compiled
+
+
+def _is_current(node: _ItemCompilado, current_path: str, current_query: tuple, path_queries) -> bool:
+    if current_path == node.path:
+        if node.query:
+            return current_query == node.query
+        return current_query not in path_queries.get(node.path, ())
+    return not node.query and bool(node.path) and node.path != "/" and current_path.startswith(node.path)
+
+
+def _current_nodes(compiled: _MenuCompilado, current_path: str, current_query: tuple) -> set[_ItemCompilado]:
+    current = {
+        node
+        for node in compiled.by_path.get(current_path, ())
+        if _is_current(node, current_path, current_query, compiled.path_queries)
+    }
+    for end in range(1, len(current_path)):
+        current.update(compiled.by_prefix.get(current_path[:end], ()))
+    return current
+
+
+def _instantiate(nodes, current: set[_ItemCompilado]) -> tuple[List[MenuItem], bool]:
+    items: List[MenuItem] = []
     any_active = False
-    current_split = urlsplit(current_full_path)
-    current_query = tuple(sorted(parse_qsl(current_split.query, keep_blank_values=True)))
-    for item in items:
-        child_active = False
-        if item.children:
-            child_active = _mark_active(item.children, current_full_path, path_queries)
-
-        split = urlsplit(item.path)
-        item_query = tuple(sorted(parse_qsl(split.query, keep_blank_values=True)))
-        same_path = current_split.path == split.path
-        is_current = False
-
-        if same_path:
-            if item_query:
-                is_current = current_query == item_query
-            else:
-                other_queries = {
-                    q for q in path_queries.get(split.path, set()) if q
-                }
-                is_current = current_query not in other_queries
-        elif (
-            not item_query
-            and split.path
-            and split.path != "/"
-            and current_split.path.startswith(split.path)
-        ):
-            is_current = True
-
-        item.is_current = is_current
+    for node in nodes:
+        children, child_active = _instantiate(node.children, current) if node.children else ([], False)
+        item = replace(node.item, children=children or None)
+        item.is_current = node in current
         item.has_active_child = child_active
-        item.is_active = is_current or child_active
+        item.is_active = item.is_current or child_active
         item.is_expanded = item.is_active
         any_active = any_active or item.is_active
-    return any_active
+        items.append(item)
+    return items, any_active
 
 
 def build_menu(request) -> List[MenuItem]:
-    """Retorna itens de menu filtrados por tipo de usuário."""
+    """Retorna itens de menu filtrados por tipo de usuário.
+
+    A árvore filtrada, o caminho do dashboard e o índice de caminhos são
+    compilados uma vez por processo para cada variante de perfil; por
+    requisição resta copiar os itens, marcar os ativos e inserir os itens da
+    organização do usuário.
+    """
 
-    items = _get_menu_items()
     user = request.user
-    dashboard_path = _resolve_dashboard_path(user)
-    _apply_dashboard_path(items, dashboard_path)
-    filtered = _filter_items(items, user)
+    compiled = _get_compiled_menu(user)
+    current_split = urlsplit(request.get_full_path())
+    current_path = current_split.path
+    current_query = _query_key(current_split.query)
+    filtered, _any_active = _instantiate(compiled.items, _current_nodes(compiled, current_path, current_query))
+
+    org_items = []
     org_site_item = _build_organizacao_site_menu_item(user)
     if org_site_item:
-        logout_index = next(
-            (idx for idx, item in enumerate(filtered) if item.id == "logout"),
-            len(filtered),
-        )
-        filtered.insert(logout_index, org_site_item)
-    org_admin_item = _build_organizacao_admin_menu_item(user)
+        org_items.append((compiled.org_site_index, org_site_item))
+    org_admin_item = _build_organizacao_admin_menu_item(user) if compiled.org_admin_index is not None else None
     if org_admin_item:
-        config_index = next(
-            (idx for idx, item in enumerate(filtered) if item.id == "configuracoes"),
-            len(filtered),
-        )
-        filtered.insert(config_index, org_admin_item)
-    current_full_path = request.get_full_path()
-    path_queries = defaultdict(set)
-    _collect_path_queries(filtered, path_queries)
-    _mark_active(filtered, current_full_path, path_queries)
+        org_items.append((compiled.org_admin_index, org_admin_item))
+    # Inseridos do maior índice para o menor, preservando as posições compiladas.
+    for index, item in sorted(org_items, key=lambda pair: pair[0], reverse=True):
+        node = _compile_item(item)
+        item.is_current = _is_current(node, current_path, current_query, compiled.path_queries)
+        item.has_active_child = False
+        item.is_active = item.is_expanded = item.is_current
+        filtered.insert(index, item)
     return filtered
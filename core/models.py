@@ -1,6 +1,12 @@
 """Core mixins shared across applications."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, ClassVar
+
 from django.db import models
+from django.db.models.base import DEFERRED
 from django.utils import timezone
 from django.utils.timezone import now
 
@@ -62,3 +68,91 @@ class SoftDeleteModel(models.Model):
 
     def hard_delete(self, using: str | None = None, keep_parents: bool = False) -> None:
         super().delete(using=using, keep_parents=keep_parents)
+
+
+class FieldTrackerMixin(models.Model):
+    """Detecta alterações em ``tracked_fields`` sem reconsultar a linha no ``save``.
+
+    Os valores carregados em ``from_db`` (e os gravados após cada ``save``;
+    com ``update_fields``, apenas os campos informados) são guardados em uma
+    única tupla alinhada a ``tracked_fields``. Campos adiados (``only``/``defer``)
+    ficam como ``DEFERRED`` e só contam como alterados se forem atribuídos
+    depois do carregamento.
+    """
+
+    tracked_fields: ClassVar[tuple[str, ...]] = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _tracked_attnames(cls) -> tuple[str, ...]:
+        attnames = cls.__dict__.get("_tracked_attnames_cache")
+        if attnames is None:
+            attnames = tuple(cls._meta.get_field(name).attname for name in cls.tracked_fields)
+            cls._tracked_attnames_cache = attnames
+        return attnames
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.reset_tracker()
+        return instance
+
+    def reset_tracker(self) -> None:
+        """Considera os valores atuais como o estado persistido."""
+
+        self._tracker_snapshot = tuple(self.__dict__.get(attname, DEFERRED) for attname in self._tracked_attnames())
+
+    def _attname(self, field: str) -> str:
+        return self._meta.get_field(field).attname
+
+    def previous_value(self, field: str) -> Any:
+        """Valor carregado do banco (``None`` para instâncias novas ou campos adiados)."""
+
+        snapshot = getattr(self, "_tracker_snapshot", None)
+        if snapshot is None:
+            return None
+        value = snapshot[self._tracked_attnames().index(self._attname(field))]
+        return None if value is DEFERRED else value
+
+    def has_changed(self, field: str) -> bool:
+        snapshot = getattr(self, "_tracker_snapshot", None)
+        if snapshot is None:
+            return True
+        attname = self._attname(field)
+        previous = snapshot[self._tracked_attnames().index(attname)]
+        if attname not in self.__dict__:
+            return False
+        if previous is DEFERRED:
+            return True
+        return self.__dict__[attname] != previous
+
+    def saves_change(self, field: str, update_fields: Iterable[str] | None = None) -> bool:
+        """Indica se ``save(update_fields=...)`` vai gravar uma alteração de ``field``."""
+
+        if update_fields is not None and not {field, self._attname(field)} & set(update_fields):
+            return False
+        return self.has_changed(field)
+
+    @property
+    def changed_fields(self) -> set[str]:
+        return {field for field in self.tracked_fields if self.has_changed(field)}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        snapshot = getattr(self, "_tracker_snapshot", None)
+        if update_fields is None or snapshot is None:
+            self.reset_tracker()
+            return
+        # Campos fora de ``update_fields`` não foram gravados e continuam pendentes.
+        saved = {self._attname(name) for name in update_fields}
+        self._tracker_snapshot = tuple(
+            self.__dict__.get(attname, DEFERRED) if attname in saved else previous
+            for attname, previous in zip(self._tracked_attnames(), snapshot)
+        )
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.reset_tracker()
@@ -66,21 +66,26 @@ class AdminOrOperatorRequiredMixin(AdminRequiredMixin):
         }
 
 
+def admin_operador_ou_coordenador(user) -> bool:
+    """Indica se ``user`` é administrador, operador ou coordenador."""
+
+    tipo = getattr(user, "get_tipo_usuario", None)
+    if isinstance(tipo, UserType):
+        tipo = tipo.value
+    return tipo in {
+        UserType.ADMIN.value,
+        UserType.OPERADOR.value,
+        UserType.COORDENADOR.value,
+    }
+
+
 class AdminOperatorOrCoordinatorRequiredMixin(UserPassesTestMixin):
     """Permite acesso a administradores, operadores e coordenadores."""
 
     raise_exception = True
 
     def test_func(self) -> bool:  # pragma: no cover - comportamento validado em views
-        user = self.request.user
-        tipo = getattr(user, "get_tipo_usuario", None)
-        if isinstance(tipo, UserType):
-            tipo = tipo.value
-        return tipo in {
-            UserType.ADMIN.value,
-            UserType.OPERADOR.value,
-            UserType.COORDENADOR.value,
-        }
+        return admin_operador_ou_coordenador(self.request.user)
 
 
 class GerenteRequiredMixin(UserPassesTestMixin):
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from . import exports
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def gerar_exportacao(nome: str, objeto_id: str, formato: str, caminho: str) -> str | None:
+    """Gera o arquivo de uma exportação registrada em ``core.exports``."""
+
+    try:
+        return exports.generate_export(nome, objeto_id, formato, caminho)
+    except Exception as exc:
+        logger.exception("exportacao_falhou", extra={"exportacao": nome, "objeto": objeto_id, "formato": formato})
+        exports.record_failure(caminho, str(exc) or exc.__class__.__name__)
+        return None
+    finally:
+        exports.finish(caminho)
@@ -10,4 +10,6 @@ urlpatterns = [
     path("sobre/", views.AboutView.as_view(), name="about"),
     path("termos/", views.TermsView.as_view(), name="terms"),
     path("privacidade/", views.PrivacyView.as_view(), name="privacy"),
+    path("exportacoes/<str:job_id>/", views.exportacao_status, name="exportacao_status"),
+    path("exportacoes/<str:job_id>/download/", views.exportacao_download, name="exportacao_download"),
 ]
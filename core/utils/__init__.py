@@ -1,5 +1,6 @@
 """Utility helpers shared across Hubx apps."""
 
+from .htmx import is_htmx_partial
 from .navigation import get_back_navigation_fallback, resolve_back_href
 
-__all__ = ["get_back_navigation_fallback", "resolve_back_href"]
+__all__ = ["get_back_navigation_fallback", "is_htmx_partial", "resolve_back_href"]
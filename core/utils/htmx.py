@@ -0,0 +1,16 @@
+"""Helpers for requests issued by HTMX."""
+
+from __future__ import annotations
+
+
+def is_htmx_partial(request) -> bool:
+    """Return ``True`` when the response only replaces a fragment of the page.
+
+    Boosted navigations and history-restore requests still expect the full
+    layout (menu, header badges), so they are not considered partial.
+    """
+
+    headers = getattr(request, "headers", None)
+    if not headers or not headers.get("HX-Request"):
+        return False
+    return not (headers.get("HX-Boosted") or headers.get("HX-History-Restore-Request"))
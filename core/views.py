@@ -1,9 +1,14 @@
 from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
 from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.views.generic import TemplateView
 
 from feed.models import Post
 
+from .exports import ExportError, load_job
+
 
 def home(request):
     if request.user.is_authenticated:
@@ -27,3 +32,38 @@ class TermsView(TemplateView):
 
 class PrivacyView(TemplateView):
     template_name = "core/privacy.html"
+
+
+def _exportacao_context(job) -> dict:
+    return {
+        "job": job,
+        "status_url": reverse("core:exportacao_status", args=[job.job_id]),
+        "download_url": reverse("core:exportacao_download", args=[job.job_id]),
+    }
+
+
+def _load_exportacao(request, job_id: str):
+    try:
+        return load_job(job_id, user=request.user)
+    except ExportError as exc:
+        raise Http404(str(exc)) from exc
+
+
+@login_required
+def exportacao_status(request, job_id: str):
+    job = _load_exportacao(request, job_id)
+    template = "core/partials/exportacao_status.html" if request.headers.get("HX-Request") else "core/exportacao.html"
+    return render(request, template, _exportacao_context(job))
+
+
+@login_required
+def exportacao_download(request, job_id: str):
+    job = _load_exportacao(request, job_id)
+    if not job.ready:
+        return redirect("core:exportacao_status", job_id=job.job_id)
+    return FileResponse(
+        default_storage.open(job.path, "rb"),
+        as_attachment=True,
+        filename=job.filename,
+        content_type=job.content_type,
+    )
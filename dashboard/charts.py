@@ -0,0 +1,547 @@
+"""Especificações Plotly do dashboard geradas diretamente em JSON.
+
+Os gráficos são montados como dicionários no formato final consumido pelo
+Plotly.js (``{"data": [...], "layout": {...}}``), sem instanciar
+``plotly.graph_objects``. O template padrão do Plotly é carregado de
+``plotly_template.json`` e os resultados ficam em cache por processo,
+indexados pelo hash das séries de entrada e do idioma ativo. Os dicionários
+retornados são compartilhados entre requisições e devem ser tratados como
+somente leitura (use ``deepcopy`` antes de alterá-los).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import get_language, gettext
+
+CHART_CACHE_MAX_ENTRIES = 256
+_TEMPLATE_PATH = Path(__file__).with_name("plotly_template.json")
+
+_chart_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _plotly_template() -> dict[str, Any]:
+    """Template ``plotly`` padrão, equivalente ao incluído por ``Figure.to_dict()``."""
+
+    with _TEMPLATE_PATH.open(encoding="utf-8") as handler:
+        return json.load(handler)
+
+
+def _cache_key(kind: str, *parts: Any) -> str:
+    raw = json.dumps([kind, get_language(), parts], cls=DjangoJSONEncoder, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _cached(key: str, builder: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    with _chart_cache_lock:
+        cached = _chart_cache.get(key)
+        if cached is not None:
+            _chart_cache.move_to_end(key)
+            return cached
+
+    value = builder()
+    with _chart_cache_lock:
+        _chart_cache[key] = value
+        while len(_chart_cache) > CHART_CACHE_MAX_ENTRIES:
+            _chart_cache.popitem(last=False)
+    return value
+
+
+def clear_chart_cache() -> None:
+    """Esvazia o cache de especificações (útil em testes)."""
+
+    with _chart_cache_lock:
+        _chart_cache.clear()
+
+
+def as_figure(spec: Mapping[str, Any]):
+    """Converte uma especificação em ``plotly.graph_objects.Figure``.
+
+    O ``plotly`` só é importado aqui, para chamadores que ainda precisam do
+    objeto ``Figure``.
+    """
+
+    from plotly import graph_objects as go
+
+    return go.Figure(spec)
+
+
+CHART_PALETTE = [
+    "#0ea5e9",  # sky-500
+    "#2563eb",  # blue-600
+    "#7c3aed",  # violet-600
+    "#22c55e",  # green-500
+    "#f97316",  # orange-500
+    "#eab308",  # yellow-500
+    "#ec4899",  # pink-500
+]
+
+
+def _clamp(value: float, minimum: float = 0.0, maximum: float = 255.0) -> float:
+    """Limita ``value`` dentro do intervalo informado."""
+
+    return max(minimum, min(value, maximum))
+
+
+def _adjust_color_luminance(color: str, factor: float) -> str:
+    """Ajusta a luminosidade de uma cor hexadecimal.
+
+    ``factor`` deve estar entre ``-1`` (mais escuro) e ``1`` (mais claro).
+    """
+
+    hex_color = color.strip().lstrip("#")
+    if len(hex_color) not in (3, 6):
+        return color
+
+    if len(hex_color) == 3:
+        hex_color = "".join(component * 2 for component in hex_color)
+
+    try:
+        red = int(hex_color[0:2], 16)
+        green = int(hex_color[2:4], 16)
+        blue = int(hex_color[4:6], 16)
+    except ValueError:
+        return color
+
+    if factor >= 0:
+        red = _clamp(red + (255 - red) * factor)
+        green = _clamp(green + (255 - green) * factor)
+        blue = _clamp(blue + (255 - blue) * factor)
+    else:
+        red = _clamp(red * (1 + factor))
+        green = _clamp(green * (1 + factor))
+        blue = _clamp(blue * (1 + factor))
+
+    return f"#{int(red):02x}{int(green):02x}{int(blue):02x}"
+
+
+def _palette_for_length(length: int) -> list[str]:
+    if length <= 0:
+        return []
+    repeats = (length // len(CHART_PALETTE)) + 1
+    return (CHART_PALETTE * repeats)[:length]
+
+
+def _base_layout(**extras: Any) -> dict[str, Any]:
+    layout: dict[str, Any] = {
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "plot_bgcolor": "rgba(0,0,0,0)",
+        "margin": {"l": 40, "r": 40, "t": 48, "b": 96},
+        "font": {"color": "var(--text-primary, #0f172a)"},
+        "legend": {
+            "orientation": "h",
+            "yanchor": "top",
+            "xanchor": "center",
+            "x": 0.5,
+            "y": -0.18,
+            "bgcolor": "rgba(255,255,255,0.0)",
+            "bordercolor": "rgba(148,163,184,0.4)",
+            "borderwidth": 1,
+            "font": {"size": 12},
+            "itemwidth": 80,
+        },
+        "hoverlabel": {
+            "bgcolor": "rgba(255,255,255,0.95)",
+            "bordercolor": "rgba(148,163,184,0.4)",
+            "font": {"color": "var(--text-primary, #0f172a)"},
+        },
+    }
+    layout.update(extras)
+    return layout
+
+
+def _axis_title(text: str) -> dict[str, str]:
+    return {"text": text}
+
+
+def _figure(data: list[dict[str, Any]], layout: dict[str, Any]) -> dict[str, Any]:
+    layout["template"] = _plotly_template()
+    return {"data": data, "layout": layout}
+
+
+def _empty_figure(message: str) -> dict[str, Any]:
+    return _figure(
+        [],
+        _base_layout(
+            annotations=[
+                {
+                    "text": message,
+                    "xref": "paper",
+                    "yref": "paper",
+                    "x": 0.5,
+                    "y": 0.5,
+                    "showarrow": False,
+                    "font": {"size": 16, "color": "var(--text-secondary, #6b7280)"},
+                }
+            ],
+            xaxis={"visible": False},
+            yaxis={"visible": False},
+            height=400,
+        ),
+    )
+
+
+def _time_series_figure(
+    data_points: list[dict[str, Any]],
+    *,
+    value_field: str,
+    label: str,
+    std_field: str | None,
+    color: str,
+    value_format: str,
+    value_prefix: str,
+    value_suffix: str,
+    yaxis_title: str,
+    yaxis_tickprefix: str,
+    yaxis_ticksuffix: str,
+) -> dict[str, Any]:
+    x_values = [point["period"] for point in data_points]
+    y_values = [float(point.get(value_field) or 0.0) for point in data_points]
+
+    if not any(y_values):
+        return _empty_figure(gettext("Sem dados disponíveis"))
+
+    traces: list[dict[str, Any]] = []
+    std_values: list[float] = []
+    if std_field:
+        std_values = [float(point.get(std_field) or 0.0) for point in data_points]
+
+    band_color = _adjust_color_luminance(color, 0.4)
+    band_border = _adjust_color_luminance(color, 0.2)
+
+    if std_field and any(std_values):
+        upper = [value + std for value, std in zip(y_values, std_values)]
+        lower = [max(0.0, value - std) for value, std in zip(y_values, std_values)]
+        traces.append(
+            {
+                "hoverinfo": "skip",
+                "line": {"color": band_border, "width": 0},
+                "mode": "lines",
+                "name": "upper",
+                "showlegend": False,
+                "x": x_values,
+                "y": upper,
+                "type": "scatter",
+            }
+        )
+        traces.append(
+            {
+                "customdata": [[std] for std in std_values],
+                "fill": "tonexty",
+                "fillcolor": band_color,
+                "hovertemplate": (
+                    "<b>%{x|%m/%y}</b><br>"
+                    + gettext("Desvio padrão")
+                    + ": "
+                    + value_prefix
+                    + "%{customdata[0]:"
+                    + value_format
+                    + "}"
+                    + value_suffix
+                    + "<extra></extra>"
+                ),
+                "line": {"color": band_border, "width": 0},
+                "mode": "lines",
+                "name": gettext("Desvio padrão"),
+                "x": x_values,
+                "y": lower,
+                "type": "scatter",
+            }
+        )
+
+    traces.append(
+        {
+            "hovertemplate": (
+                "<b>%{x|%m/%y}</b><br>"
+                + label
+                + ": "
+                + value_prefix
+                + "%{y:"
+                + value_format
+                + "}"
+                + value_suffix
+                + "<extra></extra>"
+            ),
+            "line": {"color": color, "width": 3},
+            "marker": {
+                "color": _adjust_color_luminance(color, -0.02),
+                "line": {"color": "#ffffff", "width": 1},
+                "size": 8,
+            },
+            "mode": "lines+markers",
+            "name": label,
+            "x": x_values,
+            "y": y_values,
+            "type": "scatter",
+        }
+    )
+
+    return _figure(
+        traces,
+        _base_layout(
+            xaxis={
+                "title": _axis_title(""),
+                "tickformat": "%m/%y",
+                "dtick": "M1",
+                "hoverformat": "%m/%y",
+            },
+            yaxis={
+                "title": _axis_title(yaxis_title),
+                "tickprefix": yaxis_tickprefix,
+                "ticksuffix": yaxis_ticksuffix,
+                "rangemode": "tozero",
+            },
+            hovermode="x unified",
+            margin={"l": 72, "r": 32, "t": 48, "b": 96},
+            height=420,
+        ),
+    )
+
+
+def build_time_series_chart(
+    data_points: list[dict[str, Any]],
+    *,
+    value_field: str,
+    label: str,
+    std_field: str | None = None,
+    color: str = "#2563eb",
+    value_format: str = ".0f",
+    value_prefix: str = "",
+    value_suffix: str = "",
+    yaxis_title: str = "",
+    yaxis_tickprefix: str = "",
+    yaxis_ticksuffix: str = "",
+) -> dict[str, Any]:
+    """Gera a especificação Plotly de série temporal com banda de desvio padrão opcional."""
+
+    options = {
+        "value_field": value_field,
+        "label": label,
+        "std_field": std_field,
+        "color": color,
+        "value_format": value_format,
+        "value_prefix": value_prefix,
+        "value_suffix": value_suffix,
+        "yaxis_title": yaxis_title,
+        "yaxis_tickprefix": yaxis_tickprefix,
+        "yaxis_ticksuffix": yaxis_ticksuffix,
+    }
+
+    def build() -> dict[str, Any]:
+        if not data_points:
+            return {"points": [], "figure": _empty_figure(gettext("Sem dados disponíveis")), "type": "line"}
+
+        serialized_points: list[dict[str, Any]] = []
+        for point in data_points:
+            serialized = dict(point)
+            period = serialized.get("period")
+            if hasattr(period, "isoformat"):
+                serialized["period"] = period.isoformat()
+            serialized_points.append(serialized)
+
+        return {
+            "points": serialized_points,
+            "figure": _time_series_figure(data_points, **options),
+            "type": "line",
+        }
+
+    return _cached(_cache_key("line", data_points, options), build)
+
+
+def _format_legend_label(label: str, total: int) -> str:
+    template = gettext("%(label)s · %(total)s")
+    return template % {"label": label, "total": total}
+
+
+def _is_numeric_suffix(value: str) -> bool:
+    normalized = value.strip()
+    if not normalized:
+        return False
+    normalized = normalized.replace(".", "").replace(",", "")
+    return normalized.isdigit()
+
+
+def _strip_numeric_suffix(label: str) -> str:
+    trimmed = label.strip()
+    separators = (" · ", "·", ",", " - ", " – ", " — ")
+    for separator in separators:
+        if separator in trimmed:
+            head, _, tail = trimmed.partition(separator)
+            if _is_numeric_suffix(tail):
+                return head.strip()
+    return trimmed
+
+
+def _pie_chart(labels: list[str], series: list[int]) -> dict[str, Any]:
+    total = sum(series)
+    if total == 0:
+        return _empty_figure(gettext("Sem dados disponíveis"))
+
+    colors = _palette_for_length(len(series)) or ["#0ea5e9"]
+    highlight_colors = [_adjust_color_luminance(color, 0.08) for color in colors]
+    shadow_colors = [_adjust_color_luminance(color, -0.15) for color in colors]
+    legend_labels = [_format_legend_label(label, value) for label, value in zip(labels, series)]
+
+    tooltip_labels: list[str] = []
+    for original_label, legend_label in zip(labels, legend_labels):
+        sanitized = _strip_numeric_suffix(legend_label)
+        if sanitized == legend_label:
+            sanitized = original_label
+        tooltip_labels.append(sanitized)
+
+    customdata = [[tooltip_label, value] for tooltip_label, value in zip(tooltip_labels, series)]
+
+    data = [
+        {
+            "direction": "clockwise",
+            "hole": 0.45,
+            "hoverinfo": "skip",
+            "labels": legend_labels,
+            "marker": {
+                "colors": shadow_colors,
+                "line": {"color": "rgba(15,23,42,0.25)", "width": 1},
+            },
+            "opacity": 0.55,
+            "pull": 0.015,
+            "rotation": 2,
+            "showlegend": False,
+            "sort": False,
+            "textinfo": "none",
+            "values": series,
+            "type": "pie",
+        },
+        {
+            "customdata": customdata,
+            "hole": 0.55,
+            "hovertemplate": (
+                "<b>%{customdata[0]}</b><br>" "Total: %{value}<br>" "Participação: %{percent}<extra></extra>"
+            ),
+            "labels": legend_labels,
+            "marker": {
+                "colors": highlight_colors,
+                "line": {"color": "#ffffff", "width": 2},
+            },
+            "sort": False,
+            "textinfo": "none",
+            "values": series,
+            "type": "pie",
+        },
+    ]
+    return _figure(
+        data,
+        _base_layout(
+            legend={
+                "traceorder": "normal",
+            },
+            margin={"l": 32, "r": 32, "t": 48, "b": 120},
+            height=440,
+            annotations=[
+                {
+                    "text": gettext("Total") + f"<br><b>{total}</b>",
+                    "xref": "paper",
+                    "yref": "paper",
+                    "x": 0.5,
+                    "y": 0.5,
+                    "showarrow": False,
+                    "font": {"size": 18, "color": "var(--text-primary, #0f172a)"},
+                }
+            ],
+        ),
+    )
+
+
+def _bar_chart(labels: list[str], series: list[int]) -> dict[str, Any]:
+    total = sum(series)
+    if total == 0:
+        return _empty_figure(gettext("Sem dados disponíveis"))
+
+    colors = _palette_for_length(len(series)) or ["#2563eb"]
+    legend_labels = [_format_legend_label(label, value) for label, value in zip(labels, series)]
+
+    traces: list[dict[str, Any]] = []
+    for index, (label, value, legend_label, color) in enumerate(zip(labels, series, legend_labels, colors)):
+        traces.append(
+            {
+                "customdata": [[label, value]],
+                "hovertemplate": ("<b>%{customdata[0]}</b><br>" "Total: %{customdata[1]}<extra></extra>"),
+                "legendgroup": str(index),
+                "marker": {
+                    "color": color,
+                    "line": {"color": "#e5e7eb", "width": 1},
+                },
+                "name": legend_label,
+                "showlegend": True,
+                "x": [label],
+                "y": [value],
+                "type": "bar",
+            }
+        )
+
+    return _figure(
+        traces,
+        _base_layout(
+            xaxis={
+                "title": _axis_title(""),
+                "gridcolor": "#e5e7eb",
+                "zerolinecolor": "#cbd5f5",
+                "showticklabels": False,
+                "showgrid": False,
+                "ticks": "",
+                "automargin": True,
+            },
+            yaxis={
+                "title": _axis_title(""),
+                "tickfont": {"size": 12, "color": "var(--text-secondary, #374151)"},
+                "gridcolor": "#e5e7eb",
+                "rangemode": "tozero",
+            },
+            legend={
+                "traceorder": "normal",
+            },
+            bargap=0.35,
+            margin={"l": 48, "r": 24, "t": 48, "b": 140},
+            barmode="group",
+            height=440,
+        ),
+    )
+
+
+def build_chart_payload(counts: Mapping[str, int], *, chart_type: str = "pie") -> dict[str, Any]:
+    """Normaliza contagens e gera os metadados e a especificação Plotly correspondente."""
+
+    labels = list(counts.keys())
+    series = [counts[label] for label in labels]
+
+    def build() -> dict[str, Any]:
+        total = sum(series)
+        if total:
+            percentages = [round((value / total) * 100, 2) for value in series]
+        else:
+            percentages = [0 for _ in series]
+
+        if chart_type == "bar":
+            figure = _bar_chart(labels, series)
+        else:
+            figure = _pie_chart(labels, series)
+
+        return {
+            "labels": labels,
+            "series": series,
+            "percentages": percentages,
+            "total": total,
+            "figure": figure,
+            "type": chart_type,
+        }
+
+    return _cached(_cache_key(chart_type, labels, series), build)
@@ -0,0 +1,389 @@
+"""Motor de métricas do dashboard com agregações condicionais agrupadas.
+
+Cada widget declara as métricas de que precisa (:class:`Aggregate`,
+:class:`Breakdown` ou :class:`Series`). As fontes são recortadas pela
+organização (e núcleos) ou, no dashboard do membro, pelo próprio usuário. O
+motor agrupa todas as agregações escalares de uma mesma tabela em um único
+``aggregate()`` com ``filter=`` condicional, executa os grupos independentes (em paralelo quando o banco
+permite) e devolve um :class:`DashboardMetrics` tipado para as views.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Avg, Count, F, Q, QuerySet, Sum
+
+from accounts.models import PerfilFeedback, UserType
+from eventos.models import Evento, InscricaoEvento
+from feed.models import Post, Reacao
+from nucleos.models import ParticipacaoNucleo
+
+from .services import (
+    EVENTOS_PUBLICOS_LABEL,
+    MEMBROS_NAO_NUCLEADOS_LABEL,
+    MEMBROS_NUCLEADOS_LABEL,
+    SEM_NUCLEO_LABEL,
+    _extract_organizacao_id,
+    _normalize_nucleo_ids,
+)
+
+User = get_user_model()
+
+
+@dataclass(frozen=True)
+class MetricScope:
+    """Recorte aplicado a todas as fontes de dados de uma execução."""
+
+    organizacao_id: Any
+    nucleo_ids: tuple[Any, ...] | None = None
+    user_id: Any = None
+
+
+def _usuarios(scope: MetricScope) -> QuerySet:
+    return User.objects.filter(organizacao_id=scope.organizacao_id)
+
+
+def _participacoes(scope: MetricScope) -> QuerySet:
+    queryset = ParticipacaoNucleo.objects.filter(nucleo__organizacao_id=scope.organizacao_id)
+    if scope.nucleo_ids is not None:
+        queryset = queryset.filter(nucleo_id__in=scope.nucleo_ids)
+    return queryset
+
+
+def _eventos(scope: MetricScope) -> QuerySet:
+    queryset = Evento.objects.filter(organizacao_id=scope.organizacao_id)
+    if scope.nucleo_ids is not None:
+        queryset = queryset.filter(nucleo_id__in=scope.nucleo_ids)
+    return queryset
+
+
+def _inscricoes(scope: MetricScope) -> QuerySet:
+    queryset = InscricaoEvento.objects.filter(evento__organizacao_id=scope.organizacao_id)
+    if scope.nucleo_ids is not None:
+        queryset = queryset.filter(evento__nucleo_id__in=scope.nucleo_ids)
+    return queryset
+
+
+def _avaliacoes(scope: MetricScope) -> QuerySet:
+    return PerfilFeedback.objects.filter(avaliado_id=scope.user_id)
+
+
+def _conexoes(scope: MetricScope) -> QuerySet:
+    return User.connections.through.objects.filter(from_user_id=scope.user_id)
+
+
+def _posts(scope: MetricScope) -> QuerySet:
+    return Post.objects.filter(autor_id=scope.user_id)
+
+
+def _reacoes(scope: MetricScope) -> QuerySet:
+    return Reacao.objects.filter(user_id=scope.user_id)
+
+
+SOURCES: dict[str, Callable[[MetricScope], QuerySet]] = {
+    "usuarios": _usuarios,
+    "participacoes": _participacoes,
+    "eventos": _eventos,
+    "inscricoes": _inscricoes,
+    "avaliacoes": _avaliacoes,
+    "conexoes": _conexoes,
+    "posts": _posts,
+    "reacoes": _reacoes,
+}
+
+# Fontes restritas por núcleo: com ``nucleo_ids`` vazio não há o que consultar.
+NUCLEO_SCOPED_SOURCES = frozenset({"participacoes", "eventos", "inscricoes"})
+# Fontes do próprio usuário: dependem apenas de ``user_id``.
+USER_SCOPED_SOURCES = frozenset({"avaliacoes", "conexoes", "posts", "reacoes"})
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """Valor escalar calculado por agregação condicional sobre ``source``."""
+
+    name: str
+    source: str
+    expression: Any
+    default: Any = 0
+
+
+@dataclass(frozen=True)
+class Breakdown:
+    """Contagens agrupadas pelos campos ``group_by`` de ``source``."""
+
+    name: str
+    source: str
+    group_by: tuple[str, ...]
+    expression: Any
+    order_by: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Series:
+    """Resultado arbitrário calculado por ``compute`` (ex.: séries mensais).
+
+    ``compute`` é sempre executado e deve tratar recortes sem organização.
+    """
+
+    name: str
+    compute: Callable[[MetricScope], Any]
+    default: Any = None
+
+
+MetricSpec = Aggregate | Breakdown | Series
+
+
+@dataclass(frozen=True)
+class Widget:
+    """Declaração das métricas consumidas por um bloco do dashboard."""
+
+    name: str
+    metrics: tuple[MetricSpec, ...]
+
+
+@dataclass
+class DashboardMetrics:
+    """Resultado tipado de uma execução do motor."""
+
+    values: dict[str, Any] = field(default_factory=dict)
+    query_groups: int = 0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def membership_totals(self) -> OrderedDict[str, int]:
+        total_membros = int(self.get("total_membros", 0) or 0)
+        total_nucleados = int(self.get("total_nucleados", 0) or 0)
+        return OrderedDict(
+            (
+                (MEMBROS_NUCLEADOS_LABEL, total_nucleados),
+                (MEMBROS_NAO_NUCLEADOS_LABEL, max(total_membros - total_nucleados, 0)),
+            )
+        )
+
+    def event_status_totals(self) -> OrderedDict[str, int]:
+        return OrderedDict(
+            (status.label, int(self.get(f"eventos_status_{status.value}", 0) or 0)) for status in Evento.Status
+        )
+
+    def events_by_nucleo(self) -> OrderedDict[str, int]:
+        totals: OrderedDict[str, int] = OrderedDict()
+        public_total = 0
+        for item in self.get("eventos_por_nucleo", []) or []:
+            if item["publico_alvo"] == 0 and not item["nucleo__nome"]:
+                public_total += item["total"]
+                continue
+            label = item["nucleo__nome"] or SEM_NUCLEO_LABEL
+            totals[label] = totals.get(label, 0) + item["total"]
+        if public_total:
+            totals[EVENTOS_PUBLICOS_LABEL] = public_total
+        return totals
+
+
+def _flatten(specs: Iterable[Widget | MetricSpec]) -> list[MetricSpec]:
+    flattened: list[MetricSpec] = []
+    seen: set[str] = set()
+    for spec in specs:
+        items = spec.metrics if isinstance(spec, Widget) else (spec,)
+        for item in items:
+            if item.name in seen:
+                continue
+            seen.add(item.name)
+            flattened.append(item)
+    return flattened
+
+
+class MetricsEngine:
+    """Executa as métricas declaradas com o menor número de consultas possível."""
+
+    def __init__(
+        self,
+        organizacao: Any | None,
+        *,
+        nucleo_ids: Iterable[Any] | None = None,
+        user: Any | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        normalized = _normalize_nucleo_ids(nucleo_ids)
+        self.scope = MetricScope(
+            organizacao_id=_extract_organizacao_id(organizacao),
+            nucleo_ids=tuple(normalized) if normalized is not None else None,
+            user_id=getattr(user, "pk", None),
+        )
+        if max_workers is None:
+            max_workers = getattr(settings, "DASHBOARD_METRICS_MAX_WORKERS", 4)
+        self.max_workers = max_workers
+
+    def _skip_source(self, source: str) -> bool:
+        if source in USER_SCOPED_SOURCES:
+            return not self.scope.user_id
+        if not self.scope.organizacao_id:
+            return True
+        return source in NUCLEO_SCOPED_SOURCES and self.scope.nucleo_ids == ()
+
+    def _plan(self, specs: list[MetricSpec]) -> tuple[dict[str, Any], list[Callable[[], dict[str, Any]]]]:
+        defaults: dict[str, Any] = {}
+        aggregates: dict[str, dict[str, Any]] = {}
+        jobs: list[Callable[[], dict[str, Any]]] = []
+
+        for spec in specs:
+            if isinstance(spec, Aggregate):
+                defaults[spec.name] = spec.default
+                if not self._skip_source(spec.source):
+                    aggregates.setdefault(spec.source, {})[spec.name] = spec.expression
+            elif isinstance(spec, Breakdown):
+                defaults[spec.name] = []
+                if not self._skip_source(spec.source):
+                    jobs.append(self._breakdown_job(spec))
+            else:
+                defaults[spec.name] = spec.default
+                jobs.append(self._series_job(spec))
+
+        for source, expressions in aggregates.items():
+            jobs.insert(0, self._aggregate_job(source, expressions))
+        return defaults, jobs
+
+    def _aggregate_job(self, source: str, expressions: dict[str, Any]) -> Callable[[], dict[str, Any]]:
+        scope = self.scope
+
+        def job() -> dict[str, Any]:
+            return SOURCES[source](scope).aggregate(**expressions)
+
+        return job
+
+    def _breakdown_job(self, spec: Breakdown) -> Callable[[], dict[str, Any]]:
+        scope = self.scope
+
+        def job() -> dict[str, Any]:
+            queryset = (
+                SOURCES[spec.source](scope)
+                .values(*spec.group_by)
+                .annotate(total=spec.expression)
+                .order_by(*spec.order_by)
+            )
+            return {spec.name: list(queryset)}
+
+        return job
+
+    def _series_job(self, spec: Series) -> Callable[[], dict[str, Any]]:
+        scope = self.scope
+
+        def job() -> dict[str, Any]:
+            return {spec.name: spec.compute(scope)}
+
+        return job
+
+    def _concurrent(self, jobs: int) -> bool:
+        return self.max_workers > 1 and jobs > 1 and connection.vendor != "sqlite"
+
+    @staticmethod
+    def _run_in_thread(job: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        try:
+            return job()
+        finally:
+            connections.close_all()
+
+    def run(self, specs: Iterable[Widget | MetricSpec]) -> DashboardMetrics:
+        defaults, jobs = self._plan(_flatten(specs))
+        result = DashboardMetrics(values=dict(defaults), query_groups=len(jobs))
+
+        if self._concurrent(len(jobs)):
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+                outputs = list(executor.map(self._run_in_thread, jobs))
+        else:
+            outputs = [job() for job in jobs]
+
+        for output in outputs:
+            for name, value in output.items():
+                result.values[name] = defaults.get(name) if value is None else value
+        return result
+
+
+ACTIVE_EVENT_STATUSES = (Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO)
+
+MEMBERSHIP_WIDGET = Widget(
+    name="membros",
+    metrics=(
+        Aggregate(
+            "total_membros",
+            "usuarios",
+            Count(
+                "id",
+                filter=Q(
+                    is_associado=True,
+                    user_type__in=[
+                        UserType.ASSOCIADO.value,
+                        UserType.COORDENADOR.value,
+                        UserType.NUCLEADO.value,
+                    ],
+                ),
+            ),
+        ),
+        Aggregate(
+            "total_nucleados",
+            "participacoes",
+            Count(
+                "user_id",
+                filter=Q(status="ativo", user__organizacao_id=F("nucleo__organizacao_id")),
+                distinct=True,
+            ),
+        ),
+    ),
+)
+
+EVENT_STATUS_WIDGET = Widget(
+    name="eventos_status",
+    metrics=tuple(
+        Aggregate(f"eventos_status_{status.value}", "eventos", Count("id", filter=Q(status=status)))
+        for status in Evento.Status
+    ),
+)
+
+EVENTS_BY_NUCLEO_WIDGET = Widget(
+    name="eventos_por_nucleo",
+    metrics=(
+        Breakdown(
+            "eventos_por_nucleo",
+            "eventos",
+            group_by=("nucleo__nome", "publico_alvo"),
+            expression=Count("id"),
+            order_by=("nucleo__nome", "publico_alvo"),
+        ),
+    ),
+)
+
+REGISTRATIONS_WIDGET = Widget(
+    name="inscricoes",
+    metrics=(
+        Aggregate("inscricoes_confirmadas", "inscricoes", Count("id", filter=Q(status="confirmada"))),
+        Aggregate(
+            "valor_inscricoes_confirmadas",
+            "inscricoes",
+            Sum("valor_pago", filter=Q(status="confirmada")),
+            default=Decimal("0"),
+        ),
+    ),
+)
+
+MEMBER_WIDGET = Widget(
+    name="membro",
+    metrics=(
+        Aggregate("avaliacao_media", "avaliacoes", Avg("nota"), default=None),
+        Aggregate("avaliacao_total", "avaliacoes", Count("id")),
+        Aggregate("total_conexoes", "conexoes", Count("id")),
+        Aggregate("total_posts", "posts", Count("id")),
+        Aggregate("total_reacoes", "reacoes", Count("id")),
+    ),
+)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.rollups import rebuild_rollups
+from dashboard.widgets import bump_data_version
+from organizacoes.models import Organizacao
+
+
+class Command(BaseCommand):
+    help = "Reconstrói os agregados mensais do dashboard a partir das tabelas de origem."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--organizacao", help="ID da organização a reconstruir (padrão: todas).")
+        parser.add_argument("--since", help="Reconstrói apenas a partir desta data (AAAA-MM-DD).")
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401 - command signature
+        since = None
+        if options.get("since"):
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError as exc:
+                raise CommandError("Data inválida para --since; use AAAA-MM-DD.") from exc
+
+        organizacoes = Organizacao.objects.values_list("id", flat=True)
+        if options.get("organizacao"):
+            organizacoes = organizacoes.filter(pk=options["organizacao"])
+
+        total = 0
+        for organizacao_id in organizacoes:
+            total += rebuild_rollups(organizacao_id, since=since)
+            bump_data_version(organizacao_id)
+        self.stdout.write(self.style.SUCCESS(f"Agregados do dashboard reconstruídos: {total} linhas."))
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:15
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("nucleos", "0013_nucleomidia"),
+        ("organizacoes", "0017_organizacao_cep_contato_whatsapp_remove_cover"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("membros", "Novos membros"),
+                            ("nucleados", "Novos nucleados"),
+                            ("inscricoes", "Inscrições confirmadas"),
+                            ("eventos", "Eventos"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("status", models.PositiveSmallIntegerField(blank=True, null=True)),
+                ("month", models.DateField()),
+                ("day", models.DateField()),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("value_count", models.PositiveIntegerField(default=0)),
+                ("value_sum", models.DecimalField(decimal_places=2, default=Decimal("0"), max_digits=14)),
+                ("value_sq_sum", models.FloatField(default=0.0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "nucleo",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dashboard_rollups",
+                        to="nucleos.nucleo",
+                    ),
+                ),
+                (
+                    "organizacao",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dashboard_rollups",
+                        to="organizacoes.organizacao",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Agregado do dashboard",
+                "verbose_name_plural": "Agregados do dashboard",
+                "indexes": [
+                    models.Index(fields=["organizacao", "metric", "month"], name="dash_rollup_org_metric_month"),
+                    models.Index(fields=["organizacao", "metric", "day"], name="dash_rollup_org_metric_day"),
+                ],
+            },
+        ),
+    ]
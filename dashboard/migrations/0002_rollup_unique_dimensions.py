@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:30
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def remover_duplicados(apps, schema_editor):
+    DashboardRollup = apps.get_model("dashboard", "DashboardRollup")
+    vistos = set()
+    duplicados = []
+    linhas = DashboardRollup.objects.order_by("pk").values_list(
+        "pk", "organizacao_id", "metric", "day", "nucleo_id", "status"
+    )
+    for pk, *chave in linhas.iterator():
+        chave = tuple(chave)
+        if chave in vistos:
+            duplicados.append(pk)
+        else:
+            vistos.add(chave)
+    for inicio in range(0, len(duplicados), 500):
+        DashboardRollup.objects.filter(pk__in=duplicados[inicio : inicio + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0001_initial"),
+        ("nucleos", "0013_nucleomidia"),
+        ("organizacoes", "0017_organizacao_cep_contato_whatsapp_remove_cover"),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="dashboardrollup",
+            constraint=models.UniqueConstraint(
+                models.F("organizacao"),
+                models.F("metric"),
+                models.F("day"),
+                django.db.models.functions.comparison.Coalesce("nucleo", models.Value(0)),
+                django.db.models.functions.comparison.Coalesce("status", models.Value(-1)),
+                name="dash_rollup_unique_dimensions",
+            ),
+        ),
+    ]
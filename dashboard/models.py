@@ -0,0 +1,69 @@
+"""Tabelas de agregados pré-calculados consumidas pelo dashboard."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+
+
+class DashboardRollup(models.Model):
+    """Agregado diário por organização, núcleo e métrica.
+
+    Cada linha representa um dia local de um mês (``month``) e guarda os
+    acumuladores necessários para reconstruir totais, somas e desvios padrão
+    mensais sem consultar as tabelas de origem.
+    """
+
+    class Metric(models.TextChoices):
+        MEMBROS = "membros", _("Novos membros")
+        NUCLEADOS = "nucleados", _("Novos nucleados")
+        INSCRICOES = "inscricoes", _("Inscrições confirmadas")
+        EVENTOS = "eventos", _("Eventos")
+
+    organizacao = models.ForeignKey(
+        "organizacoes.Organizacao",
+        on_delete=models.CASCADE,
+        related_name="dashboard_rollups",
+    )
+    nucleo = models.ForeignKey(
+        "nucleos.Nucleo",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="dashboard_rollups",
+    )
+    metric = models.CharField(max_length=20, choices=Metric.choices)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    month = models.DateField()
+    day = models.DateField()
+    total = models.PositiveIntegerField(default=0)
+    value_count = models.PositiveIntegerField(default=0)
+    value_sum = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    value_sq_sum = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Agregado do dashboard"
+        verbose_name_plural = "Agregados do dashboard"
+        indexes = [
+            models.Index(fields=["organizacao", "metric", "month"], name="dash_rollup_org_metric_month"),
+            models.Index(fields=["organizacao", "metric", "day"], name="dash_rollup_org_metric_day"),
+        ]
+        constraints = [
+            # ``NULL`` não conflita em índices únicos; as dimensões vazias entram com valores fixos.
+            models.UniqueConstraint(
+                F("organizacao"),
+                F("metric"),
+                F("day"),
+                Coalesce("nucleo", Value(0)),
+                Coalesce("status", Value(-1)),
+                name="dash_rollup_unique_dimensions",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - representação simples
+        return f"{self.metric} {self.day:%Y-%m-%d} ({self.total})"
@@ -0,0 +1,358 @@
+"""Manutenção incremental dos agregados consumidos pelo dashboard.
+
+Os agregados ficam em :class:`dashboard.models.DashboardRollup`, com uma linha
+por organização, métrica, dia local e dimensões (núcleo/status). Sinais de
+modelo marcam os dias afetados por cada alteração e a recomputação acontece
+apenas para esses dias; ``rebuild_rollups`` refaz o histórico completo.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, ExpressionWrapper, F, FloatField, QuerySet, StdDev, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from eventos.models import Evento, InscricaoEvento
+from nucleos.models import ParticipacaoNucleo
+
+from .models import DashboardRollup
+
+User = get_user_model()
+
+Metric = DashboardRollup.Metric
+
+RollupKey = tuple[str, Any, date]
+
+
+@dataclass(frozen=True)
+class _RollupSource:
+    """Descreve como extrair uma métrica das tabelas de origem."""
+
+    date_field: str
+    organizacao_field: str
+    nucleo_field: str | None = None
+    status_field: str | None = None
+    value_field: str | None = None
+
+
+_SOURCES: dict[str, _RollupSource] = {
+    Metric.MEMBROS: _RollupSource(
+        date_field="date_joined",
+        organizacao_field="organizacao_id",
+    ),
+    Metric.NUCLEADOS: _RollupSource(
+        date_field="created_at",
+        organizacao_field="nucleo__organizacao_id",
+        nucleo_field="nucleo_id",
+    ),
+    Metric.INSCRICOES: _RollupSource(
+        date_field="data_confirmacao",
+        organizacao_field="evento__organizacao_id",
+        nucleo_field="evento__nucleo_id",
+        value_field="valor_pago",
+    ),
+    Metric.EVENTOS: _RollupSource(
+        date_field="data_inicio",
+        organizacao_field="organizacao_id",
+        nucleo_field="nucleo_id",
+        status_field="status",
+    ),
+}
+
+
+def _source_queryset(metric: str, organizacao_id: Any) -> QuerySet:
+    """Retorna o queryset de origem já restrito às regras de cada métrica."""
+
+    if metric == Metric.MEMBROS:
+        return User.objects.filter(
+            organizacao_id=organizacao_id,
+            is_associado=True,
+            date_joined__isnull=False,
+        )
+    if metric == Metric.NUCLEADOS:
+        return ParticipacaoNucleo.objects.filter(
+            nucleo__organizacao_id=organizacao_id,
+            status="ativo",
+        )
+    if metric == Metric.INSCRICOES:
+        return InscricaoEvento.objects.filter(
+            evento__organizacao_id=organizacao_id,
+            status="confirmada",
+            data_confirmacao__isnull=False,
+        )
+    if metric == Metric.EVENTOS:
+        return Evento.objects.filter(
+            organizacao_id=organizacao_id,
+            data_inicio__isnull=False,
+        )
+    raise ValueError(f"Métrica de dashboard desconhecida: {metric}")
+
+
+def local_day(moment: datetime) -> date:
+    """Converte ``moment`` para a data no timezone configurado."""
+
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return timezone.localtime(moment).date()
+
+
+def _day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _collect_rows(
+    metric: str,
+    organizacao_id: Any,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[DashboardRollup]:
+    """Agrupa a origem por dia/dimensões e devolve linhas prontas para gravação."""
+
+    source = _SOURCES[metric]
+    queryset = _source_queryset(metric, organizacao_id)
+    if start is not None:
+        queryset = queryset.filter(**{f"{source.date_field}__gte": _day_start(start)})
+    if end is not None:
+        queryset = queryset.filter(**{f"{source.date_field}__lt": _day_start(end)})
+
+    group_fields = ["rollup_day"]
+    if source.nucleo_field:
+        group_fields.append(source.nucleo_field)
+    if source.status_field:
+        group_fields.append(source.status_field)
+
+    aggregates: dict[str, Any] = {"total": Count("pk")}
+    if source.value_field:
+        aggregates.update(
+            value_count=Count(source.value_field),
+            value_sum=Sum(source.value_field),
+            value_sq_sum=Sum(
+                ExpressionWrapper(
+                    F(source.value_field) * F(source.value_field),
+                    output_field=FloatField(),
+                )
+            ),
+        )
+
+    grouped = (
+        queryset.annotate(rollup_day=TruncDate(source.date_field))
+        .values(*group_fields)
+        .annotate(**aggregates)
+        .order_by()
+    )
+
+    rows: list[DashboardRollup] = []
+    for item in grouped:
+        day = item["rollup_day"]
+        if not day:
+            continue
+        rows.append(
+            DashboardRollup(
+                organizacao_id=organizacao_id,
+                nucleo_id=item.get(source.nucleo_field) if source.nucleo_field else None,
+                metric=metric,
+                status=item.get(source.status_field) if source.status_field else None,
+                month=day.replace(day=1),
+                day=day,
+                total=int(item["total"] or 0),
+                value_count=int(item.get("value_count") or 0),
+                value_sum=Decimal(item.get("value_sum") or 0),
+                value_sq_sum=float(item.get("value_sq_sum") or 0.0),
+            )
+        )
+    return rows
+
+
+def _replace_day(metric: str, organizacao_id: Any, day: date) -> None:
+    rows = _collect_rows(metric, organizacao_id, start=day, end=day + timedelta(days=1))
+    with transaction.atomic():
+        DashboardRollup.objects.filter(
+            organizacao_id=organizacao_id,
+            metric=metric,
+            day=day,
+        ).delete()
+        DashboardRollup.objects.bulk_create(rows)
+
+
+def refresh_days(metric: str, organizacao_id: Any, days: Iterable[date]) -> None:
+    """Recalcula os agregados de ``metric`` apenas para os dias informados."""
+
+    if not organizacao_id:
+        return
+    for day in sorted(set(days)):
+        try:
+            _replace_day(metric, organizacao_id, day)
+        except IntegrityError:
+            # Outro refresh gravou o mesmo dia em paralelo; recalcula sobre o que ele confirmou.
+            _replace_day(metric, organizacao_id, day)
+
+
+def refresh_keys(keys: Iterable[RollupKey]) -> None:
+    """Agrupa chaves ``(métrica, organização, dia)`` e recalcula cada grupo."""
+
+    grouped: dict[tuple[str, Any], set[date]] = {}
+    for metric, organizacao_id, day in keys:
+        if not organizacao_id or day is None:
+            continue
+        grouped.setdefault((metric, organizacao_id), set()).add(day)
+    for (metric, organizacao_id), days in grouped.items():
+        refresh_days(metric, organizacao_id, days)
+
+
+def rebuild_rollups(
+    organizacao_id: Any,
+    *,
+    metrics: Iterable[str] | None = None,
+    since: date | None = None,
+) -> int:
+    """Reconstrói os agregados da organização a partir das tabelas de origem.
+
+    Quando ``since`` é informado, apenas os dias a partir dessa data são
+    substituídos. Retorna a quantidade de linhas gravadas.
+    """
+
+    written = 0
+    for metric in metrics or Metric.values:
+        rows = _collect_rows(metric, organizacao_id, start=since)
+        with transaction.atomic():
+            stale = DashboardRollup.objects.filter(organizacao_id=organizacao_id, metric=metric)
+            if since is not None:
+                stale = stale.filter(day__gte=since)
+            stale.delete()
+            DashboardRollup.objects.bulk_create(rows, batch_size=500)
+        written += len(rows)
+    return written
+
+
+def _filtered_rollups(
+    metric: str,
+    organizacao_id: Any,
+    *,
+    start_month: date,
+    nucleo_ids: list[Any] | None = None,
+    statuses: Iterable[Any] | None = None,
+) -> QuerySet:
+    queryset = DashboardRollup.objects.filter(
+        organizacao_id=organizacao_id,
+        metric=metric,
+        month__gte=start_month,
+    )
+    if nucleo_ids:
+        queryset = queryset.filter(nucleo_id__in=nucleo_ids)
+    if statuses:
+        queryset = queryset.filter(status__in=list(statuses))
+    return queryset
+
+
+def monthly_count_stats(
+    metric: str,
+    organizacao_id: Any,
+    *,
+    start_month: date,
+    nucleo_ids: list[Any] | None = None,
+    statuses: Iterable[Any] | None = None,
+    include_std: bool = False,
+) -> dict[date, tuple[int, float]]:
+    """Total mensal e desvio padrão populacional dos totais diários.
+
+    Retorna ``{mês: (total, desvio)}``. Quando a métrica tem uma única linha
+    por dia, soma e desvio são calculados pelo banco (``StdDev``); com
+    dimensões de núcleo/status, os totais diários são combinados com NumPy
+    sobre uma única leitura das linhas.
+    """
+
+    queryset = _filtered_rollups(
+        metric,
+        organizacao_id,
+        start_month=start_month,
+        nucleo_ids=nucleo_ids,
+        statuses=statuses,
+    )
+    source = _SOURCES[metric]
+    if not include_std or not (source.nucleo_field or source.status_field):
+        aggregates: dict[str, Any] = {"month_total": Sum("total")}
+        if include_std:
+            aggregates["month_std"] = StdDev("total")
+        rows = queryset.values("month").annotate(**aggregates).order_by()
+        return {
+            row["month"]: (
+                int(row["month_total"] or 0),
+                round(float(row.get("month_std") or 0.0), 2),
+            )
+            for row in rows
+        }
+    return _daily_stats(queryset.values_list("month", "day", "total").order_by())
+
+
+def _daily_stats(rows: Iterable[tuple[date, date, int]]) -> dict[date, tuple[int, float]]:
+    """Soma as linhas por dia e calcula total e desvio padrão por mês."""
+
+    fetched = list(rows)
+    if not fetched:
+        return {}
+
+    import numpy as np
+
+    months = np.fromiter((row[0].toordinal() for row in fetched), dtype=np.int64, count=len(fetched))
+    days = np.fromiter((row[1].toordinal() for row in fetched), dtype=np.int64, count=len(fetched))
+    totals = np.fromiter((row[2] for row in fetched), dtype=np.float64, count=len(fetched))
+
+    day_keys, first_index, day_index = np.unique(days, return_index=True, return_inverse=True)
+    day_totals = np.bincount(day_index, weights=totals, minlength=len(day_keys))
+
+    month_keys, month_index = np.unique(months[first_index], return_inverse=True)
+    counts = np.bincount(month_index, minlength=len(month_keys))
+    sums = np.bincount(month_index, weights=day_totals, minlength=len(month_keys))
+    deviations = day_totals - (sums / counts)[month_index]
+    std = np.sqrt(np.bincount(month_index, weights=deviations * deviations, minlength=len(month_keys)) / counts)
+
+    return {
+        date.fromordinal(int(month)): (int(total), round(float(value), 2) if count > 1 else 0.0)
+        for month, total, value, count in zip(month_keys, sums, std, counts)
+    }
+
+
+def monthly_value_moments(
+    metric: str,
+    organizacao_id: Any,
+    *,
+    start_month: date,
+    nucleo_ids: list[Any] | None = None,
+) -> QuerySet:
+    """Contagem, soma e soma dos quadrados dos valores agrupados por mês."""
+
+    return (
+        _filtered_rollups(
+            metric,
+            organizacao_id,
+            start_month=start_month,
+            nucleo_ids=nucleo_ids,
+        )
+        .values("month")
+        .annotate(
+            n=Sum("value_count"),
+            value_total=Sum("value_sum"),
+            value_sq_total=Sum("value_sq_sum"),
+        )
+        .order_by()
+    )
+
+
+def std_from_moments(count: int, total: float, sq_total: float) -> float:
+    """Desvio padrão populacional a partir de contagem, soma e soma dos quadrados."""
+
+    if count <= 1:
+        return 0.0
+    mean = total / count
+    variance = max(sq_total / count - mean * mean, 0.0)
+    return round(math.sqrt(variance), 2)
@@ -0,0 +1,158 @@
+"""Sinais que mantêm os agregados do dashboard atualizados incrementalmente."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from eventos.models import Evento, InscricaoEvento
+from nucleos.models import Nucleo, ParticipacaoNucleo
+
+from .models import DashboardRollup
+from .rollups import local_day
+from .widgets import bump_data_version
+
+User = get_user_model()
+
+Metric = DashboardRollup.Metric
+
+_USER_ROLLUP_FIELDS = {"organizacao", "organizacao_id", "is_associado", "date_joined", "deleted"}
+
+
+def _key(metric: str, organizacao_id: Any, moment) -> tuple[str, Any, str] | None:
+    if not organizacao_id or not moment:
+        return None
+    return (str(metric), str(organizacao_id), local_day(moment).isoformat())
+
+
+def _instance_keys(instance) -> set[tuple[str, Any, str]]:
+    """Chaves ``(métrica, organização, dia)`` afetadas pelo estado atual."""
+
+    keys: set[tuple[str, Any, str] | None] = set()
+    if isinstance(instance, InscricaoEvento):
+        if InscricaoEvento.evento.is_cached(instance):
+            organizacao_id = instance.evento.organizacao_id
+        else:
+            organizacao_id = (
+                Evento.all_objects.filter(pk=instance.evento_id).values_list("organizacao_id", flat=True).first()
+            )
+        keys.add(_key(Metric.INSCRICOES, organizacao_id, instance.data_confirmacao))
+    elif isinstance(instance, Evento):
+        keys.add(_key(Metric.EVENTOS, instance.organizacao_id, instance.data_inicio))
+    elif isinstance(instance, ParticipacaoNucleo):
+        organizacao_id = instance.nucleo.organizacao_id if instance.nucleo_id else None
+        keys.add(_key(Metric.NUCLEADOS, organizacao_id, instance.created_at))
+    elif isinstance(instance, User):
+        keys.add(_key(Metric.MEMBROS, instance.organizacao_id, instance.date_joined))
+    keys.discard(None)
+    return keys  # type: ignore[return-value]
+
+
+# Campos que definem as chaves de cada modelo; todos em ``tracked_fields``.
+_ROLLUP_FIELDS = {
+    InscricaoEvento: ("evento", "data_confirmacao"),
+    Evento: ("organizacao", "nucleo", "data_inicio"),
+    ParticipacaoNucleo: ("nucleo", "created_at"),
+    User: ("organizacao", "date_joined"),
+}
+
+
+def _previous(instance, field: str) -> Any:
+    # Campo adiado e não atribuído: o valor persistido é o atual.
+    value = instance.previous_value(field)
+    return getattr(instance, instance._meta.get_field(field).attname) if value is None else value
+
+
+def _stored_keys(sender, instance) -> set[tuple[str, Any, str]]:
+    """Chaves do estado persistido, para limpar o dia antigo após mudanças.
+
+    Usa os valores carregados do banco (``FieldTrackerMixin``): se nenhum campo
+    das chaves mudou, o dia antigo coincide com o atual e não há o que limpar.
+    Só consulta a organização anterior quando o evento ou o núcleo foi trocado.
+    """
+
+    keys: set[tuple[str, Any, str] | None] = set()
+    if not any(instance.has_changed(field) for field in _ROLLUP_FIELDS[sender]):
+        return set()
+    if sender is InscricaoEvento:
+        evento_id = _previous(instance, "evento")
+        if evento_id == instance.evento_id and InscricaoEvento.evento.is_cached(instance):
+            organizacao_id = instance.evento.organizacao_id
+        else:
+            organizacao_id = Evento.all_objects.filter(pk=evento_id).values_list("organizacao_id", flat=True).first()
+        keys.add(_key(Metric.INSCRICOES, organizacao_id, _previous(instance, "data_confirmacao")))
+    elif sender is Evento:
+        organizacao_id = _previous(instance, "organizacao")
+        keys.add(_key(Metric.EVENTOS, organizacao_id, _previous(instance, "data_inicio")))
+        instance._dashboard_previous_dimensions = (organizacao_id, _previous(instance, "nucleo"))
+    elif sender is ParticipacaoNucleo:
+        nucleo_id = _previous(instance, "nucleo")
+        if nucleo_id == instance.nucleo_id:
+            organizacao_id = instance.nucleo.organizacao_id
+        else:
+            organizacao_id = Nucleo.all_objects.filter(pk=nucleo_id).values_list("organizacao_id", flat=True).first()
+        keys.add(_key(Metric.NUCLEADOS, organizacao_id, _previous(instance, "created_at")))
+    elif sender is User:
+        keys.add(_key(Metric.MEMBROS, _previous(instance, "organizacao"), _previous(instance, "date_joined")))
+    keys.discard(None)
+    return keys  # type: ignore[return-value]
+
+
+def _schedule(keys: set[tuple[str, Any, str]], *, eventos: list[list[Any]] | None = None) -> None:
+    if not keys and not eventos:
+        return
+    from .tasks import atualizar_rollups_dashboard
+
+    payload = [list(key) for key in sorted(keys)]
+    transaction.on_commit(lambda: atualizar_rollups_dashboard.delay(payload, eventos or []))
+
+
+@receiver(pre_save, sender=InscricaoEvento)
+@receiver(pre_save, sender=Evento)
+@receiver(pre_save, sender=ParticipacaoNucleo)
+@receiver(pre_save, sender=User)
+def capture_rollup_keys(sender, instance, update_fields=None, **kwargs):
+    if not instance.pk or kwargs.get("raw"):
+        return
+    if sender is User and update_fields is not None and not (set(update_fields) & _USER_ROLLUP_FIELDS):
+        return
+    instance._dashboard_rollup_keys = _stored_keys(sender, instance)
+
+
+@receiver(post_save, sender=InscricaoEvento)
+@receiver(post_save, sender=Evento)
+@receiver(post_save, sender=ParticipacaoNucleo)
+@receiver(post_save, sender=User)
+def schedule_rollup_refresh(sender, instance, created=False, update_fields=None, **kwargs):
+    if kwargs.get("raw"):
+        return
+    if sender is User and update_fields is not None and not (set(update_fields) & _USER_ROLLUP_FIELDS):
+        return
+    keys = _instance_keys(instance) | getattr(instance, "_dashboard_rollup_keys", set())
+    instance._dashboard_rollup_keys = set()
+
+    eventos: list[list[Any]] = []
+    previous = getattr(instance, "_dashboard_previous_dimensions", None)
+    if sender is Evento and previous and previous != (instance.organizacao_id, instance.nucleo_id):
+        eventos.append([str(instance.pk), str(previous[0]) if previous[0] else None])
+        instance._dashboard_previous_dimensions = None
+    _schedule(keys, eventos=eventos)
+
+
+@receiver(post_delete, sender=InscricaoEvento)
+@receiver(post_delete, sender=Evento)
+@receiver(post_delete, sender=ParticipacaoNucleo)
+@receiver(post_delete, sender=User)
+def schedule_rollup_refresh_on_delete(sender, instance, **kwargs):
+    _schedule(_instance_keys(instance))
+
+
+@receiver(post_save, sender=Nucleo)
+@receiver(post_delete, sender=Nucleo)
+def invalidate_dashboard_widgets(sender, instance, **kwargs):
+    organizacao_id = instance.organizacao_id
+    transaction.on_commit(lambda: bump_data_version(organizacao_id))
@@ -139,11 +139,24 @@
         }
       });
 
-      renderPlotlyChart("membros-chart", "membros-chart-data");
-      renderPlotlyChart("eventos-nucleo-chart", "eventos-nucleo-chart-data");
-      renderPlotlyChart("membros-periodo-chart", "membros-periodo-chart-data");
-      renderPlotlyChart("valores-inscricoes-periodo-chart", "valores-inscricoes-periodo-chart-data");
-      renderPlotlyChart("inscricoes-periodo-chart", "inscricoes-periodo-chart-data");
-      renderPlotlyChart("nucleados-periodo-chart", "nucleados-periodo-chart-data");
+      function renderChartsWithin(root) {
+        if (!root || typeof root.querySelectorAll !== "function") {
+          return;
+        }
+        const containers = root.matches?.("[data-dashboard-chart]")
+          ? [root]
+          : root.querySelectorAll("[data-dashboard-chart]");
+        containers.forEach((container) => {
+          if (chartsRegistry.has(container.id)) {
+            return;
+          }
+          renderPlotlyChart(container.id, container.dataset.dashboardChart);
+        });
+      }
+
+      renderChartsWithin(document);
+      document.body?.addEventListener("htmx:load", (event) => {
+        renderChartsWithin(event.detail?.elt);
+      });
     });
   
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Any
+
+from celery import shared_task
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from eventos.models import Evento, InscricaoEvento
+from organizacoes.models import Organizacao
+
+from .models import DashboardRollup
+from .rollups import rebuild_rollups, refresh_days, refresh_keys
+from .widgets import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def atualizar_rollups_dashboard(chaves: list[list[Any]], eventos: list[list[Any]] | None = None) -> None:
+    """Recalcula os dias afetados por alterações nos modelos de origem.
+
+    ``chaves`` contém triplas ``[métrica, organização, dia ISO]``. ``eventos``
+    lista ``[evento, organização anterior]`` para eventos que mudaram de núcleo
+    ou organização, cujas inscrições precisam ser redistribuídas.
+    """
+
+    refresh_keys((metric, organizacao_id, date.fromisoformat(day)) for metric, organizacao_id, day in chaves)
+    organizacoes = {organizacao_id for _metric, organizacao_id, _day in chaves}
+
+    for evento_id, organizacao_anterior in eventos or []:
+        organizacao_atual = Evento.all_objects.filter(pk=evento_id).values_list("organizacao_id", flat=True).first()
+        dias = set(
+            InscricaoEvento.objects.filter(evento_id=evento_id, data_confirmacao__isnull=False)
+            .annotate(dia=TruncDate("data_confirmacao"))
+            .values_list("dia", flat=True)
+            .distinct()
+        )
+        for organizacao_id in {organizacao_atual, organizacao_anterior} - {None}:
+            refresh_days(DashboardRollup.Metric.INSCRICOES, organizacao_id, dias)
+            organizacoes.add(str(organizacao_id))
+
+    for organizacao_id in organizacoes:
+        bump_data_version(organizacao_id)
+
+
+@shared_task
+def reconciliar_rollups_dashboard(dias: int = 45) -> int:
+    """Refaz a janela recente dos agregados para corrigir alterações sem sinais."""
+
+    inicio = timezone.localdate() - timedelta(days=dias)
+    total = 0
+    for organizacao_id in Organizacao.objects.values_list("id", flat=True):
+        total += rebuild_rollups(organizacao_id, since=inicio)
+        bump_data_version(organizacao_id)
+    logger.info("rollups_dashboard_reconciliados", extra={"linhas": total, "desde": inicio.isoformat()})
+    return total
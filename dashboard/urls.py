@@ -2,10 +2,11 @@ from django.urls import path
 
 from .views import (
     AdminDashboardView,
-    MembroDashboardView,
+    AdminDashboardWidgetView,
     ConsultorDashboardView,
     CoordenadorDashboardView,
     DashboardRouterView,
+    MembroDashboardView,
 )
 
 app_name = "dashboard"
@@ -14,6 +15,7 @@ urlpatterns = [
     path("", DashboardRouterView.as_view(), name="admin_dashboard"),
     path("membro/", MembroDashboardView.as_view(), name="membro_dashboard"),
     path("admin/", AdminDashboardView.as_view(), name="admin_dashboard_admin"),
+    path("admin/widgets/<slug:widget>/", AdminDashboardWidgetView.as_view(), name="admin_widget"),
     path("coordenador/", CoordenadorDashboardView.as_view(), name="coordenador_dashboard"),
     path("consultor/", ConsultorDashboardView.as_view(), name="consultor_dashboard"),
 ]
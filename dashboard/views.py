@@ -1,42 +1,44 @@
+import json
 from copy import deepcopy
 from decimal import Decimal
-import json
 from itertools import zip_longest
 from typing import Any, Dict
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Avg, Count, Q, Sum
+from django.db.models import Count, Q, Sum
+from django.http import Http404, HttpResponse
 from django.utils import timezone
 from django.utils.formats import number_format
 from django.utils.translation import gettext as _
 from django.views import View
 from django.views.generic import TemplateView
 
+from accounts.models import UserType
 from core.permissions import AdminOrOperatorRequiredMixin
-
-from eventos.models import Evento
-from eventos.models import InscricaoEvento
-
-from accounts.models import PerfilFeedback, UserType
+from eventos.models import Evento, InscricaoEvento
 from feed.models import Bookmark
 from nucleos.models import Nucleo
 
+from .charts import build_time_series_chart
+from .engine import (
+    ACTIVE_EVENT_STATUSES,
+    EVENT_STATUS_WIDGET,
+    MEMBER_WIDGET,
+    REGISTRATIONS_WIDGET,
+    DashboardMetrics,
+    MetricScope,
+    MetricsEngine,
+    Series,
+)
 from .services import (
-    MEMBROS_NUCLEADOS_LABEL,
-    build_chart_payload,
-    build_time_series_chart,
-    calculate_event_status_totals,
-    calculate_events_by_nucleo,
-    calculate_membership_totals,
-    calculate_monthly_membros,
-    calculate_monthly_events,
     calculate_monthly_event_registrations,
+    calculate_monthly_events,
     calculate_monthly_nucleados,
     calculate_monthly_registration_values,
-    count_confirmed_event_registrations,
 )
+from .widgets import ADMIN_WIDGETS, WidgetScope, render_widget
 
 
 class AdminDashboardView(LoginRequiredMixin, AdminOrOperatorRequiredMixin, TemplateView):
@@ -45,8 +47,12 @@ class AdminDashboardView(LoginRequiredMixin, AdminOrOperatorRequiredMixin, Templ
     template_name = "dashboard/admin_dashboard.html"
     DEFAULT_MONTHS = 12
     PERIOD_CHOICES: tuple[int, ...] = (3, 6, 12, 24)
-    NUCLEO_LIST_LIMIT = 9
-    EVENT_LIST_LIMIT = 9
+    SERIES_WIDGETS: tuple[str, ...] = (
+        "membros_periodo",
+        "valores_inscricoes_periodo",
+        "inscricoes_periodo",
+        "nucleados_periodo",
+    )
 
     def _resolve_months(self) -> int:
         """Obtém o número de meses válido informado via query string."""
@@ -66,134 +72,34 @@ class AdminDashboardView(LoginRequiredMixin, AdminOrOperatorRequiredMixin, Templ
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        organizacao = getattr(self.request.user, "organizacao", None)
-        months = self._resolve_months()
-
-        membership_totals = calculate_membership_totals(organizacao)
-        event_totals = calculate_event_status_totals(organizacao)
-        confirmed_registrations = count_confirmed_event_registrations(organizacao)
-        eventos_por_nucleo = calculate_events_by_nucleo(organizacao)
-        eventos_chart = build_chart_payload(event_totals)
-        membros_chart = build_chart_payload(membership_totals)
-        eventos_por_nucleo_chart = build_chart_payload(
-            eventos_por_nucleo, chart_type="bar"
-        )
-
-        monthly_membros = calculate_monthly_membros(organizacao, months=months)
-        monthly_nucleados = calculate_monthly_nucleados(organizacao, months=months)
-        monthly_registrations = calculate_monthly_event_registrations(
-            organizacao, months=months
-        )
-        monthly_registration_values = calculate_monthly_registration_values(
-            organizacao, months=months
-        )
-
-        nucleos_list = (
-            list(
-                Nucleo.objects.filter(organizacao=organizacao)
-                .annotate(
-                    total_membros=Count(
-                        "participacoes",
-                        filter=Q(
-                            participacoes__status="ativo",
-                            participacoes__status_suspensao=False,
-                        ),
-                        distinct=True,
-                    )
-                )
-                .order_by("nome")[: self.NUCLEO_LIST_LIMIT]
-            )
-            if organizacao
-            else []
-        )
-
-        eventos_list = (
-            list(
-                Evento.objects.filter(
-                    organizacao=organizacao,
-                    status__in=[Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO],
-                )
-                .select_related("nucleo")
-                .annotate(
-                    total_inscritos=Count(
-                        "inscricoes",
-                        filter=Q(inscricoes__status="confirmada"),
-                        distinct=True,
-                    ),
-                    valor_total_inscricoes=Sum(
-                        "inscricoes__valor_pago",
-                        filter=Q(inscricoes__status="confirmada"),
-                    ),
-                )
-                .order_by("-data_inicio")[: self.EVENT_LIST_LIMIT]
-            )
-            if organizacao
-            else []
-        )
-
-        membros_por_periodo_chart = build_time_series_chart(
-            monthly_membros,
-            value_field="total",
-            std_field="std_dev",
-            label=_("Membros"),
-            color="#2563eb",
-            value_format=".0f",
-        )
-        nucleados_por_periodo_chart = build_time_series_chart(
-            monthly_nucleados,
-            value_field="total",
-            std_field="std_dev",
-            label=_("Nucleados"),
-            color="#0ea5e9",
-            value_format=".0f",
-        )
-        inscricoes_por_periodo_chart = build_time_series_chart(
-            monthly_registrations,
-            value_field="total",
-            label=_("Inscrições confirmadas"),
-            color="#7c3aed",
-            value_format=".0f",
-        )
-        valores_inscricoes_por_periodo_chart = build_time_series_chart(
-            monthly_registration_values,
-            value_field="total",
-            std_field="std_dev",
-            label=_("Valor total das inscrições"),
-            color="#22c55e",
-            value_format=".2f",
-            value_prefix="R$ ",
-            yaxis_tickprefix="R$ ",
-        )
-
         context.update(
             {
-                "total_membros": sum(membership_totals.values()),
-                "total_nucleados": membership_totals.get(
-                    MEMBROS_NUCLEADOS_LABEL, 0
-                ),
-                "inscricoes_confirmadas": confirmed_registrations,
-                "eventos_por_status": event_totals,
-                "eventos_ativos": event_totals.get(Evento.Status.ATIVO.label, 0),
-                "eventos_concluidos": event_totals.get(Evento.Status.CONCLUIDO.label, 0),
-                "eventos_planejamento": event_totals.get(Evento.Status.PLANEJAMENTO.label, 0),
-                "eventos_chart": eventos_chart,
-                "eventos_por_nucleo": eventos_por_nucleo_chart,
-                "membros_chart": membros_chart,
-                "membros_por_periodo_chart": membros_por_periodo_chart,
-                "nucleados_por_periodo_chart": nucleados_por_periodo_chart,
-                "inscricoes_por_periodo_chart": inscricoes_por_periodo_chart,
-                "valores_inscricoes_por_periodo_chart": valores_inscricoes_por_periodo_chart,
-                "total_eventos": eventos_chart.get("total", 0),
-                "dashboard_period_months": months,
+                "dashboard_series_widgets": self.SERIES_WIDGETS,
+                "dashboard_period_months": self._resolve_months(),
                 "dashboard_period_choices": self.PERIOD_CHOICES,
                 "dashboard_period_changed": "months" in self.request.GET,
-                "nucleos": nucleos_list,
-                "eventos": eventos_list,
             }
         )
         return context
 
 
+class AdminDashboardWidgetView(AdminDashboardView):
+    """Entrega um widget do painel administrativo para carregamento via htmx."""
+
+    def get(self, request, *args, **kwargs):
+        widget = ADMIN_WIDGETS.get(kwargs.get("widget", ""))
+        if widget is None:
+            raise Http404
+        scope = WidgetScope(
+            organizacao_id=getattr(request.user, "organizacao_id", None),
+            months=self._resolve_months(),
+        )
+        rendered = render_widget(widget, scope)
+        response = HttpResponse(rendered.html)
+        response["Server-Timing"] = rendered.server_timing(widget.name)
+        return response
+
+
 class MembroDashboardView(LoginRequiredMixin, TemplateView):
     """Dashboard direcionado a membros que não são coordenadores."""
 
@@ -211,41 +117,27 @@ class MembroDashboardView(LoginRequiredMixin, TemplateView):
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        user = self.request.user
-
-        avaliacao_stats = PerfilFeedback.objects.filter(avaliado=user).aggregate(
-            media=Avg("nota"), total=Count("id")
-        )
-        avaliacao_media = avaliacao_stats["media"]
-        avaliacao_display = (
-            f"{avaliacao_media:.1f}" if avaliacao_media is not None else ""
+    def _conexoes(self, scope: MetricScope) -> list[Any]:
+        return list(
+            self.request.user.connections.select_related("organizacao").order_by(
+                "nome_fantasia", "contato", "username"
+            )[: self.CONNECTION_LIMIT]
         )
 
-        total_conexoes = user.connections.count() if hasattr(user, "connections") else 0
-        conexoes = list(
-            user.connections.select_related("organizacao")
-            .order_by("nome_fantasia", "contato", "username")[: self.CONNECTION_LIMIT]
-        )
-        conexoes_restantes = max(total_conexoes - len(conexoes), 0)
-
-        total_posts = user.posts.filter(deleted=False).count()
-        total_reacoes = user.reacoes.filter(deleted=False).count()
-
-        participacoes = list(
-            user.participacoes.select_related("nucleo")
+    def _participacoes(self, scope: MetricScope) -> list[Any]:
+        return list(
+            self.request.user.participacoes.select_related("nucleo")
             .filter(status="ativo", status_suspensao=False, papel="membro")
             .order_by("nucleo__nome")
         )
 
-        now = timezone.now()
+    def _inscricoes_ativas(self, scope: MetricScope) -> list[InscricaoEvento]:
         inscricoes_qs = (
-            InscricaoEvento.objects.filter(user=user)
+            InscricaoEvento.objects.filter(user_id=scope.user_id)
             .filter(Q(status__in=["confirmada", "pendente"]) | Q(presente=True))
             .filter(evento__status__in=[Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO])
-            .filter(evento__data_fim__gte=now)
-            .select_related("evento")
+            .filter(evento__data_fim__gte=timezone.now())
+            .select_related("evento", "user")
             .order_by("-evento__data_inicio", "-created_at")
         )
         inscricoes_ativas = list(inscricoes_qs[: self.EVENT_LIMIT])
@@ -254,26 +146,47 @@ class MembroDashboardView(LoginRequiredMixin, TemplateView):
             if valor_exibicao is None:
                 valor_exibicao = inscricao.get_valor_evento()
             inscricao.valor_exibicao = valor_exibicao
+        return inscricoes_ativas
 
-        favoritos = list(
-            Bookmark.objects.filter(user=user, post__isnull=False)
+    def _favoritos(self, scope: MetricScope) -> list[Bookmark]:
+        return list(
+            Bookmark.objects.filter(user_id=scope.user_id, post__isnull=False)
             .select_related("post", "post__autor")
             .order_by("-created_at")[: self.FAVORITES_LIMIT]
         )
 
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        user = self.request.user
+
+        metrics = MetricsEngine(getattr(user, "organizacao", None), user=user).run(
+            [
+                MEMBER_WIDGET,
+                Series("conexoes", self._conexoes, default=[]),
+                Series("participacoes", self._participacoes, default=[]),
+                Series("inscricoes_ativas", self._inscricoes_ativas, default=[]),
+                Series("favoritos", self._favoritos, default=[]),
+            ]
+        )
+
+        avaliacao_media = metrics["avaliacao_media"]
+        avaliacao_display = f"{avaliacao_media:.1f}" if avaliacao_media is not None else ""
+        total_conexoes = int(metrics["total_conexoes"] or 0)
+        conexoes = metrics["conexoes"]
+
         context.update(
             {
                 "avaliacao_media": avaliacao_media,
                 "avaliacao_display": avaliacao_display,
-                "avaliacao_total": avaliacao_stats["total"],
+                "avaliacao_total": metrics["avaliacao_total"],
                 "total_conexoes": total_conexoes,
                 "conexoes": conexoes,
-                "conexoes_restantes": conexoes_restantes,
-                "total_posts": total_posts,
-                "total_reacoes": total_reacoes,
-                "participacoes": participacoes,
-                "inscricoes_ativas": inscricoes_ativas,
-                "favoritos": favoritos,
+                "conexoes_restantes": max(total_conexoes - len(conexoes), 0),
+                "total_posts": metrics["total_posts"],
+                "total_reacoes": metrics["total_reacoes"],
+                "participacoes": metrics["participacoes"],
+                "inscricoes_ativas": metrics["inscricoes_ativas"],
+                "favoritos": metrics["favoritos"],
             }
         )
         return context
@@ -355,6 +268,37 @@ class RoleDashboardMixin(LoginRequiredMixin):
 
         return {"points": combined_points, "figure": figure, "type": "line"}
 
+    def _collect_nucleo_metrics(self, organizacao: Any, nucleo_ids: list[Any], months: int) -> DashboardMetrics:
+        """Executa em lote as métricas dos dashboards restritos a núcleos."""
+
+        monthly_kwargs = {"months": months, "nucleo_ids": nucleo_ids}
+        return MetricsEngine(organizacao, nucleo_ids=nucleo_ids).run(
+            [
+                EVENT_STATUS_WIDGET,
+                REGISTRATIONS_WIDGET,
+                Series(
+                    "monthly_events",
+                    lambda scope: calculate_monthly_events(
+                        scope.organizacao_id,
+                        statuses=ACTIVE_EVENT_STATUSES,
+                        **monthly_kwargs,
+                    ),
+                ),
+                Series(
+                    "monthly_registrations",
+                    lambda scope: calculate_monthly_event_registrations(scope.organizacao_id, **monthly_kwargs),
+                ),
+                Series(
+                    "monthly_nucleados",
+                    lambda scope: calculate_monthly_nucleados(scope.organizacao_id, **monthly_kwargs),
+                ),
+                Series(
+                    "monthly_registration_values",
+                    lambda scope: calculate_monthly_registration_values(scope.organizacao_id, **monthly_kwargs),
+                ),
+            ]
+        )
+
     def _serialize_chart(self, payload: dict[str, Any]) -> str:
         return json.dumps(payload.get("figure", {}), cls=DjangoJSONEncoder)
 
@@ -424,31 +368,13 @@ class CoordenadorDashboardView(RoleDashboardMixin, TemplateView):
             else []
         )
 
-        inscricoes_qs = (
-            InscricaoEvento.objects.filter(
-                evento__organizacao=organizacao,
-                evento__nucleo_id__in=nucleo_ids,
-                status="confirmada",
-            )
-            if nucleo_ids
-            else InscricaoEvento.objects.none()
-        )
-        total_inscritos = inscricoes_qs.count()
-        valor_total_inscricoes = inscricoes_qs.aggregate(total=Sum("valor_pago"))["total"]
-
-        monthly_kwargs = {"months": months, "nucleo_ids": nucleo_ids}
-        monthly_events = calculate_monthly_events(
-            organizacao,
-            statuses=[Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO],
-            **monthly_kwargs,
-        )
-        monthly_registrations = calculate_monthly_event_registrations(
-            organizacao, **monthly_kwargs
-        )
-        monthly_nucleados = calculate_monthly_nucleados(organizacao, **monthly_kwargs)
-        monthly_registration_values = calculate_monthly_registration_values(
-            organizacao, **monthly_kwargs
-        )
+        metrics = self._collect_nucleo_metrics(organizacao, nucleo_ids, months)
+        total_inscritos = metrics["inscricoes_confirmadas"]
+        valor_total_inscricoes = metrics["valor_inscricoes_confirmadas"]
+        monthly_events = metrics["monthly_events"]
+        monthly_registrations = metrics["monthly_registrations"]
+        monthly_nucleados = metrics["monthly_nucleados"]
+        monthly_registration_values = metrics["monthly_registration_values"]
 
         eventos_inscricoes_chart = self._build_events_vs_registrations_chart(
             monthly_events, monthly_registrations
@@ -477,11 +403,7 @@ class CoordenadorDashboardView(RoleDashboardMixin, TemplateView):
                 "nucleos_coordenados": nucleos,
                 "eventos_coordenados": list(eventos_list),
                 "total_nucleos": len(nucleos),
-                "total_eventos": eventos_base_qs.filter(
-                    status=Evento.Status.ATIVO
-                ).count()
-                if nucleo_ids
-                else 0,
+                "total_eventos": metrics[f"eventos_status_{Evento.Status.ATIVO.value}"],
                 "total_inscritos": total_inscritos,
                 "valor_total_inscricoes": self._format_currency(valor_total_inscricoes),
                 "eventos_inscricoes_por_periodo_chart": eventos_inscricoes_chart,
@@ -554,31 +476,13 @@ class ConsultorDashboardView(RoleDashboardMixin, TemplateView):
             else []
         )
 
-        inscricoes_qs = (
-            InscricaoEvento.objects.filter(
-                evento__organizacao=organizacao,
-                evento__nucleo_id__in=nucleo_ids,
-                status="confirmada",
-            )
-            if nucleo_ids
-            else InscricaoEvento.objects.none()
-        )
-        total_inscritos = inscricoes_qs.count()
-        valor_total_inscricoes = inscricoes_qs.aggregate(total=Sum("valor_pago"))["total"]
-
-        monthly_kwargs = {"months": months, "nucleo_ids": nucleo_ids}
-        monthly_events = calculate_monthly_events(
-            organizacao,
-            statuses=[Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO],
-            **monthly_kwargs,
-        )
-        monthly_registrations = calculate_monthly_event_registrations(
-            organizacao, **monthly_kwargs
-        )
-        monthly_nucleados = calculate_monthly_nucleados(organizacao, **monthly_kwargs)
-        monthly_registration_values = calculate_monthly_registration_values(
-            organizacao, **monthly_kwargs
-        )
+        metrics = self._collect_nucleo_metrics(organizacao, nucleo_ids, months)
+        total_inscritos = metrics["inscricoes_confirmadas"]
+        valor_total_inscricoes = metrics["valor_inscricoes_confirmadas"]
+        monthly_events = metrics["monthly_events"]
+        monthly_registrations = metrics["monthly_registrations"]
+        monthly_nucleados = metrics["monthly_nucleados"]
+        monthly_registration_values = metrics["monthly_registration_values"]
 
         eventos_inscricoes_chart = self._build_events_vs_registrations_chart(
             monthly_events, monthly_registrations
@@ -607,11 +511,7 @@ class ConsultorDashboardView(RoleDashboardMixin, TemplateView):
                 "nucleos_consultoria": nucleos,
                 "eventos_consultoria": list(eventos_list),
                 "total_nucleos_consultoria": len(nucleos),
-                "total_eventos_consultoria": eventos_base_qs.filter(
-                    status=Evento.Status.ATIVO
-                ).count()
-                if nucleo_ids
-                else 0,
+                "total_eventos_consultoria": metrics[f"eventos_status_{Evento.Status.ATIVO.value}"],
                 "total_inscritos_consultoria": total_inscritos,
                 "valor_total_inscricoes_consultoria": self._format_currency(
                     valor_total_inscricoes
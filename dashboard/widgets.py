@@ -0,0 +1,264 @@
+"""Widgets do dashboard carregados sob demanda e cacheados individualmente.
+
+A página do dashboard renderiza apenas a estrutura e cada bloco é buscado via
+``hx-get``. O HTML de cada widget não depende do usuário, então o cache é
+compartilhado entre administradores da mesma organização e indexado por
+organização, período, recorte de núcleos, idioma e versão dos dados
+(``dashboard_org_<id>``), incrementada quando os dados de origem mudam.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.template.loader import render_to_string
+from django.utils.functional import Promise
+from django.utils.translation import get_language
+from django.utils.translation import gettext_lazy as _
+
+from core.cache import bump_cache_version, get_cache_version
+from eventos.models import Evento
+from nucleos.models import Nucleo
+
+from .charts import build_chart_payload, build_time_series_chart
+from .engine import EVENT_STATUS_WIDGET, EVENTS_BY_NUCLEO_WIDGET, MEMBERSHIP_WIDGET, MetricsEngine
+from .services import (
+    MEMBROS_NUCLEADOS_LABEL,
+    calculate_monthly_event_registrations,
+    calculate_monthly_membros,
+    calculate_monthly_nucleados,
+    calculate_monthly_registration_values,
+)
+
+WIDGET_CACHE_TIMEOUT = 300
+NUCLEO_LIST_LIMIT = 9
+EVENT_LIST_LIMIT = 9
+
+
+@dataclass(frozen=True)
+class WidgetScope:
+    """Recorte de dados de um widget."""
+
+    organizacao_id: Any
+    months: int
+    nucleo_ids: tuple[Any, ...] | None = None
+
+
+@dataclass(frozen=True)
+class DashboardWidget:
+    """Bloco do dashboard com template e função de contexto próprios."""
+
+    name: str
+    template_name: str
+    build: Callable[[WidgetScope], dict[str, Any]]
+    uses_period: bool = False
+    timeout: int = WIDGET_CACHE_TIMEOUT
+
+
+@dataclass(frozen=True)
+class RenderedWidget:
+    html: str
+    cache_hit: bool
+    duration_ms: float
+
+    def server_timing(self, name: str) -> str:
+        """Valor do cabeçalho ``Server-Timing`` para o widget."""
+
+        source = "hit" if self.cache_hit else "miss"
+        return f'widget-{name};dur={self.duration_ms:.1f};desc="{source}"'
+
+
+def data_version_namespace(organizacao_id: Any) -> str:
+    return f"dashboard_org_{organizacao_id}"
+
+
+def bump_data_version(organizacao_id: Any) -> None:
+    """Invalida todos os widgets cacheados da organização."""
+
+    if organizacao_id:
+        bump_cache_version(data_version_namespace(organizacao_id))
+
+
+def widget_cache_key(widget: DashboardWidget, scope: WidgetScope) -> str:
+    version = get_cache_version(data_version_namespace(scope.organizacao_id))
+    if scope.nucleo_ids is None:
+        nucleos = "all"
+    else:
+        joined = ",".join(sorted(str(nucleo_id) for nucleo_id in scope.nucleo_ids))
+        nucleos = hashlib.md5(joined.encode()).hexdigest()
+    months = scope.months if widget.uses_period else 0
+    return (
+        f"dashboard_widget_{widget.name}_{scope.organizacao_id}_v{version}"
+        f"_m{months}_n{nucleos}_{get_language() or ''}"
+    )
+
+
+def render_widget(widget: DashboardWidget, scope: WidgetScope) -> RenderedWidget:
+    """Renderiza o widget, reaproveitando o HTML cacheado quando possível."""
+
+    start = time.perf_counter()
+    key = widget_cache_key(widget, scope)
+    html = cache.get(key)
+    cache_hit = html is not None
+    if not cache_hit:
+        html = render_to_string(widget.template_name, widget.build(scope))
+        cache.set(key, html, widget.timeout)
+    return RenderedWidget(html, cache_hit, (time.perf_counter() - start) * 1000)
+
+
+def _admin_metricas(scope: WidgetScope) -> dict[str, Any]:
+    metrics = MetricsEngine(scope.organizacao_id, nucleo_ids=scope.nucleo_ids).run(
+        [MEMBERSHIP_WIDGET, EVENT_STATUS_WIDGET, EVENTS_BY_NUCLEO_WIDGET]
+    )
+    membership_totals = metrics.membership_totals()
+    event_totals = metrics.event_status_totals()
+    return {
+        "total_membros": sum(membership_totals.values()),
+        "total_nucleados": membership_totals.get(MEMBROS_NUCLEADOS_LABEL, 0),
+        "eventos_ativos": event_totals.get(Evento.Status.ATIVO.label, 0),
+        "membros_chart": build_chart_payload(membership_totals),
+        "eventos_por_nucleo": build_chart_payload(metrics.events_by_nucleo(), chart_type="bar"),
+    }
+
+
+def _admin_nucleos(scope: WidgetScope) -> dict[str, Any]:
+    nucleos = Nucleo.objects.filter(organizacao_id=scope.organizacao_id)
+    if scope.nucleo_ids is not None:
+        nucleos = nucleos.filter(pk__in=scope.nucleo_ids)
+    return {
+        "nucleos": list(
+            nucleos.select_related("consultor")
+            .annotate(
+                total_membros=Count(
+                    "participacoes",
+                    filter=Q(
+                        participacoes__status="ativo",
+                        participacoes__status_suspensao=False,
+                    ),
+                    distinct=True,
+                )
+            )
+            .order_by("nome")[:NUCLEO_LIST_LIMIT]
+        )
+    }
+
+
+def _admin_eventos(scope: WidgetScope) -> dict[str, Any]:
+    eventos = Evento.objects.filter(
+        organizacao_id=scope.organizacao_id,
+        status__in=[Evento.Status.ATIVO, Evento.Status.PLANEJAMENTO],
+    )
+    if scope.nucleo_ids is not None:
+        eventos = eventos.filter(nucleo_id__in=scope.nucleo_ids)
+    return {
+        "eventos": list(
+            eventos.select_related("nucleo")
+            .annotate(
+                total_inscritos=Count(
+                    "inscricoes",
+                    filter=Q(inscricoes__status="confirmada"),
+                    distinct=True,
+                ),
+                valor_total_inscricoes=Sum(
+                    "inscricoes__valor_pago",
+                    filter=Q(inscricoes__status="confirmada"),
+                ),
+            )
+            .order_by("-data_inicio")[:EVENT_LIST_LIMIT]
+        )
+    }
+
+
+def _series_widget(
+    name: str,
+    compute: Callable[[WidgetScope], list[dict[str, Any]]],
+    *,
+    title: str,
+    description: str,
+    aria_label: str,
+    **chart_options: Any,
+) -> DashboardWidget:
+    def build(scope: WidgetScope) -> dict[str, Any]:
+        options = {key: str(value) if isinstance(value, Promise) else value for key, value in chart_options.items()}
+        return {
+            "chart_id": name.replace("_", "-"),
+            "chart": build_time_series_chart(compute(scope), value_field="total", **options),
+            "title": title,
+            "description": description,
+            "aria_label": aria_label,
+        }
+
+    return DashboardWidget(name, "dashboard/widgets/serie_chart.html", build, uses_period=True)
+
+
+def _nucleo_kwargs(scope: WidgetScope) -> dict[str, Any]:
+    if scope.nucleo_ids is None:
+        return {}
+    return {"nucleo_ids": list(scope.nucleo_ids)}
+
+
+ADMIN_WIDGETS: dict[str, DashboardWidget] = {
+    widget.name: widget
+    for widget in (
+        DashboardWidget("metricas", "dashboard/widgets/admin_metricas.html", _admin_metricas),
+        DashboardWidget("nucleos", "dashboard/widgets/admin_nucleos.html", _admin_nucleos),
+        DashboardWidget("eventos", "dashboard/widgets/admin_eventos.html", _admin_eventos),
+        _series_widget(
+            "membros_periodo",
+            lambda scope: calculate_monthly_membros(scope.organizacao_id, months=scope.months),
+            title=_("Membros por período"),
+            description=_("Total de novos membros em cada mês e variação diária."),
+            aria_label=_("Gráfico linear exibindo a evolução mensal de membros com faixa de desvio padrão."),
+            label=_("Membros"),
+            std_field="std_dev",
+            color="#2563eb",
+            value_format=".0f",
+        ),
+        _series_widget(
+            "valores_inscricoes_periodo",
+            lambda scope: calculate_monthly_registration_values(
+                scope.organizacao_id, months=scope.months, **_nucleo_kwargs(scope)
+            ),
+            title=_("Valor das inscrições por período"),
+            description=_("Soma mensal dos pagamentos confirmados, com indicação da dispersão."),
+            aria_label=_("Gráfico linear com o valor total das inscrições confirmadas por mês e desvio padrão."),
+            label=_("Valor total das inscrições"),
+            std_field="std_dev",
+            color="#22c55e",
+            value_format=".2f",
+            value_prefix="R$ ",
+            yaxis_tickprefix="R$ ",
+        ),
+        _series_widget(
+            "inscricoes_periodo",
+            lambda scope: calculate_monthly_event_registrations(
+                scope.organizacao_id, months=scope.months, **_nucleo_kwargs(scope)
+            ),
+            title=_("Inscrições confirmadas por período"),
+            description=_("Tendência mensal de inscrições confirmadas em eventos."),
+            aria_label=_("Gráfico linear mostrando o número de inscrições confirmadas por mês."),
+            label=_("Inscrições confirmadas"),
+            color="#7c3aed",
+            value_format=".0f",
+        ),
+        _series_widget(
+            "nucleados_periodo",
+            lambda scope: calculate_monthly_nucleados(
+                scope.organizacao_id, months=scope.months, **_nucleo_kwargs(scope)
+            ),
+            title=_("Nucleados por período"),
+            description=_("Quantidade de novos nucleados ativos a cada mês e a variação diária correspondente."),
+            aria_label=_("Gráfico linear exibindo a evolução de nucleados ativos por mês, com desvio padrão."),
+            label=_("Nucleados"),
+            std_field="std_dev",
+            color="#0ea5e9",
+            value_format=".0f",
+        ),
+    )
+}
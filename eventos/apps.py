@@ -8,4 +8,4 @@ class EventosConfig(AppConfig):
     verbose_name = "Eventos"
 
     def ready(self) -> None:  # pragma: no cover - configuração
-        return
+        from . import exports, signals  # noqa: F401
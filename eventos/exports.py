@@ -0,0 +1,136 @@
+"""Exportações da lista de inscritos de eventos (PDF, CSV e XLSX)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import CharField, Count, Max, Value
+from django.db.models.functions import Coalesce, Lower, NullIf, Trim
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+try:  # pragma: no cover - fallback for optional dependency
+    from xhtml2pdf import pisa
+except ImportError:  # pragma: no cover - handled at runtime
+    pisa = None
+
+from core.exports import EXPORT_CHUNK_SIZE, ExportDefinition, ExportError, register_export
+
+from .models import Evento, InscricaoEvento
+
+INSCRITOS_EXPORT = "eventos_inscritos"
+
+
+def _participante_nome(user) -> str:
+    for candidate in (
+        getattr(user, "contato", None),
+        getattr(user, "display_name", None),
+        user.get_full_name if hasattr(user, "get_full_name") else None,
+        getattr(user, "username", None),
+    ):
+        if callable(candidate):
+            candidate = candidate()
+        if candidate:
+            return str(candidate).strip()
+    return ""
+
+
+def inscricoes_confirmadas(evento_id: Any) -> list[InscricaoEvento]:
+    """Inscrições confirmadas ordenadas pelo nome do participante."""
+
+    inscricoes = list(
+        InscricaoEvento.objects.filter(evento_id=evento_id, status="confirmada")
+        .select_related("user")
+        .only(
+            "id",
+            "data_confirmacao",
+            "user__id",
+            "user__username",
+            "user__email",
+            "user__contato",
+            "user__nome_fantasia",
+            "user__phone_number",
+        )
+    )
+    for inscricao in inscricoes:
+        inscricao.participante_nome = _participante_nome(inscricao.user) or "-"
+    inscricoes.sort(key=lambda inscricao: (inscricao.participante_nome.casefold(), inscricao.pk or 0))
+    return inscricoes
+
+
+def inscritos_version(evento_id: Any) -> str:
+    """Versão dos dados exportados: muda a cada alteração de inscrição ou do evento."""
+
+    inscricoes = InscricaoEvento.all_objects.filter(evento_id=evento_id).aggregate(
+        total=Count("id"),
+        ultima=Max("updated_at"),
+    )
+    evento_atualizado = Evento.all_objects.filter(pk=evento_id).values_list("updated_at", flat=True).first()
+    ultima = inscricoes["ultima"].isoformat() if inscricoes["ultima"] else ""
+    evento = evento_atualizado.isoformat() if evento_atualizado else ""
+    return f"{inscricoes['total']}:{ultima}:{evento}"
+
+
+def _filename(evento_id: Any) -> str:
+    slug = Evento.all_objects.filter(pk=evento_id).values_list("slug", flat=True).first()
+    return f"inscritos-{slug or evento_id}"
+
+
+def _columns() -> list[str]:
+    return [_("Participante"), _("E-mail"), _("Telefone"), _("Confirmado em")]
+
+
+def _rows(evento_id: Any) -> Iterator[list[Any]]:
+    # Mesma ordem de ``inscricoes_confirmadas``, resolvida no banco para que as
+    # linhas sejam lidas em blocos em vez de carregadas e ordenadas em memória.
+    nome = Coalesce(
+        NullIf(Trim("user__contato"), Value("")),
+        NullIf("user__username", Value("")),
+        "user__email",
+        output_field=CharField(),
+    )
+    linhas = (
+        InscricaoEvento.objects.filter(evento_id=evento_id, status="confirmada")
+        .annotate(participante_nome=nome)
+        .order_by(Lower("participante_nome"), "pk")
+        .values_list("participante_nome", "user__email", "user__phone_number", "data_confirmacao")
+    )
+    for participante, email, telefone, confirmado_em in linhas.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            participante or "-",
+            email or "",
+            str(telefone or ""),
+            timezone.localtime(confirmado_em).strftime("%d/%m/%Y %H:%M") if confirmado_em else "",
+        ]
+
+
+def _render_pdf(evento_id: Any, handler) -> None:
+    if pisa is None:
+        raise ImproperlyConfigured("xhtml2pdf precisa estar instalado para gerar PDFs.")
+
+    html = render_to_string(
+        "eventos/pdf/inscritos.html",
+        {
+            "evento": Evento.all_objects.get(pk=evento_id),
+            "inscricoes": inscricoes_confirmadas(evento_id),
+            "generated_at": timezone.localtime(),
+        },
+    )
+    result = pisa.CreatePDF(html, dest=handler, encoding="utf-8")
+    if getattr(result, "err", False):
+        raise ExportError("Não foi possível gerar o PDF de inscritos.")
+
+
+register_export(
+    ExportDefinition(
+        name=INSCRITOS_EXPORT,
+        version=inscritos_version,
+        filename=_filename,
+        columns=_columns,
+        rows=_rows,
+        render_pdf=_render_pdf,
+    )
+)
@@ -199,6 +199,7 @@ class EventoForm(forms.ModelForm):
             "publico_alvo",
             "nucleo",
             "participantes_maximo",
+            "inscricao_em_fila",
             "gratuito",
             "valor_associado",
             "valor_nucleado",
@@ -0,0 +1,199 @@
+"""Feed iCalendar (ICS) para assinatura dos eventos em aplicativos de agenda.
+
+A URL do feed carrega um token assinado com o usuário, a organização, a versão
+dos links do usuário (``User.calendario_feed_versao``) e, opcionalmente, o
+núcleo. Cada consulta confere primeiro, com uma única leitura da linha do
+usuário, que ele continua ativo na organização e que o link não foi renovado.
+O ETag combina o token, a versão de dados da organização e a do índice de
+vínculos do usuário, e o ``Last-Modified`` marca quando essa versão foi servida
+pela primeira vez: clientes que consultam o feed com frequência (com
+``If-None-Match`` ou ``If-Modified-Since``) recebem ``304`` sem gerar o calendário, e quem deixa um núcleo para de ver os eventos
+dele na consulta seguinte. O conteúdo é gerado em streaming e guardado em
+cache até a próxima alteração.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from core.cache import get_cache_version
+from nucleos.membership import indice_namespace
+
+from .models import Evento
+from .querysets import filter_eventos_por_usuario
+from .services.calendario import data_version_namespace
+
+FEED_SALT = "eventos.ics.feed"
+FEED_HISTORY_DAYS = 90
+FEED_CACHE_TIMEOUT = 60 * 60
+PRODID = "-//Hubx//Eventos//PT-BR"
+
+
+def feed_token(user, *, nucleo_id: Any = None) -> str:
+    payload = {"u": str(user.pk), "o": str(user.organizacao_id), "v": user.calendario_feed_versao}
+    if nucleo_id:
+        payload["n"] = str(nucleo_id)
+    return signing.dumps(payload, salt=FEED_SALT, compress=True)
+
+
+def load_feed_token(token: str) -> dict[str, str]:
+    """Valida o token do feed; levanta :class:`signing.BadSignature` se inválido."""
+
+    return signing.loads(token, salt=FEED_SALT)
+
+
+def renovar_feeds(user) -> None:
+    """Invalida todos os links de feed já emitidos para ``user``."""
+
+    get_user_model().objects.filter(pk=user.pk).update(calendario_feed_versao=F("calendario_feed_versao") + 1)
+    user.refresh_from_db(fields=["calendario_feed_versao"])
+
+
+def feed_url(user, *, nucleo_id: Any = None, absolute: bool = False) -> str:
+    url = reverse("eventos:calendario_ics", args=[feed_token(user, nucleo_id=nucleo_id)])
+    if absolute:
+        return f"{settings.FRONTEND_URL.rstrip('/')}{url}"
+    return url
+
+
+def feed_etag(token: str, version: int, vinculos: int) -> str:
+    digest = hashlib.blake2b(f"{token}:{version}:{vinculos}".encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def feed_cache_key(etag: str) -> str:
+    return "eventos:ics:" + etag.strip('"')
+
+
+def feed_last_modified(etag: str) -> datetime:
+    """Primeiro momento em que a versão ``etag`` do feed foi servida.
+
+    Como o ETag, acompanha tanto os eventos da organização quanto os vínculos
+    do usuário; clientes que só enviam ``If-Modified-Since`` também recebem o
+    feed novo depois que o usuário deixa um núcleo.
+    """
+
+    key = feed_cache_key(etag) + ":modificado_em"
+    modificado_em = cache.get(key)
+    if modificado_em is None:
+        modificado_em = timezone.now().replace(microsecond=0)
+        cache.add(key, modificado_em, None)
+        modificado_em = cache.get(key) or modificado_em
+    return modificado_em
+
+
+def current_version(organizacao_id: Any) -> int:
+    return get_cache_version(data_version_namespace(organizacao_id))
+
+
+def vinculos_version(user_id: Any) -> int:
+    return get_cache_version(indice_namespace(user_id))
+
+
+def _escape(value: Any) -> str:
+    text = str(value or "")
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebra linhas com mais de 75 octetos conforme a RFC 5545."""
+
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    partes: list[str] = []
+    atual = b""
+    for char in line:
+        pedaco = char.encode()
+        limite = 75 if not partes else 74
+        if len(atual) + len(pedaco) > limite:
+            partes.append(atual.decode())
+            atual = b""
+        atual += pedaco
+    partes.append(atual.decode())
+    return "\r\n ".join(partes) + "\r\n"
+
+
+def _dt(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _vevent(evento: Evento, dtstamp: str, base_url: str) -> str:
+    local = ", ".join(part for part in (evento.local, evento.cidade, evento.estado) if part)
+    linhas = [
+        "BEGIN:VEVENT",
+        f"UID:evento-{evento.pk}@hubx",
+        f"DTSTAMP:{dtstamp}",
+        f"LAST-MODIFIED:{_dt(evento.updated_at)}",
+        f"DTSTART:{_dt(evento.data_inicio)}",
+        f"DTEND:{_dt(evento.data_fim or evento.data_inicio)}",
+        f"SUMMARY:{_escape(evento.titulo)}",
+        f"DESCRIPTION:{_escape(evento.descricao)}",
+        f"LOCATION:{_escape(local)}",
+        f"URL:{base_url}{evento.get_absolute_url()}",
+        f"STATUS:{'CANCELLED' if evento.status == Evento.Status.CANCELADO else 'CONFIRMED'}",
+        "END:VEVENT",
+    ]
+    return "".join(_fold(linha) for linha in linhas)
+
+
+def iter_feed(user, *, nucleo_id: Any = None, nome: str = "") -> Iterator[str]:
+    """Gera o calendário em blocos, lendo os eventos com ``iterator()``."""
+
+    qs = filter_eventos_por_usuario(Evento.objects.all(), user).filter(
+        data_inicio__gte=timezone.now() - timedelta(days=FEED_HISTORY_DAYS)
+    )
+    if nucleo_id:
+        qs = qs.filter(nucleo_id=nucleo_id)
+    qs = qs.only(
+        "id",
+        "titulo",
+        "descricao",
+        "data_inicio",
+        "data_fim",
+        "local",
+        "cidade",
+        "estado",
+        "status",
+        "updated_at",
+    ).order_by("data_inicio")
+
+    cabecalho = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(nome or 'Hubx')}",
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+    ]
+    yield "".join(_fold(linha) for linha in cabecalho)
+    dtstamp = _dt(timezone.now())
+    base_url = settings.FRONTEND_URL.rstrip("/")
+    for evento in qs.iterator(chunk_size=200):
+        yield _vevent(evento, dtstamp, base_url)
+    yield _fold("END:VCALENDAR")
+
+
+def cached_iter(chunks: Iterator[str], cache_key: str) -> Iterator[bytes]:
+    """Repassa os blocos ao cliente e guarda o feed completo ao final."""
+
+    partes: list[bytes] = []
+    for chunk in chunks:
+        data = chunk.encode()
+        partes.append(data)
+        yield data
+    cache.set(cache_key, b"".join(partes), FEED_CACHE_TIMEOUT)
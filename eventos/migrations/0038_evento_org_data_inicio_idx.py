@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eventos", "0037_briefingtemplate_remove_evento_briefing_and_more"),
+        ("nucleos", "0013_nucleomidia"),
+        ("organizacoes", "0017_organizacao_cep_contato_whatsapp_remove_cover"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["organizacao", "data_inicio"], name="evento_org_data_inicio_idx"),
+        ),
+    ]
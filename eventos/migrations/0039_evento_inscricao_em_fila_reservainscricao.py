@@ -0,0 +1,110 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:10
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eventos", "0038_evento_org_data_inicio_idx"),
+        ("pagamentos", "0005_pagamento"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evento",
+            name="inscricao_em_fila",
+            field=models.BooleanField(
+                default=False,
+                help_text="Para eventos de alta demanda: a vaga é reservada na hora e a confirmação é processada em segundo plano.",
+                verbose_name="Inscrições em fila",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evento",
+            name="vagas_reservadas",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="ReservaInscricao",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("ticket", models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("na_fila", "Na fila"), ("processada", "Processada"), ("recusada", "Recusada")],
+                        default="na_fila",
+                        max_length=20,
+                    ),
+                ),
+                ("valor_pago", models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                (
+                    "metodo_pagamento",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("pix", "Pix"),
+                            ("boleto", "Boleto"),
+                            ("card", "Cartão de crédito"),
+                            ("faturamento", "Faturamento interno"),
+                            ("faturar_avista", "Faturar à vista"),
+                            ("faturar_2x", "Faturar em 2x"),
+                            ("faturar_3x", "Faturar em 3x"),
+                        ],
+                        max_length=20,
+                        null=True,
+                    ),
+                ),
+                ("comprovante_pagamento", models.FileField(blank=True, null=True, upload_to="eventos/comprovantes/")),
+                ("mensagem", models.CharField(blank=True, max_length=255)),
+                (
+                    "evento",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="reservas", to="eventos.evento"
+                    ),
+                ),
+                (
+                    "inscricao",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="reservas",
+                        to="eventos.inscricaoevento",
+                    ),
+                ),
+                (
+                    "transacao",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="reservas_inscricao",
+                        to="pagamentos.transacao",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reservas_inscricao",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("evento", "user"), name="reserva_inscricao_evento_user_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copiar_contadores(apps, schema_editor):
+    Evento = apps.get_model("eventos", "Evento")
+    VagasEvento = apps.get_model("eventos", "VagasEvento")
+    VagasEvento.objects.bulk_create(
+        [
+            VagasEvento(evento_id=evento_id, ocupadas=ocupadas)
+            for evento_id, ocupadas in Evento.objects.filter(inscricao_em_fila=True).values_list(
+                "pk", "vagas_reservadas"
+            )
+        ],
+        batch_size=500,
+    )
+
+
+def restaurar_contadores(apps, schema_editor):
+    Evento = apps.get_model("eventos", "Evento")
+    VagasEvento = apps.get_model("eventos", "VagasEvento")
+    for evento_id, ocupadas in VagasEvento.objects.values_list("evento_id", "ocupadas").iterator():
+        Evento.objects.filter(pk=evento_id).update(vagas_reservadas=ocupadas)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eventos", "0039_evento_inscricao_em_fila_reservainscricao"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VagasEvento",
+            fields=[
+                (
+                    "evento",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="vagas",
+                        serialize=False,
+                        to="eventos.evento",
+                    ),
+                ),
+                ("ocupadas", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Vagas do evento",
+                "verbose_name_plural": "Vagas dos eventos",
+            },
+        ),
+        migrations.RunPython(copiar_contadores, restaurar_contadores),
+        migrations.RemoveField(
+            model_name="evento",
+            name="vagas_reservadas",
+        ),
+    ]
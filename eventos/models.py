@@ -1,27 +1,23 @@
 from __future__ import annotations
 
-# ruff: noqa: I001
-
+import hmac
 import logging
 import secrets
 import string
 import uuid
-import hmac
-from hashlib import sha256
 from decimal import Decimal
-from io import BytesIO
+from hashlib import sha256
 from pathlib import Path
 
-import qrcode
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
-from django.db import models
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
@@ -29,7 +25,7 @@ from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
 from accounts.models import MediaTag, UserType
-from core.models import SoftDeleteManager, SoftDeleteModel, TimeStampedModel
+from core.models import FieldTrackerMixin, SoftDeleteManager, SoftDeleteModel, TimeStampedModel
 from nucleos.models import Nucleo
 from organizacoes.models import Organizacao
 from pagamentos.models import Transacao
@@ -37,12 +33,18 @@ from tokens.models import TokenAcesso
 
 from .validators import validate_uploaded_file
 
+# ruff: noqa: I001
+
+
+
+
+
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
-class InscricaoEvento(TimeStampedModel, SoftDeleteModel):
+class InscricaoEvento(FieldTrackerMixin, TimeStampedModel, SoftDeleteModel):
     STATUS_CHOICES = [
         ("pendente", "Pendente"),
         ("confirmada", "Confirmada"),
@@ -122,6 +124,8 @@ class InscricaoEvento(TimeStampedModel, SoftDeleteModel):
     objects = SoftDeleteManager()
     all_objects = models.Manager()
 
+    tracked_fields = ("presente", "evento", "data_confirmacao")
+
     class Meta:
         unique_together = ("user", "evento")
 
@@ -196,37 +200,35 @@ class InscricaoEvento(TimeStampedModel, SoftDeleteModel):
                 acao="inscricao_cancelada",
             )
             self.delete()
+            from .services.fila_inscricao import cancelar_reserva
+
+            cancelar_reserva(self.evento_id, self.user_id)
 
-    def realizar_check_in(self) -> None:
+    def realizar_check_in(self) -> bool:
         if self.check_in_realizado_em:
-            return
-        with transaction.atomic():
-            evento = Evento.objects.select_for_update().get(pk=self.evento.pk)
-            self.check_in_realizado_em = timezone.now()
-            self.save(update_fields=["check_in_realizado_em", "updated_at"])
-            evento.numero_presentes += 1
-            evento.save(update_fields=["numero_presentes", "updated_at"])
-            EventoLog.objects.create(
-                evento=self.evento,
-                usuario=self.user,
-                acao="check_in",
-            )
+            return False
+        from .services.checkin import registrar_check_in
+
+        realizado_em = timezone.now()
+        if not registrar_check_in(
+            self.pk,
+            evento_id=self.evento_id,
+            usuario_id=self.user_id,
+            realizado_em=realizado_em,
+        ):
+            return False
+        self.check_in_realizado_em = realizado_em
+        return True
 
     def gerar_qrcode(self) -> bytes:
-        """Gera um QRCode único com detalhes da inscrição e salva no armazenamento padrão."""
+        """Obtém o QRCode da inscrição (gerado uma única vez) e atualiza ``qrcode_url``."""
 
-        inscricao_id = str(self.pk) if self.pk else None
-        if not inscricao_id:
+        if not self.pk:
             raise ValueError("Não é possível gerar QRCode sem identificador da inscrição.")
 
-        checksum = self.gerar_checksum(inscricao_id)
-        qrcode_payload = f"inscricao:{inscricao_id}:{checksum}" if checksum else f"inscricao:{inscricao_id}"
-        img = qrcode.make(qrcode_payload)
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        content = buffer.getvalue()
-        filename = f"inscricoes/qrcodes/{self.pk}.png"
-        path = default_storage.save(filename, ContentFile(content))
+        from .services.qrcodes import obter_qrcode
+
+        content, path = obter_qrcode(self.pk)
         self.qrcode_url = default_storage.url(path)
         return content
 
@@ -243,19 +245,53 @@ class InscricaoEvento(TimeStampedModel, SoftDeleteModel):
         return self.evento.get_valor_para_usuario(user=getattr(self, "user", None))
 
     def save(self, *args, **kwargs):
-        if self.pk:
-            old = InscricaoEvento.all_objects.filter(pk=self.pk).first()
-            if old and old.presente != self.presente:
-                EventoLog.objects.create(
-                    evento=self.evento,
-                    usuario=self.user,
-                    acao="presenca_alterada",
-                    detalhes={"presente": self.presente},
-                )
+        if not self._state.adding and self.saves_change("presente", kwargs.get("update_fields")):
+            EventoLog.objects.create(
+                evento=self.evento,
+                usuario=self.user,
+                acao="presenca_alterada",
+                detalhes={"presente": self.presente},
+            )
         super().save(*args, **kwargs)
 
 
-class Evento(TimeStampedModel, SoftDeleteModel):
+class EventoQuerySet(models.QuerySet):
+    """QuerySet de :class:`Evento` com agregados de inscrições calculados no banco."""
+
+    def com_contagem_inscricoes(self):
+        """Anota ``num_inscritos`` (confirmadas), ``num_pendentes`` e ``num_presentes``.
+
+        Cada contagem é uma subconsulta correlacionada, evitando carregar as
+        inscrições e o ``GROUP BY`` sobre as colunas de ``select_related``.
+        """
+
+        inscricoes = InscricaoEvento.objects.filter(evento=OuterRef("pk")).order_by().values("evento")
+
+        def contagem(qs):
+            return Coalesce(Subquery(qs.annotate(total=Count("pk")).values("total")[:1]), 0)
+
+        return self.annotate(
+            num_inscritos=contagem(inscricoes.filter(status="confirmada")),
+            num_pendentes=contagem(inscricoes.filter(status="pendente")),
+            num_presentes=contagem(inscricoes.filter(check_in_realizado_em__isnull=False)),
+        )
+
+    def com_inscricao_do_usuario(self, user):
+        """Anota ``usuario_inscrito`` indicando se ``user`` tem inscrição ativa no evento."""
+
+        if not getattr(user, "is_authenticated", False):
+            return self.annotate(usuario_inscrito=Value(False, output_field=models.BooleanField()))
+        return self.annotate(
+            usuario_inscrito=Exists(
+                InscricaoEvento.objects.filter(evento=OuterRef("pk"), user=user).exclude(status="cancelada")
+            )
+        )
+
+
+EventoManager = SoftDeleteManager.from_queryset(EventoQuerySet)
+
+
+class Evento(FieldTrackerMixin, TimeStampedModel, SoftDeleteModel):
     class Status(models.IntegerChoices):
         ATIVO = 0, _("Ativo")
         CONCLUIDO = 1, _("Concluído")
@@ -306,6 +342,13 @@ class Evento(TimeStampedModel, SoftDeleteModel):
     orcamento_estimado = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     valor_gasto = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     participantes_maximo = models.PositiveIntegerField(null=True, blank=True)
+    inscricao_em_fila = models.BooleanField(
+        _("Inscrições em fila"),
+        default=False,
+        help_text=_(
+            "Para eventos de alta demanda: a vaga é reservada na hora e a confirmação é processada em segundo plano."
+        ),
+    )
     cronograma = models.TextField(blank=True)
     informacoes_adicionais = models.TextField(blank=True)
     parcerias = models.FileField(
@@ -324,12 +367,17 @@ class Evento(TimeStampedModel, SoftDeleteModel):
         null=True,
     )
 
-    objects = SoftDeleteManager()
-    all_objects = models.Manager()
+    objects = EventoManager()
+    all_objects = models.Manager.from_queryset(EventoQuerySet)()
+
+    tracked_fields = ("orcamento_estimado", "valor_gasto", "inscricao_em_fila", "organizacao", "nucleo", "data_inicio")
 
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
+        indexes = [
+            models.Index(fields=["organizacao", "data_inicio"], name="evento_org_data_inicio_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.titulo
@@ -388,24 +436,24 @@ class Evento(TimeStampedModel, SoftDeleteModel):
             counter += 1
         self.slug = slug_candidate
 
-        if self.pk:
-            old = Evento.all_objects.filter(pk=self.pk).first()
-            if old:
-                if old.orcamento_estimado != self.orcamento_estimado:
-                    logger.info(
-                        "orcamento_estimado alterado para evento %s de %s para %s",
-                        self.pk,
-                        old.orcamento_estimado,
-                        self.orcamento_estimado,
-                    )
-                if old.valor_gasto != self.valor_gasto:
+        update_fields = kwargs.get("update_fields")
+        if not self._state.adding:
+            for campo in ("orcamento_estimado", "valor_gasto"):
+                if self.saves_change(campo, update_fields):
                     logger.info(
-                        "valor_gasto alterado para evento %s de %s para %s",
+                        "%s alterado para evento %s de %s para %s",
+                        campo,
                         self.pk,
-                        old.valor_gasto,
-                        self.valor_gasto,
+                        self.previous_value(campo),
+                        getattr(self, campo),
                     )
+        ativou_fila = self.inscricao_em_fila and self.saves_change("inscricao_em_fila", update_fields)
         super().save(*args, **kwargs)
+        if ativou_fila:
+            # O contador de vagas passa a valer a partir daqui; parte das inscrições existentes.
+            from .services.fila_inscricao import recontar_vagas
+
+            recontar_vagas(self.pk)
 
     def get_valor_para_usuario(self, user=None) -> Decimal | None:
         """Retorna o valor aplicável ao usuário informado."""
@@ -746,3 +794,74 @@ class EventoLog(TimeStampedModel, SoftDeleteModel):
 
     class Meta:
         ordering = ["-created_at"]
+
+
+class VagasEvento(models.Model):
+    """Vagas ocupadas de um evento com ``inscricao_em_fila``.
+
+    Fica fora da linha do ``Evento`` para que um ``save()`` do evento (admin,
+    formulários) nunca grave de volta um valor antigo; só é alterado por
+    ``UPDATE`` em :mod:`eventos.services.fila_inscricao`.
+    """
+
+    evento = models.OneToOneField(Evento, on_delete=models.CASCADE, primary_key=True, related_name="vagas")
+    ocupadas = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Vagas do evento"
+        verbose_name_plural = "Vagas dos eventos"
+
+    def __str__(self) -> str:  # pragma: no cover - simples
+        return f"{self.evento_id}: {self.ocupadas}"
+
+
+class ReservaInscricao(TimeStampedModel):
+    """Vaga reservada em evento com ``inscricao_em_fila``; o ``ticket`` acompanha o processamento."""
+
+    class Status(models.TextChoices):
+        NA_FILA = "na_fila", _("Na fila")
+        PROCESSADA = "processada", _("Processada")
+        RECUSADA = "recusada", _("Recusada")
+
+    ticket = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name="reservas")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="reservas_inscricao",
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.NA_FILA)
+    valor_pago = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+    metodo_pagamento = models.CharField(
+        max_length=20,
+        choices=InscricaoEvento.METODO_PAGAMENTO_CHOICES,
+        null=True,
+        blank=True,
+    )
+    comprovante_pagamento = models.FileField(
+        upload_to="eventos/comprovantes/",
+        null=True,
+        blank=True,
+    )
+    transacao = models.ForeignKey(
+        Transacao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reservas_inscricao",
+    )
+    inscricao = models.ForeignKey(
+        InscricaoEvento,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reservas",
+    )
+    mensagem = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        constraints = [models.UniqueConstraint(fields=["evento", "user"], name="reserva_inscricao_evento_user_unique")]
+
+    def __str__(self) -> str:  # pragma: no cover - simples
+        return f"{self.ticket} ({self.get_status_display()})"
@@ -3,6 +3,7 @@ from __future__ import annotations
 from django.db.models import Q
 
 from accounts.models import UserType
+from nucleos.membership import obter_indice
 
 from .models import Evento
 
@@ -31,12 +32,11 @@ def filter_eventos_por_usuario(qs, user, *, evento_field: str | None = None):
     tipo_usuario = getattr(user, "get_tipo_usuario", None)
     if isinstance(tipo_usuario, UserType):  # pragma: no cover - defensive fallback
         tipo_usuario = tipo_usuario.value
-    nucleos_qs = getattr(user, "nucleos", None)
-    nucleo_ids = list(nucleos_qs.values_list("id", flat=True)) if nucleos_qs is not None else []
-
     if tipo_usuario in {UserType.ADMIN.value, UserType.OPERADOR.value}:
         return qs
 
+    nucleo_ids = sorted(obter_indice(user).ativos)
+
     if tipo_usuario == UserType.ASSOCIADO.value and not nucleo_ids:
         status_field = f"{prefix}status"
         publico_field = f"{prefix}publico_alvo"
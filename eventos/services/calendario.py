@@ -0,0 +1,86 @@
+"""Consultas do calendário de eventos com cache por mês e perfil de visibilidade.
+
+Os períodos são convertidos em limites ``datetime`` na meia-noite local, de
+modo que o filtro em ``data_inicio`` continua utilizando o índice da coluna
+(``data_inicio__date`` aplica um cast e impede o uso do índice). A contagem de
+inscritos vem de :meth:`EventoQuerySet.com_contagem_inscricoes`.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from accounts.models import UserType
+from core.cache import bump_cache_version, get_cache_version
+from eventos.models import Evento
+from eventos.querysets import filter_eventos_por_usuario
+from nucleos.membership import obter_indice
+
+CACHE_TIMEOUT = 60 * 10
+
+
+def data_version_namespace(organizacao_id: Any) -> str:
+    return f"eventos_org_{organizacao_id}"
+
+
+def bump_data_version(organizacao_id: Any) -> None:
+    if organizacao_id:
+        bump_cache_version(data_version_namespace(organizacao_id))
+
+
+def intervalo_local(inicio: date, fim: date) -> tuple[datetime, datetime]:
+    """Limites ``[inicio 00:00, (fim + 1) 00:00)`` no fuso local."""
+
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(inicio, time.min), tz),
+        timezone.make_aware(datetime.combine(fim + timedelta(days=1), time.min), tz),
+    )
+
+
+def perfil_visibilidade(user) -> str:
+    """Resume o que ``filter_eventos_por_usuario`` considera para ``user``."""
+
+    tipo = getattr(user, "get_tipo_usuario", None)
+    if isinstance(tipo, UserType):  # pragma: no cover - compatibilidade defensiva
+        tipo = tipo.value
+    if tipo in {UserType.ADMIN.value, UserType.OPERADOR.value}:
+        return str(tipo)
+    nucleo_ids = sorted(obter_indice(user).ativos)
+    return f"{tipo}:{','.join(str(nucleo_id) for nucleo_id in nucleo_ids)}"
+
+
+def eventos_no_periodo(user, inicio: date, fim: date) -> list[Evento]:
+    """Eventos visíveis para ``user`` com início entre ``inicio`` e ``fim`` (inclusive).
+
+    O resultado é compartilhado entre usuários da mesma organização com o mesmo
+    perfil de visibilidade e invalidado pela versão de dados da organização.
+    """
+
+    organizacao_id = getattr(user, "organizacao_id", None)
+    version = get_cache_version(data_version_namespace(organizacao_id))
+    cache_key = (
+        f"eventos:calendario:{organizacao_id}:{perfil_visibilidade(user)}:"
+        f"{inicio.isoformat()}:{fim.isoformat()}:v{version}"
+    )
+    eventos = cache.get(cache_key)
+    if eventos is None:
+        limite_inicial, limite_final = intervalo_local(inicio, fim)
+        qs = filter_eventos_por_usuario(Evento.objects.all(), user).filter(
+            data_inicio__gte=limite_inicial,
+            data_inicio__lt=limite_final,
+        )
+        eventos = list(qs.com_contagem_inscricoes().select_related("organizacao", "nucleo").order_by("data_inicio"))
+        cache.set(cache_key, eventos, CACHE_TIMEOUT)
+    return eventos
+
+
+def agrupar_por_dia(eventos: list[Evento]) -> dict[date, list[Evento]]:
+    agrupado: dict[date, list[Evento]] = {}
+    for evento in eventos:
+        agrupado.setdefault(timezone.localtime(evento.data_inicio).date(), []).append(evento)
+    return agrupado
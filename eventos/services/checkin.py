@@ -0,0 +1,319 @@
+"""Check-in de inscrições a partir do QRCode.
+
+O payload do QRCode (``inscricao:<id>:<checksum>``) é validado apenas com o
+HMAC de :meth:`InscricaoEvento.gerar_checksum`, sem consultar o banco. O
+registro do check-in é um ``UPDATE`` condicional na própria inscrição
+(``check_in_realizado_em IS NULL``), de modo que leituras concorrentes do
+mesmo QRCode não contam presença em dobro, e o contador ``numero_presentes``
+do evento é incrementado com ``F()`` sem ``select_for_update``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hmac
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+
+from eventos.models import Evento, EventoLog, InscricaoEvento
+
+PAYLOAD_PREFIX = "inscricao"
+MAX_LOTE = 500
+MANIFESTO_SALT = "eventos.checkin.manifesto"
+MANIFESTO_CAMPOS = ("id", "checksum", "nome", "pagamento_validado", "check_in")
+
+
+class CodigoInvalido(ValueError):
+    """Payload de QRCode malformado ou com checksum incorreto."""
+
+
+@dataclass(frozen=True)
+class CheckinResultado:
+    codigo: str
+    status: str
+    message: str
+    inscricao_id: int | None = None
+    realizado_em: datetime | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in {"ok", "duplicado"}
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "codigo": self.codigo,
+            "status": self.status,
+            "message": str(self.message),
+            "inscricao": self.inscricao_id,
+            "realizado_em": self.realizado_em.isoformat() if self.realizado_em else None,
+        }
+
+
+def validar_codigo(codigo: str, *, exigir_checksum: bool = True) -> int:
+    """Extrai o id da inscrição do payload, validando o checksum em memória.
+
+    Códigos antigos sem checksum só são aceitos com ``exigir_checksum=False``.
+    """
+
+    partes = (codigo or "").strip().split(":", 2)
+    if len(partes) < 2 or partes[0] != PAYLOAD_PREFIX or not partes[1].isdigit():
+        raise CodigoInvalido(_("Código inválido."))
+
+    checksum = partes[2] if len(partes) > 2 else ""
+    if not checksum or checksum.startswith("{"):
+        if exigir_checksum:
+            raise CodigoInvalido(_("Código inválido."))
+    else:
+        esperado = InscricaoEvento.gerar_checksum(partes[1]) or ""
+        if not hmac.compare_digest(checksum, esperado):
+            raise CodigoInvalido(_("Código inválido."))
+    return int(partes[1])
+
+
+def _marcar_check_in(inscricao_id: int, realizado_em: datetime) -> bool:
+    atualizadas = InscricaoEvento.objects.filter(
+        pk=inscricao_id,
+        status="confirmada",
+        check_in_realizado_em__isnull=True,
+    ).update(check_in_realizado_em=realizado_em, updated_at=timezone.now())
+    return atualizadas == 1
+
+
+def _contabilizar(presencas: Counter, logs: Sequence[EventoLog]) -> None:
+    agora = timezone.now()
+    for evento_id, total in presencas.items():
+        Evento.all_objects.filter(pk=evento_id).update(
+            numero_presentes=F("numero_presentes") + total,
+            updated_at=agora,
+        )
+    EventoLog.objects.bulk_create(logs)
+
+
+def registrar_check_in(
+    inscricao_id: int,
+    *,
+    evento_id: Any,
+    usuario_id: Any,
+    realizado_em: datetime | None = None,
+) -> bool:
+    """Registra o check-in de uma inscrição já conhecida.
+
+    Retorna ``False`` se o check-in já havia sido feito (ou a inscrição não
+    está confirmada); nesse caso nada é alterado.
+    """
+
+    realizado_em = realizado_em or timezone.now()
+    with transaction.atomic():
+        if not _marcar_check_in(inscricao_id, realizado_em):
+            return False
+        _contabilizar(
+            Counter({evento_id: 1}),
+            [EventoLog(evento_id=evento_id, usuario_id=usuario_id, acao="check_in")],
+        )
+    return True
+
+
+def _parse_realizado_em(valor: Any, agora: datetime) -> datetime:
+    if isinstance(valor, datetime):
+        momento = valor
+    elif isinstance(valor, str) and valor:
+        try:
+            momento = datetime.fromisoformat(valor)
+        except ValueError:
+            return agora
+    else:
+        return agora
+    if timezone.is_naive(momento):
+        momento = timezone.make_aware(momento)
+    return min(momento, agora)
+
+
+def registrar_check_ins_em_lote(
+    itens: Iterable[dict[str, Any]],
+    *,
+    evento: Evento,
+    operador: Any = None,
+) -> list[CheckinResultado]:
+    """Processa check-ins acumulados por leitores que ficaram offline.
+
+    Cada item traz ``codigo`` e, opcionalmente, ``realizado_em`` (ISO 8601) com
+    o horário da leitura no dispositivo. Os checksums são conferidos em
+    memória, as inscrições do lote são lidas em uma única consulta e o
+    contador do evento recebe um único incremento ao final.
+    """
+
+    agora = timezone.now()
+    pendentes: list[tuple[str, int, datetime]] = []
+    resultados: list[CheckinResultado | None] = []
+    for item in itens:
+        codigo = str(item.get("codigo", "")).strip()
+        try:
+            inscricao_id = validar_codigo(codigo)
+        except CodigoInvalido as exc:
+            resultados.append(CheckinResultado(codigo, "invalido", str(exc)))
+            continue
+        pendentes.append((codigo, inscricao_id, _parse_realizado_em(item.get("realizado_em"), agora)))
+        resultados.append(None)  # preenchido abaixo, preservando a ordem do lote
+
+    inscricoes = {
+        row["pk"]: row
+        for row in InscricaoEvento.objects.filter(
+            pk__in={inscricao_id for _codigo, inscricao_id, _momento in pendentes},
+            evento=evento,
+        ).values("pk", "user_id", "status", "check_in_realizado_em")
+    }
+
+    presencas: Counter = Counter()
+    logs: list[EventoLog] = []
+    processados: list[CheckinResultado] = []
+    with transaction.atomic():
+        for codigo, inscricao_id, realizado_em in pendentes:
+            row = inscricoes.get(inscricao_id)
+            if row is None:
+                processados.append(
+                    CheckinResultado(codigo, "nao_encontrada", _("Inscrição não encontrada."), inscricao_id)
+                )
+            elif row["status"] != "confirmada":
+                processados.append(
+                    CheckinResultado(codigo, "nao_confirmada", _("Inscrição não está confirmada."), inscricao_id)
+                )
+            elif row["check_in_realizado_em"] is None and _marcar_check_in(inscricao_id, realizado_em):
+                row["check_in_realizado_em"] = realizado_em
+                presencas[evento.pk] += 1
+                logs.append(
+                    EventoLog(
+                        evento=evento,
+                        usuario_id=row["user_id"],
+                        acao="check_in",
+                        detalhes={"offline": True, "operador": getattr(operador, "pk", None)},
+                    )
+                )
+                processados.append(
+                    CheckinResultado(codigo, "ok", _("Check-in confirmado."), inscricao_id, realizado_em)
+                )
+            else:
+                processados.append(
+                    CheckinResultado(
+                        codigo,
+                        "duplicado",
+                        _("Check-in já realizado."),
+                        inscricao_id,
+                        row["check_in_realizado_em"],
+                    )
+                )
+        if presencas:
+            _contabilizar(presencas, logs)
+
+    fila = iter(processados)
+    return [resultado if resultado is not None else next(fila) for resultado in resultados]
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _versao(momento: datetime | None) -> int:
+    return (momento - _EPOCH) // timedelta(microseconds=1) if momento else 0
+
+
+def _momento(versao: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=versao)
+
+
+def versao_manifesto(evento_id: Any) -> int:
+    """Versão do manifesto: maior ``updated_at``/``deleted_at`` das inscrições."""
+
+    ultimas = InscricaoEvento.all_objects.filter(evento_id=evento_id).aggregate(
+        alterada=Max("updated_at"),
+        removida=Max("deleted_at"),
+    )
+    return max(_versao(ultimas["alterada"]), _versao(ultimas["removida"]))
+
+
+def gerar_manifesto(evento_id: Any, *, desde: int | None = None) -> dict[str, Any]:
+    """Manifesto de check-in para validação offline nos leitores.
+
+    Traz, para cada inscrição confirmada, o id, o checksum do QRCode, o nome do
+    participante, se o pagamento foi validado e se o check-in já foi feito,
+    como listas na ordem de :data:`MANIFESTO_CAMPOS`. Com ``desde`` (a versão
+    de um manifesto anterior) só as inscrições alteradas depois dela são
+    enviadas, e as que deixaram de valer aparecem em ``removidas``.
+    """
+
+    versao = versao_manifesto(evento_id)
+    inscricoes = InscricaoEvento.all_objects.filter(evento_id=evento_id)
+    if desde:
+        limite = _momento(desde)
+        inscricoes = inscricoes.filter(Q(updated_at__gt=limite) | Q(deleted_at__gt=limite))
+
+    validas: list[list[Any]] = []
+    removidas: list[int] = []
+    for row in inscricoes.order_by("pk").values(
+        "pk",
+        "status",
+        "deleted",
+        "pagamento_validado",
+        "check_in_realizado_em",
+        "user__contato",
+        "user__nome_fantasia",
+        "user__username",
+    ):
+        if row["deleted"] or row["status"] != "confirmada":
+            removidas.append(row["pk"])
+            continue
+        nome = (row["user__contato"] or row["user__nome_fantasia"] or row["user__username"] or "").strip()
+        validas.append(
+            [
+                row["pk"],
+                InscricaoEvento.gerar_checksum(str(row["pk"])),
+                nome or "-",
+                row["pagamento_validado"],
+                row["check_in_realizado_em"] is not None,
+            ]
+        )
+
+    return {
+        "evento": str(evento_id),
+        "versao": versao,
+        "desde": desde or 0,
+        "campos": list(MANIFESTO_CAMPOS),
+        "inscricoes": validas,
+        "removidas": removidas if desde else [],
+    }
+
+
+def _chave_manifesto() -> Ed25519PrivateKey:
+    semente = getattr(settings, "CHECKIN_MANIFESTO_CHAVE", "")
+    if semente:
+        bruta = base64.b64decode(semente)
+    else:
+        bruta = salted_hmac(MANIFESTO_SALT, "ed25519", algorithm="sha256").digest()
+    return Ed25519PrivateKey.from_private_bytes(bruta)
+
+
+def chave_publica_manifesto() -> str:
+    """Chave pública Ed25519 (32 bytes, base64) com que os leitores conferem o manifesto."""
+
+    publica = _chave_manifesto().public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return base64.b64encode(publica).decode()
+
+
+def assinar_manifesto(conteudo: str) -> str:
+    """Assinatura Ed25519 (base64) do manifesto serializado, enviada em cabeçalho.
+
+    Os leitores verificam com :func:`chave_publica_manifesto`, obtida uma vez
+    enquanto online, sem precisar de nenhum segredo do servidor.
+    """
+
+    return base64.b64encode(_chave_manifesto().sign(conteudo.encode())).decode()
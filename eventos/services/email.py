@@ -1,4 +1,3 @@
-import base64
 import logging
 
 from django.conf import settings
@@ -6,12 +5,9 @@ from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
-logger = logging.getLogger(__name__)
-
+from .qrcodes import url_qrcode
 
-def _build_qrcode_data_url(qrcode_bytes: bytes) -> str:
-    encoded = base64.b64encode(qrcode_bytes).decode()
-    return f"data:image/png;base64,{encoded}"
+logger = logging.getLogger(__name__)
 
 
 def enviar_email_confirmacao_inscricao(inscricao, qrcode_bytes: bytes) -> None:
@@ -28,7 +24,7 @@ def enviar_email_confirmacao_inscricao(inscricao, qrcode_bytes: bytes) -> None:
             "inscricao": inscricao,
             "evento": inscricao.evento,
             "usuario": inscricao.user,
-            "qrcode_data_url": _build_qrcode_data_url(qrcode_bytes),
+            "qrcode_url": url_qrcode(inscricao, absolute=True),
         },
     )
     text_body = strip_tags(html_body)
@@ -0,0 +1,169 @@
+"""Fila de inscrições para eventos de alta demanda (``Evento.inscricao_em_fila``).
+
+Na abertura de um evento concorrido, a requisição apenas reserva uma vaga com
+um ``UPDATE`` condicional em :class:`~eventos.models.VagasEvento` e grava uma
+:class:`~eventos.models.ReservaInscricao` (o *ticket*). Nenhuma linha fica
+bloqueada e a transação é curta, de modo que a latência não cresce com o número
+de tentativas simultâneas. Confirmação, vínculo com a ``Transacao``, QRCode e
+e-mail são executados pela task :func:`eventos.tasks.processar_reserva_inscricao`.
+
+O contador soma as inscrições ativas e as reservas ainda na fila. Ocupar uma
+vaga é um incremento condicional; ao devolver uma vaga o contador é recontado a
+partir dessas linhas, o que também cobre inscrições anteriores à fila.
+"""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.translation import gettext as _
+
+from eventos.models import Evento, InscricaoEvento, ReservaInscricao, VagasEvento
+from pagamentos.models import Transacao
+
+from .inscricao import ProcessamentoInscricaoResultado, processar_inscricao_evento
+
+logger = logging.getLogger(__name__)
+
+
+class EventoLotado(ValueError):
+    """Não há mais vagas para reservar."""
+
+
+def _ocupar_vaga(evento: Evento) -> bool:
+    vagas = VagasEvento.objects.filter(evento_id=evento.pk)
+    if evento.participantes_maximo is not None:
+        vagas = vagas.filter(ocupadas__lt=evento.participantes_maximo)
+    return bool(vagas.update(ocupadas=F("ocupadas") + 1))
+
+
+def _possui_inscricao(evento_id: Any, user_id: Any) -> bool:
+    return InscricaoEvento.objects.filter(evento_id=evento_id, user_id=user_id).exclude(status="cancelada").exists()
+
+
+def recontar_vagas(evento_id: Any) -> None:
+    """Recalcula as vagas ocupadas a partir das inscrições ativas e das reservas na fila."""
+
+    with transaction.atomic():
+        # O bloqueio espera reservas em andamento; as contagens abaixo já as enxergam.
+        VagasEvento.objects.select_for_update().get_or_create(evento_id=evento_id)
+        inscritos = InscricaoEvento.objects.filter(evento_id=evento_id).exclude(status="cancelada").values("user_id")
+        na_fila = ReservaInscricao.objects.filter(evento_id=evento_id, status=ReservaInscricao.Status.NA_FILA).exclude(
+            user_id__in=inscritos
+        )
+        VagasEvento.objects.filter(evento_id=evento_id).update(ocupadas=inscritos.count() + na_fila.count())
+
+
+def reservar_vaga(
+    *,
+    evento: Evento,
+    user,
+    valor_pago: Decimal | None = None,
+    metodo_pagamento: str | None = None,
+    comprovante_pagamento=None,
+    transacao: Transacao | None = None,
+) -> ReservaInscricao:
+    """Reserva uma vaga para ``user`` e agenda o processamento da inscrição.
+
+    É idempotente: uma nova tentativa do mesmo usuário devolve a reserva já
+    existente. Levanta :class:`EventoLotado` quando o limite foi atingido.
+    """
+
+    # Quem já tem inscrição ativa (feita antes da fila, ou pendente de pagamento)
+    # já ocupa uma vaga no contador; a reserva só leva a inscrição ao worker.
+    ocupa_vaga = not _possui_inscricao(evento.pk, user.pk)
+    for _tentativa in range(3):
+        existente = ReservaInscricao.objects.filter(evento=evento, user=user).first()
+        if existente is not None:
+            if existente.status != ReservaInscricao.Status.RECUSADA:
+                return existente
+            existente.delete()
+        try:
+            with transaction.atomic():
+                if ocupa_vaga and not _ocupar_vaga(evento):
+                    raise EventoLotado(_("Evento lotado."))
+                reserva = ReservaInscricao.objects.create(
+                    evento=evento,
+                    user=user,
+                    valor_pago=valor_pago,
+                    metodo_pagamento=metodo_pagamento or None,
+                    comprovante_pagamento=comprovante_pagamento,
+                    transacao=transacao,
+                )
+        except IntegrityError:
+            # Requisição concorrente do mesmo usuário; o incremento foi desfeito junto.
+            # A reserva concorrente pode ser uma recusada sendo removida: tenta de novo.
+            continue
+        break
+    else:
+        raise IntegrityError("Não foi possível registrar a reserva de inscrição.")
+
+    from eventos.tasks import processar_reserva_inscricao
+
+    transaction.on_commit(lambda: processar_reserva_inscricao.delay(reserva.pk))
+    return reserva
+
+
+def processar_reserva(reserva_id: int) -> ReservaInscricao | None:
+    """Cria/confirma a inscrição de uma reserva; executado no worker."""
+
+    reserva = (
+        ReservaInscricao.objects.select_related("evento", "user", "transacao")
+        .filter(pk=reserva_id, status=ReservaInscricao.Status.NA_FILA)
+        .first()
+    )
+    if reserva is None:
+        return None
+
+    resultado = processar_inscricao_evento(
+        evento=reserva.evento,
+        user=reserva.user,
+        valor_pago=reserva.valor_pago,
+        metodo_pagamento=reserva.metodo_pagamento,
+        comprovante_pagamento=reserva.comprovante_pagamento or None,
+        transacao=reserva.transacao,
+        remover_se_falhar_confirmacao=True,
+    )
+    if resultado.status == "error":
+        reserva.status = ReservaInscricao.Status.RECUSADA
+        reserva.inscricao = None
+    else:
+        reserva.status = ReservaInscricao.Status.PROCESSADA
+        reserva.inscricao = resultado.inscricao
+    reserva.mensagem = str(resultado.message)[:255]
+    reserva.save(update_fields=["status", "inscricao", "mensagem", "updated_at"])
+    if reserva.status == ReservaInscricao.Status.RECUSADA:
+        recontar_vagas(reserva.evento_id)
+    logger.info(
+        "reserva_inscricao_processada",
+        extra={"reserva": reserva.pk, "evento": str(reserva.evento_id), "status": reserva.status},
+    )
+    return reserva
+
+
+def inscrever_ocupando_vaga(*, evento: Evento, user, **dados: Any) -> ProcessamentoInscricaoResultado:
+    """Inscrição síncrona (checkout) em evento com fila, ocupando a vaga no mesmo passo.
+
+    Levanta :class:`EventoLotado` quando o limite foi atingido; os demais
+    argumentos seguem :func:`~eventos.services.inscricao.processar_inscricao_evento`.
+    """
+
+    ocupa_vaga = not _possui_inscricao(evento.pk, user.pk)
+    with transaction.atomic():
+        if ocupa_vaga and not _ocupar_vaga(evento):
+            raise EventoLotado(_("Evento lotado."))
+        return processar_inscricao_evento(evento=evento, user=user, **dados)
+
+
+def cancelar_reserva(evento_id: Any, user_id: Any) -> None:
+    """Libera a vaga de quem cancelou a inscrição, permitindo uma nova reserva."""
+
+    ReservaInscricao.objects.filter(evento_id=evento_id, user_id=user_id).exclude(
+        status=ReservaInscricao.Status.RECUSADA
+    ).delete()
+    if VagasEvento.objects.filter(evento_id=evento_id).exists():
+        recontar_vagas(evento_id)
@@ -0,0 +1,112 @@
+"""Geração e cache dos QRCodes de inscrição.
+
+O payload (``inscricao:<id>:<checksum>``) é determinístico, então a imagem é
+endereçada pelo hash do próprio payload: cada QRCode é renderizado uma única
+vez, gravado no storage e reaproveitado a partir do cache ou do arquivo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from io import BytesIO
+
+import qrcode
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+
+from eventos.models import InscricaoEvento
+
+CACHE_TIMEOUT = 60 * 60 * 24
+STORAGE_DIR = "inscricoes/qrcodes"
+
+
+def payload_qrcode(inscricao_id) -> str:
+    inscricao_id = str(inscricao_id)
+    checksum = InscricaoEvento.gerar_checksum(inscricao_id)
+    return f"inscricao:{inscricao_id}:{checksum}" if checksum else f"inscricao:{inscricao_id}"
+
+
+def _digest(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def caminho_qrcode(inscricao_id) -> str:
+    return f"{STORAGE_DIR}/{_digest(payload_qrcode(inscricao_id))}.png"
+
+
+def _render(payload: str) -> bytes:
+    buffer = BytesIO()
+    qrcode.make(payload).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def obter_qrcode(inscricao_id) -> tuple[bytes, str]:
+    """Retorna ``(png, caminho)``, renderizando só se ainda não existir."""
+
+    payload = payload_qrcode(inscricao_id)
+    digest = _digest(payload)
+    path = f"{STORAGE_DIR}/{digest}.png"
+    cache_key = f"eventos:qrcode:{digest}"
+
+    content = cache.get(cache_key)
+    if content is None:
+        if default_storage.exists(path):
+            with default_storage.open(path, "rb") as handler:
+                content = handler.read()
+        else:
+            content = _render(payload)
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(content))
+        cache.set(cache_key, content, CACHE_TIMEOUT)
+    return content, path
+
+
+def etag_qrcode(inscricao_id) -> str:
+    return f'"{_digest(payload_qrcode(inscricao_id))}"'
+
+
+def url_qrcode(inscricao: InscricaoEvento, *, absolute: bool = False) -> str:
+    """URL do endpoint cacheado que serve o PNG da inscrição."""
+
+    url = reverse("eventos:inscricao_qrcode", args=[inscricao.uuid])
+    if absolute:
+        return f"{settings.FRONTEND_URL.rstrip('/')}{url}"
+    return url
+
+
+def gerar_qrcodes_em_lote(inscricao_ids: Iterable[int]) -> int:
+    """Gera os QRCodes que faltam e grava ``qrcode_url`` com um único ``bulk_update``."""
+
+    pendentes = list(
+        InscricaoEvento.objects.filter(pk__in=list(inscricao_ids))
+        .filter(Q(qrcode_url__isnull=True) | Q(qrcode_url=""))
+        .only("id", "qrcode_url")
+    )
+    for inscricao in pendentes:
+        _content, path = obter_qrcode(inscricao.pk)
+        inscricao.qrcode_url = default_storage.url(path)
+    InscricaoEvento.objects.bulk_update(pendentes, ["qrcode_url"], batch_size=500)
+    return len(pendentes)
+
+
+def preparar_qrcodes(inscricoes: Iterable[InscricaoEvento]) -> None:
+    """Aponta inscrições sem QRCode para o endpoint e agenda a geração em lote.
+
+    Evita renderizar e gravar imagens durante a montagem de listagens.
+    """
+
+    faltantes = []
+    for inscricao in inscricoes:
+        if not inscricao.qrcode_url:
+            inscricao.qrcode_url = url_qrcode(inscricao)
+            faltantes.append(inscricao.pk)
+    if faltantes:
+        from eventos.tasks import gerar_qrcodes_inscricoes
+
+        transaction.on_commit(lambda: gerar_qrcodes_inscricoes.delay(faltantes))
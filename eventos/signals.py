@@ -0,0 +1,30 @@
+"""Invalida os caches de eventos (calendário) quando os dados mudam."""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Evento, InscricaoEvento
+from .services.calendario import bump_data_version
+
+
+def _organizacao_id(instance) -> object | None:
+    if isinstance(instance, Evento):
+        return instance.organizacao_id
+    if InscricaoEvento.evento.is_cached(instance):
+        return instance.evento.organizacao_id
+    return Evento.all_objects.filter(pk=instance.evento_id).values_list("organizacao_id", flat=True).first()
+
+
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+@receiver(post_save, sender=InscricaoEvento)
+@receiver(post_delete, sender=InscricaoEvento)
+def invalidar_cache_eventos(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    organizacao_id = _organizacao_id(instance)
+    if organizacao_id:
+        transaction.on_commit(lambda: bump_data_version(organizacao_id))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from .services.qrcodes import gerar_qrcodes_em_lote
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def gerar_qrcodes_inscricoes(inscricao_ids: list[int]) -> int:
+    """Gera os QRCodes de listas de inscrições (importações, convites em massa)."""
+
+    total = gerar_qrcodes_em_lote(inscricao_ids)
+    logger.info("qrcodes_inscricoes_gerados", extra={"total": total})
+    return total
+
+
+@shared_task
+def processar_reserva_inscricao(reserva_id: int) -> str | None:
+    """Confirma a inscrição de uma vaga reservada em evento com fila de inscrições."""
+
+    from .services.fila_inscricao import processar_reserva
+
+    reserva = processar_reserva(reserva_id)
+    return reserva.status if reserva else None
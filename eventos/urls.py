@@ -2,35 +2,36 @@ from django.urls import path
 
 from . import views
 from .views import (
-    BriefingEventoFillView,
     BriefingEventoDetailView,
+    BriefingEventoFillView,
     BriefingTemplateCreateView,
     BriefingTemplateDeleteView,
     BriefingTemplateListView,
     BriefingTemplateSelectView,
     BriefingTemplateUpdateView,
-    EventoCancelSubscriptionView,
     EventoCancelarInscricaoModalView,
+    EventoCancelSubscriptionView,
     EventoCreateView,
     EventoDeleteView,
     EventoDetailView,
-    EventoInscritosPDFView,
+    EventoFeedbackView,
     EventoInscritosCarouselView,
+    EventoInscritosExportView,
     EventoInscritosPartialView,
-    EventoFeedbackView,
-    EventoRemoverInscritoModalView,
+    EventoInscritosPDFView,
     EventoPortfolioDeleteView,
     EventoPortfolioUpdateView,
     EventoRemoveInscritoView,
+    EventoRemoverInscritoModalView,
     EventoSubscribeView,
     EventoUpdateView,
-    InscricaoEventoCreateView,
-    InscricaoEventoPagamentoCreateView,
     InscricaoEventoCheckoutView,
+    InscricaoEventoCreateView,
+    InscricaoEventoListView,
     InscricaoEventoOverviewView,
+    InscricaoEventoPagamentoCreateView,
     InscricaoEventoUpdateView,
     InscricaoTogglePagamentoValidacaoView,
-    InscricaoEventoListView,
     inscricao_resultado,
 )
 
@@ -78,6 +79,8 @@ urlpatterns = [
     path("", views.painel_eventos, name="painel"),
     path("ultimos-30/", views.calendario_cards_ultimos_30, name="calendario"),
     path("<int:ano>/<int:mes>/", views.calendario, name="calendario_mes"),
+    path("calendario/feed/<str:token>/eventos.ics", views.calendario_ics, name="calendario_ics"),
+    path("calendario/feed/renovar/", views.calendario_ics_renovar, name="calendario_ics_renovar"),
     path("dia/<slug:dia_iso>/", views.lista_eventos, name="lista_eventos"),
     # CRUD
     path("evento/novo/", EventoCreateView.as_view(), name="evento_novo"),
@@ -103,6 +106,11 @@ urlpatterns = [
         EventoInscritosPDFView.as_view(),
         name="evento_inscritos_pdf",
     ),
+    path(
+        "evento/<uuid:pk>/inscritos/exportar/<str:formato>/",
+        EventoInscritosExportView.as_view(),
+        name="evento_inscritos_exportar",
+    ),
     path("evento/<uuid:pk>/editar/", EventoUpdateView.as_view(), name="evento_editar"),
     path("evento/<uuid:pk>/excluir/", EventoDeleteView.as_view(), name="evento_excluir"),
     path(
@@ -130,6 +138,11 @@ urlpatterns = [
         inscricao_resultado,
         name="inscricao_resultado",
     ),
+    path(
+        "inscricoes/fila/<uuid:ticket>/",
+        views.reserva_status,
+        name="reserva_status",
+    ),
     path(
         "inscricoes/<uuid:uuid>/editar/",
         InscricaoEventoUpdateView.as_view(),
@@ -180,12 +193,16 @@ urlpatterns = [
         EventoPortfolioDeleteView.as_view(),
         name="evento_portfolio_delete",
     ),
+    path("inscricoes/<uuid:uuid>/qrcode.png", views.inscricao_qrcode, name="inscricao_qrcode"),
     path("checkin/<int:pk>/", views.checkin_form, name="inscricao_checkin_form"),
     path(
         "api/inscricoes/<int:pk>/checkin/",
         views.checkin_inscricao,
         name="inscricao_checkin",
     ),
+    path("api/eventos/<uuid:pk>/checkins/", views.checkin_lote, name="evento_checkin_lote"),
+    path("api/eventos/<uuid:pk>/checkins/manifesto/", views.checkin_manifesto, name="evento_checkin_manifesto"),
+    path("api/checkins/manifesto/chave/", views.checkin_manifesto_chave, name="checkin_manifesto_chave"),
     path("api/eventos/<uuid:pk>/orcamento/", views.evento_orcamento, name="evento_orcamento"),
     path("eventos_por_dia/", views.eventos_por_dia, name="eventos_por_dia"),
     path("inscricoes/", InscricaoEventoListView.as_view(), name="inscricao_list"),
@@ -1,12 +1,11 @@
 import calendar
 import json
 from collections import Counter
-from types import SimpleNamespace
-from decimal import Decimal
-from urllib.parse import urlencode
 from datetime import date, timedelta
-from io import BytesIO
+from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any
+from urllib.parse import urlencode
 
 from django import forms
 from django.conf import settings
@@ -14,11 +13,13 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ImproperlyConfigured, PermissionDenied
-from django.core.paginator import Paginator
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
 from django.core.files.uploadedfile import UploadedFile
+from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q, Count, Model
+from django.db.models import Count, Model, Q
 from django.db.models.fields.files import FieldFile
 from django.http import (
     Http404,
@@ -26,43 +27,47 @@ from django.http import (
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotAllowed,
-    HttpResponseServerError,
     JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
 from django.utils.functional import Promise
 from django.utils.html import format_html
-from django.utils.http import urlencode
+from django.utils.http import http_date, urlencode
 from django.utils.translation import gettext_lazy as _
-from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_POST
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, TemplateView, UpdateView
 
-try:  # pragma: no cover - fallback for optional dependency
-    from xhtml2pdf import pisa
-except ImportError:  # pragma: no cover - handled at runtime
-    pisa = None
-
 from accounts.models import UserType
+from core.exports import ExportError, request_export
 from core.permissions import (
     AdminOperatorOrCoordinatorRequiredMixin,
     AdminOrOperatorRequiredMixin,
     GerenteRequiredMixin,
     NoSuperadminMixin,
+    admin_operador_ou_coordenador,
     no_superadmin_required,
 )
 from core.utils import resolve_back_href
 from notificacoes.services.email_client import send_email
+from nucleos.membership import obter_indice
+from nucleos.models import Nucleo
 from pagamentos.forms import PixCheckoutForm
 from pagamentos.models import Transacao
 from pagamentos.providers import MercadoPagoProvider
 from tokens.models import TokenAcesso
 from tokens.services import create_invite_token
 
+from . import ics
+from .exports import INSCRITOS_EXPORT
 from .forms import (
     BriefingEventoForm,
     BriefingTemplateForm,
@@ -85,12 +90,18 @@ from .models import (
     FeedbackNota,
     InscricaoEvento,
     PreRegistroConvite,
+    ReservaInscricao,
 )
 from .querysets import filter_eventos_por_usuario
+from .services import checkin as checkin_service
+from .services.calendario import agrupar_por_dia, eventos_no_periodo
+from .services.fila_inscricao import EventoLotado, inscrever_ocupando_vaga, reservar_vaga
 from .services.inscricao import processar_inscricao_evento
+from .services.qrcodes import etag_qrcode, obter_qrcode, preparar_qrcodes
 
 User = get_user_model()
 
+QRCODE_MAX_AGE = 60 * 60 * 24 * 30
 EVENTO_CAROUSEL_PAGE_SIZE = 6
 MINHAS_INSCRICOES_ALLOWED_TYPES = {
     UserType.ASSOCIADO.value,
@@ -106,8 +117,7 @@ MINHAS_INSCRICOES_ALLOWED_TYPES = {
 
 
 def _queryset_por_organizacao(request):
-    qs = Evento.objects.prefetch_related("inscricoes").all()
-    return filter_eventos_por_usuario(qs, request.user)
+    return filter_eventos_por_usuario(Evento.objects.all(), request.user)
 
 
 def _get_tipo_usuario(user) -> str | None:
@@ -261,28 +271,7 @@ class BriefingTemplateSelectForm(forms.Form):
 def _get_nucleos_coordenacao_consultoria_ids(user) -> set[int]:
     """Retorna os IDs de núcleos em que o usuário atua como coordenador ou consultor."""
 
-    nucleo_ids: set[int] = set()
-
-    # Núcleo principal vinculado ao usuário (campo ``nucleo``)
-    nucleo_id = getattr(user, "nucleo_id", None)
-    if nucleo_id:
-        nucleo_ids.add(nucleo_id)
-
-    participacoes = getattr(user, "participacoes", None)
-    if participacoes is not None:
-        coordenacoes = participacoes.filter(
-            papel="coordenador",
-            status="ativo",
-            status_suspensao=False,
-        ).values_list("nucleo_id", flat=True)
-        nucleo_ids.update(pk for pk in coordenacoes if pk)
-
-    nucleos_consultoria = getattr(user, "nucleos_consultoria", None)
-    if nucleos_consultoria is not None:
-        consultoria_ids = nucleos_consultoria.values_list("id", flat=True)
-        nucleo_ids.update(pk for pk in consultoria_ids if pk)
-
-    return nucleo_ids
+    return set(obter_indice(user).coordenacao_ou_consultoria)
 
 
 def _resolve_planejamento_permissions(user):
@@ -301,10 +290,7 @@ def _resolve_planejamento_permissions(user):
 
 
 def get_evento_base_queryset(request):
-    qs = (
-        Evento.objects.select_related("nucleo", "organizacao")
-        .prefetch_related("inscricoes")
-    )
+    qs = Evento.objects.select_related("nucleo", "organizacao")
     qs = filter_eventos_por_usuario(qs, request.user)
     q = request.GET.get("q", "").strip()
     if q:
@@ -363,16 +349,7 @@ def build_evento_carousel_sections(
     if status_filter not in {"ativos", "realizados", "planejamento", "cancelados"}:
         status_filter = "todos"
 
-    annotated_base = base_queryset.annotate(
-        num_inscritos=Count(
-            "inscricoes",
-            filter=Q(
-                inscricoes__status="confirmada",
-                inscricoes__deleted=False,
-            ),
-            distinct=True,
-        )
-    )
+    annotated_base = base_queryset.com_contagem_inscricoes().com_inscricao_do_usuario(request.user)
 
     sections_order = ["ativos"]
     if can_view_planejamento_cancelados:
@@ -472,16 +449,7 @@ class EventoListView(LoginRequiredMixin, NoSuperadminMixin, ListView):
             qs = qs.filter(status=Evento.Status.CONCLUIDO)
         elif status_filter == "ativos":
             qs = qs.filter(status=Evento.Status.ATIVO)
-        return qs.annotate(
-            num_inscritos=Count(
-                "inscricoes",
-                filter=Q(
-                    inscricoes__status="confirmada",
-                    inscricoes__deleted=False,
-                ),
-                distinct=True,
-            )
-        ).order_by("-data_inicio")
+        return qs.com_contagem_inscricoes().com_inscricao_do_usuario(self.request.user).order_by("-data_inicio")
 
     # ----- Contexto -----
     def get_context_data(self, **kwargs):
@@ -577,16 +545,7 @@ class EventoListView(LoginRequiredMixin, NoSuperadminMixin, ListView):
         ctx["total_eventos_cancelados"] = restringe_planejamento_cancelados(
             base_qs.filter(cancelados_filter)
         ).count()
-        annotated_base = base_qs.annotate(
-            num_inscritos=Count(
-                "inscricoes",
-                filter=Q(
-                    inscricoes__status="confirmada",
-                    inscricoes__deleted=False,
-                ),
-                distinct=True,
-            )
-        )
+        annotated_base = base_qs.com_contagem_inscricoes().com_inscricao_do_usuario(user)
         ctx["eventos_planejamento"] = restringe_planejamento_cancelados(
             annotated_base.filter(planejamento_filter)
         ).order_by("data_inicio")
@@ -697,9 +656,7 @@ class EventoListView(LoginRequiredMixin, NoSuperadminMixin, ListView):
                 if valor_exibicao is None:
                     valor_exibicao = inscricao.get_valor_evento()
                 inscricao.valor_exibicao = valor_exibicao
-                if not inscricao.qrcode_url:
-                    inscricao.gerar_qrcode()
-                    inscricao.save(update_fields=["qrcode_url"])
+            preparar_qrcodes(minhas_inscricoes)
 
         ctx["minhas_inscricoes"] = minhas_inscricoes
         ctx["show_minhas_inscricoes_card"] = show_minhas_inscricoes_card
@@ -763,6 +720,24 @@ class EventoListCarouselView(LoginRequiredMixin, NoSuperadminMixin, View):
 # ---------------------------------------------------------------------------
 
 
+def _ics_feeds(request) -> list[dict[str, str]]:
+    """Links ``webcal://`` da organização e dos núcleos do usuário."""
+
+    user = request.user
+    if not getattr(user, "organizacao_id", None):
+        return []
+
+    def _webcal(url: str) -> str:
+        return "webcal://" + request.build_absolute_uri(url).split("://", 1)[1]
+
+    feeds = [{"label": _("Eventos da organização"), "url": _webcal(ics.feed_url(user))}]
+    nucleos_qs = getattr(user, "nucleos", None)
+    if nucleos_qs is not None:
+        for nucleo_id, nome in nucleos_qs.values_list("id", "nome"):
+            feeds.append({"label": nome, "url": _webcal(ics.feed_url(user, nucleo_id=nucleo_id))})
+    return feeds
+
+
 @login_required
 @no_superadmin_required
 def calendario(request, ano: int | None = None, mes: int | None = None):
@@ -778,17 +753,7 @@ def calendario(request, ano: int | None = None, mes: int | None = None):
     cal = calendar.Calendar(firstweekday=0)
     dias_iterados = list(cal.itermonthdates(ano, mes))
     inicio_periodo, fim_periodo = dias_iterados[0], dias_iterados[-1]
-    eventos_qs = (
-        _queryset_por_organizacao(request)
-        .filter(data_inicio__date__range=(inicio_periodo, fim_periodo))
-        .select_related("organizacao")
-        .prefetch_related("inscricoes")
-        .order_by("data_inicio")
-    )
-    eventos_por_dia: dict[date, list[Evento]] = {}
-    for ev in eventos_qs:
-        d = timezone.localtime(ev.data_inicio).date()
-        eventos_por_dia.setdefault(d, []).append(ev)
+    eventos_por_dia = agrupar_por_dia(eventos_no_periodo(request.user, inicio_periodo, fim_periodo))
 
     highlight_schemes = [
         {
@@ -859,6 +824,7 @@ def calendario(request, ano: int | None = None, mes: int | None = None):
         "title": _("Calendário mensal"),
         "subtitle": None,
         "calendario_url": reverse("eventos:calendario"),
+        "ics_feeds": _ics_feeds(request),
     }
     return TemplateResponse(request, "eventos/calendario_mes.html", context)
 
@@ -870,17 +836,7 @@ def calendario_cards_ultimos_30(request):
         return HttpResponseForbidden()
     hoje = timezone.localdate()
     fim = hoje + timedelta(days=30)
-    qs = (
-        _queryset_por_organizacao(request)
-        .filter(data_inicio__date__range=(hoje, fim))
-        .select_related("organizacao")
-        .prefetch_related("inscricoes")
-        .order_by("data_inicio")
-    )
-    agrupado: dict[date, list[Evento]] = {}
-    for ev in qs:
-        d = timezone.localtime(ev.data_inicio).date()
-        agrupado.setdefault(d, []).append(ev)
+    agrupado = agrupar_por_dia(eventos_no_periodo(request.user, hoje, fim))
     dias_com_eventos = [
         {"data": d, "eventos": evs} for d, evs in sorted(agrupado.items(), key=lambda x: x[0])
     ]
@@ -903,14 +859,8 @@ def lista_eventos(request, dia_iso: str):
         return HttpResponseBadRequest("Parâmetro 'dia' inválido.")
     if getattr(request.user, "user_type", None) == UserType.ROOT:
         return HttpResponseForbidden()
-    eventos = (
-        _queryset_por_organizacao(request)
-        .filter(data_inicio__date=dia)
-        .select_related("organizacao", "nucleo")
-        .prefetch_related("inscricoes")
-        .order_by("data_inicio")
-    )
-    context = {"dia": dia, "eventos": list(eventos), "title": _("Eventos"), "subtitle": None}
+    eventos = eventos_no_periodo(request.user, dia, dia)
+    context = {"dia": dia, "eventos": eventos, "title": _("Eventos"), "subtitle": None}
     return TemplateResponse(
         request,
         "eventos/partials/calendario/_lista_eventos_dia.html",
@@ -924,6 +874,75 @@ def painel_eventos(request):
     return calendario_cards_ultimos_30(request)
 
 
+@transaction.non_atomic_requests
+def calendario_ics(request, token: str):
+    """Feed ICS assinável (sem sessão) identificado por um token assinado.
+
+    Antes de qualquer resposta, uma leitura da linha do usuário confirma que
+    ele segue ativo na organização e que o link não foi renovado. O ETag
+    depende do token, da versão de dados da organização e da versão dos
+    vínculos do usuário, então consultas repetidas dos aplicativos de agenda
+    recebem ``304`` sem gerar o feed; o conteúdo completo fica em cache até a
+    próxima alteração.
+    """
+    try:
+        dados = ics.load_feed_token(token)
+    except signing.BadSignature as exc:
+        raise Http404("Feed inválido") from exc
+
+    organizacao_id = dados["o"]
+    versao_feed = (
+        User.objects.filter(pk=dados["u"], is_active=True, organizacao_id=organizacao_id)
+        .values_list("calendario_feed_versao", flat=True)
+        .first()
+    )
+    if versao_feed is None or versao_feed != dados.get("v", 0):
+        raise Http404("Feed inválido")
+
+    etag = ics.feed_etag(token, ics.current_version(organizacao_id), ics.vinculos_version(dados["u"]))
+    last_modified = int(ics.feed_last_modified(etag).timestamp())
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "private, max-age=300",
+    }
+    condicional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if condicional is not None:
+        for header, valor in headers.items():
+            condicional.headers.setdefault(header, valor)
+        return condicional
+
+    content_type = "text/calendar; charset=utf-8"
+    conteudo = cache.get(ics.feed_cache_key(etag))
+    if conteudo is not None:
+        return HttpResponse(conteudo, content_type=content_type, headers=headers)
+
+    user = User.objects.select_related("organizacao").get(pk=dados["u"])
+    nucleo_id = dados.get("n")
+    nome = user.organizacao.nome if user.organizacao else ""
+    if nucleo_id:
+        nome = Nucleo.objects.filter(pk=nucleo_id).values_list("nome", flat=True).first() or nome
+    chunks = ics.iter_feed(user, nucleo_id=nucleo_id, nome=nome)
+    response = StreamingHttpResponse(
+        ics.cached_iter(chunks, ics.feed_cache_key(etag)),
+        content_type=content_type,
+        headers=headers,
+    )
+    response["Content-Disposition"] = 'inline; filename="eventos.ics"'
+    return response
+
+
+@login_required
+@no_superadmin_required
+@require_POST
+def calendario_ics_renovar(request):
+    """Gera novos links de assinatura, invalidando os já compartilhados."""
+
+    ics.renovar_feeds(request.user)
+    messages.success(request, _("Links de assinatura do calendário renovados."))
+    return redirect("eventos:calendario")
+
+
 # ---------------------------------------------------------------------------
 # Briefings
 # ---------------------------------------------------------------------------
@@ -1056,7 +1075,7 @@ class BriefingTemplateSelectView(
                     "organizacao",
                     "nucleo",
                     "briefing__template",
-                ).prefetch_related("inscricoes"),
+                ),
                 request.user,
             ),
             pk=kwargs.get("evento_id"),
@@ -1440,10 +1459,7 @@ class EventoDetailView(LoginRequiredMixin, NoSuperadminMixin, DetailView):
         return qs
 
     def get_queryset(self):
-        base = (
-            Evento.objects.select_related("organizacao")
-            .prefetch_related("inscricoes", "feedbacks", "midias__tags")
-        )
+        base = Evento.objects.select_related("organizacao").prefetch_related("feedbacks", "midias__tags")
         return filter_eventos_por_usuario(base, self.request.user)
 
     def get_context_data(self, **kwargs):
@@ -1470,9 +1486,7 @@ class EventoDetailView(LoginRequiredMixin, NoSuperadminMixin, DetailView):
             if valor_exibicao is None:
                 valor_exibicao = minha_inscricao.get_valor_evento()
             minha_inscricao.valor_exibicao = valor_exibicao
-            if not minha_inscricao.qrcode_url:
-                minha_inscricao.gerar_qrcode()
-                minha_inscricao.save(update_fields=["qrcode_url"])
+            preparar_qrcodes([minha_inscricao])
         context["inscricao"] = minha_inscricao
         context["inscricao_permitida"] = evento.status == Evento.Status.ATIVO
         context["back_href"] = self._resolve_back_href()
@@ -1757,84 +1771,32 @@ class EventoDetailView(LoginRequiredMixin, NoSuperadminMixin, DetailView):
         return resolve_back_href(request, fallback=fallback)
 
 
-class EventoInscritosPDFView(LoginRequiredMixin, NoSuperadminMixin, DetailView):
+class EventoInscritosExportView(LoginRequiredMixin, NoSuperadminMixin, DetailView):
+    """Solicita a exportação da lista de inscritos e redireciona para o download.
+
+    A geração acontece em um worker (``core.exports``); enquanto o arquivo não
+    estiver pronto, o usuário acompanha o andamento na página de status.
+    """
+
     model = Evento
+    formato = "pdf"
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
         if not _usuario_pode_ver_inscritos(request.user, self.object):
             raise PermissionDenied
-        inscricoes_queryset = (
-            InscricaoEvento.objects.filter(
-                evento=self.object,
-                status="confirmada",
-                deleted=False,
-            )
-            .select_related("user")
-            .order_by("user__contato", "user__nome_fantasia", "user__username")
-        )
-
-        def _inscricao_sort_key(inscricao: InscricaoEvento) -> tuple[str, int]:
-            user = inscricao.user
-            candidates = [
-                getattr(user, "contato", None),
-                getattr(user, "display_name", None),
-                user.get_full_name() if hasattr(user, "get_full_name") else None,
-                getattr(user, "username", None),
-            ]
-            for candidate in candidates:
-                if callable(candidate):
-                    candidate = candidate()
-                if candidate:
-                    return (str(candidate).strip().casefold(), inscricao.pk or 0)
-            return ("", inscricao.pk or 0)
-
-        def _resolve_participante_nome(inscricao: InscricaoEvento) -> str:
-            user = inscricao.user
-            for candidate in (
-                getattr(user, "contato", None),
-                getattr(user, "display_name", None),
-                user.get_full_name if hasattr(user, "get_full_name") else None,
-                getattr(user, "username", None),
-            ):
-                if callable(candidate):
-                    candidate = candidate()
-                if candidate:
-                    return str(candidate).strip()
-            return "-"
-
-        inscricoes = sorted(inscricoes_queryset, key=_inscricao_sort_key)
-        for inscricao in inscricoes:
-            inscricao.participante_nome = _resolve_participante_nome(inscricao)
-        contexto = {
-            "evento": self.object,
-            "inscricoes": inscricoes,
-            "generated_at": timezone.localtime(),
-        }
-        if pisa is None:
-            raise ImproperlyConfigured("xhtml2pdf precisa estar instalado para gerar PDFs.")
-
-        rendered_html = render_to_string(
-            "eventos/pdf/inscritos.html",
-            contexto,
-            request=request,
-        )
+        formato = kwargs.get("formato", self.formato)
+        try:
+            job = request_export(INSCRITOS_EXPORT, self.object.pk, formato, user=request.user)
+        except ExportError as exc:
+            raise Http404(str(exc)) from exc
+        if job.ready:
+            return redirect("core:exportacao_download", job_id=job.job_id)
+        return redirect("core:exportacao_status", job_id=job.job_id)
 
-        pdf_buffer = BytesIO()
-        pdf_result = pisa.CreatePDF(
-            rendered_html,
-            dest=pdf_buffer,
-            encoding="utf-8",
-        )
-        if getattr(pdf_result, "err", False):
-            return HttpResponseServerError("Não foi possível gerar o PDF de inscritos.")
 
-        response = HttpResponse(pdf_buffer.getvalue(), content_type="application/pdf")
-        slug = getattr(self.object, "slug", None) or str(self.object.pk)
-        response["Content-Disposition"] = (
-            f'attachment; filename="inscritos-{slug}.pdf"'
-        )
-        return response
+class EventoInscritosPDFView(EventoInscritosExportView):
+    formato = "pdf"
 
 
 class EventoInscritosPartialView(EventoDetailView):
@@ -2018,6 +1980,8 @@ class EventoSubscribeView(EventoInscricaoActionMixin, LoginRequiredMixin, NoSupe
         if _get_tipo_usuario(request.user) == UserType.ADMIN.value:
             messages.error(request, _("Administradores não podem se inscrever em eventos."))  # pragma: no cover
             return self._redirect(request, pk)
+        if evento.inscricao_em_fila:
+            return _reservar_vaga_e_redirecionar(request, evento)
         resultado = processar_inscricao_evento(
             evento=evento,
             user=request.user,
@@ -2456,6 +2420,14 @@ class InscricaoEventoCreateView(InscricaoEventoBaseView, CreateView):
         return context
 
     def form_valid(self, form):
+        if self.evento.inscricao_em_fila:
+            return _reservar_vaga_e_redirecionar(
+                self.request,
+                self.evento,
+                valor_pago=form.cleaned_data.get("valor_pago"),
+                metodo_pagamento=form.cleaned_data.get("metodo_pagamento"),
+                comprovante_pagamento=form.cleaned_data.get("comprovante_pagamento"),
+            )
         resultado = processar_inscricao_evento(
             evento=self.evento,
             user=self.request.user,
@@ -2659,15 +2631,34 @@ class InscricaoEventoPagamentoCreateView(InscricaoEventoCreateView):
             metodo_pagamento = transacao.metodo
             form.cleaned_data["metodo_pagamento"] = metodo_pagamento
 
-        resultado = processar_inscricao_evento(
-            evento=self.evento,
-            user=self.request.user,
-            valor_pago=form.cleaned_data.get("valor_pago"),
-            metodo_pagamento=metodo_pagamento,
-            comprovante_pagamento=form.cleaned_data.get("comprovante_pagamento"),
-            transacao=transacao,
-            exigir_checkout_aprovado=self._checkout_required(metodo_pagamento),
-        )
+        dados = {
+            "valor_pago": form.cleaned_data.get("valor_pago"),
+            "metodo_pagamento": metodo_pagamento,
+            "comprovante_pagamento": form.cleaned_data.get("comprovante_pagamento"),
+            "transacao": transacao,
+        }
+        checkout_required = self._checkout_required(metodo_pagamento)
+        if self.evento.inscricao_em_fila and not checkout_required:
+            return _reservar_vaga_e_redirecionar(self.request, self.evento, **dados)
+        if self.evento.inscricao_em_fila:
+            # O checkout precisa da inscrição na hora; a vaga é ocupada no mesmo passo.
+            try:
+                resultado = inscrever_ocupando_vaga(
+                    evento=self.evento,
+                    user=self.request.user,
+                    exigir_checkout_aprovado=True,
+                    **dados,
+                )
+            except EventoLotado as exc:
+                messages.error(self.request, str(exc))
+                return redirect("eventos:evento_detalhe", pk=self.evento.pk)
+        else:
+            resultado = processar_inscricao_evento(
+                evento=self.evento,
+                user=self.request.user,
+                exigir_checkout_aprovado=checkout_required,
+                **dados,
+            )
         self.object = resultado.inscricao
         getattr(messages, resultado.status)(self.request, resultado.message)
         return self._redirect_to_result(status=resultado.status, message=resultado.message)
@@ -2871,11 +2862,76 @@ def inscricao_resultado(request, uuid: str):
     return TemplateResponse(request, "eventos/inscricoes/resultado.html", context)
 
 
+def _reservar_vaga_e_redirecionar(request, evento: Evento, **dados):
+    """Inscrição em evento com fila: reserva a vaga e leva ao acompanhamento do ticket."""
+
+    try:
+        reserva = reservar_vaga(evento=evento, user=request.user, **dados)
+    except EventoLotado as exc:
+        messages.error(request, str(exc))
+        return redirect("eventos:evento_detalhe", pk=evento.pk)
+    return redirect("eventos:reserva_status", ticket=reserva.ticket)
+
+
+@login_required
+@no_superadmin_required
+def reserva_status(request, ticket: str):
+    """Acompanha o processamento de uma reserva; a página consulta o status via htmx."""
+
+    reserva = get_object_or_404(
+        ReservaInscricao.objects.select_related("evento", "inscricao"),
+        ticket=ticket,
+        user=request.user,
+    )
+    if reserva.status == ReservaInscricao.Status.PROCESSADA and reserva.inscricao:
+        url = reverse("eventos:inscricao_resultado", kwargs={"uuid": reserva.inscricao.uuid})
+        url = f"{url}?{urlencode({'message': reserva.mensagem})}"
+        if request.headers.get("HX-Request"):
+            response = HttpResponse(status=204)
+            response["HX-Redirect"] = url
+            return response
+        return redirect(url)
+
+    context = {
+        "reserva": reserva,
+        "evento": reserva.evento,
+        "status_url": reverse("eventos:reserva_status", kwargs={"ticket": reserva.ticket}),
+        "title": _("Status da inscrição"),
+    }
+    template = (
+        "eventos/inscricoes/partials/reserva_status.html"
+        if request.headers.get("HX-Request")
+        else "eventos/inscricoes/reserva_status.html"
+    )
+    return TemplateResponse(request, template, context)
+
+
+def inscricao_qrcode(request, uuid: str):
+    """Serve o PNG do QRCode da inscrição com cache HTTP.
+
+    O UUID da inscrição não é enumerável e o conteúdo nunca muda para a mesma
+    inscrição, então a resposta é pública e cacheável (usada nos e-mails).
+    """
+    inscricao = get_object_or_404(InscricaoEvento.objects.only("id", "uuid"), uuid=uuid)
+    etag = etag_qrcode(inscricao.pk)
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponse(status=304)
+    else:
+        content, _path = obter_qrcode(inscricao.pk)
+        response = HttpResponse(content, content_type="image/png")
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={QRCODE_MAX_AGE}, immutable"
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Check-in de inscrições (reintroduzido após refatoração)
 # ---------------------------------------------------------------------------
 
 
+_CHECKIN_FORM_STAFF = {UserType.ADMIN.value, UserType.COORDENADOR.value}
+
+
 @login_required
 @no_superadmin_required
 def checkin_form(request, pk: int):
@@ -2883,8 +2939,7 @@ def checkin_form(request, pk: int):
 
     A URL usa o PK da inscrição. Validamos que o usuário pertence à mesma
     organização do evento. Permitimos acesso ao próprio inscrito ou a usuários
-    de staff (ADMIN / COORDENADOR / GERENTE) da mesma organização. Outros
-    recebem 403.
+    de staff (ADMIN / COORDENADOR) da mesma organização. Outros recebem 403.
     """
     inscricao = get_object_or_404(InscricaoEvento.objects.select_related("evento", "user"), pk=pk)
     evento = inscricao.evento
@@ -2893,10 +2948,7 @@ def checkin_form(request, pk: int):
     if evento.organizacao != getattr(user, "organizacao", None):
         return HttpResponseForbidden()
     # Regras simples de permissão: o próprio usuário inscrito ou staff
-    staff_tipos = {UserType.ADMIN.value, UserType.COORDENADOR.value}
-    if hasattr(UserType, "GERENTE"):
-        staff_tipos.add(UserType.GERENTE.value)
-    if user != inscricao.user and _get_tipo_usuario(user) not in staff_tipos:
+    if user != inscricao.user and _get_tipo_usuario(user) not in _CHECKIN_FORM_STAFF:
         return HttpResponseForbidden()
     context = {
         "evento": evento,
@@ -2918,38 +2970,110 @@ def checkin_inscricao(request, pk: int):
     """
     if request.method != "POST":  # pragma: no cover - apenas POST suportado
         return HttpResponseBadRequest("Método não suportado.")
-    inscricao = get_object_or_404(InscricaoEvento.objects.select_related("evento", "user"), pk=pk)
-    evento = inscricao.evento
-    user = request.user
-    if evento.organizacao != getattr(user, "organizacao", None):
-        return HttpResponseForbidden()
-    codigo = request.POST.get("codigo", "").strip()
-    # Código esperado começa com 'inscricao:' e conter o pk da inscrição
-    if not codigo or "inscricao:" not in codigo:
-        return HttpResponseBadRequest("Código inválido.")
-
-    partes_codigo = codigo.split(":", 2)
-    if len(partes_codigo) < 2 or not partes_codigo[1]:
+    # O checksum é conferido em memória antes de qualquer consulta ao banco.
+    try:
+        codigo_inscricao = checkin_service.validar_codigo(request.POST.get("codigo", ""), exigir_checksum=False)
+    except checkin_service.CodigoInvalido:
         return HttpResponseBadRequest("Código inválido.")
-
-    codigo_inscricao = partes_codigo[1]
-    checksum = partes_codigo[2] if len(partes_codigo) > 2 else None
-
-    if str(inscricao.pk) != codigo_inscricao:
+    if codigo_inscricao != pk:
         return HttpResponseBadRequest("Código inválido.")
 
-    if checksum and not checksum.startswith("{"):
-        expected = InscricaoEvento.gerar_checksum(str(inscricao.pk))
-        if checksum != expected:
-            return HttpResponseBadRequest("Código inválido.")
+    inscricao = get_object_or_404(
+        InscricaoEvento.objects.only(
+            "id",
+            "status",
+            "check_in_realizado_em",
+            "user_id",
+            "evento_id",
+            "evento__organizacao_id",
+        ).select_related("evento"),
+        pk=pk,
+    )
+    if inscricao.evento.organizacao_id != getattr(request.user, "organizacao_id", None):
+        return HttpResponseForbidden()
     if inscricao.status != "confirmada":
         return HttpResponseBadRequest("Inscrição não está confirmada.")
-    if inscricao.check_in_realizado_em:
+    if not inscricao.realizar_check_in():
         return JsonResponse({"status": "ok", "message": "Check-in já realizado."})
-    inscricao.realizar_check_in()
     return JsonResponse({"status": "ok"})
 
 
+@login_required
+@no_superadmin_required
+def checkin_lote(request, pk):
+    """Endpoint API (POST) para sincronizar check-ins feitos offline.
+
+    Recebe um JSON ``{"checkins": [{"codigo": ..., "realizado_em": ...}]}``
+    com as leituras acumuladas pelo leitor e devolve o resultado de cada item
+    na mesma ordem. Restrito à equipe da organização do evento.
+    """
+    if request.method != "POST":  # pragma: no cover - apenas POST suportado
+        return HttpResponseBadRequest("Método não suportado.")
+    evento = get_object_or_404(Evento.objects.only("id", "organizacao_id"), pk=pk)
+    user = request.user
+    if evento.organizacao_id != getattr(user, "organizacao_id", None):
+        return HttpResponseForbidden()
+    if not admin_operador_ou_coordenador(user):
+        return HttpResponseForbidden()
+    try:
+        itens = json.loads(request.body or b"{}").get("checkins")
+    except (ValueError, AttributeError):
+        itens = None
+    if not isinstance(itens, list) or not all(isinstance(item, dict) for item in itens):
+        return HttpResponseBadRequest("Lote inválido.")
+    if len(itens) > checkin_service.MAX_LOTE:
+        return HttpResponseBadRequest("Lote muito grande.")
+
+    resultados = checkin_service.registrar_check_ins_em_lote(itens, evento=evento, operador=user)
+    return JsonResponse(
+        {
+            "status": "ok",
+            "registrados": sum(1 for resultado in resultados if resultado.status == "ok"),
+            "resultados": [resultado.as_dict() for resultado in resultados],
+        }
+    )
+
+
+@login_required
+@no_superadmin_required
+@gzip_page
+def checkin_manifesto(request, pk):
+    """Manifesto (JSON compactado) para validar check-ins offline.
+
+    Aceita ``?desde=<versao>`` para baixar apenas as alterações desde o
+    manifesto anterior. O cabeçalho ``X-Manifesto-Assinatura`` traz a
+    assinatura Ed25519 do corpo, conferida pelo leitor com a chave pública de
+    :func:`checkin_manifesto_chave` antes de usá-lo.
+    """
+    evento = get_object_or_404(Evento.objects.only("id", "organizacao_id"), pk=pk)
+    user = request.user
+    if evento.organizacao_id != getattr(user, "organizacao_id", None):
+        return HttpResponseForbidden()
+    if not admin_operador_ou_coordenador(user):
+        return HttpResponseForbidden()
+    desde = request.GET.get("desde", "")
+    if desde and not desde.isdigit():
+        return HttpResponseBadRequest("Versão inválida.")
+
+    manifesto = checkin_service.gerar_manifesto(evento.pk, desde=int(desde) if desde else None)
+    conteudo = json.dumps(manifesto, separators=(",", ":"), ensure_ascii=False)
+    response = HttpResponse(conteudo, content_type="application/json")
+    response["X-Manifesto-Versao"] = str(manifesto["versao"])
+    response["X-Manifesto-Assinatura"] = checkin_service.assinar_manifesto(conteudo)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@login_required
+@no_superadmin_required
+def checkin_manifesto_chave(request):
+    """Chave pública que os leitores guardam para verificar manifestos offline."""
+
+    if not admin_operador_ou_coordenador(request.user):
+        return HttpResponseForbidden()
+    return JsonResponse({"algoritmo": "Ed25519", "chave_publica": checkin_service.chave_publica_manifesto()})
+
+
 # ---------------------------------------------------------------------------
 # Convites para eventos
 # ---------------------------------------------------------------------------
@@ -3139,13 +3263,7 @@ def eventos_por_dia(request):
         return HttpResponseBadRequest("Data inválida.")
     if getattr(request.user, "user_type", None) == UserType.ROOT:
         return HttpResponseForbidden()
-    eventos = (
-        _queryset_por_organizacao(request)
-        .filter(data_inicio__date=dia)
-        .select_related("organizacao", "nucleo")
-        .prefetch_related("inscricoes")
-        .order_by("data_inicio")
-    )
-    context = {"dia": dia, "eventos": list(eventos), "title": _("Eventos"), "subtitle": None}
+    eventos = eventos_no_periodo(request.user, dia, dia)
+    context = {"dia": dia, "eventos": eventos, "title": _("Eventos"), "subtitle": None}
     template = "eventos/partials/calendario/_lista_eventos_dia.html"
     return TemplateResponse(request, template, context)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from django.db.models import QuerySet
 
 from accounts.models import UserType
+from nucleos.membership import obter_indice
 from nucleos.models import Nucleo
 from nucleos.permissions import can_manage_feed
 
@@ -22,21 +23,7 @@ def get_allowed_nucleos_for_user(user) -> QuerySet[Nucleo]:
             return Nucleo.objects.filter(organizacao_id=organizacao_id)
         return Nucleo.objects.none()
 
-    nucleo_ids: set[int] = set()
-
-    participacoes = getattr(user, "participacoes", None)
-    if participacoes is not None:
-        nucleo_ids.update(
-            participacoes.filter(status="ativo", status_suspensao=False).values_list("nucleo_id", flat=True)
-        )
-
-    nucleo_id = getattr(user, "nucleo_id", None)
-    if nucleo_id:
-        nucleo_ids.add(nucleo_id)
-
-    nucleos_consultoria = getattr(user, "nucleos_consultoria", None)
-    if nucleos_consultoria is not None:
-        nucleo_ids.update(nucleos_consultoria.filter(deleted=False).values_list("id", flat=True))
+    nucleo_ids = obter_indice(user).nucleos_vinculados
 
     if not nucleo_ids and can_manage_feed(user):
         return Nucleo.objects.none()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.translation import gettext as _
+from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.models import UserType
+
+from .importacao import ImportacaoError, carregar_progresso, formato_planilha, iniciar_importacao, ler_planilha
+from .promocao import OperacaoPromocao, promover_em_lote
+from .serializers import OperacaoPromocaoSerializer
+
+User = get_user_model()
+
+
+class IsAdminOuOperador(IsAuthenticated):
+    """Mesmos perfis da tela de promoção de membros."""
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        return request.user.get_tipo_usuario in {UserType.ADMIN.value, UserType.OPERADOR.value}
+
+
+def _ler_planilha(arquivo) -> list[dict[str, Any]]:
+    """Linhas de uma planilha com cabeçalho ``usuario,papel,nucleo,papel_coordenador``."""
+
+    try:
+        formato = formato_planilha(arquivo.name)
+    except ImportacaoError as exc:
+        raise ValidationError({"arquivo": [str(exc)]}) from exc
+    return [{**linha, "nucleo": linha.get("nucleo") or None} for linha in ler_planilha(arquivo, formato)]
+
+
+class PromocaoLoteAPIView(APIView):
+    """Promove membros em lote a partir de JSON (``operacoes``) ou de uma planilha CSV/XLSX (``arquivo``)."""
+
+    permission_classes = [IsAdminOuOperador]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        organizacao = getattr(request.user, "organizacao", None)
+        if organizacao is None:
+            raise PermissionDenied(_("É necessário pertencer a uma organização para promover membros."))
+
+        arquivo = request.FILES.get("arquivo")
+        linhas = _ler_planilha(arquivo) if arquivo else request.data.get("operacoes") or []
+        serializer = OperacaoPromocaoSerializer(data=linhas, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        # E-mails resolvidos em uma única consulta.
+        emails = {linha["usuario"].lower() for linha in serializer.validated_data if "@" in linha["usuario"]}
+        por_email = {
+            email.lower(): pk
+            for email, pk in User.objects.filter(organizacao=organizacao, email__in=emails).values_list("email", "pk")
+        }
+        erros: list[str] = []
+        operacoes: list[OperacaoPromocao] = []
+        for linha in serializer.validated_data:
+            identificador = linha["usuario"].strip()
+            user_id = por_email.get(identificador.lower()) if "@" in identificador else None
+            if user_id is None and identificador.isdigit():
+                user_id = int(identificador)
+            if user_id is None:
+                erros.append(_("Usuário %(id)s não encontrado na organização.") % {"id": identificador})
+                continue
+            operacoes.append(
+                OperacaoPromocao(
+                    user_id=user_id,
+                    papel=linha["papel"],
+                    nucleo_id=linha["nucleo"],
+                    papel_coordenador=linha["papel_coordenador"],
+                )
+            )
+        if erros:
+            return Response({"erros": erros}, status=status.HTTP_400_BAD_REQUEST)
+
+        resultado = promover_em_lote(organizacao, operacoes)
+        if not resultado.ok:
+            return Response({"erros": resultado.erros}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                "usuarios_atualizados": resultado.usuarios_atualizados,
+                "participacoes_criadas": resultado.participacoes_criadas,
+                "participacoes_atualizadas": resultado.participacoes_atualizadas,
+                "nucleos_atualizados": resultado.nucleos_atualizados,
+            }
+        )
+
+
+class ImportacaoMembrosAPIView(APIView):
+    """Recebe uma planilha (``arquivo``) de membros e agenda a importação em lote."""
+
+    permission_classes = [IsAdminOuOperador]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        organizacao = getattr(request.user, "organizacao", None)
+        if organizacao is None:
+            raise PermissionDenied(_("É necessário pertencer a uma organização para importar membros."))
+        arquivo = request.FILES.get("arquivo")
+        if arquivo is None:
+            raise ValidationError({"arquivo": [_("Envie uma planilha CSV ou XLSX.")]})
+        try:
+            job_id = iniciar_importacao(organizacao, arquivo, user=request.user)
+        except ImportacaoError as exc:
+            raise ValidationError({"arquivo": [str(exc)]}) from exc
+        return Response(
+            {
+                "job_id": job_id,
+                "status_url": reverse("membros_api:membros-importacao-status", args=[job_id]),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ImportacaoMembrosStatusAPIView(APIView):
+    """Andamento de uma importação solicitada pelo próprio usuário."""
+
+    permission_classes = [IsAdminOuOperador]
+
+    def get(self, request, job_id: str):
+        try:
+            return Response(carregar_progresso(job_id, user=request.user))
+        except ImportacaoError as exc:
+            raise NotFound(str(exc)) from exc
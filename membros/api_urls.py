@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .api import ImportacaoMembrosAPIView, ImportacaoMembrosStatusAPIView, PromocaoLoteAPIView
+
+urlpatterns = [
+    path("promocoes/", PromocaoLoteAPIView.as_view(), name="membros-promocoes-lote"),
+    path("importacoes/", ImportacaoMembrosAPIView.as_view(), name="membros-importacao"),
+    path("importacoes/<str:job_id>/", ImportacaoMembrosStatusAPIView.as_view(), name="membros-importacao-status"),
+]
@@ -5,3 +5,6 @@ class MembrosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "membros"
     verbose_name = "Membros"
+
+    def ready(self) -> None:  # pragma: no cover - configuração
+        from . import exports  # noqa: F401
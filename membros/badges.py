@@ -0,0 +1,120 @@
+"""Projeção das badges de papel e núcleo exibidas nos cards de usuário.
+
+Para cada usuário guardamos, em cache, as participações ativas (núcleo, nome,
+papel e papel de coordenação), os núcleos em que é consultor e o nome do
+núcleo principal. A entrada usa a versão do índice de vínculos
+(``nucleos.membership.indice_namespace``), incrementada pelos sinais de
+``ParticipacaoNucleo`` e ``Nucleo`` (consultor, exclusão e nome).
+
+:func:`carregar_badges` monta as projeções de uma página inteira com um
+``get_many`` e, para as ausentes, três consultas; as templatetags de
+``membros_extras`` só formatam o resultado.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+
+from core.cache import get_cache_versions
+from nucleos.membership import indice_namespace
+
+CACHE_TIMEOUT = 60 * 60
+_MEMO_ATTR = "_projecao_badges"
+
+
+@dataclass(frozen=True)
+class ParticipacaoBadge:
+    nucleo_id: int
+    nucleo_nome: str
+    coordenador: bool
+    # Código de ``ParticipacaoNucleo.PapelCoordenador``; o rótulo é traduzido na exibição.
+    papel_coordenador: str = ""
+
+
+@dataclass(frozen=True)
+class ProjecaoBadges:
+    participacoes: tuple[ParticipacaoBadge, ...] = ()
+    consultoria: tuple[str, ...] = ()
+    nucleo_id: int | None = None
+    nucleo_nome: str = ""
+
+
+_VAZIA = ProjecaoBadges()
+
+
+def _chave(user, versao: int) -> str:
+    return f"badges_usuario:{user.pk}:v{versao}:n{getattr(user, 'nucleo_id', None)}"
+
+
+def _construir(usuarios: list[Any]) -> dict[Any, ProjecaoBadges]:
+    from nucleos.models import Nucleo, ParticipacaoNucleo
+
+    ids = [user.pk for user in usuarios]
+    participacoes: dict[Any, list[ParticipacaoBadge]] = defaultdict(list)
+    for user_id, nucleo_id, nome, papel, papel_coordenador in ParticipacaoNucleo.objects.filter(
+        user_id__in=ids,
+        status="ativo",
+        status_suspensao=False,
+        nucleo__deleted=False,
+    ).values_list("user_id", "nucleo_id", "nucleo__nome", "papel", "papel_coordenador"):
+        participacoes[user_id].append(
+            ParticipacaoBadge(nucleo_id, nome, papel == "coordenador", papel_coordenador or "")
+        )
+
+    consultoria: dict[Any, list[str]] = defaultdict(list)
+    for consultor_id, nome in Nucleo.objects.filter(consultor_id__in=ids).values_list("consultor_id", "nome"):
+        consultoria[consultor_id].append(nome)
+
+    nucleo_ids = {user.nucleo_id for user in usuarios if getattr(user, "nucleo_id", None)}
+    nomes = dict(Nucleo.objects.filter(pk__in=nucleo_ids).values_list("pk", "nome")) if nucleo_ids else {}
+
+    projecoes = {}
+    for user in usuarios:
+        nucleo_id = getattr(user, "nucleo_id", None)
+        projecoes[user.pk] = ProjecaoBadges(
+            participacoes=tuple(participacoes.get(user.pk, ())),
+            consultoria=tuple(consultoria.get(user.pk, ())),
+            nucleo_id=nucleo_id if nucleo_id in nomes else None,
+            nucleo_nome=nomes.get(nucleo_id, ""),
+        )
+    return projecoes
+
+
+def carregar_badges(usuarios: Iterable[Any]) -> list[Any]:
+    """Anexa a projeção de badges a cada usuário e devolve a lista."""
+
+    usuarios = list(usuarios)
+    pendentes = [user for user in usuarios if getattr(user, "pk", None) is not None]
+    if not pendentes:
+        return usuarios
+
+    versoes = get_cache_versions({indice_namespace(user.pk) for user in pendentes})
+    chaves = {user.pk: _chave(user, versoes[indice_namespace(user.pk)]) for user in pendentes}
+    encontradas = cache.get_many(list(set(chaves.values())))
+
+    faltantes = [user for user in pendentes if chaves[user.pk] not in encontradas]
+    if faltantes:
+        novas = _construir(list({user.pk: user for user in faltantes}.values()))
+        cache.set_many({chaves[user_id]: projecao for user_id, projecao in novas.items()}, CACHE_TIMEOUT)
+        encontradas.update({chaves[user_id]: projecao for user_id, projecao in novas.items()})
+
+    for user in pendentes:
+        setattr(user, _MEMO_ATTR, encontradas[chaves[user.pk]])
+    return usuarios
+
+
+def obter_badges(user) -> ProjecaoBadges:
+    """Projeção de ``user``; carrega individualmente se a página não foi pré-carregada."""
+
+    if getattr(user, "pk", None) is None:
+        return _VAZIA
+    projecao = getattr(user, _MEMO_ATTR, None)
+    if projecao is None:
+        carregar_badges([user])
+        projecao = getattr(user, _MEMO_ATTR, _VAZIA)
+    return projecao
@@ -0,0 +1,97 @@
+"""Exportação da lista de membros de uma organização (CSV e XLSX).
+
+As linhas são lidas com ``values_list(...).iterator(chunk_size=...)`` e
+escritas conforme chegam, sem instanciar usuários nem montar a lista inteira
+em memória.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+
+from accounts.models import UserType
+from core.exports import EXPORT_CHUNK_SIZE, ExportDefinition, register_export
+
+MEMBROS_EXPORT = "membros_organizacao"
+
+User = get_user_model()
+
+
+def membros_version(organizacao_id: Any) -> str:
+    """Muda a cada cadastro, alteração ou exclusão de usuário da organização."""
+
+    dados = User.all_objects.filter(organizacao_id=organizacao_id).aggregate(
+        total=Count("id"), ultima=Max("updated_at")
+    )
+    ultima = dados["ultima"].isoformat() if dados["ultima"] else ""
+    return f"{dados['total']}:{ultima}"
+
+
+def _filename(organizacao_id: Any) -> str:
+    from organizacoes.models import Organizacao
+
+    nome = Organizacao.objects.filter(pk=organizacao_id).values_list("nome", flat=True).first()
+    return f"membros-{slugify(nome or '') or organizacao_id}"
+
+
+def _columns() -> list[str]:
+    return [
+        _("Nome"),
+        _("Usuário"),
+        _("E-mail"),
+        _("Telefone"),
+        _("Tipo"),
+        _("Núcleo principal"),
+        _("Associado"),
+        _("Cadastrado em"),
+    ]
+
+
+def _rows(organizacao_id: Any) -> Iterator[list[Any]]:
+    tipos = dict(UserType.choices)
+    linhas = (
+        User.objects.filter(organizacao_id=organizacao_id)
+        .order_by("id")
+        .values_list(
+            "contato",
+            "username",
+            "email",
+            "phone_number",
+            "user_type",
+            "nucleo__nome",
+            "is_associado",
+            "date_joined",
+        )
+    )
+    for contato, username, email, telefone, tipo, nucleo, associado, cadastro in linhas.iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield [
+            (contato or "").strip() or username,
+            username,
+            email or "",
+            str(telefone or ""),
+            str(tipos.get(tipo, tipo)),
+            nucleo or "",
+            _("Sim") if associado else _("Não"),
+            timezone.localtime(cadastro).strftime("%d/%m/%Y") if cadastro else "",
+        ]
+
+
+register_export(
+    ExportDefinition(
+        name=MEMBROS_EXPORT,
+        version=membros_version,
+        filename=_filename,
+        columns=_columns,
+        rows=_rows,
+        formats=("csv", "xlsx"),
+    )
+)
@@ -0,0 +1,369 @@
+"""Importação de membros em lote a partir de planilhas CSV ou XLSX.
+
+A planilha enviada é gravada no storage e processada por um worker
+(:func:`membros.tasks.importar_membros`) em blocos de ``IMPORT_BATCH_SIZE``
+linhas. Em cada bloco, e-mails, usuários existentes e núcleos são resolvidos
+com uma consulta por tipo; usuários novos entram com ``bulk_create`` e os
+existentes da organização são atualizados com ``bulk_update``. As
+participações são aplicadas por :func:`membros.promocao.promover_em_lote`,
+que também agenda as invalidações de cache e os avisos.
+
+O andamento (linhas processadas, criados, atualizados e erros) fica em cache
+sob a chave do job, cujo identificador é assinado e vinculado ao usuário que
+enviou a planilha.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import islice
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+from phonenumber_field.phonenumber import to_python as telefone_python
+
+from accounts.models import UserType
+from accounts.search import busca_namespace, documento_busca, sincronizar_fts
+from core.cache import bump_cache_version
+
+from .promocao import NUCLEADO, OperacaoPromocao, promover_em_lote
+
+FORMATOS = ("csv", "xlsx")
+COLUNAS = ("email", "nome", "usuario", "telefone", "nucleo")
+# Campos de ``User`` preenchidos (ou atualizados) a partir das colunas.
+CAMPOS_ATUALIZAVEIS = (("contato", "nome"), ("phone_number", "telefone"))
+IMPORT_BATCH_SIZE = 500
+MAX_ERROS = 100
+JOB_SALT = "membros.importacao.job"
+JOB_MAX_AGE = 60 * 60 * 24
+PROGRESSO_TIMEOUT = 60 * 60 * 24
+
+
+class ImportacaoError(Exception):
+    """Falha ao solicitar ou consultar uma importação."""
+
+
+def formato_planilha(nome: str) -> str:
+    formato = (nome or "").rsplit(".", 1)[-1].lower()
+    if formato not in FORMATOS:
+        raise ImportacaoError(_("Envie uma planilha CSV ou XLSX."))
+    return formato
+
+
+def _texto(valor: Any) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def ler_planilha(arquivo, formato: str) -> Iterator[dict[str, str]]:
+    """Linhas não vazias como ``{cabeçalho em minúsculas: texto}``, lidas sob demanda."""
+
+    if formato == "xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(arquivo, read_only=True, data_only=True)
+        try:
+            linhas = workbook.active.iter_rows(values_only=True)
+            cabecalho = [_texto(valor).lower() for valor in next(linhas, ())]
+            for valores in linhas:
+                linha = {chave: _texto(valor) for chave, valor in zip(cabecalho, valores) if chave}
+                if any(linha.values()):
+                    yield linha
+        finally:
+            workbook.close()
+        return
+
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    try:
+        amostra = texto.read(4096)
+        texto.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;")
+        except csv.Error:
+            dialeto = csv.excel
+        for linha in csv.DictReader(texto, dialect=dialeto):
+            linha = {chave.strip().lower(): _texto(valor) for chave, valor in linha.items() if chave}
+            if any(linha.values()):
+                yield linha
+    finally:
+        texto.detach()
+
+
+def _progresso_key(chave: str) -> str:
+    return f"importacao_membros:{chave}"
+
+
+def _progresso_inicial() -> dict[str, Any]:
+    return {
+        "status": "pendente",
+        "total": None,
+        "processadas": 0,
+        "criados": 0,
+        "atualizados": 0,
+        "participacoes": 0,
+        "erros": [],
+    }
+
+
+def _salvar_progresso(chave: str, progresso: dict[str, Any]) -> None:
+    cache.set(_progresso_key(chave), progresso, PROGRESSO_TIMEOUT)
+
+
+def iniciar_importacao(organizacao, arquivo, *, user) -> str:
+    """Grava a planilha, agenda o processamento e devolve o ``job_id`` assinado."""
+
+    from .tasks import importar_membros
+
+    formato = formato_planilha(getattr(arquivo, "name", ""))
+    chave = uuid.uuid4().hex
+    caminho = default_storage.save(f"importacoes/membros/{organizacao.pk}/{chave}.{formato}", arquivo)
+    _salvar_progresso(chave, _progresso_inicial())
+    transaction.on_commit(lambda: importar_membros.delay(str(organizacao.pk), caminho, chave))
+    return signing.dumps({"c": chave, "u": str(user.pk)}, salt=JOB_SALT, compress=True)
+
+
+def carregar_progresso(job_id: str, *, user) -> dict[str, Any]:
+    """Andamento do job ``job_id``, que precisa ter sido solicitado por ``user``."""
+
+    try:
+        dados = signing.loads(job_id, salt=JOB_SALT, max_age=JOB_MAX_AGE)
+    except signing.BadSignature as exc:
+        raise ImportacaoError(_("Importação inválida ou expirada.")) from exc
+    if dados.get("u") != str(getattr(user, "pk", "")):
+        raise ImportacaoError(_("Importação solicitada por outro usuário."))
+    progresso = cache.get(_progresso_key(dados["c"]))
+    if progresso is None:
+        raise ImportacaoError(_("Importação inválida ou expirada."))
+    return progresso
+
+
+def _usernames_disponiveis(bases: dict[str, str]) -> dict[str, str]:
+    """Usernames livres para cada e-mail, com sufixo numérico em caso de colisão.
+
+    Cada rodada confere todas as propostas em uma consulta.
+    """
+
+    User = get_user_model()
+    bases = {email: (slugify(base) or "membro")[:140] for email, base in bases.items()}
+    escolhidos: dict[str, str] = {}
+    sufixos = dict.fromkeys(bases, 1)
+    while len(escolhidos) < len(bases):
+        propostas = {
+            email: base if sufixos[email] == 1 else f"{base}{sufixos[email]}"
+            for email, base in bases.items()
+            if email not in escolhidos
+        }
+        ocupados = set(
+            User.all_objects.annotate(username_normalizado=Lower("username"))
+            .filter(username_normalizado__in={proposta.lower() for proposta in propostas.values()})
+            .values_list("username_normalizado", flat=True)
+        )
+        ocupados |= {username.lower() for username in escolhidos.values()}
+        for email, proposta in propostas.items():
+            if proposta.lower() in ocupados:
+                sufixos[email] += 1
+            else:
+                escolhidos[email] = proposta
+                ocupados.add(proposta.lower())
+    return escolhidos
+
+
+def _resolver_nucleos(organizacao, referencias: set[str]) -> dict[str, int]:
+    """Núcleos da organização referenciados por id ou nome (sem diferenciar maiúsculas)."""
+
+    from nucleos.models import Nucleo
+
+    if not referencias:
+        return {}
+    ids = {int(referencia) for referencia in referencias if referencia.isdigit()}
+    nomes = {referencia.lower() for referencia in referencias}
+    resolvidos: dict[str, int] = {}
+    for pk, nome in (
+        Nucleo.objects.filter(organizacao=organizacao)
+        .annotate(nome_normalizado=Lower("nome"))
+        .filter(Q(pk__in=ids) | Q(nome_normalizado__in=nomes))
+        .values_list("pk", "nome")
+    ):
+        resolvidos[str(pk)] = pk
+        resolvidos[nome.lower()] = pk
+    return {
+        referencia: resolvidos[referencia.lower()] for referencia in referencias if referencia.lower() in resolvidos
+    }
+
+
+def _validar_linhas(linhas: Iterable[tuple[int, dict[str, str]]], erros: list[str]) -> dict[str, tuple[int, dict]]:
+    """Linhas válidas por e-mail normalizado; o telefone sai no formato E.164."""
+
+    validas: dict[str, tuple[int, dict[str, str]]] = {}
+    for numero, linha in linhas:
+        email = linha.get("email", "").lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            erros.append(_("Linha %(linha)s: e-mail inválido.") % {"linha": numero})
+            continue
+        if email in validas:
+            erros.append(_("Linha %(linha)s: e-mail repetido na planilha.") % {"linha": numero})
+            continue
+        if linha.get("telefone"):
+            telefone = telefone_python(linha["telefone"], region="BR")
+            if not telefone.is_valid():
+                erros.append(_("Linha %(linha)s: telefone inválido.") % {"linha": numero})
+                continue
+            linha = {**linha, "telefone": telefone.as_e164}
+        validas[email] = (numero, linha)
+    return validas
+
+
+def _depois_do_commit(organizacao_id: Any, novos: list[Any]) -> None:
+    from dashboard.models import DashboardRollup
+    from dashboard.rollups import local_day
+    from dashboard.tasks import atualizar_rollups_dashboard
+
+    bump_cache_version(busca_namespace(organizacao_id))
+    dias = sorted({local_day(user.date_joined).isoformat() for user in novos})
+    if dias:
+        atualizar_rollups_dashboard.delay(
+            [[DashboardRollup.Metric.MEMBROS.value, str(organizacao_id), dia] for dia in dias], []
+        )
+
+
+def importar_lote(organizacao, linhas: Iterable[tuple[int, dict[str, str]]]) -> dict[str, Any]:
+    """Valida e grava um bloco de linhas ``(número, linha)``; devolve os totais do bloco."""
+
+    from configuracoes.models import ConfiguracaoConta
+    from notificacoes.models import UserNotificationPreference
+
+    User = get_user_model()
+    erros: list[str] = []
+    validas = _validar_linhas(linhas, erros)
+
+    nucleos = _resolver_nucleos(
+        organizacao, {linha["nucleo"] for _numero, linha in validas.values() if linha.get("nucleo")}
+    )
+    for email, (numero, linha) in list(validas.items()):
+        if linha.get("nucleo") and linha["nucleo"] not in nucleos:
+            erros.append(
+                _("Linha %(linha)s: núcleo %(nucleo)s não encontrado.") % {"linha": numero, "nucleo": linha["nucleo"]}
+            )
+            del validas[email]
+
+    existentes = {
+        user.email_normalizado: user
+        for user in User.all_objects.annotate(email_normalizado=Lower("email")).filter(email_normalizado__in=validas)
+    }
+    usernames = _usernames_disponiveis(
+        {
+            email: linha.get("usuario") or email.split("@")[0]
+            for email, (_numero, linha) in validas.items()
+            if email not in existentes
+        }
+    )
+
+    agora = timezone.now()
+    novos: list[Any] = []
+    alterados: list[Any] = []
+    usuarios: dict[str, Any] = {}
+    for email, (numero, linha) in validas.items():
+        valores = {campo: linha[coluna] for campo, coluna in CAMPOS_ATUALIZAVEIS if linha.get(coluna)}
+        user = existentes.get(email)
+        if user is None:
+            user = User(
+                email=email,
+                username=usernames[email],
+                organizacao=organizacao,
+                user_type=UserType.ASSOCIADO.value,
+                is_associado=True,
+                **valores,
+            )
+            user.set_unusable_password()
+            user.search_document = documento_busca(user)
+            novos.append(user)
+        elif user.deleted or user.organizacao_id != organizacao.pk:
+            erros.append(_("Linha %(linha)s: e-mail já cadastrado em outra organização.") % {"linha": numero})
+            continue
+        elif any(str(getattr(user, campo) or "") != valor for campo, valor in valores.items()):
+            for campo, valor in valores.items():
+                setattr(user, campo, valor)
+            user.search_document = documento_busca(user)
+            user.updated_at = agora
+            alterados.append(user)
+        usuarios[email] = user
+
+    with transaction.atomic():
+        User.objects.bulk_create(novos)
+        User.objects.bulk_update(alterados, ["contato", "phone_number", "search_document", "updated_at"])
+        # O que os sinais ``post_save`` de criação fariam; ``bulk_create`` não os dispara.
+        ConfiguracaoConta.objects.bulk_create([ConfiguracaoConta(user=user) for user in novos], ignore_conflicts=True)
+        UserNotificationPreference.objects.bulk_create(
+            [UserNotificationPreference(user=user) for user in novos], ignore_conflicts=True
+        )
+        if novos or alterados:
+            sincronizar_fts([user.pk for user in [*novos, *alterados]])
+            transaction.on_commit(partial(_depois_do_commit, organizacao.pk, novos))
+
+    operacoes = [
+        OperacaoPromocao(usuarios[email].pk, NUCLEADO, nucleos[linha["nucleo"]])
+        for email, (_numero, linha) in validas.items()
+        if email in usuarios and linha.get("nucleo")
+    ]
+    participacoes = 0
+    if operacoes:
+        resultado = promover_em_lote(organizacao, operacoes)
+        erros.extend(resultado.erros)
+        participacoes = resultado.participacoes_criadas + resultado.participacoes_atualizadas
+    return {"criados": len(novos), "atualizados": len(alterados), "participacoes": participacoes, "erros": erros}
+
+
+def importar_planilha(organizacao_id: Any, caminho: str, chave: str) -> dict[str, Any]:
+    """Processa a planilha gravada em ``caminho`` bloco a bloco (executado pelo worker)."""
+
+    from organizacoes.models import Organizacao
+
+    organizacao = Organizacao.objects.get(pk=organizacao_id)
+    formato = formato_planilha(caminho)
+    progresso = _progresso_inicial()
+    with default_storage.open(caminho, "rb") as arquivo:
+        progresso["total"] = sum(1 for _linha in ler_planilha(arquivo, formato))
+    progresso["status"] = "processando"
+    _salvar_progresso(chave, progresso)
+
+    with default_storage.open(caminho, "rb") as arquivo:
+        # A linha 1 é o cabeçalho.
+        linhas = enumerate(ler_planilha(arquivo, formato), start=2)
+        while bloco := list(islice(linhas, IMPORT_BATCH_SIZE)):
+            totais = importar_lote(organizacao, bloco)
+            progresso["processadas"] += len(bloco)
+            for campo in ("criados", "atualizados", "participacoes"):
+                progresso[campo] += totais[campo]
+            progresso["erros"] = (progresso["erros"] + totais["erros"])[:MAX_ERROS]
+            _salvar_progresso(chave, progresso)
+
+    progresso["status"] = "concluida"
+    _salvar_progresso(chave, progresso)
+    return progresso
+
+
+def registrar_falha(chave: str, mensagem: str) -> None:
+    progresso = cache.get(_progresso_key(chave)) or _progresso_inicial()
+    progresso["status"] = "falhou"
+    progresso["erros"] = [*progresso["erros"], mensagem][:MAX_ERROS]
+    _salvar_progresso(chave, progresso)
@@ -0,0 +1,544 @@
+"""Promoção de membros e atribuição de núcleos em lote.
+
+:func:`promover_em_lote` recebe operações ``(usuário, núcleo, papel)`` de uma
+organização, valida os conflitos com consultas agrupadas (uma por tipo de
+verificação, independentemente do número de linhas) e aplica o conjunto numa
+transação curta, com ``bulk_create``/``bulk_update`` em ``ParticipacaoNucleo``,
+``Nucleo`` e ``User``.
+
+Operações em lote não disparam sinais; por isso, após o commit, as
+invalidações que os sinais de ``nucleos`` fariam (índice de vínculos, listagem
+de núcleos, membros e métricas por núcleo), a atualização dos agregados do
+dashboard e um único aviso por usuário afetado são agendados de uma vez.
+
+Usado pela tela de promoção (um usuário por envio) e pela API de promoção por
+planilha (``membros.api``).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from accounts.models import UserType
+from core.cache import bump_cache_version
+from nucleos.membership import invalidar_indice
+from nucleos.models import Nucleo, ParticipacaoNucleo
+from nucleos.services import invalidar_listagem
+
+NUCLEADO = "nucleado"
+CONSULTOR = "consultor"
+COORDENADOR = "coordenador"
+REMOVER_NUCLEADO = "remover_nucleado"
+REMOVER_CONSULTOR = "remover_consultor"
+REMOVER_COORDENADOR = "remover_coordenador"
+# Convidado passa a associado; não exige núcleo.
+ASSOCIADO = "associado"
+
+PAPEIS = (
+    NUCLEADO,
+    CONSULTOR,
+    COORDENADOR,
+    REMOVER_NUCLEADO,
+    REMOVER_CONSULTOR,
+    REMOVER_COORDENADOR,
+    ASSOCIADO,
+)
+
+PAPEIS_EXCLUSIVOS = (
+    ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL,
+    ParticipacaoNucleo.PapelCoordenador.VICE_COORDENADOR,
+)
+TIPOS_RECALCULADOS = {
+    UserType.ASSOCIADO,
+    UserType.NUCLEADO,
+    UserType.CONSULTOR,
+    UserType.COORDENADOR,
+}
+CAMPOS_PARTICIPACAO = ["status", "status_suspensao", "papel", "papel_coordenador", "updated_at"]
+CAMPOS_USUARIO = ["user_type", "is_associado", "is_coordenador", "nucleo", "updated_at"]
+
+
+@dataclass(frozen=True)
+class OperacaoPromocao:
+    user_id: int
+    papel: str
+    nucleo_id: int | None = None
+    # Obrigatório para ``coordenador``: código de ``ParticipacaoNucleo.PapelCoordenador``.
+    papel_coordenador: str = ""
+
+
+@dataclass
+class ResultadoPromocao:
+    erros: list[str] = field(default_factory=list)
+    usuarios_atualizados: int = 0
+    participacoes_criadas: int = 0
+    participacoes_atualizadas: int = 0
+    nucleos_atualizados: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.erros
+
+
+@dataclass
+class _Plano:
+    """Operações de um usuário agrupadas por tipo."""
+
+    nucleado: set[int] = field(default_factory=set)
+    consultor: set[int] = field(default_factory=set)
+    coordenador: dict[int, str] = field(default_factory=dict)
+    remover_nucleado: set[int] = field(default_factory=set)
+    remover_consultor: set[int] = field(default_factory=set)
+    remover_coordenador: set[int] = field(default_factory=set)
+    associado: bool = False
+
+    def nucleos(self) -> set[int]:
+        return (
+            self.nucleado
+            | self.consultor
+            | set(self.coordenador)
+            | self.remover_nucleado
+            | self.remover_consultor
+            | self.remover_coordenador
+        )
+
+
+_VAZIO = _Plano()
+
+
+class _Erros:
+    """Acumula mensagens sem repetição; com vários usuários, prefixa o nome."""
+
+    def __init__(self) -> None:
+        self._itens: dict[tuple[Any, str], None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._itens)
+
+    def add(self, mensagem: str, user_id: Any = None) -> None:
+        self._itens[(user_id, str(mensagem))] = None
+
+    def listar(self, usuarios: dict[Any, Any]) -> list[str]:
+        prefixar = len({user_id for user_id, _mensagem in self._itens if user_id is not None}) > 1
+        mensagens = []
+        for user_id, mensagem in self._itens:
+            user = usuarios.get(user_id)
+            if prefixar and user is not None:
+                mensagem = f"{_nome(user)}: {mensagem}"
+            mensagens.append(mensagem)
+        return mensagens
+
+
+def _nome(user) -> str:
+    return user.display_name or user.username
+
+
+def _agrupar(operacoes: list[OperacaoPromocao], erros: _Erros) -> dict[int, _Plano]:
+    planos: dict[int, _Plano] = defaultdict(_Plano)
+    for operacao in operacoes:
+        plano = planos[operacao.user_id]
+        if operacao.papel == ASSOCIADO:
+            plano.associado = True
+        elif operacao.papel not in PAPEIS or operacao.nucleo_id is None:
+            erros.add(_("Operação de promoção inválida: %(papel)s.") % {"papel": operacao.papel}, operacao.user_id)
+        elif operacao.papel == COORDENADOR:
+            plano.coordenador[operacao.nucleo_id] = (operacao.papel_coordenador or "").strip()
+        else:
+            getattr(plano, operacao.papel).add(operacao.nucleo_id)
+    return dict(planos)
+
+
+def _validar_planos(
+    planos: dict[int, _Plano], usuarios: dict[int, Any], nucleos: dict[int, Nucleo], erros: _Erros
+) -> None:
+    """Verificações que não dependem de consultas além de usuários e núcleos."""
+
+    papel_choices = {value for value, _label in ParticipacaoNucleo.PapelCoordenador.choices}
+    role_labels = dict(ParticipacaoNucleo.PapelCoordenador.choices)
+
+    for user_id, plano in planos.items():
+        user = usuarios.get(user_id)
+        if user is None:
+            erros.add(_("Usuário %(id)s não encontrado na organização.") % {"id": user_id})
+            continue
+        is_guest = user.user_type == UserType.CONVIDADO.value
+        if not plano.nucleos() and not (is_guest and plano.associado):
+            erros.add(_("Selecione ao menos um núcleo e papel para promoção ou remoção."), user_id)
+        if any(nucleo_id not in nucleos for nucleo_id in plano.nucleos()):
+            erros.add(_("Selecione núcleos válidos da organização."), user_id)
+        for papel in plano.coordenador.values():
+            if not papel:
+                erros.add(_("Selecione um papel de coordenação para cada núcleo escolhido."), user_id)
+            elif papel not in papel_choices:
+                erros.add(_("Selecione um papel de coordenação válido."), user_id)
+        if plano.nucleado & plano.remover_nucleado:
+            erros.add(_("Não é possível promover e remover a participação de nucleado no mesmo núcleo."), user_id)
+        if plano.consultor & plano.remover_consultor:
+            erros.add(_("Não é possível promover e remover a consultoria do mesmo núcleo."), user_id)
+        if set(plano.coordenador) & plano.remover_coordenador:
+            erros.add(_("Não é possível promover e remover a coordenação no mesmo núcleo."), user_id)
+        if plano.consultor & set(plano.coordenador):
+            erros.add(_("Selecione apenas uma opção de promoção por núcleo."), user_id)
+
+    # Conflitos entre linhas do próprio lote.
+    atribuicoes: dict[tuple[int, str], list[int]] = defaultdict(list)
+    consultorias: dict[int, list[int]] = defaultdict(list)
+    for user_id, plano in planos.items():
+        for nucleo_id, papel in plano.coordenador.items():
+            atribuicoes[(nucleo_id, papel)].append(user_id)
+        for nucleo_id in plano.consultor:
+            consultorias[nucleo_id].append(user_id)
+    for (nucleo_id, papel), user_ids in atribuicoes.items():
+        if len(user_ids) > 1 and nucleo_id in nucleos:
+            erros.add(
+                _("O papel %(papel)s do núcleo %(nucleo)s foi atribuído a mais de um usuário.")
+                % {"papel": role_labels.get(papel, papel), "nucleo": nucleos[nucleo_id].nome}
+            )
+    for nucleo_id, user_ids in consultorias.items():
+        if len(user_ids) > 1 and nucleo_id in nucleos:
+            erros.add(_("O núcleo %(nucleo)s recebeu mais de um consultor.") % {"nucleo": nucleos[nucleo_id].nome})
+
+
+def _validar_estado(planos: dict[int, _Plano], nucleos: dict[int, Nucleo], erros: _Erros) -> None:
+    """Conflitos com os vínculos já gravados, em uma consulta por verificação."""
+
+    role_labels = dict(ParticipacaoNucleo.PapelCoordenador.choices)
+    coordenacoes = {
+        (nucleo_id, papel): user_id
+        for user_id, plano in planos.items()
+        for nucleo_id, papel in plano.coordenador.items()
+    }
+
+    if coordenacoes:
+        ocupados = ParticipacaoNucleo.objects.filter(
+            nucleo_id__in={nucleo_id for nucleo_id, _papel in coordenacoes},
+            papel="coordenador",
+            status="ativo",
+            papel_coordenador__in={papel for _nucleo_id, papel in coordenacoes},
+        ).select_related("user", "nucleo")
+        for participacao in ocupados:
+            user_id = coordenacoes.get((participacao.nucleo_id, participacao.papel_coordenador))
+            liberado = participacao.nucleo_id in planos.get(participacao.user_id, _VAZIO).remover_coordenador
+            if user_id is not None and user_id != participacao.user_id and not liberado:
+                erros.add(
+                    _("O papel %(papel)s do núcleo %(nucleo)s já está ocupado por %(nome)s.")
+                    % {
+                        "papel": role_labels.get(participacao.papel_coordenador, participacao.papel_coordenador),
+                        "nucleo": participacao.nucleo.nome,
+                        "nome": _nome(participacao.user),
+                    },
+                    user_id,
+                )
+
+        existentes: dict[int, dict[str, set[int]]] = defaultdict(lambda: defaultdict(set))
+        for user_id, papel, nucleo_id in ParticipacaoNucleo.objects.filter(
+            user_id__in={user_id for user_id in coordenacoes.values()},
+            papel="coordenador",
+            status="ativo",
+            papel_coordenador__in=PAPEIS_EXCLUSIVOS,
+        ).values_list("user_id", "papel_coordenador", "nucleo_id"):
+            existentes[user_id][papel].add(nucleo_id)
+        for user_id, plano in planos.items():
+            for papel in PAPEIS_EXCLUSIVOS:
+                novos = {nucleo_id for nucleo_id, escolhido in plano.coordenador.items() if escolhido == papel}
+                if not novos:
+                    continue
+                atuais = existentes[user_id][papel] - plano.remover_coordenador
+                novos_diferentes = novos - atuais
+                if atuais and novos_diferentes:
+                    erros.add(
+                        _("%(papel)s não pode ser atribuído a múltiplos núcleos diferentes.")
+                        % {"papel": role_labels.get(papel, papel)},
+                        user_id,
+                    )
+                elif not atuais and len(novos_diferentes) > 1:
+                    erros.add(
+                        _("Selecione apenas um núcleo para o papel %(papel)s.")
+                        % {"papel": role_labels.get(papel, papel)},
+                        user_id,
+                    )
+
+    for user_id, plano in planos.items():
+        for nucleo_id in plano.consultor:
+            nucleo = nucleos[nucleo_id]
+            atual = nucleo.consultor_id
+            if atual and atual != user_id and nucleo_id not in planos.get(atual, _VAZIO).remover_consultor:
+                erros.add(
+                    _("O núcleo %(nucleo)s já possui o consultor %(nome)s.")
+                    % {"nucleo": nucleo.nome, "nome": _nome(nucleo.consultor)},
+                    user_id,
+                )
+
+    remocoes = {user_id: plano.remover_nucleado for user_id, plano in planos.items() if plano.remover_nucleado}
+    if remocoes:
+        for user_id, nucleo_id in ParticipacaoNucleo.objects.filter(
+            user_id__in=remocoes,
+            nucleo_id__in=set().union(*remocoes.values()),
+            status="ativo",
+            papel="coordenador",
+        ).values_list("user_id", "nucleo_id"):
+            plano = planos[user_id]
+            if nucleo_id in plano.remover_nucleado and nucleo_id not in plano.remover_coordenador:
+                erros.add(
+                    _("Remova a coordenação do núcleo %(nucleo)s antes de remover a participação.")
+                    % {"nucleo": nucleos[nucleo_id].nome},
+                    user_id,
+                )
+
+
+def _atualizar(objeto, **valores) -> bool:
+    alterado = False
+    for campo, valor in valores.items():
+        if getattr(objeto, campo) != valor:
+            setattr(objeto, campo, valor)
+            alterado = True
+    return alterado
+
+
+def _aplicar_participacoes(
+    planos: dict[int, _Plano], existentes: dict[tuple[int, int], ParticipacaoNucleo]
+) -> tuple[list[ParticipacaoNucleo], dict[int, ParticipacaoNucleo], set[int]]:
+    novas: list[ParticipacaoNucleo] = []
+    alteradas: dict[int, ParticipacaoNucleo] = {}
+    afetados: set[int] = set()
+
+    def marcar(participacao: ParticipacaoNucleo, user_id: int, **valores) -> None:
+        if _atualizar(participacao, **valores):
+            afetados.add(user_id)
+            if participacao.pk:
+                alteradas[participacao.pk] = participacao
+
+    for user_id, plano in planos.items():
+        for nucleo_id in plano.nucleado | set(plano.coordenador):
+            participacao = existentes.get((user_id, nucleo_id))
+            if participacao is None:
+                participacao = ParticipacaoNucleo(user_id=user_id, nucleo_id=nucleo_id, status="ativo")
+                existentes[(user_id, nucleo_id)] = participacao
+                novas.append(participacao)
+                afetados.add(user_id)
+            marcar(participacao, user_id, status="ativo", status_suspensao=False)
+            if nucleo_id in plano.coordenador:
+                marcar(participacao, user_id, papel="coordenador", papel_coordenador=plano.coordenador[nucleo_id])
+            elif participacao.papel != "coordenador":
+                marcar(participacao, user_id, papel="membro", papel_coordenador=None)
+
+        for nucleo_id in plano.remover_coordenador:
+            participacao = existentes.get((user_id, nucleo_id))
+            if participacao is not None and participacao.papel == "coordenador":
+                marcar(
+                    participacao,
+                    user_id,
+                    papel="membro",
+                    papel_coordenador=None,
+                    status="ativo",
+                    status_suspensao=False,
+                )
+
+        for nucleo_id in plano.remover_nucleado:
+            participacao = existentes.get((user_id, nucleo_id))
+            if participacao is not None:
+                marcar(
+                    participacao,
+                    user_id,
+                    status="inativo",
+                    papel="membro",
+                    papel_coordenador=None,
+                    status_suspensao=False,
+                )
+    return novas, alteradas, afetados
+
+
+def _recalcular_usuarios(organizacao, planos: dict[int, _Plano], usuarios: dict[int, Any]) -> list[Any]:
+    """Mesma regra da tela de promoção: coordenador > consultor > nucleado > associado."""
+
+    coordenam: set[int] = set()
+    participam: set[int] = set()
+    for user_id, papel in ParticipacaoNucleo.objects.filter(
+        user_id__in=planos, status="ativo", status_suspensao=False
+    ).values_list("user_id", "papel"):
+        participam.add(user_id)
+        if papel == "coordenador":
+            coordenam.add(user_id)
+    consultores = set(
+        Nucleo.objects.filter(organizacao=organizacao, consultor_id__in=planos).values_list("consultor_id", flat=True)
+    )
+
+    alterados = []
+    for user_id, plano in planos.items():
+        user = usuarios[user_id]
+        mudou = False
+        if plano.associado and user.user_type == UserType.CONVIDADO.value:
+            mudou |= _atualizar(user, user_type=UserType.ASSOCIADO.value, is_associado=True)
+        coordenador = user_id in coordenam
+        consultor = user_id in consultores
+        participa = user_id in participam
+        mudou |= _atualizar(user, is_coordenador=coordenador)
+        if not (participa or coordenador or consultor):
+            mudou |= _atualizar(user, nucleo_id=None)
+        try:
+            tipo_atual = UserType(user.user_type)
+        except ValueError:
+            tipo_atual = None
+        if tipo_atual in TIPOS_RECALCULADOS:
+            if coordenador:
+                tipo = UserType.COORDENADOR
+            elif consultor:
+                tipo = UserType.CONSULTOR
+            elif participa:
+                tipo = UserType.NUCLEADO
+            else:
+                tipo = UserType.ASSOCIADO
+            mudou |= _atualizar(user, user_type=tipo.value)
+        if mudou:
+            alterados.append(user)
+    return alterados
+
+
+def _depois_do_commit(
+    organizacao_id: Any,
+    user_ids: set[int],
+    nucleo_ids: set[int],
+    chaves_dashboard: set[tuple[str, str, str]],
+    avisos: dict[str, list[str]],
+) -> None:
+    from dashboard.tasks import atualizar_rollups_dashboard
+    from dashboard.widgets import bump_data_version
+
+    from .tasks import notificar_promocoes
+
+    invalidar_indice(*user_ids)
+    invalidar_listagem(organizacao_id)
+    bump_cache_version(f"nucleos_list_{organizacao_id}")
+    for nucleo_id in nucleo_ids:
+        bump_cache_version(f"nucleo_{nucleo_id}_membros")
+        bump_cache_version(f"nucleo_{nucleo_id}_metrics")
+    if chaves_dashboard:
+        atualizar_rollups_dashboard.delay([list(chave) for chave in sorted(chaves_dashboard)], [])
+    else:
+        bump_data_version(organizacao_id)
+    if avisos:
+        notificar_promocoes.delay(avisos)
+
+
+def promover_em_lote(organizacao, operacoes) -> ResultadoPromocao:
+    """Valida e aplica ``operacoes`` (iterável de :class:`OperacaoPromocao`).
+
+    Nada é gravado se houver erros; as mensagens seguem as da tela de promoção.
+    """
+
+    from dashboard.models import DashboardRollup
+    from dashboard.rollups import local_day
+
+    User = get_user_model()
+    erros = _Erros()
+    planos = _agrupar(list(operacoes), erros)
+    if not planos:
+        erros.add(_("Selecione ao menos um núcleo e papel para promoção ou remoção."))
+        return ResultadoPromocao(erros=erros.listar({}))
+
+    usuarios = {user.pk: user for user in User.objects.filter(organizacao=organizacao, pk__in=planos)}
+    nucleo_ids = set().union(*(plano.nucleos() for plano in planos.values()))
+    nucleos = {
+        nucleo.pk: nucleo
+        for nucleo in Nucleo.objects.filter(organizacao=organizacao, pk__in=nucleo_ids).select_related("consultor")
+    }
+    _validar_planos(planos, usuarios, nucleos, erros)
+    if not erros:
+        _validar_estado(planos, nucleos, erros)
+    if erros:
+        return ResultadoPromocao(erros=erros.listar(usuarios))
+
+    agora = timezone.now()
+    with transaction.atomic():
+        nucleos = {
+            nucleo.pk: nucleo
+            for nucleo in Nucleo.objects.select_for_update().filter(organizacao=organizacao, pk__in=nucleo_ids)
+        }
+        existentes = {
+            (participacao.user_id, participacao.nucleo_id): participacao
+            for participacao in ParticipacaoNucleo.objects.select_for_update().filter(
+                user_id__in=planos, nucleo_id__in=nucleo_ids
+            )
+        }
+
+        # Remoções antes das atribuições: permite trocar o consultor no mesmo lote.
+        nucleos_alterados: dict[int, Nucleo] = {}
+        afetados: set[int] = set()
+        for user_id, plano in planos.items():
+            for nucleo_id in plano.remover_consultor:
+                nucleo = nucleos[nucleo_id]
+                if nucleo.consultor_id == user_id:
+                    nucleo.consultor_id = None
+                    nucleos_alterados[nucleo_id] = nucleo
+                    afetados.add(user_id)
+        for user_id, plano in planos.items():
+            for nucleo_id in plano.consultor:
+                nucleo = nucleos[nucleo_id]
+                if nucleo.consultor_id != user_id:
+                    afetados.update({user_id, nucleo.consultor_id} - {None})
+                    nucleo.consultor_id = user_id
+                    nucleos_alterados[nucleo_id] = nucleo
+        for nucleo in nucleos_alterados.values():
+            nucleo.updated_at = agora
+        Nucleo.objects.bulk_update(nucleos_alterados.values(), ["consultor", "updated_at"])
+
+        novas, alteradas, participantes = _aplicar_participacoes(planos, existentes)
+        afetados |= participantes
+        for participacao in alteradas.values():
+            participacao.updated_at = agora
+        # Rebaixamentos primeiro: liberam o papel (``uniq_coordenador_papel``)
+        # antes que outra participação do lote o ocupe.
+        rebaixadas = [participacao for participacao in alteradas.values() if participacao.papel != "coordenador"]
+        promovidas = [participacao for participacao in alteradas.values() if participacao.papel == "coordenador"]
+        ParticipacaoNucleo.objects.bulk_update(rebaixadas, CAMPOS_PARTICIPACAO)
+        ParticipacaoNucleo.objects.bulk_update(promovidas, CAMPOS_PARTICIPACAO)
+        ParticipacaoNucleo.objects.bulk_create(novas)
+
+        usuarios_alterados = _recalcular_usuarios(organizacao, planos, usuarios)
+        for user in usuarios_alterados:
+            user.updated_at = agora
+        User.objects.bulk_update(usuarios_alterados, CAMPOS_USUARIO)
+
+        chaves_dashboard = {
+            (
+                DashboardRollup.Metric.NUCLEADOS.value,
+                str(organizacao.pk),
+                local_day(participacao.created_at).isoformat(),
+            )
+            for participacao in [*novas, *alteradas.values()]
+        }
+        chaves_dashboard |= {
+            (DashboardRollup.Metric.MEMBROS.value, str(organizacao.pk), local_day(user.date_joined).isoformat())
+            for user in usuarios_alterados
+            if planos[user.pk].associado
+        }
+        avisados = (afetados | {user.pk for user in usuarios_alterados}) & set(planos)
+        avisos = {
+            str(user_id): sorted(nucleos[nucleo_id].nome for nucleo_id in planos[user_id].nucleos())
+            for user_id in avisados
+        }
+        transaction.on_commit(
+            partial(
+                _depois_do_commit,
+                organizacao.pk,
+                set(planos) | afetados,
+                {participacao.nucleo_id for participacao in [*novas, *alteradas.values()]} | set(nucleos_alterados),
+                chaves_dashboard,
+                avisos,
+            )
+        )
+
+    return ResultadoPromocao(
+        usuarios_atualizados=len(usuarios_alterados),
+        participacoes_criadas=len(novas),
+        participacoes_atualizadas=len(alteradas),
+        nucleos_atualizados=len(nucleos_alterados),
+    )
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from .promocao import PAPEIS
+
+
+class OperacaoPromocaoSerializer(serializers.Serializer):
+    """Linha da promoção em lote; ``usuario`` aceita id ou e-mail."""
+
+    usuario = serializers.CharField()
+    papel = serializers.ChoiceField(choices=PAPEIS)
+    nucleo = serializers.IntegerField(required=False, allow_null=True, default=None)
+    papel_coordenador = serializers.CharField(required=False, allow_blank=True, default="")
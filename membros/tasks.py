@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import structlog
+from celery import shared_task  # type: ignore
+from django.contrib.auth import get_user_model
+
+from notificacoes.services.notificacoes import enviar_para_usuario
+
+logger = structlog.get_logger(__name__)
+User = get_user_model()
+
+
+@shared_task
+def notificar_promocoes(avisos: dict[str, list[str]]) -> None:
+    """Avisa cada usuário promovido em lote, com os núcleos alterados."""
+
+    for user in User.objects.filter(pk__in=list(avisos)):
+        try:
+            enviar_para_usuario(
+                user,
+                "membro_promovido",
+                {"nome": user.display_name or user.username, "nucleos": ", ".join(avisos[str(user.pk)])},
+            )
+        except Exception:
+            logger.exception("falha_notificacao_promocao", user_id=user.pk)
+
+
+@shared_task
+def importar_membros(organizacao_id: str, caminho: str, chave: str) -> None:
+    """Processa uma planilha enviada para ``membros.importacao``."""
+
+    from django.core.files.storage import default_storage
+
+    from . import importacao
+
+    try:
+        importacao.importar_planilha(organizacao_id, caminho, chave)
+    except Exception as exc:
+        logger.exception("importacao_membros_falhou", organizacao_id=organizacao_id, caminho=caminho)
+        importacao.registrar_falha(chave, str(exc) or exc.__class__.__name__)
+    finally:
+        default_storage.delete(caminho)
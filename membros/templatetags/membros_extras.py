@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import re
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 
 from django import template
 from django.utils.translation import gettext as _
 
 from accounts.models import UserType
+from membros.badges import obter_badges
+from nucleos.models import ParticipacaoNucleo
 
 register = template.Library()
 
@@ -66,31 +68,27 @@ def _nucleo_style(nucleo_id) -> str:
     return NUCLEO_BADGE_PALETTE[hash_base % len(NUCLEO_BADGE_PALETTE)]
 
 
-def _active_participacoes_data(user) -> list[dict[str, object]]:
-    participacoes_manager = getattr(user, "participacoes", None)
-    participacoes = []
-    if participacoes_manager is not None:
-        prefetched = _get_prefetched(participacoes_manager, "participacoes")
-        if prefetched is not None:
-            participacoes = list(prefetched)
-        else:
-            participacoes = list(participacoes_manager.select_related("nucleo").all())
+def _papel_coordenador_label(codigo: str) -> str:
+    if not codigo:
+        return ""
+    try:
+        return str(ParticipacaoNucleo.PapelCoordenador(codigo).label)
+    except ValueError:
+        return codigo
 
-    participacoes_data: list[dict[str, object]] = []
-    for participacao in participacoes:
-        if participacao.status != "ativo" or getattr(participacao, "status_suspensao", False):
-            continue
 
-        nucleo = getattr(participacao, "nucleo", None)
-        papel_coordenador = participacao.get_papel_coordenador_display() if participacao.papel_coordenador else ""
-        promotion_label = papel_coordenador if participacao.papel == "coordenador" else _("Nucleado")
+def _active_participacoes_data(user) -> list[dict[str, object]]:
+    participacoes_data: list[dict[str, object]] = []
+    for participacao in obter_badges(user).participacoes:
+        papel_coordenador = _papel_coordenador_label(participacao.papel_coordenador)
+        promotion_label = papel_coordenador if participacao.coordenador else _("Nucleado")
 
         participacoes_data.append(
             {
                 "promotion_label": promotion_label,
-                "nucleo_nome": getattr(nucleo, "nome", ""),
-                "nucleo_id": getattr(nucleo, "id", None),
-                "is_coordenador": participacao.papel == "coordenador",
+                "nucleo_nome": participacao.nucleo_nome,
+                "nucleo_id": participacao.nucleo_id,
+                "is_coordenador": participacao.coordenador,
                 "papel_coordenador": papel_coordenador,
             }
         )
@@ -98,15 +96,6 @@ def _active_participacoes_data(user) -> list[dict[str, object]]:
     return participacoes_data
 
 
-def _get_prefetched(manager, cache_key):
-    related_cache = getattr(manager, "instance", None)
-    if related_cache is not None:
-        cache = getattr(related_cache, "_prefetched_objects_cache", {})
-        if cache_key in cache:
-            return cache[cache_key]
-    return None
-
-
 @register.simple_tag
 def rating_stars(average) -> list[str]:
     """Return star states for a five-star rating with half-star rounding."""
@@ -138,55 +127,22 @@ def rating_stars(average) -> list[str]:
 
 
 def _has_nucleo_specific_badge(user, tipo: str) -> bool:
-    if tipo == UserType.COORDENADOR.value:
-        participacoes_manager = getattr(user, "participacoes", None)
-        participacoes = []
-        if participacoes_manager is not None:
-            prefetched = _get_prefetched(participacoes_manager, "participacoes")
-            if prefetched is not None:
-                participacoes = list(prefetched)
-            else:
-                participacoes = list(participacoes_manager.select_related("nucleo").all())
-
-        for participacao in participacoes:
-            if participacao.status != "ativo" or getattr(participacao, "status_suspensao", False):
-                continue
-            if participacao.papel == "coordenador" and getattr(participacao, "nucleo", None):
-                return True
+    projecao = obter_badges(user)
 
-        if getattr(user, "is_coordenador", False) and getattr(user, "nucleo", None):
+    if tipo == UserType.COORDENADOR.value:
+        if any(participacao.coordenador for participacao in projecao.participacoes):
+            return True
+        if getattr(user, "is_coordenador", False) and projecao.nucleo_id:
             return True
 
     if tipo == UserType.NUCLEADO.value:
-        participacoes_manager = getattr(user, "participacoes", None)
-        participacoes = []
-        if participacoes_manager is not None:
-            prefetched = _get_prefetched(participacoes_manager, "participacoes")
-            if prefetched is not None:
-                participacoes = list(prefetched)
-            else:
-                participacoes = list(participacoes_manager.select_related("nucleo").all())
-
-        for participacao in participacoes:
-            if participacao.status != "ativo" or getattr(participacao, "status_suspensao", False):
-                continue
-            if participacao.papel != "coordenador" and getattr(participacao, "nucleo", None):
-                return True
-
-        if getattr(user, "nucleo", None):
+        if any(not participacao.coordenador for participacao in projecao.participacoes):
+            return True
+        if projecao.nucleo_id:
             return True
 
     if tipo == UserType.CONSULTOR.value:
-        nucleos_consultoria_manager = getattr(user, "nucleos_consultoria", None)
-        consultoria = []
-        if nucleos_consultoria_manager is not None:
-            prefetched = _get_prefetched(nucleos_consultoria_manager, "nucleos_consultoria")
-            if prefetched is not None:
-                consultoria = list(prefetched)
-            else:
-                consultoria = list(nucleos_consultoria_manager.all())
-
-        return any(nucleo is not None for nucleo in consultoria)
+        return bool(projecao.consultoria)
 
     return False
 
@@ -243,17 +199,8 @@ def usuario_badges(user):
             badges.append(nucleus_badge)
             types_present.add("nucleus")
 
-    nucleos_consultoria_manager = getattr(user, "nucleos_consultoria", None)
-    consultoria = []
-    if nucleos_consultoria_manager is not None:
-        prefetched = _get_prefetched(nucleos_consultoria_manager, "nucleos_consultoria")
-        if prefetched is not None:
-            consultoria = list(prefetched)
-        else:
-            consultoria = list(nucleos_consultoria_manager.all())
-
-    for nucleo in consultoria:
-        nucleo_nome = getattr(nucleo, "nome", "")
+    projecao = obter_badges(user)
+    for nucleo_nome in projecao.consultoria:
         if nucleo_nome:
             label = _("Consultor · %(nucleo)s") % {"nucleo": nucleo_nome}
         else:
@@ -261,8 +208,8 @@ def usuario_badges(user):
         badges.append(_make_badge(label, "consultor"))
         types_present.add("consultor")
 
-    if getattr(user, "nucleo", None) and not {"coordenador", "nucleado"} & types_present:
-        nucleo_nome = getattr(user.nucleo, "nome", "")
+    if projecao.nucleo_id and not {"coordenador", "nucleado"} & types_present:
+        nucleo_nome = projecao.nucleo_nome
         if getattr(user, "is_coordenador", False):
             promotion_badge = _make_badge(_("Coordenador"), "coordenador")
             promotion_badge["group"] = "promotion"
@@ -11,6 +11,7 @@ urlpatterns = [
         views.MembroSectionListView.as_view(),
         name="membros_lista_api",
     ),
+    path("busca/sugestoes/", views.MembroBuscaSugestoesView.as_view(), name="membros_sugestoes"),
     path("promover/", views.MembroPromoverListView.as_view(), name="membros_promover"),
     path(
         "promover/carousel/",
@@ -22,5 +23,6 @@ urlpatterns = [
         views.MembroPromoverFormView.as_view(),
         name="membro_promover_form",
     ),
+    path("exportar/<str:formato>/", views.MembrosExportView.as_view(), name="membros_exportar"),
     path("novo/", views.OrganizacaoUserCreateView.as_view(), name="membros_adicionar"),
 ]
@@ -7,29 +7,39 @@ from urllib.parse import urlparse
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError
 from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.db.models.functions import Lower
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import FormView, ListView, TemplateView, View
-from django.template.loader import render_to_string
 
 from accounts.models import UserType
+from accounts.search import busca_namespace, buscar_usuarios, ordenar_por_relevancia, termos_busca
+from core.cache import get_cache_version
+from core.exports import ExportError, request_export
 from core.permissions import MembrosRequiredMixin, NoSuperadminMixin
 from core.utils import resolve_back_href
 from nucleos.models import Nucleo, ParticipacaoNucleo
 
+from . import promocao
+from .badges import carregar_badges
+from .exports import MEMBROS_EXPORT
 from .forms import OrganizacaoUserCreateForm
 
 User = get_user_model()
 
 MEMBRO_PROMOVER_CAROUSEL_PAGE_SIZE = 6
+SUGESTOES_LIMITE = 8
+SUGESTOES_MIN_CARACTERES = 2
+SUGESTOES_CACHE_TIMEOUT = 5 * 60
 
 
 class MembrosPermissionMixin(MembrosRequiredMixin, NoSuperadminMixin):
@@ -210,18 +220,10 @@ class MembroListDataMixin:
                 | Q(is_coordenador=True)
             )
             .select_related("organizacao", "nucleo")
-            .prefetch_related("participacoes__nucleo", "nucleos_consultoria")
             .annotate(_order=Lower("username"))
-            .order_by("_order", "id")
         )
-
-        search_term = self.get_search_term()
-        if search_term:
-            queryset = queryset.filter(
-                Q(username__icontains=search_term) | Q(contato__icontains=search_term)
-            )
-
-        return queryset.distinct()
+        queryset = buscar_usuarios(queryset, self.get_search_term())
+        return ordenar_por_relevancia(queryset, "_order", "id").distinct()
 
     def get_section_queryset(self, base_queryset, section: str):
         active_participacao = ParticipacaoNucleo.objects.filter(
@@ -258,6 +260,7 @@ class MembroListDataMixin:
         paginator = Paginator(queryset, self.get_paginate_by())
         number = page_number or self.request.GET.get(f"{section}_page") or 1
         page_obj = paginator.get_page(number)
+        page_obj.object_list = carregar_badges(page_obj.object_list)
         return page_obj, paginator
 
     def get_empty_message(self, section: str) -> str:
@@ -445,6 +448,39 @@ class MembroSectionListView(
         )
 
 
+class MembroBuscaSugestoesView(MembrosPermissionMixin, LoginRequiredMixin, View):
+    """Sugestões de membros da organização enquanto o usuário digita.
+
+    As respostas ficam em cache por organização e prefixo normalizado, sob a
+    versão ``usuarios_busca_org_<id>`` (incrementada quando um membro muda).
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        organizacao_id = getattr(request.user, "organizacao_id", None)
+        prefixo = " ".join(termos_busca(request.GET.get("q") or ""))
+        if not organizacao_id or len(prefixo) < SUGESTOES_MIN_CARACTERES:
+            return JsonResponse({"results": []})
+
+        versao = get_cache_version(busca_namespace(organizacao_id))
+        cache_key = f"membros_sugestoes:{organizacao_id}:v{versao}:{prefixo.replace(' ', '+')}"
+        resultados = cache.get(cache_key)
+        if resultados is None:
+            queryset = buscar_usuarios(User.objects.filter(organizacao_id=organizacao_id, is_active=True), prefixo)
+            resultados = [
+                {
+                    "id": usuario.pk,
+                    "public_id": str(usuario.public_id),
+                    "nome": usuario.get_display_name(),
+                    "username": usuario.username,
+                }
+                for usuario in ordenar_por_relevancia(queryset, "username")[:SUGESTOES_LIMITE]
+            ]
+            cache.set(cache_key, resultados, SUGESTOES_CACHE_TIMEOUT)
+        return JsonResponse({"results": resultados})
+
+
 class MembroPromoverListView(MembrosPromocaoPermissionMixin, LoginRequiredMixin, ListView):
     template_name = "membros/promover_list.html"
     context_object_name = "membros"
@@ -474,20 +510,12 @@ class MembroPromoverListView(MembrosPromocaoPermissionMixin, LoginRequiredMixin,
                 | Q(is_coordenador=True)
             )
             .select_related("organizacao", "nucleo")
-            .prefetch_related("participacoes__nucleo", "nucleos_consultoria")
         )
 
         search_term = (self.request.GET.get("q") or "").strip()
         self.search_term = search_term
 
-        if search_term:
-            base_queryset = base_queryset.filter(
-                Q(username__icontains=search_term)
-                | Q(contato__icontains=search_term)
-                | Q(nome_fantasia__icontains=search_term)
-                | Q(razao_social__icontains=search_term)
-                | Q(cnpj__icontains=search_term)
-            )
+        base_queryset = buscar_usuarios(base_queryset, search_term)
 
         consultor_filter = Q(user_type=UserType.CONSULTOR.value)
         coordenador_filter = (
@@ -513,7 +541,7 @@ class MembroPromoverListView(MembrosPromocaoPermissionMixin, LoginRequiredMixin,
         base_queryset = base_queryset.distinct()
 
         base_queryset = base_queryset.annotate(_order_name=Lower("username"))
-        return base_queryset.order_by("_order_name", "id")
+        return ordenar_por_relevancia(base_queryset, "_order_name", "id")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -587,6 +615,11 @@ class MembroPromoverListView(MembrosPromocaoPermissionMixin, LoginRequiredMixin,
         )
         return context
 
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = carregar_badges(object_list)
+        return paginator, page, page.object_list, is_paginated
+
     def get_current_filter(self) -> str:
         valid_filters = {"membros", "nucleados", "consultores", "coordenadores"}
         current_filter = self.request.GET.get("tipo") or ""
@@ -610,6 +643,7 @@ class MembroPromoverCarouselView(MembrosPromocaoPermissionMixin, View):
         queryset = list_view.get_queryset()
         paginator = Paginator(queryset, MEMBRO_PROMOVER_CAROUSEL_PAGE_SIZE)
         page_obj = paginator.get_page(request.GET.get("page") or 1)
+        page_obj.object_list = carregar_badges(page_obj.object_list)
 
         empty_message = list_view.get_empty_message()
 
@@ -633,6 +667,27 @@ class MembroPromoverCarouselView(MembrosPromocaoPermissionMixin, View):
         )
 
 
+class MembrosExportView(MembrosPromocaoPermissionMixin, LoginRequiredMixin, View):
+    """Solicita a exportação dos membros da organização (CSV ou XLSX).
+
+    A geração acontece em um worker (``core.exports``) e as linhas são lidas do
+    banco em blocos; enquanto o arquivo não estiver pronto, o usuário acompanha
+    o andamento na página de status.
+    """
+
+    def get(self, request, *args, **kwargs):
+        organizacao_id = getattr(request.user, "organizacao_id", None)
+        if organizacao_id is None:
+            raise PermissionDenied(_("É necessário pertencer a uma organização para exportar membros."))
+        try:
+            job = request_export(MEMBROS_EXPORT, organizacao_id, kwargs.get("formato", "csv"), user=request.user)
+        except ExportError as exc:
+            raise Http404(str(exc)) from exc
+        if job.ready:
+            return redirect("core:exportacao_download", job_id=job.job_id)
+        return redirect("core:exportacao_status", job_id=job.job_id)
+
+
 class MembroPromoverFormView(MembrosPromocaoPermissionMixin, LoginRequiredMixin, TemplateView):
     template_name = "membros/promover_form.html"
 
@@ -662,13 +717,6 @@ class MembroPromoverFormView(MembrosPromocaoPermissionMixin, LoginRequiredMixin,
         return context
 
     def post(self, request, *args, **kwargs):
-        raw_nucleado = request.POST.getlist("nucleado_nucleos")
-        raw_consultor = request.POST.getlist("consultor_nucleos")
-        raw_coordenador = request.POST.getlist("coordenador_nucleos")
-        raw_remover_nucleado = request.POST.getlist("remover_nucleado_nucleos")
-        raw_remover_consultor = request.POST.getlist("remover_consultor_nucleos")
-        raw_remover_coordenador = request.POST.getlist("remover_coordenador_nucleos")
-
         def _parse_ids(values: list[str]) -> list[int]:
             parsed: list[int] = []
             seen: set[int] = set()
@@ -682,382 +730,51 @@ class MembroPromoverFormView(MembrosPromocaoPermissionMixin, LoginRequiredMixin,
                     seen.add(pk)
             return parsed
 
-        nucleado_ids = _parse_ids(raw_nucleado)
-        consultor_ids = _parse_ids(raw_consultor)
-        coordenador_ids = _parse_ids(raw_coordenador)
-        remover_nucleado_ids = _parse_ids(raw_remover_nucleado)
-        remover_consultor_ids = _parse_ids(raw_remover_consultor)
-        remover_coordenador_ids = _parse_ids(raw_remover_coordenador)
-
-        selected_coordenador_roles: dict[str, str] = {}
-        coordenador_roles: dict[int, str] = {}
-        for nucleo_id in coordenador_ids:
-            role_value = (request.POST.get(f"coordenador_papel_{nucleo_id}") or "").strip()
-            selected_coordenador_roles[str(nucleo_id)] = role_value
-            if role_value:
-                coordenador_roles[nucleo_id] = role_value
-
-        all_selected_ids = set(nucleado_ids) | set(consultor_ids) | set(coordenador_ids)
-        removal_ids = (
-            set(remover_nucleado_ids)
-            | set(remover_consultor_ids)
-            | set(remover_coordenador_ids)
-        )
-        all_action_ids = all_selected_ids | removal_ids
-
-        form_errors: list[str] = []
-        promote_associado_raw = (request.POST.get("promover_associado") or "").strip().lower()
-        promote_associado = promote_associado_raw in {"1", "true", "on", "yes"}
-        is_guest = self.membro.user_type == UserType.CONVIDADO.value
-
-        if not all_action_ids and not (is_guest and promote_associado):
-            form_errors.append(
-                _("Selecione ao menos um núcleo e papel para promoção ou remoção.")
-            )
-
-        valid_action_ids: set[int] = set()
-        if all_action_ids:
-            valid_action_ids = set(
-                Nucleo.objects.filter(
-                    organizacao=self.organizacao, id__in=all_action_ids
-                ).values_list("id", flat=True)
-            )
-            if len(valid_action_ids) != len(all_action_ids):
-                form_errors.append(_("Selecione núcleos válidos da organização."))
-
-        valid_ids = set(nid for nid in all_selected_ids if nid in valid_action_ids)
-
-        papel_choices = {value for value, _ in ParticipacaoNucleo.PapelCoordenador.choices}
-        for nucleo_id in coordenador_ids:
-            papel = (request.POST.get(f"coordenador_papel_{nucleo_id}") or "").strip()
-            if not papel:
-                form_errors.append(_("Selecione um papel de coordenação para cada núcleo escolhido."))
-                break
-            if papel not in papel_choices:
-                form_errors.append(_("Selecione um papel de coordenação válido."))
-                break
-
-        role_labels = dict(ParticipacaoNucleo.PapelCoordenador.choices)
-
-        valid_coordenador_ids = {nid for nid in coordenador_roles.keys() if nid in valid_action_ids}
-
-        if valid_coordenador_ids and not form_errors:
-            ocupados = (
-                ParticipacaoNucleo.objects.filter(
-                    nucleo_id__in=valid_coordenador_ids,
-                    papel="coordenador",
-                    status="ativo",
-                    papel_coordenador__in=set(coordenador_roles.values()),
-                )
-                .exclude(user=self.membro)
-                .select_related("user", "nucleo")
-            )
-            for participacao in ocupados:
-                papel = participacao.papel_coordenador
-                if papel and coordenador_roles.get(participacao.nucleo_id) == papel:
-                    form_errors.append(
-                        _("O papel %(papel)s do núcleo %(nucleo)s já está ocupado por %(nome)s.")
-                        % {
-                            "papel": role_labels.get(papel, papel),
-                            "nucleo": participacao.nucleo.nome,
-                            "nome": participacao.user.display_name or participacao.user.username,
-                        }
-                    )
-
-            restricted_roles = {
-                ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL,
-                ParticipacaoNucleo.PapelCoordenador.VICE_COORDENADOR,
-            }
-            selected_by_role: defaultdict[str, set[int]] = defaultdict(set)
-            for nucleo_id, papel in coordenador_roles.items():
-                if nucleo_id not in valid_coordenador_ids:
-                    continue
-                selected_by_role[papel].add(nucleo_id)
-
-            existentes = defaultdict(set)
-            if restricted_roles:
-                existentes_qs = ParticipacaoNucleo.objects.filter(
-                    user=self.membro,
-                    papel="coordenador",
-                    status="ativo",
-                    papel_coordenador__in=restricted_roles,
-                ).values_list("papel_coordenador", "nucleo_id")
-                for papel, nucleo_id in existentes_qs:
-                    existentes[papel].add(nucleo_id)
-
-            for papel in restricted_roles:
-                novos = selected_by_role.get(papel, set())
-                if not novos:
-                    continue
-                atuais = existentes.get(papel, set())
-                novos_diferentes = {nid for nid in novos if nid not in atuais}
-                if atuais and novos_diferentes:
-                    form_errors.append(
-                        _("%(papel)s não pode ser atribuído a múltiplos núcleos diferentes.")
-                        % {"papel": role_labels.get(papel, papel)}
-                    )
-                elif not atuais and len(novos_diferentes) > 1:
-                    form_errors.append(
-                        _("Selecione apenas um núcleo para o papel %(papel)s.")
-                        % {"papel": role_labels.get(papel, papel)}
-                    )
-
-        conflict_nucleado = set(nucleado_ids) & set(remover_nucleado_ids)
-        if conflict_nucleado:
-            form_errors.append(
-                _("Não é possível promover e remover a participação de nucleado no mesmo núcleo.")
-            )
-
-        conflict_consultor = set(consultor_ids) & set(remover_consultor_ids)
-        if conflict_consultor:
-            form_errors.append(
-                _("Não é possível promover e remover a consultoria do mesmo núcleo.")
-            )
-
-        conflict_coordenador = set(coordenador_ids) & set(remover_coordenador_ids)
-        if conflict_coordenador:
-            form_errors.append(
-                _("Não é possível promover e remover a coordenação no mesmo núcleo.")
+        selecionados = {
+            papel: _parse_ids(request.POST.getlist(f"{papel}_nucleos"))
+            for papel in (
+                promocao.NUCLEADO,
+                promocao.CONSULTOR,
+                promocao.COORDENADOR,
+                promocao.REMOVER_NUCLEADO,
+                promocao.REMOVER_CONSULTOR,
+                promocao.REMOVER_COORDENADOR,
             )
+        }
+        selected_coordenador_roles = {
+            str(nucleo_id): (request.POST.get(f"coordenador_papel_{nucleo_id}") or "").strip()
+            for nucleo_id in selecionados[promocao.COORDENADOR]
+        }
 
-        overlapping_consultor_coordenador = set(consultor_ids) & set(coordenador_ids)
-        if overlapping_consultor_coordenador:
-            form_errors.append(_("Selecione apenas uma opção de promoção por núcleo."))
-
-        valid_consultor_ids = {nid for nid in consultor_ids if nid in valid_action_ids}
-        if valid_consultor_ids and not form_errors:
-            consultores_ocupados = (
-                Nucleo.objects.filter(id__in=valid_consultor_ids)
-                .exclude(consultor__isnull=True)
-                .exclude(consultor=self.membro)
-                .select_related("consultor")
-            )
-            for nucleo in consultores_ocupados:
-                form_errors.append(
-                    _("O núcleo %(nucleo)s já possui o consultor %(nome)s.")
-                    % {
-                        "nucleo": nucleo.nome,
-                        "nome": nucleo.consultor.display_name or nucleo.consultor.username,
-                    }
-                    )
-
-        if remover_nucleado_ids and not form_errors:
-            coordenador_ativos = set(
-                ParticipacaoNucleo.objects.filter(
-                    user=self.membro,
-                    nucleo_id__in=remover_nucleado_ids,
-                    status="ativo",
-                    papel="coordenador",
-                ).values_list("nucleo_id", flat=True)
+        operacoes = [
+            promocao.OperacaoPromocao(
+                user_id=self.membro.pk,
+                papel=papel,
+                nucleo_id=nucleo_id,
+                papel_coordenador=selected_coordenador_roles.get(str(nucleo_id), ""),
             )
-            bloqueados = coordenador_ativos - set(remover_coordenador_ids)
-            if bloqueados:
-                nomes = dict(
-                    Nucleo.objects.filter(id__in=bloqueados).values_list("id", "nome")
-                )
-                for nucleo_id in bloqueados:
-                    form_errors.append(
-                        _("Remova a coordenação do núcleo %(nucleo)s antes de remover a participação.")
-                        % {"nucleo": nomes.get(nucleo_id, nucleo_id)}
-                    )
+            for papel, nucleo_ids in selecionados.items()
+            for nucleo_id in nucleo_ids
+        ]
+        promote_associado_raw = (request.POST.get("promover_associado") or "").strip().lower()
+        if promote_associado_raw in {"1", "true", "on", "yes"}:
+            operacoes.append(promocao.OperacaoPromocao(user_id=self.membro.pk, papel=promocao.ASSOCIADO))
 
-        if form_errors:
+        resultado = promocao.promover_em_lote(self.organizacao, operacoes)
+        if not resultado.ok:
             context = self.get_context_data(
-                selected_nucleado=[str(pk) for pk in nucleado_ids],
-                selected_consultor=[str(pk) for pk in consultor_ids],
-                selected_coordenador=[str(pk) for pk in coordenador_ids],
+                selected_nucleado=selecionados[promocao.NUCLEADO],
+                selected_consultor=selecionados[promocao.CONSULTOR],
+                selected_coordenador=selecionados[promocao.COORDENADOR],
                 selected_coordenador_roles=selected_coordenador_roles,
-                selected_remover_nucleado=[str(pk) for pk in remover_nucleado_ids],
-                selected_remover_consultor=[str(pk) for pk in remover_consultor_ids],
-                selected_remover_coordenador=[str(pk) for pk in remover_coordenador_ids],
-                form_errors=form_errors,
+                selected_remover_nucleado=selecionados[promocao.REMOVER_NUCLEADO],
+                selected_remover_consultor=selecionados[promocao.REMOVER_CONSULTOR],
+                selected_remover_coordenador=selecionados[promocao.REMOVER_COORDENADOR],
+                form_errors=resultado.erros,
             )
             return self.render_to_response(context, status=400)
 
-        if not valid_action_ids and not (is_guest and promote_associado):
-            context = self.get_context_data(
-                selected_nucleado=[],
-                selected_consultor=[],
-                selected_coordenador=[],
-                selected_coordenador_roles={},
-                selected_remover_nucleado=[],
-                selected_remover_consultor=[],
-                selected_remover_coordenador=[],
-                form_errors=(
-                    [] if is_guest and promote_associado else [_("Nenhum núcleo válido foi selecionado.")]
-                ),
-            )
-            return self.render_to_response(context, status=400)
-
-        with transaction.atomic():
-            nucleos_queryset = {
-                nucleo.id: nucleo
-                for nucleo in Nucleo.objects.filter(
-                    organizacao=self.organizacao,
-                    id__in=valid_action_ids,
-                ).select_for_update()
-            }
-
-            participacoes_map = {
-                participacao.nucleo_id: participacao
-                for participacao in ParticipacaoNucleo.objects.select_for_update()
-                .filter(user=self.membro, nucleo_id__in=valid_action_ids)
-            }
-
-            for nucleo_id in set(remover_consultor_ids) & valid_action_ids:
-                nucleo = nucleos_queryset.get(nucleo_id)
-                if nucleo and nucleo.consultor_id == self.membro.pk:
-                    nucleo.consultor = None
-                    nucleo.save(update_fields=["consultor"])
-
-            if valid_consultor_ids:
-                for nucleo_id in valid_consultor_ids:
-                    nucleo = nucleos_queryset.get(nucleo_id)
-                    if not nucleo:
-                        continue
-                    if nucleo.consultor_id != self.membro.pk:
-                        nucleo.consultor = self.membro
-                        nucleo.save(update_fields=["consultor"])
-
-            for nucleo_id in valid_ids:
-                nucleo = nucleos_queryset.get(nucleo_id)
-                if not nucleo:
-                    continue
-                assign_coordenador = nucleo_id in coordenador_roles
-                assign_nucleado = nucleo_id in nucleado_ids
-                if not assign_coordenador and not assign_nucleado:
-                    continue
-                participacao = participacoes_map.get(nucleo_id)
-                if not participacao:
-                    participacao = ParticipacaoNucleo.objects.create(
-                        nucleo=nucleo,
-                        user=self.membro,
-                        status="ativo",
-                    )
-                    participacoes_map[nucleo_id] = participacao
-
-                update_fields: set[str] = set()
-                if participacao.status != "ativo":
-                    participacao.status = "ativo"
-                    update_fields.add("status")
-                if participacao.status_suspensao:
-                    participacao.status_suspensao = False
-                    update_fields.add("status_suspensao")
-                if assign_coordenador:
-                    if participacao.papel != "coordenador":
-                        participacao.papel = "coordenador"
-                        update_fields.add("papel")
-                    novo_papel = coordenador_roles.get(nucleo_id)
-                    if participacao.papel_coordenador != novo_papel:
-                        participacao.papel_coordenador = novo_papel
-                        update_fields.add("papel_coordenador")
-                elif assign_nucleado and participacao.papel != "coordenador":
-                    if participacao.papel != "membro":
-                        participacao.papel = "membro"
-                        update_fields.add("papel")
-                    if participacao.papel_coordenador:
-                        participacao.papel_coordenador = None
-                        update_fields.add("papel_coordenador")
-                if update_fields:
-                    participacao.save(update_fields=list(update_fields))
-
-            for nucleo_id in set(remover_coordenador_ids) & valid_action_ids:
-                participacao = participacoes_map.get(nucleo_id)
-                if not participacao or participacao.papel != "coordenador":
-                    continue
-                update_fields: set[str] = set()
-                if participacao.papel != "membro":
-                    participacao.papel = "membro"
-                    update_fields.add("papel")
-                if participacao.papel_coordenador:
-                    participacao.papel_coordenador = None
-                    update_fields.add("papel_coordenador")
-                if participacao.status != "ativo":
-                    participacao.status = "ativo"
-                    update_fields.add("status")
-                if participacao.status_suspensao:
-                    participacao.status_suspensao = False
-                    update_fields.add("status_suspensao")
-                if update_fields:
-                    participacao.save(update_fields=list(update_fields))
-
-            for nucleo_id in set(remover_nucleado_ids) & valid_action_ids:
-                participacao = participacoes_map.get(nucleo_id)
-                if not participacao:
-                    continue
-                update_fields: set[str] = set()
-                if participacao.status != "inativo":
-                    participacao.status = "inativo"
-                    update_fields.add("status")
-                if participacao.papel != "membro":
-                    participacao.papel = "membro"
-                    update_fields.add("papel")
-                if participacao.papel_coordenador:
-                    participacao.papel_coordenador = None
-                    update_fields.add("papel_coordenador")
-                if participacao.status_suspensao:
-                    participacao.status_suspensao = False
-                    update_fields.add("status_suspensao")
-                if update_fields:
-                    participacao.save(update_fields=list(update_fields))
-
-        remaining_participacoes = ParticipacaoNucleo.objects.filter(
-            user=self.membro,
-            status="ativo",
-            status_suspensao=False,
-        )
-        has_coordenador = remaining_participacoes.filter(papel="coordenador").exists()
-        has_participacao = remaining_participacoes.exists()
-        has_consultor = Nucleo.objects.filter(
-            organizacao=self.organizacao,
-            consultor=self.membro,
-        ).exists()
-
-        updates: list[str] = []
-        if is_guest and promote_associado:
-            if self.membro.user_type != UserType.ASSOCIADO.value:
-                self.membro.user_type = UserType.ASSOCIADO.value
-                updates.append("user_type")
-            if not self.membro.is_associado:
-                self.membro.is_associado = True
-                updates.append("is_associado")
-
-        if self.membro.is_coordenador != has_coordenador:
-            self.membro.is_coordenador = has_coordenador
-            updates.append("is_coordenador")
-
-        if not (has_participacao or has_coordenador or has_consultor):
-            if self.membro.nucleo is not None:
-                self.membro.nucleo = None
-                updates.append("nucleo")
-
-        allowed_types = {
-            UserType.ASSOCIADO,
-            UserType.NUCLEADO,
-            UserType.CONSULTOR,
-            UserType.COORDENADOR,
-        }
-        try:
-            current_type = UserType(self.membro.user_type)
-        except ValueError:
-            current_type = None
-
-        if current_type in allowed_types:
-            if has_coordenador:
-                target_type = UserType.COORDENADOR
-            elif has_consultor:
-                target_type = UserType.CONSULTOR
-            elif has_participacao:
-                target_type = UserType.NUCLEADO
-            else:
-                target_type = UserType.ASSOCIADO
-            if current_type != target_type:
-                self.membro.user_type = target_type.value
-                updates.append("user_type")
-
-        if updates:
-            self.membro.save(update_fields=updates)
-
+        self.membro.refresh_from_db()
         context = self.get_context_data(
             selected_nucleado=[],
             selected_consultor=[],
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+from functools import cache
+
+from core.utils import is_htmx_partial
+
 from .models import Canal, NotificationLog, NotificationStatus
 
 
 def push_notification_count(request):
-    if not getattr(request, "user", None) or not request.user.is_authenticated:
+    if not getattr(request, "user", None) or not request.user.is_authenticated or is_htmx_partial(request):
         return {"push_notification_pending_count": 0}
 
-    count = NotificationLog.objects.filter(
-        user=request.user,
-        canal__in=[Canal.PUSH, Canal.APP],
-        status=NotificationStatus.ENVIADA,
-    ).count()
-    return {"push_notification_pending_count": count}
+    # O template chama o valor ao lê-lo; a contagem só é consultada (uma vez)
+    # quando o cabeçalho é renderizado. Um ``SimpleLazyObject`` não serve aqui
+    # porque ``{% blocktrans count %}`` exige um número de verdade.
+    @cache
+    def _count() -> int:
+        return NotificationLog.objects.filter(
+            user=request.user,
+            canal__in=[Canal.PUSH, Canal.APP],
+            status=NotificationStatus.ENVIADA,
+        ).count()
+
+    return {"push_notification_pending_count": _count}
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+TEMPLATES = [
+    {
+        "codigo": "membro_promovido",
+        "assunto": "Seus papéis nos núcleos foram atualizados",
+        "corpo": "Olá {{ nome }}, seus papéis foram atualizados nos núcleos: {{ nucleos }}.",
+        "canal": "push",
+    },
+]
+
+
+def create_templates(apps, schema_editor):
+    NotificationTemplate = apps.get_model("notificacoes", "NotificationTemplate")
+    for template in TEMPLATES:
+        NotificationTemplate.objects.get_or_create(
+            codigo=template["codigo"],
+            defaults=template,
+        )
+
+
+def remove_templates(apps, schema_editor):
+    NotificationTemplate = apps.get_model("notificacoes", "NotificationTemplate")
+    NotificationTemplate.objects.filter(codigo__in=[tpl["codigo"] for tpl in TEMPLATES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notificacoes", "0015_account_notification_templates"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_templates, remove_templates),
+    ]
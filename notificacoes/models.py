@@ -6,7 +6,7 @@ from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from core.models import SoftDeleteModel, TimeStampedModel
+from core.models import FieldTrackerMixin, SoftDeleteModel, TimeStampedModel
 
 
 class Canal(models.TextChoices):
@@ -72,7 +72,7 @@ class NotificationTemplate(TimeStampedModel, SoftDeleteModel):
         return self.codigo
 
 
-class NotificationLog(TimeStampedModel):
+class NotificationLog(FieldTrackerMixin, TimeStampedModel):
     id: models.UUIDField = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user: models.ForeignKey = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     destinatario: models.CharField = models.CharField(max_length=254, blank=True)
@@ -87,18 +87,16 @@ class NotificationLog(TimeStampedModel):
     erro: models.TextField | None = models.TextField(null=True, blank=True)
     corpo_renderizado: models.TextField | None = models.TextField(null=True, blank=True)
 
+    tracked_fields = ("user", "template", "canal", "destinatario")
+
     class Meta:
         verbose_name = _("Log de Notificação")
         verbose_name_plural = _("Logs de Notificação")
         unique_together = ("user", "template", "canal", "created_at")
 
     def save(self, *args, **kwargs):  # pragma: no cover - comportamento definido
-        if self.pk and NotificationLog.objects.filter(pk=self.pk).exists():
-            original = NotificationLog.objects.get(pk=self.pk)
-            imutaveis = ["user_id", "template_id", "canal", "destinatario"]
-            for campo in imutaveis:
-                if getattr(self, campo) != getattr(original, campo):
-                    raise PermissionError(_("NotificationLog é imutável"))
+        if not self._state.adding and self.changed_fields:
+            raise PermissionError(_("NotificationLog é imutável"))
         super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):  # pragma: no cover - comportamento definido
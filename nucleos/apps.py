@@ -6,4 +6,4 @@ class NucleosConfig(AppConfig):
     name = "nucleos"
 
     def ready(self):
-        from . import signals  # noqa: F401
+        from . import exports, signals  # noqa: F401
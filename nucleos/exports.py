@@ -0,0 +1,99 @@
+"""Exportação das participações de um núcleo (CSV e XLSX).
+
+As linhas são lidas com ``values_list(...).iterator(chunk_size=...)`` e
+escritas conforme chegam; a memória não cresce com o número de membros.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+
+from core.exports import EXPORT_CHUNK_SIZE, ExportDefinition, register_export
+
+from .models import Nucleo, ParticipacaoNucleo
+
+NUCLEO_MEMBROS_EXPORT = "nucleo_membros"
+
+
+def membros_version(nucleo_id: Any) -> str:
+    """Muda a cada alteração de participação ou do próprio núcleo."""
+
+    dados = ParticipacaoNucleo.all_objects.filter(nucleo_id=nucleo_id).aggregate(
+        total=Count("id"),
+        ultima=Max("updated_at"),
+    )
+    nucleo_atualizado = Nucleo.all_objects.filter(pk=nucleo_id).values_list("updated_at", flat=True).first()
+    ultima = dados["ultima"].isoformat() if dados["ultima"] else ""
+    nucleo = nucleo_atualizado.isoformat() if nucleo_atualizado else ""
+    return f"{dados['total']}:{ultima}:{nucleo}"
+
+
+def _filename(nucleo_id: Any) -> str:
+    nome = Nucleo.all_objects.filter(pk=nucleo_id).values_list("nome", flat=True).first()
+    return f"membros-{slugify(nome or '') or nucleo_id}"
+
+
+def _columns() -> list[str]:
+    return [_("Nome"), _("E-mail"), _("Telefone"), _("Papel"), _("Coordenação"), _("Status"), _("Desde")]
+
+
+def _rows(nucleo_id: Any) -> Iterator[list[Any]]:
+    papeis = dict(ParticipacaoNucleo.PAPEL_CHOICES)
+    coordenacao = dict(ParticipacaoNucleo.PapelCoordenador.choices)
+    status = dict(ParticipacaoNucleo.STATUS_CHOICES)
+    linhas = (
+        ParticipacaoNucleo.objects.filter(nucleo_id=nucleo_id, user__deleted=False)
+        .order_by("id")
+        .values_list(
+            "user__contato",
+            "user__username",
+            "user__email",
+            "user__phone_number",
+            "papel",
+            "papel_coordenador",
+            "status",
+            "status_suspensao",
+            "data_decisao",
+            "data_solicitacao",
+        )
+    )
+    for (
+        contato,
+        username,
+        email,
+        telefone,
+        papel,
+        papel_coordenador,
+        situacao,
+        suspenso,
+        decisao,
+        solicitacao,
+    ) in linhas.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        desde = decisao or solicitacao
+        yield [
+            (contato or "").strip() or username,
+            email or "",
+            str(telefone or ""),
+            str(papeis.get(papel, papel)),
+            str(coordenacao.get(papel_coordenador, papel_coordenador or "")),
+            _("Suspenso") if suspenso else str(status.get(situacao, situacao)),
+            timezone.localtime(desde).strftime("%d/%m/%Y") if desde else "",
+        ]
+
+
+register_export(
+    ExportDefinition(
+        name=NUCLEO_MEMBROS_EXPORT,
+        version=membros_version,
+        filename=_filename,
+        columns=_columns,
+        rows=_rows,
+        formats=("csv", "xlsx"),
+    )
+)
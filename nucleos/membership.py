@@ -0,0 +1,140 @@
+"""Índice de vínculos do usuário com núcleos.
+
+Reúne em um único objeto os núcleos em que o usuário participa, coordena, presta
+consultoria ou atua como suplente. O índice é montado com poucas consultas,
+guardado em cache por usuário (invalidado pelos sinais de ``ParticipacaoNucleo``,
+``Nucleo.consultor`` e ``CoordenadorSuplente``) e memorizado no próprio objeto
+``user`` durante a requisição. Organização e núcleo principal são lidos do
+usuário a cada acesso, sem passar pelo cache.
+
+A versão do índice é lida do cache uma vez por instância: acessos seguintes
+reutilizam a memória, a menos que o próprio processo tenha invalidado algum
+índice desde então (ex.: promoção feita na mesma requisição). Alterações de
+outros processos valem a partir da próxima instância.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache import bump_cache_version, get_cache_version
+
+CACHE_TIMEOUT = 60 * 60
+_MEMO_ATTR = "_indice_vinculos"
+_VERSAO_ATTR = "_indice_vinculos_versao"
+# Incrementada a cada invalidação feita neste processo; descarta versões memorizadas.
+_geracao_local = 0
+
+
+def indice_namespace(user_id: Any) -> str:
+    return f"vinculos_usuario_{user_id}"
+
+
+def invalidar_indice(*user_ids: Any) -> None:
+    global _geracao_local
+
+    ids = {user_id for user_id in user_ids if user_id}
+    for user_id in ids:
+        bump_cache_version(indice_namespace(user_id))
+    if ids:
+        _geracao_local += 1
+
+
+def versao_indice(user) -> int:
+    """Versão do índice de ``user``, lida do cache uma vez por instância."""
+
+    memo = getattr(user, _VERSAO_ATTR, None)
+    if memo is not None and memo[0] == _geracao_local:
+        return memo[1]
+    geracao = _geracao_local
+    versao = get_cache_version(indice_namespace(user.pk))
+    setattr(user, _VERSAO_ATTR, (geracao, versao))
+    return versao
+
+
+@dataclass(frozen=True)
+class IndiceVinculos:
+    organizacao_id: Any = None
+    nucleo_id: int | None = None
+    # Participações com status ``ativo``, inclusive suspensas (como ``User.nucleos``).
+    ativos: frozenset[int] = frozenset()
+    ativos_sem_suspensao: frozenset[int] = frozenset()
+    coordenacao: frozenset[int] = frozenset()
+    consultoria: frozenset[int] = frozenset()
+    suplencias: tuple[tuple[int, datetime, datetime], ...] = ()
+
+    @property
+    def nucleos_vinculados(self) -> frozenset[int]:
+        """Participações ativas sem suspensão, consultoria e núcleo principal."""
+
+        ids = self.ativos_sem_suspensao | self.consultoria
+        return ids | {self.nucleo_id} if self.nucleo_id else ids
+
+    @property
+    def coordenacao_ou_consultoria(self) -> frozenset[int]:
+        ids = self.coordenacao | self.consultoria
+        return ids | {self.nucleo_id} if self.nucleo_id else ids
+
+    def suplencias_ativas(self, momento: datetime | None = None) -> frozenset[int]:
+        momento = momento or timezone.now()
+        return frozenset(nucleo_id for nucleo_id, inicio, fim in self.suplencias if inicio <= momento <= fim)
+
+
+def _construir(user_id: Any) -> IndiceVinculos:
+    from .models import CoordenadorSuplente, Nucleo, ParticipacaoNucleo
+
+    ativos: set[int] = set()
+    sem_suspensao: set[int] = set()
+    coordenacao: set[int] = set()
+    participacoes = ParticipacaoNucleo.objects.filter(
+        user_id=user_id,
+        status="ativo",
+        nucleo__deleted=False,
+    ).values_list("nucleo_id", "papel", "status_suspensao")
+    for nucleo_id, papel, suspenso in participacoes:
+        ativos.add(nucleo_id)
+        if not suspenso:
+            sem_suspensao.add(nucleo_id)
+            if papel == "coordenador":
+                coordenacao.add(nucleo_id)
+
+    return IndiceVinculos(
+        ativos=frozenset(ativos),
+        ativos_sem_suspensao=frozenset(sem_suspensao),
+        coordenacao=frozenset(coordenacao),
+        consultoria=frozenset(Nucleo.objects.filter(consultor_id=user_id).values_list("id", flat=True)),
+        suplencias=tuple(
+            CoordenadorSuplente.objects.filter(usuario_id=user_id, nucleo__deleted=False).values_list(
+                "nucleo_id", "periodo_inicio", "periodo_fim"
+            )
+        ),
+    )
+
+
+def obter_indice(user) -> IndiceVinculos:
+    """Índice de vínculos de ``user``; usuários anônimos recebem um índice vazio."""
+
+    if not getattr(user, "is_authenticated", False) or getattr(user, "pk", None) is None:
+        return IndiceVinculos()
+
+    version = versao_indice(user)
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is not None and memo[0] == version:
+        indice = memo[1]
+    else:
+        cache_key = f"vinculos:{user.pk}:v{version}"
+        indice = cache.get(cache_key)
+        if indice is None:
+            indice = _construir(user.pk)
+            cache.set(cache_key, indice, CACHE_TIMEOUT)
+        setattr(user, _MEMO_ATTR, (version, indice))
+    return replace(
+        indice,
+        organizacao_id=getattr(user, "organizacao_id", None),
+        nucleo_id=getattr(user, "nucleo_id", None),
+    )
@@ -11,13 +11,13 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models import MediaTag
-from core.models import SoftDeleteManager, SoftDeleteModel, TimeStampedModel
+from core.models import FieldTrackerMixin, SoftDeleteManager, SoftDeleteModel, TimeStampedModel
 from eventos.validators import validate_uploaded_file
 
 User = get_user_model()
 
 
-class ParticipacaoNucleo(TimeStampedModel, SoftDeleteModel):
+class ParticipacaoNucleo(FieldTrackerMixin, TimeStampedModel, SoftDeleteModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="participacoes")
     nucleo = models.ForeignKey("Nucleo", on_delete=models.CASCADE, related_name="participacoes")
 
@@ -67,6 +67,8 @@ class ParticipacaoNucleo(TimeStampedModel, SoftDeleteModel):
     )
     justificativa = models.TextField(blank=True)
 
+    tracked_fields = ("nucleo", "created_at")
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=("user", "nucleo"), name="uniq_participacao_usuario_nucleo"),
@@ -94,7 +96,7 @@ class ParticipacaoNucleo(TimeStampedModel, SoftDeleteModel):
         super().save(*args, **kwargs)
 
 
-class Nucleo(TimeStampedModel, SoftDeleteModel):
+class Nucleo(FieldTrackerMixin, TimeStampedModel, SoftDeleteModel):
     class Classificacao(models.TextChoices):
         CONSTITUIDO = "constituido", _("Constituído")
         PLANEJAMENTO = "planejamento", _("Planejamento")
@@ -128,6 +130,8 @@ class Nucleo(TimeStampedModel, SoftDeleteModel):
         verbose_name=_("Consultor"),
     )
 
+    tracked_fields = ("consultor", "deleted", "nome")
+
     class Meta:
         constraints = [models.UniqueConstraint(fields=("organizacao", "nome"), name="uniq_org_nome")]
         verbose_name = "Núcleo"
@@ -144,6 +148,13 @@ class Nucleo(TimeStampedModel, SoftDeleteModel):
             participacoes__status_suspensao=False,
         )
 
+    @property
+    def total_membros(self) -> int:
+        membros_count = getattr(self, "membros_count", None)
+        if membros_count is not None:
+            return membros_count
+        return self.membros.count()
+
     @property
     def coordenadores(self):
         return self.membros.filter(participacoes__papel="coordenador")
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import logging
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Iterable
+from typing import Any, Iterable
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from core.cache import bump_cache_version, get_cache_version
 from tokens.models import TokenAcesso
 
 from .metrics import convites_gerados_total
@@ -80,3 +86,170 @@ def registrar_uso_convite(convite: ConviteNucleo) -> None:
         raise ValueError("limite diário de uso do convite atingido")
     # Armazena por 24h para reiniciar a contagem a cada dia
     cache.set(cache_key, count + 1, 24 * 60 * 60)
+
+
+# ---------------------------------------------------------------------------
+# Listagem de núcleos em cache
+# ---------------------------------------------------------------------------
+
+LISTAGEM_CACHE_TIMEOUT = 300
+LISTAGEM_GLOBAL_NAMESPACE = "nucleos_listagem"
+
+
+def listagem_namespace(organizacao_id: Any) -> str:
+    return f"{LISTAGEM_GLOBAL_NAMESPACE}_{organizacao_id}"
+
+
+def invalidar_listagem(organizacao_id: Any) -> None:
+    """Invalida as listagens da organização (e a listagem sem escopo de organização)."""
+
+    bump_cache_version(listagem_namespace(organizacao_id))
+    bump_cache_version(LISTAGEM_GLOBAL_NAMESPACE)
+
+
+@dataclass(frozen=True)
+class PessoaResumo:
+    username: str
+    display_name: str = ""
+    contato: str = ""
+    nome_fantasia: str = ""
+    razao_social: str = ""
+
+
+@dataclass(frozen=True)
+class NucleoResumo:
+    """Projeção de :class:`Nucleo` com o necessário para os cards da listagem."""
+
+    id: int
+    public_id: uuid.UUID
+    nome: str
+    classificacao: str
+    ativo: bool
+    membros_count: int
+    avatar: str = ""
+    cover: str = ""
+    consultor: PessoaResumo | None = None
+    coordenador_geral: PessoaResumo | None = None
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @property
+    def total_membros(self) -> int:
+        return self.membros_count
+
+    def get_classificacao_display(self) -> str:
+        return str(Nucleo.Classificacao(self.classificacao).label)
+
+
+@dataclass(frozen=True)
+class ListagemNucleos:
+    nucleos: list[NucleoResumo] = field(default_factory=list)
+
+    def filtrar(self, *, q: str = "", classificacao: str | None = None) -> list[NucleoResumo]:
+        termo = q.strip().casefold()
+        return [
+            nucleo
+            for nucleo in self.nucleos
+            if (not termo or termo in nucleo.nome.casefold())
+            and (not classificacao or nucleo.classificacao == classificacao)
+        ]
+
+    @staticmethod
+    def totais(nucleos: Iterable[NucleoResumo], allowed_keys: Iterable[str]) -> dict[str, int]:
+        contagem = Counter(nucleo.classificacao for nucleo in nucleos)
+        return {key: contagem.get(key, 0) for key in allowed_keys}
+
+
+def _pessoa(user) -> PessoaResumo:
+    return PessoaResumo(
+        username=user.username,
+        display_name=user.display_name,
+        contato=user.contato or "",
+        nome_fantasia=user.nome_fantasia or "",
+        razao_social=user.razao_social or "",
+    )
+
+
+def _projetar(queryset: QuerySet) -> list[NucleoResumo]:
+    membros_ativos = (
+        ParticipacaoNucleo.objects.filter(nucleo=OuterRef("pk"), status="ativo", status_suspensao=False)
+        .order_by()
+        .values("nucleo")
+        .annotate(total=Count("user", distinct=True))
+        .values("total")
+    )
+    rows = list(
+        queryset.order_by()
+        .annotate(membros_total=Coalesce(Subquery(membros_ativos, output_field=IntegerField()), Value(0)))
+        .values(
+            "id",
+            "public_id",
+            "nome",
+            "classificacao",
+            "ativo",
+            "avatar",
+            "cover",
+            "consultor_id",
+            "membros_total",
+        )
+        .distinct()
+        .order_by("nome")
+    )
+    if not rows:
+        return []
+
+    campos_pessoa = ("id", "username", "email", "contato", "nome_fantasia", "razao_social")
+    consultor_ids = {row["consultor_id"] for row in rows if row["consultor_id"]}
+    consultores = {user.pk: _pessoa(user) for user in User.objects.filter(pk__in=consultor_ids).only(*campos_pessoa)}
+    coordenadores: dict[int, PessoaResumo] = {}
+    participacoes = (
+        ParticipacaoNucleo.objects.filter(
+            nucleo_id__in=[row["id"] for row in rows],
+            status="ativo",
+            status_suspensao=False,
+            papel="coordenador",
+            papel_coordenador=ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL,
+        )
+        .select_related("user")
+        .only("nucleo_id", *(f"user__{campo}" for campo in campos_pessoa))
+        .order_by("pk")
+    )
+    for participacao in participacoes:
+        coordenadores.setdefault(participacao.nucleo_id, _pessoa(participacao.user))
+
+    avatar_storage = Nucleo._meta.get_field("avatar").storage
+    cover_storage = Nucleo._meta.get_field("cover").storage
+    return [
+        NucleoResumo(
+            id=row["id"],
+            public_id=row["public_id"],
+            nome=row["nome"],
+            classificacao=row["classificacao"],
+            ativo=row["ativo"],
+            membros_count=row["membros_total"],
+            avatar=avatar_storage.url(row["avatar"]) if row["avatar"] else "",
+            cover=cover_storage.url(row["cover"]) if row["cover"] else "",
+            consultor=consultores.get(row["consultor_id"]),
+            coordenador_geral=coordenadores.get(row["id"]),
+        )
+        for row in rows
+    ]
+
+
+def listar_nucleos(queryset: QuerySet, *, organizacao_id: Any, escopo: str) -> ListagemNucleos:
+    """Projeções dos núcleos de ``queryset``, em cache pela versão da organização.
+
+    ``escopo`` identifica os filtros aplicados ao ``queryset`` (perfil,
+    usuário, classificações permitidas). Com ``organizacao_id=None`` a versão
+    global é utilizada. Em um acerto de cache nenhuma consulta é executada.
+    """
+
+    namespace = listagem_namespace(organizacao_id) if organizacao_id else LISTAGEM_GLOBAL_NAMESPACE
+    cache_key = f"nucleos:listagem:{organizacao_id or '_'}:v{get_cache_version(namespace)}:{escopo}"
+    listagem = cache.get(cache_key)
+    if listagem is None:
+        listagem = ListagemNucleos(nucleos=_projetar(queryset))
+        cache.set(cache_key, listagem, LISTAGEM_CACHE_TIMEOUT)
+    return listagem
@@ -1,28 +1,53 @@
 from __future__ import annotations
 
+from django.contrib.auth import get_user_model
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from core.cache import bump_cache_version
 
-from .models import CoordenadorSuplente, ParticipacaoNucleo
+from .membership import invalidar_indice
+from .models import CoordenadorSuplente, Nucleo, ParticipacaoNucleo
+from .services import invalidar_listagem
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Nucleo)
+def invalidate_nucleo(sender, instance, created=False, **kwargs):
+    invalidar_listagem(instance.organizacao_id)
+    bump_cache_version(f"nucleos_list_{instance.organizacao_id}")
+    update_fields = kwargs.get("update_fields")
+    if created or kwargs.get("signal") is post_delete or instance.saves_change("consultor", update_fields):
+        invalidar_indice(instance.consultor_id, instance.previous_value("consultor"))
+    if not created and (
+        instance.saves_change("deleted", update_fields) or instance.saves_change("nome", update_fields)
+    ):
+        # O nome do núcleo também compõe as badges dos cards (``membros.badges``).
+        invalidar_indice(
+            instance.consultor_id,
+            *ParticipacaoNucleo.objects.filter(nucleo=instance).values_list("user_id", flat=True),
+            *User.all_objects.filter(nucleo=instance).values_list("pk", flat=True),
+        )
 
 
 @receiver([post_save, post_delete], sender=ParticipacaoNucleo)
 def invalidate_participacao(sender, instance, **kwargs):
     nucleo_id = instance.nucleo_id
     org_id = instance.nucleo.organizacao_id
-    bump_cache_version("nucleos_list")
-    bump_cache_version("nucleos_meus")
+    invalidar_indice(instance.user_id)
+    invalidar_listagem(org_id)
     bump_cache_version(f"nucleo_{nucleo_id}_membros")
     bump_cache_version(f"nucleo_{nucleo_id}_metrics")
     bump_cache_version(f"nucleos_list_{org_id}")
+
+
 @receiver([post_save, post_delete], sender=CoordenadorSuplente)
 def invalidate_suplente(sender, instance, **kwargs):
     nucleo_id = instance.nucleo_id
     org_id = instance.nucleo.organizacao_id
-    bump_cache_version("nucleos_list")
-    bump_cache_version("nucleos_meus")
+    invalidar_indice(instance.usuario_id)
+    invalidar_listagem(org_id)
     bump_cache_version(f"nucleo_{nucleo_id}_membros")
     bump_cache_version(f"nucleo_{nucleo_id}_metrics")
     bump_cache_version(f"nucleos_list_{org_id}")
@@ -30,6 +30,11 @@ urlpatterns = [
         views.NucleoMembrosCarouselView.as_view(),
         name="membros_carousel_api",
     ),
+    path(
+        "<uuid:public_id>/membros/exportar/<str:formato>/",
+        views.NucleoMembrosExportView.as_view(),
+        name="membros_exportar",
+    ),
     path("<int:pk>/membros/carousel/", views.NucleoLegacyRedirectView.as_view(target_name="nucleos:membros_carousel_api"), name="membros_carousel_api_legacy"),
     path("<uuid:public_id>/", views.NucleoDetailView.as_view(), name="detail"),
     path("<int:pk>/", views.NucleoLegacyRedirectView.as_view(target_name="nucleos:detail"), name="detail_legacy"),
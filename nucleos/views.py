@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-
 from collections import Counter
 from typing import Iterable, Mapping
 
@@ -9,11 +8,10 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
-from django.db.models import Count, Q, Prefetch
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Count, Q
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
@@ -22,18 +20,10 @@ from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import (
-    CreateView,
-    DeleteView,
-    DetailView,
-    FormView,
-    ListView,
-    UpdateView,
-    View,
-)
+from django.views.generic import CreateView, DeleteView, DetailView, FormView, ListView, UpdateView, View
 
 from accounts.models import UserType
-from core.cache import get_cache_version
+from core.exports import ExportError, request_export
 from core.permissions import (
     AdminOperatorOrCoordinatorRequiredMixin,
     AdminOrOperatorRequiredMixin,
@@ -43,16 +33,14 @@ from core.permissions import (
 )
 from core.utils import resolve_back_href
 from eventos.models import Evento
+from membros.badges import carregar_badges
 
-from .forms import (
-    NucleoForm,
-    NucleoMediaForm,
-    NucleoPortfolioFilterForm,
-    NucleoSearchForm,
-    ParticipacaoDecisaoForm,
-)
+from .exports import NUCLEO_MEMBROS_EXPORT
+from .forms import NucleoForm, NucleoMediaForm, NucleoPortfolioFilterForm, NucleoSearchForm, ParticipacaoDecisaoForm
+from .membership import obter_indice
 from .models import CoordenadorSuplente, Nucleo, NucleoMidia, ParticipacaoNucleo
 from .permissions import can_manage_feed
+from .services import ListagemNucleos, listar_nucleos
 from .tasks import notify_participacao_aprovada, notify_participacao_recusada
 
 logger = logging.getLogger(__name__)
@@ -69,38 +57,11 @@ def _user_has_consultoria_access(user) -> bool:
     if user_type in {UserType.CONSULTOR, UserType.CONSULTOR.value}:
         return True
 
-    nucleos_consultoria = getattr(user, "nucleos_consultoria", None)
-    if nucleos_consultoria is not None:
-        try:
-            return nucleos_consultoria.filter(deleted=False).exists()
-        except Exception:  # pragma: no cover - defensive
-            pass
-    return False
+    return bool(obter_indice(user).consultoria)
 
 
 def _get_consultor_nucleo_ids(user) -> set[int]:
-    nucleo_ids: set[int] = set()
-
-    nucleos_consultoria = getattr(user, "nucleos_consultoria", None)
-    if nucleos_consultoria is not None:
-        try:
-            nucleo_ids.update(pk for pk in nucleos_consultoria.values_list("id", flat=True) if pk)
-        except Exception:  # pragma: no cover - defensive
-            pass
-
-    participacoes = getattr(user, "participacoes", None)
-    if participacoes is not None:
-        participacao_ids = participacoes.filter(
-            status="ativo",
-            status_suspensao=False,
-        ).values_list("nucleo_id", flat=True)
-        nucleo_ids.update(pk for pk in participacao_ids if pk)
-
-    nucleo_id = getattr(user, "nucleo_id", None)
-    if nucleo_id:
-        nucleo_ids.add(nucleo_id)
-
-    return nucleo_ids
+    return set(obter_indice(user).nucleos_vinculados)
 
 
 def _get_allowed_classificacao_keys(user) -> set[str]:
@@ -366,79 +327,47 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
         self._classificacao = classificacao
         return classificacao
 
-    def get_queryset(self):
-        if hasattr(self, "_cached_queryset"):
-            return self._cached_queryset
+    def get_listagem(self) -> ListagemNucleos:
+        """Núcleos visíveis ao usuário (sem busca), compartilhados via cache por escopo."""
+
+        if hasattr(self, "_listagem"):
+            return self._listagem
 
         user = self.request.user
-        q = self.request.GET.get("q", "")
         allowed_keys = self.get_allowed_classificacao_keys()
-        classificacao = self.get_classificacao()
-        version = get_cache_version("nucleos_list")
         allowed_fragment = ",".join(sorted(allowed_keys)) or "_"
-        cache_key = (
-            f"nucleos_list:v{version}:{user.id}:{allowed_fragment}:{q}:{classificacao or 'all'}"
-        )
-
-        base_qs = (
-            Nucleo.objects.select_related("organizacao")
-            .prefetch_related("participacoes")
-            .annotate(
-                membros_count=Count(
-                    "participacoes",
-                    filter=Q(
-                        participacoes__status="ativo",
-                        participacoes__status_suspensao=False,
-                    ),
-                    distinct=True,
-                )
-            )
-        )
-
-        qs = base_qs.filter(deleted=False, classificacao__in=allowed_keys)
+        organizacao_id = getattr(user, "organizacao_id", None)
 
+        qs = Nucleo.objects.filter(deleted=False, classificacao__in=allowed_keys)
         tipo_usuario = getattr(user, "get_tipo_usuario", None)
-        if tipo_usuario == UserType.ADMIN.value:
-            qs = qs.filter(organizacao=user.organizacao)
+        if tipo_usuario in {UserType.ADMIN.value, UserType.ASSOCIADO.value, UserType.NUCLEADO.value}:
+            qs = qs.filter(organizacao_id=organizacao_id)
+            escopo = "organizacao"
         elif tipo_usuario == UserType.COORDENADOR.value:
             qs = qs.filter(participacoes__user=user)
-        elif tipo_usuario in {UserType.ASSOCIADO.value, UserType.NUCLEADO.value}:
-            qs = qs.filter(organizacao=user.organizacao)
+            escopo = f"coordenador:{user.pk}"
         elif self.user_has_consultoria_access():
             consultor_ids = self.get_consultor_nucleo_ids()
-            if consultor_ids:
-                qs = qs.filter(pk__in=consultor_ids)
-            else:
-                qs = qs.none()
-
-        if q:
-            qs = qs.filter(nome__icontains=q)
-
-        # Armazena um queryset com os mesmos filtros aplicados para ser usado na
-        # contagem dos cartões de classificação. O ``distinct()`` garante que
-        # núcleos não sejam contabilizados mais de uma vez quando há múltiplas
-        # participações relacionadas ao mesmo usuário.
-        self._qs_for_counts = qs.distinct()
-
-        cached_ids = cache.get(cache_key)
-        if cached_ids is not None:
-            result = list(
-                base_qs.filter(pk__in=cached_ids, classificacao__in=allowed_keys).order_by("nome")
-            )
-            self._cached_queryset = result
-            return result
+            qs = qs.filter(pk__in=consultor_ids) if consultor_ids else qs.none()
+            escopo = f"consultor:{user.pk}"
+        else:
+            organizacao_id = None
+            escopo = "todos"
 
-        if classificacao:
-            qs = qs.filter(classificacao=classificacao)
+        self._listagem = listar_nucleos(qs, organizacao_id=organizacao_id, escopo=f"list:{escopo}:{allowed_fragment}")
+        return self._listagem
 
-        ids = list(qs.order_by("nome").distinct().values_list("pk", flat=True))
-        cache.set(cache_key, ids, 300)
+    def get_queryset(self):
+        if hasattr(self, "_cached_queryset"):
+            return self._cached_queryset
 
-        result = list(
-            base_qs.filter(pk__in=ids, classificacao__in=allowed_keys).order_by("nome")
-        )
-        self._cached_queryset = result
-        return result
+        listagem = self.get_listagem()
+        q = self.request.GET.get("q", "")
+        # Núcleos com os mesmos filtros (exceto a classificação) para os
+        # cartões de classificação e as seções do carrossel.
+        self._qs_for_counts = listagem.filtrar(q=q)
+        self._cached_queryset = listagem.filtrar(q=q, classificacao=self.get_classificacao())
+        return self._cached_queryset
 
     def can_view_nucleacao_solicitacoes(self) -> bool:
         tipo = getattr(self.request.user, "get_tipo_usuario", None)
@@ -510,8 +439,6 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
             ctx["total_nucleos"] = len(qs)
             nucleo_ids = [n.pk for n in qs]
             # contar membros ativos (sem suspensão) somando participações únicas por usuário
-            from .models import ParticipacaoNucleo
-
             ctx["total_membros_org"] = (
                 ParticipacaoNucleo.objects.filter(nucleo_id__in=nucleo_ids, status="ativo", status_suspensao=False)
                 .values("user")
@@ -578,13 +505,11 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
 
         classificacao_filters: list[dict[str, object]] = []
 
+        base_qs_for_totals = getattr(self, "_qs_for_counts", [])
+        classificacao_totals = ListagemNucleos.totais(base_qs_for_totals, allowed_keys)
+
         if show_totals:
-            base_qs = getattr(self, "_qs_for_counts", Nucleo.objects.none())
-            counts = {key: 0 for key in allowed_keys}
-            for row in base_qs.values("classificacao").annotate(total=Count("id", distinct=True)):
-                key = row["classificacao"]
-                if key in counts:
-                    counts[key] = row["total"]
+            counts = classificacao_totals
 
             classificacao_labels = [
                 (Nucleo.Classificacao.EM_FORMACAO.value, _("Formação")),
@@ -611,18 +536,7 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
                 )
 
         ctx["classificacao_filters"] = classificacao_filters
-
-        base_qs_for_totals = getattr(self, "_qs_for_counts", Nucleo.objects.none())
-        classificacao_totals: dict[str, int] = {key: 0 for key in allowed_keys}
-
-        if hasattr(base_qs_for_totals, "values"):
-            for row in base_qs_for_totals.values("classificacao").annotate(total=Count("id", distinct=True)):
-                key = row["classificacao"]
-                if key in classificacao_totals:
-                    classificacao_totals[key] = row["total"]
-
         ctx["classificacao_totals"] = classificacao_totals
-        base_qs_for_totals = getattr(self, "_qs_for_counts", Nucleo.objects.none())
         sections = build_nucleo_sections(
             self.request,
             base_qs_for_totals,
@@ -642,22 +556,13 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
         }
 
         if user_tipo in allowed_user_types:
-            my_nucleos = (
-                base_qs_for_totals.filter(
-                    (
-                        Q(
-                            participacoes__user=self.request.user,
-                            participacoes__status="ativo",
-                            participacoes__status_suspensao=False,
-                        )
-                        | Q(consultor=self.request.user)
-                    ),
-                    classificacao=Nucleo.Classificacao.CONSTITUIDO,
-                    ativo=True,
-                )
-                .order_by("nome")
-                .distinct()
-            )
+            indice = obter_indice(self.request.user)
+            meus_ids = indice.ativos_sem_suspensao | indice.consultoria
+            my_nucleos = [
+                nucleo
+                for nucleo in base_qs_for_totals
+                if nucleo.pk in meus_ids and nucleo.classificacao == Nucleo.Classificacao.CONSTITUIDO and nucleo.ativo
+            ]
 
             meus_section = build_custom_nucleo_section(
                 self.request,
@@ -686,7 +591,7 @@ class NucleoListView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
             if user_organizacao:
                 org_nucleos = org_nucleos.filter(organizacao=user_organizacao)
             else:
-                org_nucleos = org_nucleos.filter(pk__in=base_qs_for_totals.values("pk"))
+                org_nucleos = org_nucleos.filter(pk__in=[nucleo.pk for nucleo in base_qs_for_totals])
 
             todos_section = build_custom_nucleo_section(
                 self.request,
@@ -723,56 +628,23 @@ class NucleoMeusView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
             return self._cached_queryset
 
         user = self.request.user
-        q = self.request.GET.get("q", "")
         allowed_keys = self.get_allowed_classificacao_keys()
-        version = get_cache_version("nucleos_meus")
         allowed_fragment = ",".join(sorted(allowed_keys)) or "_"
-        cache_key = f"nucleos_meus:v{version}:{user.id}:{allowed_fragment}:{q}"
-        cached_ids = cache.get(cache_key)
-
-        base_qs = (
-            Nucleo.objects.select_related("organizacao")
-            .prefetch_related("participacoes")
-            .annotate(
-                membros_count=Count(
-                    "participacoes",
-                    filter=Q(
-                        participacoes__status="ativo",
-                        participacoes__status_suspensao=False,
-                    ),
-                    distinct=True,
-                )
-            )
-        )
-
-        if cached_ids is not None:
-            qs = base_qs.filter(pk__in=cached_ids, classificacao__in=allowed_keys).order_by("nome")
-            self._qs_for_counts = qs.distinct()
-            result = list(qs)
-            self._cached_queryset = result
-            return result
-
-        qs = base_qs.filter(
+        qs = Nucleo.objects.filter(
             deleted=False,
             participacoes__user=user,
             participacoes__status="ativo",
             participacoes__status_suspensao=False,
             classificacao__in=allowed_keys,
         )
-
-        self._qs_for_counts = qs.distinct()
-
-        if q:
-            qs = qs.filter(nome__icontains=q)
-
-        ids = list(qs.order_by("nome").distinct().values_list("pk", flat=True))
-        cache.set(cache_key, ids, 300)
-
-        result = list(
-            base_qs.filter(pk__in=ids, classificacao__in=allowed_keys).order_by("nome")
+        listagem = listar_nucleos(
+            qs,
+            organizacao_id=getattr(user, "organizacao_id", None),
+            escopo=f"meus:{user.pk}:{allowed_fragment}",
         )
-        self._cached_queryset = result
-        return result
+        self._qs_for_counts = listagem.nucleos
+        self._cached_queryset = listagem.filtrar(q=self.request.GET.get("q", ""))
+        return self._cached_queryset
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -810,13 +682,8 @@ class NucleoMeusView(NoSuperadminMixin, LoginRequiredMixin, NucleoVisibilityMixi
         if selected_classificacao not in allowed_keys:
             selected_classificacao = None
         ctx["selected_classificacao"] = selected_classificacao
-        base_qs_for_totals = getattr(self, "_qs_for_counts", Nucleo.objects.none())
-        classificacao_totals: dict[str, int] = {key: 0 for key in allowed_keys}
-        if hasattr(base_qs_for_totals, "values"):
-            for row in base_qs_for_totals.values("classificacao").annotate(total=Count("id", distinct=True)):
-                key = row["classificacao"]
-                if key in classificacao_totals:
-                    classificacao_totals[key] = row["total"]
+        base_qs_for_totals = getattr(self, "_qs_for_counts", [])
+        classificacao_totals = ListagemNucleos.totais(base_qs_for_totals, allowed_keys)
         ctx["classificacao_totals"] = classificacao_totals
         ctx["nucleo_sections"] = build_nucleo_sections(
             self.request,
@@ -1137,6 +1004,15 @@ class NucleoDeleteView(NoSuperadminMixin, AdminRequiredMixin, LoginRequiredMixin
         return resolve_back_href(request, fallback=fallback)
 
 
+def _carregar_badges_pagina(page_obj):
+    """Carrega em lote as badges dos usuários das participações da página."""
+
+    participacoes = list(page_obj.object_list)
+    carregar_badges(participacao.user for participacao in participacoes)
+    page_obj.object_list = participacoes
+    return page_obj
+
+
 class NucleoDetailView(NucleoPainelRenderMixin, NoSuperadminMixin, LoginRequiredMixin, DetailView):
     model = Nucleo
     template_name = "nucleos/partials/membros_list.html"
@@ -1167,10 +1043,6 @@ class NucleoDetailView(NucleoPainelRenderMixin, NoSuperadminMixin, LoginRequired
                 user__deleted=False,
             )
             .select_related("user")
-            .prefetch_related(
-                Prefetch("user__participacoes", queryset=ParticipacaoNucleo.objects.select_related("nucleo")),
-                "user__nucleos_consultoria",
-            )
             .order_by("-created_at")
         )
 
@@ -1232,7 +1104,7 @@ class NucleoDetailView(NucleoPainelRenderMixin, NoSuperadminMixin, LoginRequired
         membros_qs = self.get_membros_queryset()
         paginator = Paginator(membros_qs, self.get_membros_paginate_by())
         page_number = self.request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        page_obj = _carregar_badges_pagina(paginator.get_page(page_number))
         ctx["page_obj"] = page_obj
         ctx["membros_ativos"] = page_obj.object_list
         coordenadores_qs = self.get_participacoes_queryset().filter(papel="coordenador")
@@ -1247,7 +1119,9 @@ class NucleoDetailView(NucleoPainelRenderMixin, NoSuperadminMixin, LoginRequired
                 )
         coordenadores_paginator = Paginator(coordenadores_qs, self.get_membros_paginate_by())
         coordenadores_page_number = page_number if self.get_card_param() == "coordenadores" else 1
-        ctx["coordenadores_page_obj"] = coordenadores_paginator.get_page(coordenadores_page_number)
+        ctx["coordenadores_page_obj"] = _carregar_badges_pagina(
+            coordenadores_paginator.get_page(coordenadores_page_number)
+        )
         ctx["coordenadores"] = self.get_participacoes_queryset().filter(papel="coordenador")
         # Pendentes e suplentes (somente leitura)
         ctx["membros_pendentes"] = nucleo.participacoes.filter(status="pendente")
@@ -1371,8 +1245,9 @@ class NucleoDetailView(NucleoPainelRenderMixin, NoSuperadminMixin, LoginRequired
 
         # Posts do feed do núcleo para a aba "Feed"
         try:
-            from django.db.models import OuterRef, Subquery, Exists
-            from feed.models import Post, Bookmark, Flag, Reacao, ModeracaoPost
+            from django.db.models import Exists, OuterRef, Subquery
+
+            from feed.models import Bookmark, Flag, ModeracaoPost, Post, Reacao
 
             user = self.request.user
             latest_status = (
@@ -1472,7 +1347,7 @@ class NucleoMembrosCarouselView(NucleoMembrosPartialView):
         membros_qs = self.get_membros_queryset()
         paginator = Paginator(membros_qs, self.get_membros_paginate_by())
         page_number = request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        page_obj = _carregar_badges_pagina(paginator.get_page(page_number))
 
         card = self.get_card_param()
 
@@ -1496,6 +1371,31 @@ class NucleoMembrosCarouselView(NucleoMembrosPartialView):
         )
 
 
+class NucleoMembrosExportView(AdminOperatorOrCoordinatorRequiredMixin, NoSuperadminMixin, LoginRequiredMixin, View):
+    """Solicita a exportação das participações do núcleo (CSV ou XLSX).
+
+    Admins e operadores exportam núcleos da própria organização; coordenadores,
+    apenas os núcleos que coordenam.
+    """
+
+    def get(self, request, *args, **kwargs):
+        nucleo = get_object_or_404(Nucleo, public_id=kwargs["public_id"], deleted=False)
+        user = request.user
+        if user.get_tipo_usuario in {UserType.ADMIN.value, UserType.OPERADOR.value}:
+            permitido = user.organizacao_id == nucleo.organizacao_id
+        else:
+            permitido = nucleo.pk in obter_indice(user).coordenacao
+        if not permitido:
+            raise PermissionDenied
+        try:
+            job = request_export(NUCLEO_MEMBROS_EXPORT, nucleo.pk, kwargs.get("formato", "csv"), user=user)
+        except ExportError as exc:
+            raise Http404(str(exc)) from exc
+        if job.ready:
+            return redirect("core:exportacao_download", job_id=job.job_id)
+        return redirect("core:exportacao_status", job_id=job.job_id)
+
+
 class NucleoMetricsView(NucleoVisibilityMixin, NoSuperadminMixin, LoginRequiredMixin, DetailView):
     model = Nucleo
     template_name = "nucleos/metrics.html"
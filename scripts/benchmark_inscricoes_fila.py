@@ -0,0 +1,169 @@
+"""Benchmark de pico de inscrições em evento com lotação limitada.
+
+Simula a abertura de um evento concorrido: ``--usuarios`` tentativas
+simultâneas (``--threads`` em paralelo) disputam ``--vagas`` vagas. O modo
+``fila`` mede apenas a reserva feita na requisição (``reservar_vaga``) e
+processa os tickets depois, como o worker faria; o modo ``direto`` usa o fluxo
+síncrono ``processar_inscricao_evento``. Ao final são exibidas as latências
+(p50/p95/p99), a vazão e a verificação de que a lotação não foi excedida. Os
+dados criados são removidos ao término.
+
+Como executar (use um banco descartável; PostgreSQL reproduz melhor a
+concorrência de produção):
+
+```
+python scripts/benchmark_inscricoes_fila.py --usuarios 2000 --vagas 300 --threads 64
+python scripts/benchmark_inscricoes_fila.py --modo direto
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+
+def _ensure_scripts_on_path() -> None:
+    """Garante que a pasta raiz do projeto esteja no ``sys.path``."""
+
+    root_dir = Path(__file__).resolve().parents[1]
+    if str(root_dir) not in sys.path:
+        sys.path.append(str(root_dir))
+
+
+_ensure_scripts_on_path()
+
+from scripts.delete_membros import setup_django  # noqa: E402
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modo", choices=["fila", "direto"], default="fila")
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--vagas", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.db import close_old_connections, transaction
+    from django.utils import timezone
+
+    from accounts.models import UserType
+    from eventos import tasks
+    from eventos.models import Evento, InscricaoEvento, ReservaInscricao
+    from eventos.services.fila_inscricao import EventoLotado, processar_reserva, reservar_vaga
+    from eventos.services.inscricao import processar_inscricao_evento
+    from organizacoes.models import Organizacao
+
+    User = get_user_model()
+    prefixo = f"bench-{uuid.uuid4().hex[:8]}"
+    organizacao = Organizacao.objects.create(nome=prefixo, cnpj=f"{uuid.uuid4().int % 10**14:014d}")
+    inicio = timezone.now() + timedelta(days=30)
+    evento = Evento.objects.create(
+        titulo=prefixo,
+        slug=prefixo,
+        descricao="Benchmark",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="00000-000",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+        participantes_maximo=args.vagas,
+        inscricao_em_fila=args.modo == "fila",
+    )
+    usuarios = User.objects.bulk_create(
+        [
+            User(
+                username=f"{prefixo}-{indice}",
+                email=f"{prefixo}-{indice}@example.com",
+                user_type=UserType.ASSOCIADO,
+                organizacao=organizacao,
+            )
+            for indice in range(args.usuarios)
+        ]
+    )
+
+    # O worker é simulado depois da medição: a requisição só enfileira o ticket.
+    tickets: list[int] = []
+    tasks.processar_reserva_inscricao.delay = tickets.append
+
+    def tentar(usuario) -> tuple[float, bool]:
+        close_old_connections()
+        inicio_tentativa = time.perf_counter()
+        ok = True
+        try:
+            with transaction.atomic():  # equivalente a ATOMIC_REQUESTS
+                if args.modo == "fila":
+                    reservar_vaga(evento=evento, user=usuario)
+                else:
+                    ok = (
+                        processar_inscricao_evento(
+                            evento=evento, user=usuario, remover_se_falhar_confirmacao=True
+                        ).status
+                        != "error"
+                    )
+        except EventoLotado:
+            ok = False
+        except Exception as exc:  # bloqueios do banco contam como falha da tentativa
+            print(f"erro: {exc}", file=sys.stderr)
+            ok = False
+        finally:
+            close_old_connections()
+        return time.perf_counter() - inicio_tentativa, ok
+
+    try:
+        inicio_pico = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            resultados = list(executor.map(tentar, usuarios))
+        duracao = time.perf_counter() - inicio_pico
+
+        latencias = [latencia * 1000 for latencia, _ok in resultados]
+        aceitas = sum(1 for _latencia, ok in resultados if ok)
+        print(f"modo={args.modo} tentativas={len(resultados)} vagas={args.vagas} aceitas={aceitas}")
+        print(
+            "latência ms: p50={:.1f} p95={:.1f} p99={:.1f} média={:.1f}".format(
+                _percentil(latencias, 50),
+                _percentil(latencias, 95),
+                _percentil(latencias, 99),
+                statistics.fmean(latencias),
+            )
+        )
+        print(f"vazão: {len(resultados) / duracao:.0f} tentativas/s")
+
+        if args.modo == "fila":
+            inicio_worker = time.perf_counter()
+            for reserva_id in tickets:
+                processar_reserva(reserva_id)
+            print(f"worker: {len(tickets)} tickets em {time.perf_counter() - inicio_worker:.2f}s")
+
+        confirmadas = InscricaoEvento.objects.filter(evento=evento, status="confirmada").count()
+        print(f"confirmadas={confirmadas} lotação respeitada={confirmadas <= args.vagas}")
+    finally:
+        ReservaInscricao.objects.filter(evento=evento).delete()
+        InscricaoEvento.all_objects.filter(evento=evento).delete()
+        evento.hard_delete()
+        User.objects.filter(username__startswith=prefixo).delete()
+        getattr(organizacao, "hard_delete", organizacao.delete)()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tipo-usuario"}}
+
+
+@pytest.fixture
+def papel_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.ASSOCIADO) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+    )
+
+
+@pytest.mark.django_db
+def test_tipo_usuario_memorizado_e_invalidado_por_vinculos(papel_cache, django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    usuario = _create_user(organizacao, "usuario")
+    nucleo = Nucleo.objects.create(nome="Alfa", organizacao=organizacao)
+    participacao = ParticipacaoNucleo.objects.create(user=usuario, nucleo=nucleo, status="ativo")
+
+    usuario = User.objects.get(pk=usuario.pk)
+    assert usuario.get_tipo_usuario == UserType.NUCLEADO.value
+    with django_assert_num_queries(0):
+        for _ in range(10):
+            assert usuario.get_tipo_usuario == UserType.NUCLEADO.value
+        # Outra instância do mesmo usuário (próxima requisição) reaproveita o cache.
+        assert User(pk=usuario.pk, user_type=UserType.ASSOCIADO).get_tipo_usuario == UserType.NUCLEADO.value
+
+    participacao.papel = "coordenador"
+    participacao.papel_coordenador = ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL
+    participacao.save()
+    assert User.objects.get(pk=usuario.pk).get_tipo_usuario == UserType.COORDENADOR.value
+    # A instância já carregada (mesma requisição ou task) também enxerga a promoção.
+    assert usuario.get_tipo_usuario == UserType.COORDENADOR.value
+
+    participacao.status = "inativo"
+    participacao.save()
+    assert usuario.get_tipo_usuario == UserType.ASSOCIADO.value
+
+    usuario.user_type = UserType.ADMIN
+    with django_assert_num_queries(0):
+        assert usuario.get_tipo_usuario == UserType.ADMIN.value
+
+
+@pytest.mark.django_db
+def test_tipo_usuario_le_versao_do_indice_uma_vez_por_instancia(papel_cache, monkeypatch) -> None:
+    from nucleos import membership
+
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    ParticipacaoNucleo.objects.create(
+        user=_create_user(organizacao, "usuario"),
+        nucleo=Nucleo.objects.create(nome="Alfa", organizacao=organizacao),
+        status="ativo",
+    )
+    usuario = User.objects.get(username="usuario")
+    leituras = []
+    get_cache_version = membership.get_cache_version
+    monkeypatch.setattr(
+        membership, "get_cache_version", lambda namespace: leituras.append(namespace) or get_cache_version(namespace)
+    )
+
+    for _ in range(10):
+        assert usuario.get_tipo_usuario == UserType.NUCLEADO.value
+    membership.obter_indice(usuario)
+
+    assert leituras == [membership.indice_namespace(usuario.pk)]
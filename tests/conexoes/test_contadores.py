@@ -0,0 +1,95 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from conexoes.models import ContadorConexoes  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "conexoes-contadores"}
+}
+
+
+@pytest.fixture
+def conexoes_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        contato=username.title(),
+        user_type=UserType.ASSOCIADO,
+        is_associado=True,
+        organizacao=organizacao,
+    )
+
+
+def _totais(user) -> tuple[int, int, int]:
+    contador = ContadorConexoes.objects.get(user=user)
+    return contador.conexoes, contador.solicitacoes_recebidas, contador.solicitacoes_enviadas
+
+
+@pytest.mark.django_db
+def test_contadores_acompanham_solicitacao_aceite_e_remocao() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    ana, bia, caio = (_create_user(organizacao, nome) for nome in ("ana", "bia", "caio"))
+
+    ana.connections.add(bia)
+    ana.followers.add(caio)
+    assert (_totais(ana), _totais(bia), _totais(caio)) == ((1, 1, 0), (1, 0, 0), (0, 0, 1))
+
+    # Mesmo fluxo de ``aceitar_conexao``.
+    ana.connections.add(caio)
+    ana.followers.remove(caio)
+    assert (_totais(ana), _totais(caio)) == ((2, 0, 0), (1, 0, 0))
+
+    bia.delete()
+    assert _totais(ana) == (1, 0, 0)
+
+    ana.connections.clear()
+    assert (_totais(ana), _totais(caio)) == ((0, 0, 0), (0, 0, 0))
+
+
+@pytest.mark.django_db
+def test_carrossel_usa_contadores_e_paginas_em_cache(conexoes_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    ana = _create_user(organizacao, "ana")
+    outros = [_create_user(organizacao, f"user{indice}") for indice in range(8)]
+    ana.connections.add(*outros)
+
+    client = Client()
+    client.force_login(ana)
+    url = reverse("conexoes:conexoes_carousel_api")
+
+    primeira = client.get(url, {"section": "minhas", "page": 2}).json()
+    assert (primeira["count"], primeira["total_pages"], primeira["page"]) == (8, 2, 2)
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url, {"section": "minhas", "page": 2}).json()["count"] == 8
+    sqls = [query["sql"] for query in ctx.captured_queries]
+    assert not [sql for sql in sqls if "COUNT(" in sql]
+    assert not [sql for sql in sqls if "OFFSET" in sql]
+
+    ana.connections.remove(outros[-1])
+    segunda = client.get(url, {"section": "minhas", "page": 2}).json()
+    assert segunda["count"] == 7
+    assert "user7" not in segunda["html"]
@@ -0,0 +1,120 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from conexoes.models import SugestaoConexao  # noqa: E402
+from conexoes.sugestoes import calcular_sugestoes, sugestoes_para  # noqa: E402
+from conexoes.tasks import atualizar_sugestoes_conexoes  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        contato=username.title(),
+        user_type=UserType.ASSOCIADO,
+        is_associado=True,
+        organizacao=organizacao,
+    )
+
+
+def _create_evento(organizacao: Organizacao) -> Evento:
+    inicio = timezone.now() + timedelta(days=2)
+    return Evento.objects.create(
+        titulo="Evento",
+        slug="evento",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+def _sugeridos(user) -> list[tuple[str, int, int, int]]:
+    return [(s.sugerido.username, s.conexoes_comuns, s.nucleos_comuns, s.eventos_comuns) for s in sugestoes_para(user)]
+
+
+@pytest.mark.django_db
+def test_sugestoes_ponderam_conexoes_nucleos_e_eventos(django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    outra = Organizacao.objects.create(nome="Outra", cnpj="11222333000181")
+    ana, bia, caio, davi, eva, fabio, gil = (
+        _create_user(organizacao, nome) for nome in ("ana", "bia", "caio", "davi", "eva", "fabio", "gil")
+    )
+    externo = _create_user(outra, "externo")
+
+    ana.connections.add(bia)
+    bia.connections.add(caio, davi, externo)
+    davi.connections.add(caio)
+    # Solicitação pendente: não vira sugestão em nenhum dos sentidos.
+    gil.followers.add(ana)
+    gil.connections.add(bia)
+
+    nucleo = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    for membro in (ana, davi, eva):
+        ParticipacaoNucleo.objects.create(user=membro, nucleo=nucleo, status="ativo")
+    evento = _create_evento(organizacao)
+    for inscrito in (ana, fabio):
+        InscricaoEvento.objects.create(user=inscrito, evento=evento, status="confirmada")
+
+    assert atualizar_sugestoes_conexoes() == SugestaoConexao.objects.count()
+
+    with django_assert_num_queries(1):
+        sugeridos = _sugeridos(ana)
+    assert sugeridos == [
+        ("davi", 1, 1, 0),
+        ("caio", 1, 0, 0),
+        ("eva", 0, 1, 0),
+        ("fabio", 0, 0, 1),
+    ]
+    assert ("ana", 1, 0, 0) in _sugeridos(caio)
+    assert "ana" not in [nome for nome, *_ in _sugeridos(gil)]
+
+    # Nova conexão descarta a sugestão nos dois sentidos sem esperar o recálculo.
+    ana.connections.add(davi)
+    assert [nome for nome, *_ in _sugeridos(ana)] == ["caio", "eva", "fabio"]
+    assert "ana" not in [nome for nome, *_ in _sugeridos(davi)]
+
+    assert calcular_sugestoes(outra.pk) == 0
+
+
+@pytest.mark.django_db
+def test_paginas_exibem_sugestoes_gravadas() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    ana, bia, caio = (_create_user(organizacao, nome) for nome in ("ana", "bia", "caio"))
+    ana.connections.add(bia)
+    bia.connections.add(caio)
+    calcular_sugestoes(organizacao.pk)
+
+    client = Client()
+    client.force_login(ana)
+    response = client.get(reverse("conexoes:perfil_sections_conexoes"))
+    assert response.status_code == 200
+    assert "Pessoas que você talvez conheça" in response.content.decode()
+    assert [s.sugerido for s in response.context["sugestoes_conexao"]] == [caio]
+
+    response = client.get(reverse("accounts:perfil"))
+    assert [s.sugerido for s in response.context["sugestoes_conexao"]] == [caio]
@@ -0,0 +1,66 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.template import engines
+from django.test import RequestFactory
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from notificacoes.models import Canal, NotificationLog, NotificationStatus, NotificationTemplate  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LAYOUT = (
+    "{% for item in NAV_MENU %}[{{ item.id }}]{% endfor %}"
+    "|{{ push_notification_pending_count }}|{{ push_notification_pending_count|default:0 }}"
+)
+
+
+def _render(source: str, user, **headers) -> str:
+    request = RequestFactory().get("/membros/", headers=headers)
+    request.user = user
+    return engines["django"].from_string(source).render(request=request)
+
+
+@pytest.fixture
+def usuario() -> User:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    user = User.objects.create_user(
+        username="usuario",
+        email="usuario@example.com",
+        password="senha123",
+        user_type=UserType.ASSOCIADO,
+        organizacao=organizacao,
+    )
+    template = NotificationTemplate.objects.create(codigo="aviso", assunto="Aviso", corpo="Corpo", canal="app")
+    NotificationLog.objects.create(user=user, template=template, canal=Canal.APP, status=NotificationStatus.ENVIADA)
+    # Instância nova, como a carregada pelo middleware de autenticação.
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_fragmento_que_nao_le_menu_nem_contador_nao_consulta(usuario, django_assert_num_queries) -> None:
+    with django_assert_num_queries(0):
+        assert _render("<li>{{ request.path }}</li>", usuario) == "<li>/membros/</li>"
+
+
+@pytest.mark.django_db
+def test_requisicao_htmx_parcial_pula_menu_e_contador(usuario, django_assert_num_queries) -> None:
+    with django_assert_num_queries(0):
+        assert _render(LAYOUT, usuario, HX_Request="true") == "|0|0"
+
+
+@pytest.mark.django_db
+def test_pagina_completa_calcula_sob_demanda(usuario, django_assert_max_num_queries) -> None:
+    html = _render(LAYOUT, usuario, HX_Request="true", HX_Boosted="true")
+    assert "[perfil]" in html
+    assert html.endswith("|1|1")
+
+    # A contagem é consultada uma única vez, mesmo lida duas vezes.
+    with django_assert_max_num_queries(1):
+        assert _render("{{ push_notification_pending_count }}{{ push_notification_pending_count }}", usuario) == "11"
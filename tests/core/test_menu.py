@@ -0,0 +1,63 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from core import menu  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.ADMIN) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+    )
+
+
+def _request(user, path: str):
+    request = RequestFactory().get(path)
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+def test_menu_compilado_uma_vez_por_variante(monkeypatch, django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(
+        nome="Org", cnpj="12345678000195", nome_site="Site", site="https://org.example.com"
+    )
+    admin = _create_user(organizacao, "admin")
+    outro_admin = _create_user(organizacao, "outro")
+    associado = _create_user(organizacao, "associado", UserType.ASSOCIADO)
+
+    compilacoes = []
+    original = menu._get_menu_items
+    monkeypatch.setattr(menu, "_COMPILED_MENUS", {})
+    monkeypatch.setattr(menu, "_get_menu_items", lambda: compilacoes.append(1) or original())
+
+    itens = menu.build_menu(_request(admin, "/membros/"))
+    ids = [item.id for item in itens]
+    assert ids.index("organizacao-admin") == ids.index("configuracoes") - 1
+    assert ids.index("organizacao-site") == ids.index("logout") - 1
+    assert next(item for item in itens if item.id == "membros").is_current
+
+    with django_assert_num_queries(0):
+        segundo = menu.build_menu(_request(outro_admin, "/eventos/lista/?pagina=2"))
+    assert len(compilacoes) == 1
+    ativos = [item.id for item in segundo if item.is_active]
+    assert ativos == ["eventos"]
+    # Cada requisição recebe cópias; a marcação anterior não vaza.
+    assert not next(item for item in segundo if item.id == "membros").is_active
+
+    assert "membros" not in [item.id for item in menu.build_menu(_request(associado, "/"))]
+    assert len(compilacoes) == 2
@@ -0,0 +1,55 @@
+import json
+import os
+from datetime import datetime
+
+import django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from dashboard import charts  # noqa: E402
+
+
+def _points():
+    return [
+        {
+            "period": timezone.make_aware(datetime(2024, month, 1)),
+            "total": month * 2,
+            "std_dev": 0.5,
+        }
+        for month in range(1, 4)
+    ]
+
+
+def _normalize(payload):
+    return json.loads(json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True))
+
+
+def test_specs_match_plotly_figure():
+    charts.clear_chart_cache()
+    time_series = charts.build_time_series_chart(
+        _points(), value_field="total", std_field="std_dev", label="Membros", value_prefix="R$ "
+    )
+    pie = charts.build_chart_payload({"Ativo": 3, "Cancelado": 1})
+    bar = charts.build_chart_payload({"Núcleo A": 2, "Núcleo B": 5}, chart_type="bar")
+
+    for payload in (time_series, pie, bar):
+        figure = charts.as_figure(payload["figure"])
+        assert _normalize(payload["figure"]) == _normalize(figure.to_dict())
+
+    assert [trace["type"] for trace in time_series["figure"]["data"]] == ["scatter"] * 3
+    assert time_series["points"][0]["period"] == "2024-01-01T00:00:00-03:00"
+    assert pie["percentages"] == [75.0, 25.0]
+
+
+def test_specs_are_cached_by_input():
+    charts.clear_chart_cache()
+    first = charts.build_chart_payload({"Ativo": 3})
+    assert charts.build_chart_payload({"Ativo": 3}) is first
+    assert charts.build_chart_payload({"Ativo": 4}) is not first
+
+    empty = charts.build_time_series_chart([], value_field="total", label="Eventos")
+    assert empty["figure"]["data"] == []
+    assert empty["figure"]["layout"]["annotations"][0]["text"] == "Sem dados disponíveis"
@@ -0,0 +1,127 @@
+import os
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import PerfilFeedback, UserType  # noqa: E402
+from dashboard import services  # noqa: E402
+from dashboard.engine import (  # noqa: E402
+    EVENT_STATUS_WIDGET,
+    EVENTS_BY_NUCLEO_WIDGET,
+    MEMBER_WIDGET,
+    MEMBERSHIP_WIDGET,
+    REGISTRATIONS_WIDGET,
+    MetricsEngine,
+)
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_evento(organizacao, slug, *, status=Evento.Status.ATIVO, nucleo=None) -> Evento:
+    inicio = timezone.now() + timedelta(days=1)
+    return Evento.objects.create(
+        titulo=slug,
+        slug=slug,
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        nucleo=nucleo,
+        status=status,
+        publico_alvo=0 if nucleo is None else 1,
+        gratuito=False,
+        valor_associado=Decimal("10.00"),
+        valor_nucleado=Decimal("10.00"),
+    )
+
+
+@pytest.fixture
+def cenario():
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    nucleo = Nucleo.objects.create(organizacao=organizacao, nome="Núcleo A")
+    usuarios = [
+        User.objects.create_user(
+            username=f"membro{i}",
+            email=f"membro{i}@example.com",
+            password="senha123",
+            user_type=UserType.ASSOCIADO,
+            is_associado=True,
+            organizacao=organizacao,
+        )
+        for i in range(3)
+    ]
+    ParticipacaoNucleo.objects.create(user=usuarios[0], nucleo=nucleo, status="ativo")
+    evento = _create_evento(organizacao, "evento-publico")
+    _create_evento(organizacao, "evento-nucleo", status=Evento.Status.PLANEJAMENTO, nucleo=nucleo)
+    InscricaoEvento.objects.create(
+        user=usuarios[1],
+        evento=evento,
+        status="confirmada",
+        valor_pago=Decimal("10.00"),
+    )
+    return organizacao, nucleo
+
+
+@pytest.mark.django_db
+def test_engine_agrupa_metricas_por_tabela(cenario, django_assert_num_queries) -> None:
+    organizacao, _nucleo = cenario
+    widgets = [MEMBERSHIP_WIDGET, EVENT_STATUS_WIDGET, EVENTS_BY_NUCLEO_WIDGET, REGISTRATIONS_WIDGET]
+
+    with django_assert_num_queries(5):
+        metrics = MetricsEngine(organizacao).run(widgets)
+
+    assert metrics.membership_totals() == services.calculate_membership_totals(organizacao)
+    assert metrics.event_status_totals() == services.calculate_event_status_totals(organizacao)
+    assert metrics.events_by_nucleo() == services.calculate_events_by_nucleo(organizacao)
+    assert metrics["inscricoes_confirmadas"] == services.count_confirmed_event_registrations(organizacao)
+    assert metrics["valor_inscricoes_confirmadas"] == Decimal("10.00")
+
+
+@pytest.mark.django_db
+def test_engine_sem_nucleos_nao_consulta_fontes_restritas(cenario, django_assert_num_queries) -> None:
+    organizacao, _nucleo = cenario
+
+    with django_assert_num_queries(0):
+        metrics = MetricsEngine(organizacao, nucleo_ids=[]).run([EVENT_STATUS_WIDGET, REGISTRATIONS_WIDGET])
+
+    assert metrics["inscricoes_confirmadas"] == 0
+    assert metrics[f"eventos_status_{Evento.Status.ATIVO.value}"] == 0
+
+
+@pytest.mark.django_db
+def test_dashboard_do_membro_usa_o_engine(cenario, django_assert_num_queries) -> None:
+    organizacao, nucleo = cenario
+    membro, avaliador, conexao = User.objects.filter(organizacao=organizacao).order_by("username")
+    membro.connections.add(conexao)
+    PerfilFeedback.objects.create(avaliado=membro, autor=avaliador, nota=4)
+    PerfilFeedback.objects.create(avaliado=membro, autor=conexao, nota=5)
+
+    # Uma consulta por tabela do próprio usuário (avaliações, conexões, posts, reações).
+    with django_assert_num_queries(4):
+        metrics = MetricsEngine(organizacao, user=membro).run([MEMBER_WIDGET])
+    assert (metrics["avaliacao_media"], metrics["avaliacao_total"]) == (4.5, 2)
+    assert (metrics["total_conexoes"], metrics["total_posts"], metrics["total_reacoes"]) == (1, 0, 0)
+
+    client = Client()
+    client.force_login(membro)
+    response = client.get(reverse("dashboard:membro_dashboard"))
+    assert response.status_code == 200
+    assert response.context["avaliacao_display"] == "4.5"
+    assert response.context["conexoes"] == [conexao]
+    assert [p.nucleo for p in response.context["participacoes"]] == [nucleo]
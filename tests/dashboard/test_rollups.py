@@ -0,0 +1,219 @@
+import os
+from datetime import date, timedelta
+from decimal import Decimal
+from statistics import pstdev
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from dashboard import services  # noqa: E402
+from dashboard.models import DashboardRollup  # noqa: E402
+from dashboard.rollups import local_day, monthly_count_stats, rebuild_rollups, refresh_days  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from nucleos.models import Nucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_organizacao() -> Organizacao:
+    return Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+
+
+def _create_user(organizacao: Organizacao, username: str) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=UserType.ASSOCIADO,
+        is_associado=True,
+        organizacao=organizacao,
+    )
+
+
+def _create_evento(organizacao: Organizacao) -> Evento:
+    inicio = timezone.now() - timedelta(hours=1)
+    return Evento.objects.create(
+        titulo="Evento",
+        slug="evento-rollup",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=False,
+        valor_associado=Decimal("10.00"),
+    )
+
+
+def _current_month(series):
+    return series[-1]
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_alimenta_series_mensais() -> None:
+    organizacao = _create_organizacao()
+    usuarios = [_create_user(organizacao, f"membro{i}") for i in range(3)]
+    evento = _create_evento(organizacao)
+    for usuario, valor in zip(usuarios, ("10.00", "20.00", "30.00")):
+        InscricaoEvento.objects.create(
+            user=usuario,
+            evento=evento,
+            status="confirmada",
+            valor_pago=Decimal(valor),
+            data_confirmacao=timezone.now(),
+        )
+
+    DashboardRollup.objects.all().delete()
+    rebuild_rollups(organizacao.pk)
+
+    membros = _current_month(services.calculate_monthly_membros(organizacao, months=3))
+    inscricoes = _current_month(services.calculate_monthly_event_registrations(organizacao, months=3))
+    valores = _current_month(services.calculate_monthly_registration_values(organizacao, months=3))
+    eventos = _current_month(services.calculate_monthly_events(organizacao, months=3))
+
+    assert membros["total"] == 3
+    assert inscricoes["total"] == 3
+    assert eventos["total"] == 1
+    assert valores["total"] == pytest.approx(60.0)
+    assert valores["std_dev"] == pytest.approx(8.16)
+
+
+@pytest.mark.django_db
+def test_sinais_atualizam_rollups_incrementalmente(django_capture_on_commit_callbacks) -> None:
+    organizacao = _create_organizacao()
+    with django_capture_on_commit_callbacks(execute=True):
+        usuario = _create_user(organizacao, "membro")
+        evento = _create_evento(organizacao)
+        inscricao = InscricaoEvento.objects.create(
+            user=usuario,
+            evento=evento,
+            status="confirmada",
+            valor_pago=Decimal("15.00"),
+            data_confirmacao=timezone.now(),
+        )
+
+    assert _current_month(services.calculate_monthly_event_registrations(organizacao, months=1))["total"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        inscricao.status = "cancelada"
+        inscricao.save()
+
+    assert _current_month(services.calculate_monthly_event_registrations(organizacao, months=1))["total"] == 0
+    assert _current_month(services.calculate_monthly_membros(organizacao, months=1))["total"] == 1
+
+
+@pytest.mark.django_db
+def test_monthly_count_stats_combina_linhas_por_dia() -> None:
+    organizacao = _create_organizacao()
+    nucleo_a = Nucleo.objects.create(organizacao=organizacao, nome="Núcleo A")
+    nucleo_b = Nucleo.objects.create(organizacao=organizacao, nome="Núcleo B")
+    month = date(2024, 3, 1)
+    linhas = [(1, nucleo_a, 2), (1, nucleo_b, 3), (2, nucleo_a, 1), (9, nucleo_b, 4)]
+    DashboardRollup.objects.bulk_create(
+        [
+            DashboardRollup(
+                organizacao=organizacao,
+                nucleo=nucleo,
+                metric=DashboardRollup.Metric.NUCLEADOS,
+                month=month,
+                day=month.replace(day=dia),
+                total=total,
+            )
+            for dia, nucleo, total in linhas
+        ]
+        + [
+            DashboardRollup(
+                organizacao=organizacao,
+                metric=DashboardRollup.Metric.MEMBROS,
+                month=month,
+                day=month.replace(day=dia),
+                total=total,
+            )
+            for dia, total in ((1, 5), (2, 1), (9, 4))
+        ]
+    )
+
+    nucleados = monthly_count_stats(
+        DashboardRollup.Metric.NUCLEADOS, organizacao.pk, start_month=month, include_std=True
+    )
+    membros = monthly_count_stats(DashboardRollup.Metric.MEMBROS, organizacao.pk, start_month=month, include_std=True)
+    somente_a = monthly_count_stats(
+        DashboardRollup.Metric.NUCLEADOS,
+        organizacao.pk,
+        start_month=month,
+        nucleo_ids=[nucleo_a.pk],
+        include_std=True,
+    )
+
+    assert nucleados == {month: (10, round(pstdev([5, 1, 4]), 2))}
+    assert membros == nucleados
+    assert somente_a == {month: (3, 0.5)}
+
+
+@pytest.mark.django_db
+def test_sinais_usam_valores_carregados_para_limpar_o_dia_antigo(django_capture_on_commit_callbacks) -> None:
+    organizacao = _create_organizacao()
+    with django_capture_on_commit_callbacks(execute=True):
+        usuario = _create_user(organizacao, "membro")
+        evento = _create_evento(organizacao)
+    evento = Evento.objects.get(pk=evento.pk)
+    usuario = User.objects.get(pk=usuario.pk)
+
+    with CaptureQueriesContext(connection) as ctx:
+        usuario.contato = "Membro"
+        usuario.save(update_fields=["contato", "organizacao"])
+    assert not [query for query in ctx.captured_queries if query["sql"].startswith("SELECT")]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        evento.data_inicio -= timedelta(days=40)
+        evento.data_fim -= timedelta(days=40)
+        evento.save()
+
+    mensal = services.calculate_monthly_events(organizacao, months=3)
+    assert sum(mes["total"] for mes in mensal) == 1
+    # 40 dias antes cai sempre em um mês anterior: o dia antigo foi limpo.
+    assert _current_month(mensal)["total"] == 0
+
+
+@pytest.mark.django_db
+def test_refresh_repetido_nao_duplica_linhas() -> None:
+    organizacao = _create_organizacao()
+    nucleo = Nucleo.objects.create(organizacao=organizacao, nome="Núcleo")
+    evento = _create_evento(organizacao)
+    evento.nucleo = nucleo
+    evento.save()
+    dia = local_day(evento.data_inicio)
+    DashboardRollup.objects.all().delete()
+
+    refresh_days(DashboardRollup.Metric.EVENTOS, organizacao.pk, [dia])
+    refresh_days(DashboardRollup.Metric.EVENTOS, organizacao.pk, [dia])
+
+    linhas = DashboardRollup.objects.filter(organizacao=organizacao, metric=DashboardRollup.Metric.EVENTOS)
+    assert list(linhas.values_list("nucleo_id", "total")) == [(nucleo.pk, 1)]
+    with pytest.raises(IntegrityError), transaction.atomic():
+        DashboardRollup.objects.create(
+            organizacao=organizacao,
+            metric=DashboardRollup.Metric.MEMBROS,
+            month=dia.replace(day=1),
+            day=dia,
+        )
+        DashboardRollup.objects.create(
+            organizacao=organizacao,
+            metric=DashboardRollup.Metric.MEMBROS,
+            month=dia.replace(day=1),
+            day=dia,
+        )
@@ -0,0 +1,125 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from dashboard.widgets import bump_data_version  # noqa: E402
+from eventos.models import Evento  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "dashboard-widgets"}
+}
+
+
+def _create_admin(organizacao: Organizacao, username: str) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=UserType.ADMIN,
+        organizacao=organizacao,
+    )
+
+
+def _create_evento(organizacao: Organizacao, titulo: str) -> Evento:
+    inicio = timezone.now() + timedelta(days=2)
+    return Evento.objects.create(
+        titulo=titulo,
+        slug=titulo.lower().replace(" ", "-"),
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+@pytest.fixture
+def widget_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_renderiza_apenas_estrutura(django_assert_max_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    client = Client()
+    client.force_login(_create_admin(organizacao, "admin"))
+
+    with django_assert_max_num_queries(8):
+        response = client.get(reverse("dashboard:admin_dashboard_admin"), {"months": 6})
+
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert reverse("dashboard:admin_widget", args=["membros_periodo"]) + "?months=6" in content
+    assert 'hx-trigger="load"' in content
+
+
+@pytest.mark.django_db
+def test_widget_compartilha_cache_entre_admins_da_organizacao(widget_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    _create_evento(organizacao, "Evento Inicial")
+    primeiro, segundo = Client(), Client()
+    primeiro.force_login(_create_admin(organizacao, "admin1"))
+    segundo.force_login(_create_admin(organizacao, "admin2"))
+    url = reverse("dashboard:admin_widget", args=["eventos"])
+
+    response = primeiro.get(url)
+    assert response.status_code == 200
+    assert "Evento Inicial" in response.content.decode()
+    assert response["Server-Timing"].startswith("widget-eventos;dur=")
+    assert response["Server-Timing"].endswith('desc="miss"')
+
+    response = segundo.get(url)
+    assert response["Server-Timing"].endswith('desc="hit"')
+
+    _create_evento(organizacao, "Evento Novo")
+    bump_data_version(organizacao.pk)
+    response = segundo.get(url)
+    assert response["Server-Timing"].endswith('desc="miss"')
+    assert "Evento Novo" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_widget_desconhecido_retorna_404() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    client = Client()
+    client.force_login(_create_admin(organizacao, "admin"))
+
+    response = client.get(reverse("dashboard:admin_widget", args=["inexistente"]))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("widget", ["metricas", "nucleos", "membros_periodo", "valores_inscricoes_periodo"])
+def test_widgets_renderizam_conteudo(widget) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    client = Client()
+    client.force_login(_create_admin(organizacao, "admin"))
+
+    response = client.get(reverse("dashboard:admin_widget", args=[widget]), {"months": 3})
+
+    assert response.status_code == 200
+    assert "Server-Timing" in response
@@ -0,0 +1,110 @@
+import os
+from datetime import date, datetime, time, timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from eventos.services.calendario import eventos_no_periodo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "eventos-calendario"}
+}
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    defaults = {"user_type": UserType.ADMIN, "organizacao": organizacao}
+    defaults.update(kwargs)
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        **defaults,
+    )
+
+
+def _create_evento(organizacao: Organizacao, titulo: str, inicio: datetime) -> Evento:
+    return Evento.objects.create(
+        titulo=titulo,
+        slug=titulo.lower().replace(" ", "-"),
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=1),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+def _local(dia: date, hora: time) -> datetime:
+    return timezone.make_aware(datetime.combine(dia, hora))
+
+
+@pytest.fixture
+def calendario_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_eventos_no_periodo_usa_limites_locais_e_conta_inscritos(calendario_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    dia = timezone.localdate() + timedelta(days=10)
+    primeiro = _create_evento(organizacao, "Meia Noite", _local(dia, time(0, 0)))
+    _create_evento(organizacao, "Fim Do Dia", _local(dia, time(23, 59)))
+    _create_evento(organizacao, "Dia Seguinte", _local(dia + timedelta(days=1), time(0, 0)))
+    for indice in range(2):
+        InscricaoEvento.objects.create(
+            user=_create_user(organizacao, f"p{indice}", user_type=UserType.ASSOCIADO),
+            evento=primeiro,
+            status="confirmada",
+        )
+
+    eventos = eventos_no_periodo(admin, dia, dia)
+
+    assert [evento.titulo for evento in eventos] == ["Meia Noite", "Fim Do Dia"]
+    assert eventos[0].num_inscritos == 2
+
+
+@pytest.mark.django_db
+def test_calendario_mensal_reaproveita_cache_ate_mudanca(
+    calendario_cache, django_assert_max_num_queries, django_capture_on_commit_callbacks
+) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    dia = timezone.localdate() + timedelta(days=40)
+    _create_evento(organizacao, "Evento Mensal", _local(dia, time(10, 0)))
+
+    assert [evento.titulo for evento in eventos_no_periodo(admin, dia, dia)] == ["Evento Mensal"]
+    with django_assert_max_num_queries(0):
+        eventos_no_periodo(admin, dia, dia)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_evento(organizacao, "Evento Novo", _local(dia, time(12, 0)))
+    assert [evento.titulo for evento in eventos_no_periodo(admin, dia, dia)] == ["Evento Mensal", "Evento Novo"]
+
+    client = Client()
+    client.force_login(admin)
+    response = client.get(reverse("eventos:calendario_mes", args=[dia.year, dia.month]))
+    assert response.status_code == 200
+    assert "Evento Novo" in response.content.decode()
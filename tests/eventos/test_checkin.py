@@ -0,0 +1,220 @@
+import base64
+import gzip
+import json
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, EventoLog, InscricaoEvento  # noqa: E402
+from eventos.services.checkin import CodigoInvalido, assinar_manifesto, validar_codigo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    defaults = {"user_type": UserType.ADMIN, "organizacao": organizacao}
+    defaults.update(kwargs)
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        **defaults,
+    )
+
+
+def _create_evento(organizacao: Organizacao) -> Evento:
+    inicio = timezone.now() + timedelta(days=2)
+    return Evento.objects.create(
+        titulo="Evento",
+        slug="evento-checkin",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+def _inscrever(evento: Evento, user, status: str = "confirmada") -> InscricaoEvento:
+    return InscricaoEvento.objects.create(user=user, evento=evento, status=status)
+
+
+def _codigo(inscricao: InscricaoEvento) -> str:
+    return f"inscricao:{inscricao.pk}:{InscricaoEvento.gerar_checksum(str(inscricao.pk))}"
+
+
+def test_validar_codigo_confere_checksum_sem_banco() -> None:
+    checksum = InscricaoEvento.gerar_checksum("42")
+
+    assert validar_codigo(f"inscricao:42:{checksum}") == 42
+    assert validar_codigo("inscricao:42", exigir_checksum=False) == 42
+    for codigo in ("inscricao:42", "inscricao:42:000000000000", f"inscricao:43:{checksum}", "evento:42"):
+        with pytest.raises(CodigoInvalido):
+            validar_codigo(codigo)
+
+
+@pytest.mark.django_db
+def test_checkin_unico_conta_presenca_uma_vez() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    evento = _create_evento(organizacao)
+    inscricao = _inscrever(evento, _create_user(organizacao, "participante", user_type=UserType.ASSOCIADO))
+    client = Client()
+    client.force_login(admin)
+    url = reverse("eventos:inscricao_checkin", args=[inscricao.pk])
+
+    assert client.post(url, {"codigo": f"inscricao:{inscricao.pk}:000000000000"}).status_code == 400
+
+    response = client.post(url, {"codigo": _codigo(inscricao)})
+    assert response.json() == {"status": "ok"}
+    response = client.post(url, {"codigo": _codigo(inscricao)})
+    assert response.json()["message"] == "Check-in já realizado."
+
+    evento.refresh_from_db()
+    inscricao.refresh_from_db()
+    assert evento.numero_presentes == 1
+    assert inscricao.check_in_realizado_em is not None
+    assert EventoLog.objects.filter(evento=evento, acao="check_in").count() == 1
+
+
+@pytest.mark.django_db
+def test_checkin_em_lote_processa_leituras_offline() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    evento = _create_evento(organizacao)
+    confirmadas = [
+        _inscrever(evento, _create_user(organizacao, f"p{indice}", user_type=UserType.ASSOCIADO)) for indice in range(3)
+    ]
+    pendente = _inscrever(evento, _create_user(organizacao, "pendente", user_type=UserType.ASSOCIADO), "pendente")
+    lido_em = timezone.now() - timedelta(minutes=30)
+    payload = {
+        "checkins": [
+            {"codigo": _codigo(confirmadas[0]), "realizado_em": lido_em.isoformat()},
+            {"codigo": _codigo(confirmadas[1])},
+            {"codigo": _codigo(confirmadas[0])},
+            {"codigo": _codigo(pendente)},
+            {"codigo": "inscricao:999:abc"},
+        ]
+    }
+    client = Client()
+    client.force_login(admin)
+
+    response = client.post(
+        reverse("eventos:evento_checkin_lote", args=[evento.pk]),
+        json.dumps(payload),
+        content_type="application/json",
+    )
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data["registrados"] == 2
+    assert [item["status"] for item in data["resultados"]] == ["ok", "ok", "duplicado", "nao_confirmada", "invalido"]
+    evento.refresh_from_db()
+    confirmadas[0].refresh_from_db()
+    assert evento.numero_presentes == 2
+    assert abs(confirmadas[0].check_in_realizado_em - lido_em) < timedelta(seconds=1)
+    assert EventoLog.objects.filter(evento=evento, acao="check_in").count() == 2
+
+
+@pytest.mark.django_db
+def test_checkin_em_lote_restrito_a_equipe() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao)
+    client = Client()
+    client.force_login(_create_user(organizacao, "associado", user_type=UserType.ASSOCIADO))
+
+    response = client.post(
+        reverse("eventos:evento_checkin_lote", args=[evento.pk]),
+        json.dumps({"checkins": []}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 403
+
+    # Operadores trabalham na portaria e também sincronizam leituras.
+    client.force_login(_create_user(organizacao, "operador", user_type=UserType.OPERADOR))
+    response = client.post(
+        reverse("eventos:evento_checkin_lote", args=[evento.pk]),
+        json.dumps({"checkins": []}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_formulario_de_checkin_restrito_ao_inscrito_admin_e_coordenador() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    inscrito = _create_user(organizacao, "inscrito", user_type=UserType.ASSOCIADO)
+    url = reverse("eventos:inscricao_checkin_form", args=[_inscrever(_create_evento(organizacao), inscrito).pk])
+    client = Client()
+
+    for usuario, status in (
+        (inscrito, 200),
+        (_create_user(organizacao, "admin"), 200),
+        (_create_user(organizacao, "coordenador", user_type=UserType.COORDENADOR), 200),
+        (_create_user(organizacao, "operador", user_type=UserType.OPERADOR), 403),
+    ):
+        client.force_login(usuario)
+        assert client.get(url).status_code == status, usuario.username
+
+
+@pytest.mark.django_db
+def test_manifesto_checkin_completo_e_incremental() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    evento = _create_evento(organizacao)
+    ana, bruno = (
+        _inscrever(evento, _create_user(organizacao, nome, user_type=UserType.ASSOCIADO, contato=nome.title()))
+        for nome in ("ana", "bruno")
+    )
+    _inscrever(evento, _create_user(organizacao, "pendente", user_type=UserType.ASSOCIADO), "pendente")
+    client = Client()
+    client.force_login(admin)
+    url = reverse("eventos:evento_checkin_manifesto", args=[evento.pk])
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    conteudo = response.content
+    if response.get("Content-Encoding") == "gzip":
+        conteudo = gzip.decompress(conteudo)
+    conteudo = conteudo.decode()
+    assert response["X-Manifesto-Assinatura"] == assinar_manifesto(conteudo)
+    # O leitor confere a assinatura só com a chave pública publicada.
+    chave = client.get(reverse("eventos:checkin_manifesto_chave")).json()
+    assert chave["algoritmo"] == "Ed25519"
+    publica = Ed25519PublicKey.from_public_bytes(base64.b64decode(chave["chave_publica"]))
+    publica.verify(base64.b64decode(response["X-Manifesto-Assinatura"]), conteudo.encode())
+    with pytest.raises(InvalidSignature):
+        publica.verify(base64.b64decode(response["X-Manifesto-Assinatura"]), conteudo.replace("Ana", "Eva").encode())
+    manifesto = json.loads(conteudo)
+    assert manifesto["inscricoes"] == [
+        [ana.pk, InscricaoEvento.gerar_checksum(str(ana.pk)), "Ana", False, False],
+        [bruno.pk, InscricaoEvento.gerar_checksum(str(bruno.pk)), "Bruno", False, False],
+    ]
+
+    ana.realizar_check_in()
+    bruno.delete()
+    delta = client.get(url, {"desde": manifesto["versao"]}).json()
+    assert [linha[0] for linha in delta["inscricoes"]] == [ana.pk]
+    assert delta["inscricoes"][0][-1] is True
+    assert delta["removidas"] == [bruno.pk]
+    assert delta["versao"] > manifesto["versao"]
+    assert client.get(url, {"desde": delta["versao"]}).json()["inscricoes"] == []
@@ -0,0 +1,92 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    defaults = {"user_type": UserType.ASSOCIADO, "organizacao": organizacao}
+    defaults.update(kwargs)
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        **defaults,
+    )
+
+
+def _create_evento(organizacao: Organizacao, titulo: str) -> Evento:
+    inicio = timezone.now() + timedelta(days=5)
+    return Evento.objects.create(
+        titulo=titulo,
+        slug=titulo.lower().replace(" ", "-"),
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+@pytest.mark.django_db
+def test_contagens_e_inscricao_do_usuario_anotadas_no_banco(django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, "Evento Principal")
+    vazio = _create_evento(organizacao, "Evento Vazio")
+    usuario = _create_user(organizacao, "usuario")
+    InscricaoEvento.objects.create(
+        user=usuario, evento=evento, status="confirmada", check_in_realizado_em=timezone.now()
+    )
+    InscricaoEvento.objects.create(user=_create_user(organizacao, "b"), evento=evento, status="confirmada")
+    InscricaoEvento.objects.create(user=_create_user(organizacao, "c"), evento=evento, status="pendente")
+    InscricaoEvento.objects.create(user=_create_user(organizacao, "d"), evento=evento, status="confirmada").delete()
+
+    with django_assert_num_queries(1):
+        eventos = {
+            e.pk: e
+            for e in Evento.objects.select_related("organizacao", "nucleo")
+            .com_contagem_inscricoes()
+            .com_inscricao_do_usuario(usuario)
+        }
+
+    principal = eventos[evento.pk]
+    assert (principal.num_inscritos, principal.num_pendentes, principal.num_presentes) == (2, 1, 1)
+    assert principal.usuario_inscrito is True
+    assert (eventos[vazio.pk].num_inscritos, eventos[vazio.pk].usuario_inscrito) == (0, False)
+
+
+@pytest.mark.django_db
+def test_lista_de_eventos_exibe_contagem_e_selo_de_inscrito() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, "Evento Lista")
+    usuario = _create_user(organizacao, "usuario")
+    InscricaoEvento.objects.create(user=usuario, evento=evento, status="confirmada")
+    client = Client()
+    client.force_login(usuario)
+
+    response = client.get(reverse("eventos:lista"))
+
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert "Evento Lista" in content
+    assert "rounded-full bg-[var(--success-light)] px-2 py-0.5" in content
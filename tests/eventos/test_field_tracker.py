@@ -0,0 +1,90 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, EventoLog, InscricaoEvento  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_inscricao() -> InscricaoEvento:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    usuario = User.objects.create_user(
+        username="usuario",
+        email="usuario@example.com",
+        password="senha123",
+        user_type=UserType.ASSOCIADO,
+        organizacao=organizacao,
+    )
+    inicio = timezone.now() + timedelta(days=2)
+    evento = Evento.objects.create(
+        titulo="Evento",
+        slug="evento",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+    return InscricaoEvento.objects.create(user=usuario, evento=evento, status="confirmada")
+
+
+@pytest.mark.django_db
+def test_save_detecta_presenca_sem_reconsultar_a_linha() -> None:
+    inscricao = InscricaoEvento.objects.select_related("evento", "user").get(pk=_create_inscricao().pk)
+    assert inscricao.changed_fields == set()
+
+    inscricao.presente = True
+    assert inscricao.has_changed("presente")
+    assert inscricao.previous_value("presente") is False
+    with CaptureQueriesContext(connection) as ctx:
+        inscricao.save()
+    assert not [q for q in ctx.captured_queries if q["sql"].startswith('SELECT "eventos_inscricaoevento"."id"')]
+
+    assert inscricao.changed_fields == set()
+    assert EventoLog.objects.filter(acao="presenca_alterada").count() == 1
+    inscricao.save()
+    assert EventoLog.objects.filter(acao="presenca_alterada").count() == 1
+
+
+@pytest.mark.django_db
+def test_campos_adiados_so_mudam_quando_atribuidos() -> None:
+    pk = _create_inscricao().pk
+
+    parcial = InscricaoEvento.objects.only("id", "status").get(pk=pk)
+    assert not parcial.has_changed("presente")
+
+    parcial.presente = True
+    assert parcial.has_changed("presente")
+    assert parcial.previous_value("presente") is None
+
+
+@pytest.mark.django_db
+def test_save_parcial_preserva_alteracoes_dos_outros_campos() -> None:
+    inscricao = InscricaoEvento.objects.get(pk=_create_inscricao().pk)
+
+    inscricao.presente = True
+    inscricao.data_confirmacao = timezone.now()
+    inscricao.save(update_fields=["data_confirmacao", "updated_at"])
+
+    assert inscricao.changed_fields == {"presente"}
+    inscricao.save()
+    assert inscricao.changed_fields == set()
+    assert EventoLog.objects.filter(acao="presenca_alterada").count() == 1
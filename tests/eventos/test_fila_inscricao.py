@@ -0,0 +1,194 @@
+import os
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, InscricaoEvento, ReservaInscricao, VagasEvento  # noqa: E402
+from eventos.services.fila_inscricao import EventoLotado, reservar_vaga  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+from pagamentos.models import Pedido, Transacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=UserType.ASSOCIADO,
+        organizacao=organizacao,
+    )
+
+
+def _ocupadas(evento: Evento) -> int:
+    return VagasEvento.objects.get(evento=evento).ocupadas
+
+
+def _create_evento(organizacao: Organizacao, participantes_maximo: int) -> Evento:
+    inicio = timezone.now() + timedelta(days=5)
+    return Evento.objects.create(
+        titulo="Evento Concorrido",
+        slug="evento-concorrido",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+        participantes_maximo=participantes_maximo,
+        inscricao_em_fila=True,
+    )
+
+
+@pytest.mark.django_db
+def test_reserva_respeita_lotacao_e_worker_confirma(django_capture_on_commit_callbacks) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=2)
+    primeiro, segundo, terceiro = (_create_user(organizacao, nome) for nome in ("a", "b", "c"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        reserva = reservar_vaga(evento=evento, user=primeiro)
+        assert reservar_vaga(evento=evento, user=primeiro).ticket == reserva.ticket
+        reservar_vaga(evento=evento, user=segundo)
+        with pytest.raises(EventoLotado):
+            reservar_vaga(evento=evento, user=terceiro)
+
+    assert _ocupadas(evento) == 2
+    reserva.refresh_from_db()
+    assert reserva.status == ReservaInscricao.Status.PROCESSADA
+    assert reserva.inscricao.status == "confirmada"
+    assert InscricaoEvento.objects.filter(evento=evento, status="confirmada").count() == 2
+
+    reserva.inscricao.cancelar_inscricao()
+    assert _ocupadas(evento) == 1
+    assert reservar_vaga(evento=evento, user=terceiro).status == ReservaInscricao.Status.NA_FILA
+
+
+@pytest.mark.django_db
+def test_inscricao_em_fila_redireciona_para_ticket(django_capture_on_commit_callbacks) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=10)
+    usuario = _create_user(organizacao, "participante")
+    client = Client()
+    client.force_login(usuario)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(reverse("eventos:evento_subscribe", args=[evento.pk]))
+
+    reserva = ReservaInscricao.objects.get(evento=evento, user=usuario)
+    assert response.status_code == 302
+    assert response["Location"] == reverse("eventos:reserva_status", kwargs={"ticket": reserva.ticket})
+
+    status = client.get(response["Location"], HTTP_HX_REQUEST="true")
+    assert status.status_code == 204
+    assert status["HX-Redirect"].startswith(
+        reverse("eventos:inscricao_resultado", kwargs={"uuid": reserva.inscricao.uuid})
+    )
+
+
+@pytest.mark.django_db
+def test_edicao_do_evento_preserva_reservas_em_andamento(django_capture_on_commit_callbacks) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=2)
+    # Instância carregada pelo formulário de edição antes das reservas.
+    editado = Evento.objects.get(pk=evento.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        reservar_vaga(evento=evento, user=_create_user(organizacao, "a"))
+        reservar_vaga(evento=evento, user=_create_user(organizacao, "b"))
+
+    editado.titulo = "Evento Concorrido (atualizado)"
+    editado.save()
+
+    evento.refresh_from_db()
+    assert (evento.titulo, _ocupadas(evento)) == ("Evento Concorrido (atualizado)", 2)
+    with pytest.raises(EventoLotado):
+        reservar_vaga(evento=evento, user=_create_user(organizacao, "c"))
+
+
+@pytest.mark.django_db
+def test_reserva_de_quem_ja_esta_inscrito_nao_ocupa_vaga(django_capture_on_commit_callbacks) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=1)
+    evento.inscricao_em_fila = False
+    evento.save()
+    inscrito = _create_user(organizacao, "inscrito")
+    InscricaoEvento.objects.create(evento=evento, user=inscrito).confirmar_inscricao()
+    evento.inscricao_em_fila = True
+    evento.save()
+    assert _ocupadas(evento) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        reserva = reservar_vaga(evento=evento, user=inscrito)
+
+    reserva.refresh_from_db()
+    assert reserva.status == ReservaInscricao.Status.PROCESSADA
+    assert _ocupadas(evento) == 1
+
+
+@pytest.mark.django_db
+def test_cancelamento_de_inscricao_anterior_a_fila_libera_vaga() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=1)
+    evento.inscricao_em_fila = False
+    evento.save()
+    inscricao = InscricaoEvento.objects.create(evento=evento, user=_create_user(organizacao, "antigo"))
+    inscricao.confirmar_inscricao()
+    evento.inscricao_em_fila = True
+    evento.save()
+    assert _ocupadas(evento) == 1
+
+    inscricao.cancelar_inscricao()
+
+    assert _ocupadas(evento) == 0
+    assert (
+        reservar_vaga(evento=evento, user=_create_user(organizacao, "novo")).status == ReservaInscricao.Status.NA_FILA
+    )
+
+
+@pytest.mark.django_db
+def test_inscricao_com_checkout_em_fila_ocupa_vaga(monkeypatch) -> None:
+    monkeypatch.setenv("MERCADO_PAGO_PUBLIC_KEY", "TEST-public-key")
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao, participantes_maximo=1)
+    evento.gratuito = False
+    evento.valor_associado = Decimal("150.00")
+    evento.save()
+    pedido = Pedido.objects.create(organizacao=organizacao, valor=Decimal("150.00"), status=Pedido.Status.PENDENTE)
+    transacao = Transacao.objects.create(
+        pedido=pedido,
+        metodo=Transacao.Metodo.PIX,
+        valor=Decimal("150.00"),
+        status=Transacao.Status.PENDENTE,
+    )
+    url = reverse("eventos:inscricao_pagamentos_criar", kwargs={"pk": evento.pk})
+
+    client = Client()
+    client.force_login(_create_user(organizacao, "pagante"))
+    response = client.post(url, data={"metodo_pagamento": "pix", "transacao_id": transacao.pk})
+
+    assert response.status_code == 302
+    assert InscricaoEvento.objects.get(evento=evento).status == "pendente"
+    assert _ocupadas(evento) == 1
+
+    client.force_login(_create_user(organizacao, "atrasado"))
+    response = client.post(url, data={"metodo_pagamento": "pix"})
+
+    assert response["Location"] == reverse("eventos:evento_detalhe", kwargs={"pk": evento.pk})
+    assert InscricaoEvento.objects.filter(evento=evento).count() == 1
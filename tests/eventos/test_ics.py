@@ -0,0 +1,196 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.ics import _fold, feed_cache_key, feed_url, renovar_feeds  # noqa: E402
+from eventos.models import Evento  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "eventos-ics"}}
+
+
+def _create_evento(organizacao: Organizacao, titulo: str) -> Evento:
+    inicio = timezone.now() + timedelta(days=3)
+    return Evento.objects.create(
+        titulo=titulo,
+        slug=titulo.lower().replace(" ", "-"),
+        descricao="Linha 1\nLinha 2; com vírgula, e ponto",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Auditório",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+def _body(response) -> str:
+    if response.streaming:
+        return b"".join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+@pytest.fixture
+def ics_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_fold_quebra_linhas_longas_em_octetos() -> None:
+    linha = "DESCRIPTION:" + "ç" * 80
+
+    dobrada = _fold(linha)
+
+    partes = dobrada.rstrip("\r\n").split("\r\n ")
+    assert all(len(parte.encode()) <= 75 for parte in partes)
+    assert "".join(partes) == linha
+
+
+@pytest.mark.django_db
+def test_feed_ics_responde_304_sem_consultar_banco(
+    ics_cache, django_assert_num_queries, django_capture_on_commit_callbacks
+) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    user = User.objects.create_user(
+        username="admin",
+        email="admin@example.com",
+        password="senha123",
+        user_type=UserType.ADMIN,
+        organizacao=organizacao,
+    )
+    _create_evento(organizacao, "Encontro Mensal")
+    url = feed_url(user)
+    client = Client()
+
+    response = client.get(url)
+    body = _body(response)
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/calendar")
+    assert "SUMMARY:Encontro Mensal" in body
+    assert "DESCRIPTION:Linha 1\\nLinha 2\\; com vírgula\\, e ponto" in body
+    assert body.endswith("END:VCALENDAR\r\n")
+
+    # Só a conferência do usuário (ativo, mesma organização, link vigente).
+    with django_assert_num_queries(1):
+        assert client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+    with django_assert_num_queries(1):
+        assert _body(client.get(url)) == body
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_evento(organizacao, "Encontro Extra")
+    novo = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert novo.status_code == 200
+    assert "SUMMARY:Encontro Extra" in _body(novo)
+
+    assert client.get(url.replace("/feed/", "/feed/x")).status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_ics_acompanha_vinculos_e_pode_ser_revogado(ics_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    nucleo = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    user = User.objects.create_user(
+        username="nucleado",
+        email="nucleado@example.com",
+        password="senha123",
+        user_type=UserType.NUCLEADO,
+        organizacao=organizacao,
+        is_associado=True,
+    )
+    participacao = ParticipacaoNucleo.objects.create(user=user, nucleo=nucleo, status="ativo")
+    evento = _create_evento(organizacao, "Reunião do Núcleo")
+    Evento.objects.filter(pk=evento.pk).update(nucleo=nucleo, publico_alvo=1)
+    url = feed_url(user)
+    client = Client()
+
+    response = client.get(url)
+    assert "SUMMARY:Reunião do Núcleo" in _body(response)
+
+    # Saiu do núcleo: nenhum evento mudou, mas o feed em cache deixa de valer.
+    participacao.status = "inativo"
+    participacao.save()
+    novo = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert novo.status_code == 200
+    assert "Reunião do Núcleo" not in _body(novo)
+
+    renovar_feeds(user)
+    assert client.get(url, HTTP_IF_NONE_MATCH=novo["ETag"]).status_code == 404
+    url = feed_url(user)
+    atual = client.get(url)
+    assert atual.status_code == 200
+    _body(atual)
+
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    assert client.get(url, HTTP_IF_NONE_MATCH=atual["ETag"]).status_code == 404
+    assert client.get(url).status_code == 404
+
+    outro = User.objects.create_user(
+        username="outro",
+        email="outro@example.com",
+        password="senha123",
+        user_type=UserType.ADMIN,
+        organizacao=organizacao,
+    )
+    antigo = feed_url(outro)
+    client.force_login(outro)
+    assert client.post(reverse("eventos:calendario_ics_renovar")).status_code == 302
+    assert client.get(antigo).status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_ics_aceita_etags_fracos_listas_e_if_modified_since(ics_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    nucleo = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    user = User.objects.create_user(
+        username="nucleado",
+        email="nucleado@example.com",
+        password="senha123",
+        user_type=UserType.NUCLEADO,
+        organizacao=organizacao,
+        is_associado=True,
+    )
+    participacao = ParticipacaoNucleo.objects.create(user=user, nucleo=nucleo, status="ativo")
+    _create_evento(organizacao, "Encontro Mensal")
+    url = feed_url(user)
+    client = Client()
+
+    response = client.get(url)
+    _body(response)
+    etag = response["ETag"]
+    # Versão servida pela primeira vez há uma hora.
+    cache.set(feed_cache_key(etag) + ":modificado_em", timezone.now().replace(microsecond=0) - timedelta(hours=1))
+    last_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)["Last-Modified"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=f"W/{etag}").status_code == 304
+    assert client.get(url, HTTP_IF_NONE_MATCH=f'"outro", {etag}').status_code == 304
+    nao_modificado = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert nao_modificado.status_code == 304
+    assert nao_modificado["ETag"] == etag
+
+    # Sair do núcleo muda o feed sem alterar eventos: o ``Last-Modified`` acompanha.
+    participacao.status = "inativo"
+    participacao.save()
+    novo = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert novo.status_code == 200
+    assert novo["ETag"] != etag
+    _body(novo)
@@ -0,0 +1,128 @@
+import os
+from datetime import timedelta
+from io import BytesIO
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    defaults = {"user_type": UserType.ADMIN, "organizacao": organizacao}
+    defaults.update(kwargs)
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        **defaults,
+    )
+
+
+def _create_evento(organizacao: Organizacao) -> Evento:
+    inicio = timezone.now() + timedelta(days=2)
+    return Evento.objects.create(
+        titulo="Evento",
+        slug="evento-exportacao",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+        participantes_maximo=10,
+    )
+
+
+def _as_file(response) -> BytesIO:
+    return BytesIO(b"".join(response.streaming_content))
+
+
+@pytest.fixture
+def export_storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    cache.clear()
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_exportacao_xlsx_gera_arquivo_e_reaproveita_versao(export_storage) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    evento = _create_evento(organizacao)
+    for nome in ("Bruna", "ana"):
+        participante = _create_user(organizacao, nome.lower(), user_type=UserType.ASSOCIADO, contato=nome)
+        InscricaoEvento.objects.create(
+            user=participante, evento=evento, status="confirmada", data_confirmacao=timezone.now()
+        )
+
+    client = Client()
+    client.force_login(admin)
+    url = reverse("eventos:evento_inscritos_exportar", args=[evento.pk, "xlsx"])
+
+    response = client.get(url)
+    assert response.status_code == 302
+    assert "/download/" in response["Location"]
+
+    download = client.get(response["Location"])
+    assert download.status_code == 200
+    assert download["Content-Disposition"].endswith('filename="inscritos-evento-exportacao.xlsx"')
+    workbook = load_workbook(filename=_as_file(download))
+    linhas = list(workbook.active.iter_rows(values_only=True))
+    assert [linha[0] for linha in linhas[1:]] == ["ana", "Bruna"]
+
+    arquivos = list((export_storage / "exportacoes").rglob("*.xlsx"))
+    assert len(arquivos) == 1
+    assert client.get(url)["Location"] == response["Location"]
+
+    InscricaoEvento.objects.filter(evento=evento).first().save()
+    assert client.get(url)["Location"] != response["Location"]
+    # A versão nova substitui o arquivo anterior no storage.
+    assert [arquivo.name for arquivo in (export_storage / "exportacoes").rglob("*.xlsx")] != [arquivos[0].name]
+    assert len(list((export_storage / "exportacoes").rglob("*.xlsx"))) == 1
+
+    pdf = client.get(client.get(reverse("eventos:evento_inscritos_pdf", args=[evento.pk]))["Location"])
+    assert _as_file(pdf).read(4) == b"%PDF"
+
+
+@pytest.mark.django_db
+def test_exportacao_pendente_exibe_status_e_bloqueia_outros_usuarios(export_storage, monkeypatch) -> None:
+    from core import tasks
+
+    monkeypatch.setattr(tasks.gerar_exportacao, "delay", lambda *args, **kwargs: None)
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin")
+    outro = _create_user(organizacao, "outro")
+    evento = _create_evento(organizacao)
+
+    client = Client()
+    client.force_login(admin)
+    response = client.get(reverse("eventos:evento_inscritos_pdf", args=[evento.pk]))
+    status_url = response["Location"]
+
+    status = client.get(status_url, HTTP_HX_REQUEST="true")
+    assert status.status_code == 200
+    assert 'hx-trigger="every 2s"' in status.content.decode()
+
+    outro_client = Client()
+    outro_client.force_login(outro)
+    assert outro_client.get(status_url).status_code == 404
@@ -0,0 +1,126 @@
+import os
+from datetime import timedelta
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from eventos.models import Evento, InscricaoEvento  # noqa: E402
+from eventos.services import qrcodes  # noqa: E402
+from eventos.tasks import gerar_qrcodes_inscricoes  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "eventos-qrcodes"}}
+
+
+def _create_evento(organizacao: Organizacao) -> Evento:
+    inicio = timezone.now() + timedelta(days=2)
+    return Evento.objects.create(
+        titulo="Evento",
+        slug="evento-qrcode",
+        descricao="Descricao",
+        data_inicio=inicio,
+        data_fim=inicio + timedelta(hours=2),
+        local="Local",
+        cidade="Cidade",
+        estado="SP",
+        cep="12345-678",
+        organizacao=organizacao,
+        status=Evento.Status.ATIVO,
+        publico_alvo=0,
+        gratuito=True,
+    )
+
+
+def _inscricoes(total: int) -> list[InscricaoEvento]:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    evento = _create_evento(organizacao)
+    return [
+        InscricaoEvento.objects.create(
+            user=User.objects.create_user(
+                username=f"p{indice}",
+                email=f"p{indice}@example.com",
+                password="senha123",
+                user_type=UserType.ASSOCIADO,
+                organizacao=organizacao,
+            ),
+            evento=evento,
+            status="confirmada",
+        )
+        for indice in range(total)
+    ]
+
+
+@pytest.fixture
+def qrcode_storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    chamadas = []
+    render = qrcodes._render
+
+    def _contar(payload):
+        chamadas.append(payload)
+        return render(payload)
+
+    monkeypatch.setattr(qrcodes, "_render", _contar)
+    return chamadas
+
+
+@pytest.mark.django_db
+def test_qrcode_e_gerado_uma_vez_por_payload(qrcode_storage, renders) -> None:
+    (inscricao,) = _inscricoes(1)
+
+    primeiro = inscricao.gerar_qrcode()
+    cache.clear()
+    segundo = inscricao.gerar_qrcode()
+
+    assert primeiro == segundo
+    assert primeiro.startswith(b"\x89PNG")
+    assert renders == [qrcodes.payload_qrcode(inscricao.pk)]
+    assert inscricao.qrcode_url.endswith(qrcodes.caminho_qrcode(inscricao.pk))
+    assert len(list((qrcode_storage / "inscricoes" / "qrcodes").iterdir())) == 1
+
+
+@pytest.mark.django_db
+def test_endpoint_qrcode_responde_com_cache_http(qrcode_storage, renders) -> None:
+    (inscricao,) = _inscricoes(1)
+    client = Client()
+    url = reverse("eventos:inscricao_qrcode", args=[inscricao.uuid])
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/png"
+    assert "immutable" in response["Cache-Control"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+    assert client.get(url).content == response.content
+    assert len(renders) == 1
+
+
+@pytest.mark.django_db
+def test_geracao_em_lote_preenche_qrcode_url(qrcode_storage, renders) -> None:
+    inscricoes = _inscricoes(3)
+    inscricoes[0].gerar_qrcode()
+    inscricoes[0].save(update_fields=["qrcode_url"])
+
+    assert gerar_qrcodes_inscricoes([inscricao.pk for inscricao in inscricoes]) == 2
+
+    assert len(renders) == 3
+    assert InscricaoEvento.objects.filter(qrcode_url__isnull=True).count() == 0
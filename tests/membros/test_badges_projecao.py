@@ -0,0 +1,93 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from membros.badges import carregar_badges  # noqa: E402
+from membros.templatetags.membros_extras import usuario_badges, usuario_tipo_badge  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "membros-badges"}}
+
+
+@pytest.fixture
+def badges_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=kwargs.pop("user_type", UserType.ASSOCIADO),
+        organizacao=organizacao,
+        is_associado=True,
+        **kwargs,
+    )
+
+
+def _labels(usuarios) -> dict[str, list[str]]:
+    return {user.username: [badge["label"] for badge in usuario_badges(user)] for user in usuarios}
+
+
+def _recarregar(*usuarios) -> list[User]:
+    return list(User.objects.filter(pk__in=[user.pk for user in usuarios]).order_by("username"))
+
+
+@pytest.mark.django_db
+def test_badges_carregadas_em_lote_e_invalidadas_por_vinculos(badges_cache, django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    gama = Nucleo.objects.create(organizacao=organizacao, nome="Gama")
+    ana = _create_user(organizacao, "ana")
+    bia = _create_user(organizacao, "bia")
+    caio = _create_user(organizacao, "caio", user_type=UserType.CONSULTOR)
+    dani = _create_user(organizacao, "dani", nucleo=gama)
+    ParticipacaoNucleo.objects.create(user=ana, nucleo=alfa, status="ativo")
+    participacao_bia = ParticipacaoNucleo.objects.create(
+        user=bia,
+        nucleo=alfa,
+        status="ativo",
+        papel="coordenador",
+        papel_coordenador=ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL,
+    )
+    Nucleo.objects.create(organizacao=organizacao, nome="Beta", consultor=caio)
+
+    usuarios = _recarregar(ana, bia, caio, dani)
+    with django_assert_num_queries(3):
+        carregar_badges(usuarios)
+    with django_assert_num_queries(0):
+        assert _labels(usuarios) == {
+            "ana": ["Nucleado", "Alfa"],
+            "bia": ["Coordenador Geral", "Alfa"],
+            "caio": ["Consultor · Beta"],
+            "dani": ["Nucleado", "Gama"],
+        }
+        assert usuario_tipo_badge(usuarios[2]) is None
+
+    # Próxima requisição: instâncias novas, projeções lidas do cache.
+    usuarios = _recarregar(ana, bia, caio, dani)
+    with django_assert_num_queries(0):
+        carregar_badges(usuarios)
+
+    alfa.nome = "Alfa Norte"
+    alfa.save()
+    participacao_bia.papel = "membro"
+    participacao_bia.papel_coordenador = None
+    participacao_bia.save()
+    usuarios = _recarregar(ana, bia)
+    carregar_badges(usuarios)
+    assert _labels(usuarios) == {"ana": ["Nucleado", "Alfa Norte"], "bia": ["Nucleado", "Alfa Norte"]}
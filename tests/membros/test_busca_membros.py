@@ -0,0 +1,109 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from accounts.search import buscar_usuarios, fts_disponivel, ordenar_por_relevancia  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "membros-busca"}}
+
+
+@pytest.fixture
+def busca_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.ASSOCIADO, **kwargs) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+        is_associado=True,
+        **kwargs,
+    )
+
+
+def _buscar(consulta: str) -> list[str]:
+    return list(
+        ordenar_por_relevancia(buscar_usuarios(User.objects.all(), consulta), "username").values_list(
+            "username", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_documento_ignora_acentos_e_pontuacao_do_cnpj() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    joao = _create_user(organizacao, "joao", contato="João Conceição", nome_fantasia="Padaria São José")
+    _create_user(organizacao, "maria", contato="Maria Souza", cnpj="11.222.333/0001-81")
+    _create_user(organizacao, "pedro", cpf="529.982.247-25")
+
+    assert User.objects.get(pk=joao.pk).search_document == "joao joao conceicao padaria sao jose"
+    assert fts_disponivel()  # SQLite: candidatos resolvidos pela tabela FTS5
+    assert _buscar("CONCEIÇÃO") == ["joao"]
+    assert _buscar("sao jose") == ["joao"]
+    assert _buscar("11.222.333/0001-81") == ["maria"]
+    assert _buscar("0001") == ["maria"]
+    # CPF não é indexado: a busca de conexões é aberta a associados.
+    assert _buscar("529.982.247-25") == []
+    assert _buscar("nada") == []
+
+    joao.contato = "João Atualizado"
+    joao.save(update_fields=["contato"])
+    assert _buscar("atualizado") == ["joao"]
+    assert _buscar("conceicao") == []
+
+
+@pytest.mark.django_db
+def test_relevancia_prioriza_inicio_de_palavra() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    _create_user(organizacao, "aaa", contato="Ana Cristina")
+    _create_user(organizacao, "bbb", contato="Cristiano Lima")
+    _create_user(organizacao, "cristal")
+
+    assert _buscar("crist") == ["cristal", "aaa", "bbb"]
+
+
+@pytest.mark.django_db
+def test_sugestoes_em_cache_por_organizacao_e_prefixo(busca_cache) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    outra = Organizacao.objects.create(nome="Outra", cnpj="11222333000181")
+    usuario = _create_user(organizacao, "usuario", UserType.OPERADOR)
+    _create_user(organizacao, "beatriz", contato="Beatriz Araújo")
+    _create_user(outra, "bernardo", contato="Beatriz de Outra Org")
+    client = Client()
+    client.force_login(usuario)
+    url = reverse("membros:membros_sugestoes")
+
+    response = client.get(url, {"q": "Béa"})
+    assert [item["username"] for item in response.json()["results"]] == ["beatriz"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url, {"q": "bea"}).json() == response.json()
+    assert not [q for q in ctx.captured_queries if "LIKE" in q["sql"]]
+
+    _create_user(organizacao, "beatriz2", contato="Beatriz Lima")
+    nomes = [item["username"] for item in client.get(url, {"q": "bea"}).json()["results"]]
+    assert sorted(nomes) == ["beatriz", "beatriz2"]
+    assert client.get(url, {"q": "b"}).json() == {"results": []}
+
+    client.force_login(_create_user(organizacao, "associado"))
+    assert client.get(url, {"q": "bea"}).status_code == 403
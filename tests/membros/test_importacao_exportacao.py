@@ -0,0 +1,184 @@
+import csv
+import io
+import os
+from io import BytesIO
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+from openpyxl import load_workbook
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from configuracoes.models import ConfiguracaoConta  # noqa: E402
+from membros import importacao  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "membros-importacao"}
+}
+
+
+@pytest.fixture
+def arquivos_storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, **kwargs) -> User:
+    defaults = {"user_type": UserType.ASSOCIADO, "organizacao": organizacao, "is_associado": True}
+    defaults.update(kwargs)
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password="senha123", **defaults)
+
+
+def _as_file(response) -> BytesIO:
+    return BytesIO(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+def test_importacao_em_blocos_com_andamento(arquivos_storage, monkeypatch, django_capture_on_commit_callbacks) -> None:
+    monkeypatch.setattr(importacao, "IMPORT_BATCH_SIZE", 2)
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    outra = Organizacao.objects.create(nome="Outra", cnpj="11222333000181")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    admin = _create_user(organizacao, "admin", user_type=UserType.ADMIN)
+    _create_user(organizacao, "bia", contato="Bia")
+    _create_user(outra, "caio")
+
+    planilha = (
+        "email;nome;telefone;nucleo\n"
+        "Ana@Example.com;Ana Souza;(48) 99999-0000;alfa\n"
+        "bia@example.com;Beatriz;;\n"
+        "invalido;Sem e-mail;;\n"
+        "caio@example.com;Caio;;\n"
+        "dani@example.com;Dani;;Inexistente\n"
+    )
+    client = Client()
+    client.force_login(admin)
+    with django_capture_on_commit_callbacks(execute=True):
+        resposta = client.post(
+            reverse("membros_api:membros-importacao"),
+            {"arquivo": SimpleUploadedFile("membros.csv", planilha.encode())},
+        )
+    assert resposta.status_code == 202, resposta.content
+
+    progresso = client.get(resposta.json()["status_url"]).json()
+    assert {chave: progresso[chave] for chave in ("status", "total", "processadas", "criados", "atualizados")} == {
+        "status": "concluida",
+        "total": 5,
+        "processadas": 5,
+        "criados": 1,
+        "atualizados": 1,
+    }
+    assert progresso["erros"] == [
+        "Linha 4: e-mail inválido.",
+        "Linha 5: e-mail já cadastrado em outra organização.",
+        "Linha 6: núcleo Inexistente não encontrado.",
+    ]
+    assert not list((arquivos_storage / "importacoes").rglob("*.csv"))
+
+    ana = User.objects.get(email="ana@example.com")
+    assert (ana.username, ana.contato, str(ana.phone_number), ana.user_type) == (
+        "ana",
+        "Ana Souza",
+        "+5548999990000",
+        UserType.NUCLEADO,
+    )
+    assert "ana souza" in ana.search_document
+    assert not ana.has_usable_password()
+    assert ConfiguracaoConta.objects.filter(user=ana).exists()
+    assert ParticipacaoNucleo.objects.filter(user=ana, nucleo=alfa, status="ativo").exists()
+    assert User.objects.get(username="bia").contato == "Beatriz"
+
+    outro = Client()
+    outro.force_login(_create_user(organizacao, "operador", user_type=UserType.OPERADOR))
+    assert outro.get(resposta.json()["status_url"]).status_code == 404
+
+
+@pytest.mark.django_db
+def test_exportacoes_de_membros_e_participacoes(arquivos_storage) -> None:
+    organizacao = Organizacao.objects.create(nome="Org Teste", cnpj="12345678000195")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    admin = _create_user(organizacao, "admin", user_type=UserType.ADMIN)
+    ana = _create_user(organizacao, "ana", contato="Ana", nucleo=alfa)
+    ParticipacaoNucleo.objects.create(
+        user=ana,
+        nucleo=alfa,
+        status="ativo",
+        papel="coordenador",
+        papel_coordenador=ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL,
+    )
+
+    client = Client()
+    client.force_login(admin)
+    download = client.get(client.get(reverse("membros:membros_exportar", args=["xlsx"]))["Location"])
+    assert download["Content-Disposition"].endswith('filename="membros-org-teste.xlsx"')
+    linhas = list(load_workbook(filename=_as_file(download)).active.iter_rows(values_only=True))
+    assert [linha[:3] for linha in linhas[1:]] == [
+        ("admin", "admin", "admin@example.com"),
+        ("Ana", "ana", "ana@example.com"),
+    ]
+    assert linhas[2][5] == "Alfa"
+
+    download = client.get(client.get(reverse("nucleos:membros_exportar", args=[alfa.public_id, "csv"]))["Location"])
+    linhas = list(csv.reader(io.StringIO(_as_file(download).read().decode("utf-8-sig"))))
+    assert linhas[1][:5] == ["Ana", "ana@example.com", "", "Coordenador", "Coordenador Geral"]
+
+    client.force_login(ana)
+    assert client.get(reverse("membros:membros_exportar", args=["csv"])).status_code == 403
+
+
+@pytest.mark.django_db
+def test_exportacao_neutraliza_formulas(arquivos_storage) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(
+        organizacao, "admin", user_type=UserType.ADMIN, contato="@admin", phone_number="+5548999990000"
+    )
+    _create_user(organizacao, "ana", contato='=HYPERLINK("http://exemplo.com","clique")')
+
+    client = Client()
+    client.force_login(admin)
+    download = client.get(client.get(reverse("membros:membros_exportar", args=["xlsx"]))["Location"])
+    planilha = load_workbook(filename=_as_file(download)).active
+    nomes = [linha[0] for linha in planilha.iter_rows(min_row=2, max_col=1)]
+    assert [(celula.value, celula.data_type) for celula in nomes] == [
+        ("'@admin", "s"),
+        ('\'=HYPERLINK("http://exemplo.com","clique")', "s"),
+    ]
+    assert planilha.cell(row=2, column=4).value == "+5548999990000"
+
+    download = client.get(client.get(reverse("membros:membros_exportar", args=["csv"]))["Location"])
+    linhas = list(csv.reader(io.StringIO(_as_file(download).read().decode("utf-8-sig"))))
+    assert [linha[0] for linha in linhas[1:]] == ["'@admin", '\'=HYPERLINK("http://exemplo.com","clique")']
+    assert [linha[3] for linha in linhas[1:]] == ["+5548999990000", ""]
+
+
+@pytest.mark.django_db
+def test_nova_versao_da_exportacao_apaga_arquivo_anterior(arquivos_storage) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    admin = _create_user(organizacao, "admin", user_type=UserType.ADMIN)
+    diretorio = arquivos_storage / "exportacoes" / "membros_organizacao" / str(organizacao.pk)
+
+    client = Client()
+    client.force_login(admin)
+    client.get(reverse("membros:membros_exportar", args=["csv"]))
+    anterior = {arquivo.name for arquivo in diretorio.iterdir()}
+    _create_user(organizacao, "ana")
+    client.get(reverse("membros:membros_exportar", args=["csv"]))
+    atual = {arquivo.name for arquivo in diretorio.iterdir()}
+
+    assert len(anterior) == len(atual) == 1
+    assert anterior != atual
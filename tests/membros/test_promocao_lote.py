@@ -0,0 +1,171 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from membros.promocao import OperacaoPromocao, promover_em_lote  # noqa: E402
+from notificacoes.models import NotificationLog  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+GERAL = ParticipacaoNucleo.PapelCoordenador.COORDENADOR_GERAL
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.ASSOCIADO) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+        is_associado=user_type != UserType.CONVIDADO,
+    )
+
+
+def _participacoes() -> set[tuple[str, str, str, str | None]]:
+    return set(ParticipacaoNucleo.objects.values_list("user__username", "nucleo__nome", "status", "papel_coordenador"))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_promocao_em_lote_com_consultas_agrupadas() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    beta = Nucleo.objects.create(organizacao=organizacao, nome="Beta")
+    usuarios = [_create_user(organizacao, f"user{indice}") for indice in range(6)]
+    convidado = _create_user(organizacao, "convidado", UserType.CONVIDADO)
+    ParticipacaoNucleo.objects.create(user=usuarios[5], nucleo=beta, status="inativo")
+
+    operacoes = [OperacaoPromocao(user.pk, "nucleado", alfa.pk) for user in usuarios[:4]]
+    operacoes += [
+        OperacaoPromocao(usuarios[4].pk, "coordenador", beta.pk, GERAL),
+        OperacaoPromocao(usuarios[5].pk, "nucleado", beta.pk),
+        OperacaoPromocao(usuarios[0].pk, "consultor", beta.pk),
+        OperacaoPromocao(convidado.pk, "associado"),
+    ]
+    with CaptureQueriesContext(connection) as ctx:
+        resultado = promover_em_lote(organizacao, operacoes)
+    assert resultado.ok, resultado.erros
+    assert (resultado.participacoes_criadas, resultado.participacoes_atualizadas, resultado.nucleos_atualizados) == (
+        5,
+        1,
+        1,
+    )
+    escritas = [
+        query["sql"]
+        for query in ctx.captured_queries
+        if query["sql"].startswith(('INSERT INTO "nucleos_', 'UPDATE "nucleos_'))
+    ]
+    # Uma escrita por tabela, não uma por linha.
+    assert len(escritas) == 3
+
+    tipos = dict(User.objects.values_list("username", "user_type"))
+    assert tipos["user0"] == UserType.CONSULTOR
+    assert tipos["user1"] == UserType.NUCLEADO
+    assert tipos["user4"] == UserType.COORDENADOR
+    assert tipos["convidado"] == UserType.ASSOCIADO
+    assert User.objects.get(pk=usuarios[4].pk).is_coordenador
+    assert ("user5", "Beta", "ativo", None) in _participacoes()
+    assert Nucleo.objects.get(pk=beta.pk).consultor_id == usuarios[0].pk
+    assert NotificationLog.objects.filter(template__codigo="membro_promovido").values("user").distinct().count() == 7
+
+    # Papel ocupado e consultoria existente: nada é gravado.
+    antes = _participacoes()
+    resultado = promover_em_lote(
+        organizacao,
+        [
+            OperacaoPromocao(usuarios[1].pk, "coordenador", beta.pk, GERAL),
+            OperacaoPromocao(usuarios[2].pk, "consultor", beta.pk),
+        ],
+    )
+    assert not resultado.ok
+    assert "user1: O papel Coordenador Geral do núcleo Beta já está ocupado por user4." in resultado.erros
+    assert "user2: O núcleo Beta já possui o consultor user0." in resultado.erros
+    assert _participacoes() == antes
+
+    # No mesmo lote, a remoção libera o papel para outro usuário.
+    resultado = promover_em_lote(
+        organizacao,
+        [
+            OperacaoPromocao(usuarios[4].pk, "remover_coordenador", beta.pk),
+            OperacaoPromocao(usuarios[1].pk, "coordenador", beta.pk, GERAL),
+        ],
+    )
+    assert resultado.ok, resultado.erros
+    tipos = dict(User.objects.values_list("username", "user_type"))
+    assert (tipos["user1"], tipos["user4"]) == (UserType.COORDENADOR, UserType.NUCLEADO)
+
+
+@pytest.mark.django_db
+def test_api_promove_a_partir_de_planilha() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    admin = _create_user(organizacao, "admin", UserType.ADMIN)
+    ana = _create_user(organizacao, "ana")
+    bia = _create_user(organizacao, "bia")
+
+    client = Client()
+    url = reverse("membros_api:membros-promocoes-lote")
+    planilha = (
+        "usuario;papel;nucleo;papel_coordenador\n"
+        f"ana@example.com;nucleado;{alfa.pk};\n"
+        f"{bia.pk};coordenador;{alfa.pk};{GERAL}\n"
+    )
+
+    client.force_login(ana)
+    assert client.post(url, {"arquivo": SimpleUploadedFile("p.csv", planilha.encode())}).status_code == 403
+
+    client.force_login(admin)
+    resposta = client.post(url, {"arquivo": SimpleUploadedFile("p.csv", planilha.encode())})
+    assert resposta.status_code == 200, resposta.content
+    assert resposta.json()["participacoes_criadas"] == 2
+    assert _participacoes() == {("ana", "Alfa", "ativo", None), ("bia", "Alfa", "ativo", GERAL)}
+
+    resposta = client.post(
+        url,
+        {"operacoes": [{"usuario": "ana@example.com", "papel": "remover_nucleado", "nucleo": alfa.pk}]},
+        content_type="application/json",
+    )
+    assert resposta.status_code == 200
+    assert User.objects.get(pk=ana.pk).user_type == UserType.ASSOCIADO
+
+    resposta = client.post(
+        url,
+        {"operacoes": [{"usuario": "nao@example.com", "papel": "nucleado", "nucleo": alfa.pk}]},
+        content_type="application/json",
+    )
+    assert resposta.status_code == 400
+    assert resposta.json()["erros"] == ["Usuário nao@example.com não encontrado na organização."]
+
+
+@pytest.mark.django_db
+def test_formulario_de_promocao_usa_servico_em_lote() -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    alfa = Nucleo.objects.create(organizacao=organizacao, nome="Alfa")
+    admin = _create_user(organizacao, "admin", UserType.ADMIN)
+    ana = _create_user(organizacao, "ana")
+
+    client = Client()
+    client.force_login(admin)
+    url = reverse("membros:membro_promover_form", args=[ana.pk])
+
+    resposta = client.post(url, {"coordenador_nucleos": [alfa.pk]})
+    assert resposta.status_code == 400
+    assert "Selecione um papel de coordenação para cada núcleo escolhido." in resposta.context["form_errors"]
+
+    resposta = client.post(url, {"coordenador_nucleos": [alfa.pk], f"coordenador_papel_{alfa.pk}": GERAL})
+    assert resposta.status_code == 200
+    assert resposta.context["success_message"]
+    ana.refresh_from_db()
+    assert (ana.user_type, ana.is_coordenador) == (UserType.COORDENADOR, True)
@@ -0,0 +1,93 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from nucleos.views import NucleoListView  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "nucleos-listagem"}}
+
+
+@pytest.fixture
+def listagem_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.ADMIN) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+    )
+
+
+def _listar(user, **params):
+    request = RequestFactory().get("/nucleos/", params)
+    request.user = user
+    view = NucleoListView()
+    view.setup(request)
+    return view, view.get_queryset()
+
+
+@pytest.mark.django_db
+def test_listagem_em_cache_por_organizacao(listagem_cache, django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    outra = Organizacao.objects.create(nome="Outra", cnpj="11222333000181")
+    admin = _create_user(organizacao, "admin")
+    alfa = Nucleo.objects.create(nome="Alfa", organizacao=organizacao, classificacao="constituido")
+    Nucleo.objects.create(nome="Beta", organizacao=organizacao, classificacao="planejamento")
+    for indice in range(2):
+        ParticipacaoNucleo.objects.create(
+            user=_create_user(organizacao, f"membro{indice}", UserType.NUCLEADO),
+            nucleo=alfa,
+            status="ativo",
+        )
+
+    _view, nucleos = _listar(admin)
+    assert [(n.nome, n.membros_count) for n in nucleos] == [("Alfa", 2), ("Beta", 0)]
+
+    with django_assert_num_queries(0):
+        view, filtrados = _listar(admin, classificacao="constituido", q="alf")
+        assert [n.nome for n in filtrados] == ["Alfa"]
+        assert view.get_listagem().totais(view._qs_for_counts, {"constituido", "planejamento"}) == {
+            "constituido": 1,
+            "planejamento": 0,
+        }
+
+    Nucleo.objects.create(nome="Gama", organizacao=outra)
+    with django_assert_num_queries(0):
+        _listar(admin)
+
+    Nucleo.objects.create(nome="Delta", organizacao=organizacao)
+    assert [n.nome for n in _listar(admin)[1]] == ["Alfa", "Beta", "Delta"]
+
+
+@pytest.mark.django_db
+def test_paginas_de_nucleos_renderizam_projecoes(listagem_cache, client) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    nucleado = _create_user(organizacao, "nucleado", UserType.NUCLEADO)
+    alfa = Nucleo.objects.create(nome="Alfa", organizacao=organizacao, classificacao="constituido")
+    ParticipacaoNucleo.objects.create(user=nucleado, nucleo=alfa, status="ativo")
+    client.force_login(nucleado)
+
+    for nome_url in ("nucleos:list", "nucleos:meus"):
+        response = client.get(reverse(nome_url))
+        assert response.status_code == 200
+        assert "Alfa" in response.content.decode()
@@ -0,0 +1,66 @@
+import os
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Hubx.settings")
+django.setup()
+
+from accounts.models import UserType  # noqa: E402
+from feed.utils import get_allowed_nucleos_for_user  # noqa: E402
+from nucleos.membership import obter_indice  # noqa: E402
+from nucleos.models import Nucleo, ParticipacaoNucleo  # noqa: E402
+from organizacoes.models import Organizacao  # noqa: E402
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "nucleos-vinculos"}}
+
+
+@pytest.fixture
+def vinculos_cache(settings):
+    settings.CACHES = LOCMEM_CACHE
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create_user(organizacao: Organizacao, username: str, user_type=UserType.NUCLEADO) -> User:
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="senha123",
+        user_type=user_type,
+        organizacao=organizacao,
+    )
+
+
+@pytest.mark.django_db
+def test_indice_de_vinculos_em_cache_e_invalidado_por_sinais(vinculos_cache, django_assert_num_queries) -> None:
+    organizacao = Organizacao.objects.create(nome="Org", cnpj="12345678000195")
+    usuario = _create_user(organizacao, "usuario")
+    alfa, beta, gama = (Nucleo.objects.create(nome=nome, organizacao=organizacao) for nome in ("Alfa", "Beta", "Gama"))
+    ParticipacaoNucleo.objects.create(user=usuario, nucleo=alfa, status="ativo", papel="coordenador")
+    ParticipacaoNucleo.objects.create(user=usuario, nucleo=beta, status="ativo", status_suspensao=True)
+    gama.consultor = usuario
+    gama.save()
+
+    indice = obter_indice(usuario)
+    assert indice.ativos == {alfa.pk, beta.pk}
+    assert indice.ativos_sem_suspensao == indice.coordenacao == {alfa.pk}
+    assert indice.consultoria == {gama.pk}
+    assert indice.organizacao_id == organizacao.pk
+
+    with django_assert_num_queries(0):
+        mesmo = User(pk=usuario.pk, organizacao_id=organizacao.pk)
+        assert obter_indice(usuario) == obter_indice(mesmo) == indice
+
+    gama.consultor = None
+    gama.save()
+    ParticipacaoNucleo.objects.filter(nucleo=beta).get().delete()
+    indice = obter_indice(usuario)
+    assert indice.ativos == {alfa.pk}
+    assert indice.consultoria == frozenset()
+    assert set(get_allowed_nucleos_for_user(usuario).values_list("pk", flat=True)) == {alfa.pk}